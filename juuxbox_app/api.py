@@ -6,20 +6,37 @@ pywebview JavaScript-Python 브릿지 API
 """
 
 import base64
+import json
 import logging
 import threading
+from concurrent.futures import CancelledError
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 
-from db.models import create_tables
-from db.repository import TrackRepository
+from db.artwork import ArtworkStore
+from db.executor import BACKGROUND, DbExecutor
+from db.models import close_connections, configure as configure_database, create_tables
+from db.repository import BackfillRepository, ScanJobRepository, TrackRepository
 from db.scanner import LibraryScanner
-from audio.engine import AudioEngine, PlaybackState
-from utils.config import load_config
+from db.watcher import LibraryWatcher, WatchBatch
+from audio.engine import AudioEngine, AudioInfo, PlaybackState
+from audio.dsp import DspChain
+from audio.play_queue import RepeatMode, restore_queue
+from audio.session import SessionCheckpointer, restore_session
+from audio.transcode_cache import TranscodeCache, WARM_UP_COUNT
+from audio.visualizer import VisualizerTap
+from utils.config import load_config, save_config
 from utils.youtube_search import search_youtube, build_search_query, YOUTUBE_AVAILABLE
 
 logger = logging.getLogger(__name__)
 
+# DB 실행기 요청 key - 새 요청이 오면 같은 key의 이전 요청은 취소
+VIEW_REQUEST = "view"      # 라이브러리 화면 (트랙 목록 페이지, 그리드, 그리드 항목의 트랙)
+SEARCH_REQUEST = "search"  # 검색어 입력
+PLAY_REQUEST = "play"      # 재생할 트랙 조회 (빠르게 다음 곡을 누르면 마지막 곡만)
+WARM_REQUEST = "warm"      # 미리 변환할 다음 곡 경로
+QUEUE_REQUEST = "queue"    # 전체 라이브러리 대기열의 트랙 ID
+
 
 class JuuxBoxAPI:
     """pywebview에 노출되는 API 클래스"""
@@ -27,29 +44,103 @@ class JuuxBoxAPI:
     def __init__(self):
         self._engine: Optional[AudioEngine] = None
         self._config = load_config()
+        self._dsp = DspChain.from_config(self._config.get('dsp', {}))
+        self._transcode_cache = TranscodeCache.from_config(self._config.get('audio', {}))
+        self._visualizer = VisualizerTap()
+        self._artwork = ArtworkStore()
         self._current_track: Optional[Dict] = None
-        self._playlist: List[Dict] = []
-        self._playlist_index: int = -1
+        self._queue = restore_queue(self._config.get('playback', {}))
+        self._session: Optional[SessionCheckpointer] = None
         self._window = None  # pywebview window reference
         self._progress_thread: Optional[threading.Thread] = None
         self._running = True
+        self._watcher: Optional[LibraryWatcher] = None
+        self._scan_cancel = threading.Event()
+        self._backfill_cancel = threading.Event()
 
-        # DB 초기화
+        # DB 초기화 (라이브러리 조회/쓰기는 브리지 스레드 대신 DB 실행기에서)
+        configure_database(self._config.get('database', {}))
         create_tables()
+        self._db = DbExecutor.from_config(self._config.get('database', {}))
+        self._start_metadata_backfill()
+
+        # 라이브러리 폴더 감시 시작
+        self._start_library_watcher()
 
         # 오디오 엔진 초기화
         self._init_audio_engine()
 
+        # 마지막 세션 복원 및 지연 저장 시작
+        if self._config.get('playback', {}).get('remember_position', True):
+            self._restore_session()
+            self._session = SessionCheckpointer(self._session_snapshot, self._queue)
+            self._session.start()
+
+    def _start_metadata_backfill(self):
+        """스키마 업그레이드로 생긴 확장 메타데이터 컬럼을 백그라운드에서 채움 (종료 시 중단 → 다음 실행에서 이어서)"""
+        pending = self._db.call(BackfillRepository.pending)
+        if not pending:
+            return
+        logger.info(f"확장 메타데이터 백필 시작: 트랙 {pending}개")
+        scanner = LibraryScanner(artwork_store=self._artwork, db_executor=self._db)
+        threading.Thread(target=scanner.backfill_metadata, args=(self._backfill_cancel,), daemon=True).start()
+
+    def _start_library_watcher(self):
+        """설정된 라이브러리 폴더 감시 (watchdog 없으면 생략)"""
+        library_config = self._config.get('library', {})
+        if not library_config.get('watch_enabled', True):
+            return
+        self._watcher = LibraryWatcher.from_config(library_config, on_change=self._on_library_changed,
+                                                   db_executor=self._db)
+        if not self._watcher.start(library_config.get('scan_paths', [])):
+            self._watcher = None
+
+    def _on_library_changed(self, batch: WatchBatch):
+        """감시로 반영된 변경을 웹 UI에 전달"""
+        self._push_scanned_tracks(batch.added, batch.updated)
+        if (batch.removed or batch.moved) and self._window:
+            try:
+                self._window.evaluate_js("window.onLibraryChanged && window.onLibraryChanged()")
+            except Exception as e:
+                logger.debug(f"라이브러리 변경 전달 실패: {e}")
+
     def _init_audio_engine(self):
         """오디오 엔진 초기화"""
         try:
             device_name = self._config.get('audio', {}).get('device_name')
-            self._engine = AudioEngine(device_name=device_name)
+            self._engine = AudioEngine(device_name=device_name, dsp=self._dsp,
+                                       transcode_cache=self._transcode_cache,
+                                       visualizer=self._visualizer)
+            self._engine.set_on_track_end(self._on_track_end)
             logger.info("오디오 엔진 초기화 완료")
         except Exception as e:
             logger.error(f"오디오 엔진 초기화 실패: {e}")
             self._engine = None
 
+    def _restore_session(self):
+        """마지막 재생 곡을 저장된 위치에서 미리 열기"""
+        if not self._engine:
+            return
+        try:
+            lookup_track = lambda track_id: self._db.call(TrackRepository.get_by_id, track_id)
+            session = restore_session(self._engine, self._queue, lookup_track=lookup_track)
+            if session and session.get('track'):
+                self._current_track = self._track_to_dict(session['track'])
+        except Exception as e:
+            logger.warning(f"세션 복원 실패: {e}")
+
+    def _session_snapshot(self) -> Optional[Dict[str, Any]]:
+        """세션 저장용 현재 상태"""
+        track = self._current_track
+        if not track or not self._engine:
+            return None
+        return {
+            "track_id": track.get('id'),
+            "file_path": track.get('file_path'),
+            "position": round(self._engine.audio_info.position_seconds, 1),
+            "queue_position": self._queue.position,
+        }
+
     def set_window(self, window):
         """pywebview 윈도우 참조 설정"""
         self._window = window
@@ -74,24 +165,84 @@ class JuuxBoxAPI:
         self._progress_thread = threading.Thread(target=update_progress, daemon=True)
         self._progress_thread.start()
 
+    # ===== 시각화 =====
+
+    def start_visualizer(self) -> Dict[str, Any]:
+        """스펙트럼/레벨 미터 프레임 전송 시작 (window.onVisualizerFrame)"""
+        self._visualizer.subscribe(self._push_visualizer_frame)
+        return {"success": self._visualizer.active, "bands": self._visualizer.bands}
+
+    def stop_visualizer(self) -> Dict[str, Any]:
+        """시각화 프레임 전송 중지 (오디오 스레드 부하 없음)"""
+        self._visualizer.unsubscribe()
+        return {"success": True}
+
+    def _push_visualizer_frame(self, frame: dict):
+        """분석 스레드에서 웹 UI로 프레임 전달"""
+        if self._window:
+            self._window.evaluate_js(
+                f"window.onVisualizerFrame && window.onVisualizerFrame({json.dumps(frame)})"
+            )
+
     # ===== 라이브러리 관련 =====
 
     def get_all_tracks(self) -> List[Dict]:
         """모든 트랙 목록 반환"""
         try:
-            tracks = TrackRepository.get_all()
+            tracks = self._db.call(self._track_dicts, TrackRepository.get_all, key=VIEW_REQUEST)
             logger.info(f"트랙 조회: {len(tracks)}개")
-            return [self._track_to_dict(t) for t in tracks]
+            return tracks
+        except CancelledError:
+            return []
         except Exception as e:
             logger.error(f"트랙 조회 실패: {e}")
             return []
 
+    def get_tracks_page(self, sort: str = "artist", cursor: Optional[List] = None,
+                        limit: Optional[int] = None, descending: bool = False) -> Dict[str, Any]:
+        """
+        트랙 목록 한 페이지 (전체 목록은 한 번에 넘기지 않고 스크롤하며 이어 받음)
+
+        Args:
+            sort: artist / album / title / added
+            cursor: 이전 응답의 cursor (None이면 첫 페이지)
+            limit: 페이지 크기 (None이면 설정의 library.page_size)
+
+        Returns:
+            {"success", "tracks", "cursor", "total", "sort", "descending"}
+            - cursor: 다음 페이지 커서 (마지막 페이지면 None)
+            - total: 전체 트랙 수 (첫 페이지에만, 이어 받을 때는 None)
+        """
+        if limit is None:
+            limit = self._config.get('library', {}).get('page_size', 200)
+
+        def read_page():
+            tracks, next_cursor = TrackRepository.get_page(sort, cursor, max(1, int(limit)), bool(descending))
+            return {
+                "success": True,
+                "tracks": [self._track_to_dict(t) for t in tracks],
+                "cursor": next_cursor,
+                "total": TrackRepository.count() if cursor is None else None,
+                "sort": sort,
+                "descending": bool(descending),
+            }
+
+        try:
+            return self._db.call(read_page, key=VIEW_REQUEST)
+        except CancelledError:
+            return {"success": False, "cancelled": True, "tracks": [], "cursor": None, "total": 0}
+        except Exception as e:
+            logger.error(f"트랙 페이지 조회 실패: {e}")
+            return {"success": False, "error": str(e), "tracks": [], "cursor": None, "total": 0}
+
     def get_albums(self) -> List[Dict]:
         """앨범 목록 반환 (그리드 뷰용)"""
         try:
-            albums = TrackRepository.get_albums()
+            albums = self._db.call(TrackRepository.get_albums, key=VIEW_REQUEST)
             logger.info(f"앨범 조회: {len(albums)}개")
             return albums
+        except CancelledError:
+            return []
         except Exception as e:
             logger.error(f"앨범 조회 실패: {e}")
             return []
@@ -99,9 +250,11 @@ class JuuxBoxAPI:
     def get_artists(self) -> List[Dict]:
         """아티스트 목록 반환 (그리드 뷰용)"""
         try:
-            artists = TrackRepository.get_artists()
+            artists = self._db.call(TrackRepository.get_artists, key=VIEW_REQUEST)
             logger.info(f"아티스트 조회: {len(artists)}개")
             return artists
+        except CancelledError:
+            return []
         except Exception as e:
             logger.error(f"아티스트 조회 실패: {e}")
             return []
@@ -109,29 +262,37 @@ class JuuxBoxAPI:
     def get_folders(self) -> List[Dict]:
         """폴더 목록 반환 (그리드 뷰용)"""
         try:
-            folders = TrackRepository.get_folders()
+            folders = self._db.call(TrackRepository.get_folders, key=VIEW_REQUEST)
             logger.info(f"폴더 조회: {len(folders)}개")
             return folders
+        except CancelledError:
+            return []
         except Exception as e:
             logger.error(f"폴더 조회 실패: {e}")
             return []
 
-    def get_tracks_by_album(self, album: str) -> List[Dict]:
-        """앨범별 트랙 목록 반환"""
+    def get_tracks_by_album(self, album_id: int) -> List[Dict]:
+        """앨범 트랙 목록 반환 (get_albums 항목의 id)"""
         try:
-            tracks = TrackRepository.get_tracks_by_album(album)
-            logger.info(f"앨범 '{album}' 트랙 조회: {len(tracks)}개")
-            return [self._track_to_dict(t) for t in tracks]
+            tracks = self._db.call(self._track_dicts, TrackRepository.get_tracks_by_album, int(album_id),
+                                   key=VIEW_REQUEST)
+            logger.info(f"앨범 {album_id} 트랙 조회: {len(tracks)}개")
+            return tracks
+        except CancelledError:
+            return []
         except Exception as e:
             logger.error(f"앨범 트랙 조회 실패: {e}")
             return []
 
-    def get_tracks_by_artist(self, artist: str) -> List[Dict]:
-        """아티스트별 트랙 목록 반환"""
+    def get_tracks_by_artist(self, artist_id: int) -> List[Dict]:
+        """아티스트 트랙 목록 반환 (get_artists 항목의 id)"""
         try:
-            tracks = TrackRepository.get_tracks_by_artist(artist)
-            logger.info(f"아티스트 '{artist}' 트랙 조회: {len(tracks)}개")
-            return [self._track_to_dict(t) for t in tracks]
+            tracks = self._db.call(self._track_dicts, TrackRepository.get_tracks_by_artist, int(artist_id),
+                                   key=VIEW_REQUEST)
+            logger.info(f"아티스트 {artist_id} 트랙 조회: {len(tracks)}개")
+            return tracks
+        except CancelledError:
+            return []
         except Exception as e:
             logger.error(f"아티스트 트랙 조회 실패: {e}")
             return []
@@ -139,50 +300,139 @@ class JuuxBoxAPI:
     def get_tracks_by_folder(self, folder_name: str) -> List[Dict]:
         """폴더별 트랙 목록 반환"""
         try:
-            tracks = TrackRepository.get_tracks_by_folder(folder_name)
+            tracks = self._db.call(self._track_dicts, TrackRepository.get_tracks_by_folder, folder_name,
+                                   key=VIEW_REQUEST)
             logger.info(f"폴더 '{folder_name}' 트랙 조회: {len(tracks)}개")
-            return [self._track_to_dict(t) for t in tracks]
+            return tracks
+        except CancelledError:
+            return []
         except Exception as e:
             logger.error(f"폴더 트랙 조회 실패: {e}")
             return []
 
-    def scan_folder(self, folder_path: str) -> Dict[str, Any]:
-        """폴더 스캔"""
+    def search_tracks(self, query: str, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
+        """
+        트랙 검색 (단어별 접두어 검색, 관련도 순)
+
+        Returns:
+            {"success", "query", "tracks", "total", "offset", "limit"}
+        """
+        def run_search():
+            tracks, total = TrackRepository.search(query, int(limit), int(offset))
+            return {
+                "success": True,
+                "query": query,
+                "tracks": [self._track_to_dict(t) for t in tracks],
+                "total": total,
+                "offset": offset,
+                "limit": limit,
+            }
+
         try:
-            scanner = LibraryScanner()
-            tracks = scanner.scan_folder(folder_path)
+            return self._db.call(run_search, key=SEARCH_REQUEST)
+        except CancelledError:
+            return {"success": False, "cancelled": True, "query": query, "tracks": [], "total": 0}
+        except Exception as e:
+            logger.error(f"트랙 검색 실패: {e}")
+            return {"success": False, "error": str(e), "query": query, "tracks": [], "total": 0}
 
-            for track in tracks:
-                TrackRepository.insert(track)
+    def scan_folder(self, folder_path: str) -> Dict[str, Any]:
+        """
+        폴더 증분 스캔 (새 파일/변경된 파일만 추출)
 
-            return {"success": True, "count": len(tracks)}
+        배치가 저장될 때마다 window.onTracksAdded(added, updated)로 트랙을 전달하므로
+        웹 UI는 스캔이 끝나기 전부터 목록을 채울 수 있습니다.
+        """
+        try:
+            library_config = self._config.setdefault('library', {})
+            scanner = LibraryScanner.from_config(library_config, db_executor=self._db)
+            self._scan_cancel.clear()
+            result = scanner.rescan(folder_path, on_batch=self._push_scanned_tracks,
+                                    cancel=self._scan_cancel)
+
+            # 스캔한 폴더는 이후 변경을 감시
+            scan_paths = library_config.setdefault('scan_paths', [])
+            if folder_path not in scan_paths:
+                scan_paths.append(folder_path)
+                save_config(self._config)
+                if self._watcher:
+                    self._watcher.add_path(folder_path)
+            return {
+                "success": True,
+                "count": result.added + result.updated,
+                "cancelled": result.cancelled,
+                "resumed": result.resumed,
+                **result.summary()
+            }
         except Exception as e:
             logger.error(f"폴더 스캔 실패: {e}")
             return {"success": False, "error": str(e)}
 
+    def cancel_scan(self) -> Dict[str, Any]:
+        """진행 중인 폴더 스캔 취소 (저장된 배치까지 유지, 다음 스캔에서 이어서 진행)"""
+        self._scan_cancel.set()
+        return {"success": True}
+
+    def get_interrupted_scans(self) -> List[str]:
+        """취소되었거나 앱 종료로 끝나지 않은 스캔의 폴더 목록"""
+        try:
+            jobs = self._db.call(ScanJobRepository.find_interrupted)
+            return list(dict.fromkeys(job['folder_path'] for job in jobs))
+        except Exception as e:
+            logger.error(f"중단된 스캔 조회 실패: {e}")
+            return []
+
+    def _push_scanned_tracks(self, added: List[Dict], updated: List[Dict]):
+        """스캔 배치를 웹 UI에 전달"""
+        if not self._window:
+            return
+        payload = json.dumps([
+            [self._track_to_dict(t) for t in added],
+            [self._track_to_dict(t) for t in updated],
+        ], ensure_ascii=False)
+        try:
+            self._window.evaluate_js(f"window.onTracksAdded && window.onTracksAdded(...{payload})")
+        except Exception as e:
+            logger.debug(f"스캔 배치 전달 실패: {e}")
+
     def delete_tracks(self, file_paths: List[str]) -> Dict[str, Any]:
         """트랙 삭제"""
+        def delete():
+            deleted = TrackRepository.delete_by_file_paths(list(file_paths))
+            self._artwork.collect_garbage()
+            return deleted
+
         try:
-            for path in file_paths:
-                TrackRepository.delete_by_file_path(path)
-            return {"success": True, "count": len(file_paths)}
+            return {"success": True, "count": self._db.call(delete, priority=BACKGROUND)}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
     def delete_all_tracks(self) -> Dict[str, Any]:
         """모든 트랙 삭제"""
-        try:
+        def delete_all():
             TrackRepository.delete_all()
+            self._artwork.collect_garbage()
+
+        try:
+            self._db.call(delete_all, priority=BACKGROUND)
             return {"success": True}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
-    def get_cover_image(self, cover_path: str) -> Dict[str, Any]:
-        """커버 이미지를 base64로 반환"""
+    def get_cover_image(self, cover_path: str, size: int = 0) -> Dict[str, Any]:
+        """
+        커버 이미지를 base64로 반환
+
+        Args:
+            cover_path: 트랙의 cover_path
+            size: 표시 크기(px) - 지정하면 그 이상인 가장 작은 썸네일 사용 (0: 원본)
+        """
         if not cover_path:
             return {"success": False, "error": "경로 없음"}
 
         try:
+            if size:
+                cover_path = self._artwork.thumbnail_path(cover_path, size)
             path = Path(cover_path)
             if not path.exists():
                 return {"success": False, "error": "파일 없음"}
@@ -219,7 +469,9 @@ class JuuxBoxAPI:
             return {"success": False, "error": "오디오 엔진 없음"}
 
         try:
-            if not self._engine.load(file_path):
+            # 라이브러리 트랙이면 저장된 스트림 정보로 로드 (파일 태그를 다시 읽지 않음)
+            track = self._db.call(TrackRepository.get_by_file_path, file_path, key=PLAY_REQUEST)
+            if not self._engine.load(file_path, stream_info=AudioInfo.from_track(track)):
                 logger.error(f"파일 로드 실패: {file_path}")
                 return {"success": False, "error": "파일 로드 실패"}
 
@@ -228,16 +480,33 @@ class JuuxBoxAPI:
                 return {"success": False, "error": "재생 시작 실패"}
 
             # 현재 트랙 정보 저장
-            track = TrackRepository.get_by_file_path(file_path)
             if track:
                 self._current_track = self._track_to_dict(track)
 
+            self._warm_upcoming()
             logger.info(f"재생: {file_path}")
             return {"success": True, "track": self._current_track}
+        except CancelledError:
+            return {"success": False, "cancelled": True}
         except Exception as e:
             logger.error(f"재생 실패: {e}")
             return {"success": False, "error": str(e)}
 
+    def _warm_upcoming(self):
+        """대기열의 다음 곡들을 변환 캐시에 미리 준비"""
+        if not self._transcode_cache:
+            return
+
+        def upcoming_paths():
+            tracks = (TrackRepository.get_by_id(track_id) for track_id in self._queue.upcoming(WARM_UP_COUNT))
+            return [track['file_path'] for track in tracks if track]
+
+        try:
+            paths = self._db.call(upcoming_paths, key=WARM_REQUEST)
+        except CancelledError:
+            return
+        self._engine.warm_transcode_cache(paths)
+
     def pause(self) -> Dict[str, Any]:
         """일시정지"""
         if self._engine:
@@ -246,8 +515,10 @@ class JuuxBoxAPI:
         return {"success": False}
 
     def resume(self) -> Dict[str, Any]:
-        """재생 재개"""
+        """재생 재개 (정지 상태면 로드된 곡을 시작 위치부터 재생)"""
         if self._engine:
+            if self._engine.state == PlaybackState.STOPPED:
+                return {"success": self._engine.play()}
             self._engine.resume()
             return {"success": True}
         return {"success": False}
@@ -333,7 +604,13 @@ class JuuxBoxAPI:
                 self._engine.stop()
                 self._engine.cleanup()
             
-            self._engine = AudioEngine(device_name=device_name if device_name != 'System Default' else None)
+            self._engine = AudioEngine(
+                device_name=device_name if device_name != 'System Default' else None,
+                dsp=self._dsp,
+                transcode_cache=self._transcode_cache,
+                visualizer=self._visualizer
+            )
+            self._engine.set_on_track_end(self._on_track_end)
             logger.info(f"오디오 장치 변경: {device_name}")
             
             return {"success": True, "device_name": device_name}
@@ -341,31 +618,121 @@ class JuuxBoxAPI:
             logger.error(f"오디오 장치 설정 실패: {e}")
             return {"success": False, "error": str(e)}
 
+    def get_dsp_stats(self) -> Dict[str, Any]:
+        """DSP 체인 상태 및 스테이지별 처리 비용"""
+        return {
+            "bypass": self._dsp.bypass,
+            "active": self._dsp.active,
+            "stages": self._dsp.stats()
+        }
+
+    def set_dsp_bypass(self, bypass: bool) -> Dict[str, Any]:
+        """DSP 체인 우회 (True: Bit-Perfect)"""
+        self._dsp.bypass = bool(bypass)
+        self._config.setdefault('dsp', {})['bypass'] = self._dsp.bypass
+        try:
+            save_config(self._config)
+        except Exception as e:
+            logger.warning(f"설정 저장 실패: {e}")
+        return {"success": True, "bypass": self._dsp.bypass}
+
     # ===== 플레이리스트 =====
 
-    def set_playlist(self, tracks: List[Dict], start_index: int = 0) -> Dict[str, Any]:
-        """플레이리스트 설정"""
-        self._playlist = tracks
-        self._playlist_index = start_index
+    def set_playlist(self, tracks: List[Any], start_index: int = 0) -> Dict[str, Any]:
+        """플레이리스트 설정 (트랙 ID 목록, 구버전 호환을 위해 트랙 dict도 허용)"""
+        track_ids = [t['id'] if isinstance(t, dict) else int(t) for t in tracks]
+        self._queue.set_tracks(track_ids, start_index)
         return {"success": True}
 
+    def set_library_playlist(self, sort: str = "artist", descending: bool = False,
+                             track_id: Optional[int] = None) -> Dict[str, Any]:
+        """전체 라이브러리를 get_tracks_page와 같은 정렬 순서로 대기열에 설정 (불러온 페이지와 무관)"""
+        try:
+            track_ids = self._db.call(TrackRepository.get_ids, sort, bool(descending), key=QUEUE_REQUEST)
+        except CancelledError:
+            return {"success": False, "cancelled": True}
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
+        start_index = track_ids.index(track_id) if track_id in track_ids else 0
+        self._queue.set_tracks(track_ids, start_index)
+        return {"success": True, "count": len(track_ids)}
+
+    def _play_queue_track(self, track_id: Optional[int]) -> Dict[str, Any]:
+        """대기열에서 선택된 트랙 재생"""
+        if track_id is None:
+            return {"success": False, "error": "다음 곡 없음"}
+        try:
+            track = self._db.call(TrackRepository.get_by_id, track_id, key=PLAY_REQUEST)
+        except CancelledError:
+            return {"success": False, "cancelled": True}
+        if not track:
+            return {"success": False, "error": "트랙 없음"}
+        return self.play(track['file_path'])
+
     def play_next(self) -> Dict[str, Any]:
         """다음 곡 재생"""
-        if not self._playlist:
+        if not len(self._queue):
             return {"success": False, "error": "플레이리스트 없음"}
-
-        self._playlist_index = (self._playlist_index + 1) % len(self._playlist)
-        track = self._playlist[self._playlist_index]
-        return self.play(track['file_path'])
+        return self._play_queue_track(self._queue.next(manual=True))
+
+    def _on_track_end(self):
+        """곡 재생 완료 (엔진의 위치 추적 스레드에서 호출 → 그 스레드를 멈추는 재생은 별도 스레드에서)"""
+        threading.Thread(target=self._advance_after_track_end, daemon=True).start()
+
+    def _advance_after_track_end(self):
+        """곡이 끝나면 다음 곡 재생 (한 곡 반복이면 같은 곡, 전체 반복이면 끝에서 처음으로) 후 웹 UI에 전달"""
+        if not len(self._queue):
+            return
+        result = self._play_queue_track(self._queue.next(manual=False))
+        if result.get('success') and self._window:
+            try:
+                self._window.evaluate_js(
+                    f"window.onTrackChanged && window.onTrackChanged({json.dumps(result['track'], ensure_ascii=False)})"
+                )
+            except Exception as e:
+                logger.debug(f"자동 다음 곡 전달 실패: {e}")
 
     def play_previous(self) -> Dict[str, Any]:
         """이전 곡 재생"""
-        if not self._playlist:
+        if not len(self._queue):
             return {"success": False, "error": "플레이리스트 없음"}
-
-        self._playlist_index = (self._playlist_index - 1) % len(self._playlist)
-        track = self._playlist[self._playlist_index]
-        return self.play(track['file_path'])
+        return self._play_queue_track(self._queue.previous())
+
+    def add_to_queue(self, track_id: int, play_next: bool = False) -> Dict[str, Any]:
+        """대기열에 추가 (play_next=True면 현재 곡 다음)"""
+        if play_next:
+            self._queue.insert_next(int(track_id))
+        else:
+            self._queue.append(int(track_id))
+        return {"success": True, "length": len(self._queue)}
+
+    def remove_from_queue(self, position: int) -> Dict[str, Any]:
+        """대기열 위치의 곡 삭제"""
+        try:
+            track_id = self._queue.remove(int(position))
+            return {"success": True, "track_id": track_id}
+        except IndexError:
+            return {"success": False, "error": "잘못된 위치"}
+
+    def set_shuffle(self, enabled: bool) -> Dict[str, Any]:
+        """셔플 설정"""
+        self._queue.shuffle = bool(enabled)
+        self._save_playback_setting('shuffle', self._queue.shuffle)
+        return {"success": True, "shuffle": self._queue.shuffle}
+
+    def set_repeat_mode(self, mode: str) -> Dict[str, Any]:
+        """반복 모드 설정 (off / one / all)"""
+        self._queue.repeat_mode = RepeatMode.parse(mode)
+        self._save_playback_setting('repeat_mode', self._queue.repeat_mode.value)
+        return {"success": True, "repeat_mode": self._queue.repeat_mode.value}
+
+    def _save_playback_setting(self, key: str, value):
+        """playback 설정 저장"""
+        self._config.setdefault('playback', {})[key] = value
+        try:
+            save_config(self._config)
+        except Exception as e:
+            logger.warning(f"설정 저장 실패: {e}")
 
     # ===== 유틸리티 =====
 
@@ -380,19 +747,31 @@ class JuuxBoxAPI:
                 return result[0]
         return None
 
+    def _track_dicts(self, fetch, *args) -> List[Dict[str, Any]]:
+        """트랙 조회 후 API 응답 형식으로 변환 (DB 실행기 작업자에서 실행)"""
+        return [self._track_to_dict(t) for t in fetch(*args)]
+
     def _track_to_dict(self, track: Dict) -> Dict[str, Any]:
         """Track 딕셔너리를 API 응답 형식으로 변환"""
         return {
             "id": track.get('id'),
+            "artist_id": track.get('artist_id'),
+            "album_id": track.get('album_id'),
             "title": track.get('title') or "Unknown",
             "artist": track.get('artist') or "Unknown Artist",
             "album": track.get('album') or "",
             "album_artist": track.get('album_artist', ''),
             "track_number": track.get('track_number', 0),
+            "disc_number": track.get('disc_number'),
+            "year": track.get('year'),
             "genre": track.get('genre', ''),
+            "composer": track.get('composer') or "",
+            "conductor": track.get('conductor') or "",
+            "performer": track.get('performer') or "",
             "duration": track.get('duration_seconds') or 0,
             "sample_rate": track.get('sample_rate') or 0,
             "bit_depth": track.get('bit_depth') or 0,
+            "bitrate": track.get('bitrate') or 0,
             "channels": track.get('channels', 2),
             "file_path": track.get('file_path'),
             "folder_name": track.get('folder_name') or "",
@@ -424,5 +803,19 @@ class JuuxBoxAPI:
     def cleanup(self):
         """정리"""
         self._running = False
+        self._scan_cancel.set()
+        self._backfill_cancel.set()
+        self._visualizer.unsubscribe()
+        if self._watcher:
+            self._watcher.stop()
+        if self._session:
+            self._session.stop()
+        else:
+            try:
+                self._queue.save()
+            except Exception as e:
+                logger.warning(f"대기열 저장 실패: {e}")
         if self._engine:
             self._engine.stop()
+        self._db.shutdown()
+        close_connections()
@@ -5,12 +5,20 @@ UI와 오디오 엔진을 연결하는 컨트롤러
 """
 
 import logging
+import threading
 from pathlib import Path
 from typing import Optional
 
-from audio.engine import AudioEngine, PlaybackState
+from audio.engine import AudioEngine, AudioInfo, PlaybackState
+from audio.dsp import DspChain
 from audio.gapless import GaplessManager
+from audio.play_queue import RepeatMode, restore_queue
+from audio.session import SessionCheckpointer, restore_session
+from audio.transcode_cache import TranscodeCache, WARM_UP_COUNT
+from audio.visualizer import VisualizerTap
+from db.models import close_connections
 from db.repository import TrackRepository
+from utils.config import load_config, save_config
 
 logger = logging.getLogger(__name__)
 
@@ -22,42 +30,108 @@ class AppController:
     UI 이벤트를 처리하고 오디오 엔진을 제어합니다.
     """
 
-    def __init__(self):
-        self._engine = AudioEngine()
-        self._gapless = GaplessManager()
+    def __init__(self, config: Optional[dict] = None):
+        # 설정을 주지 않으면 저장된 설정 사용 (재생 설정 저장 시 다른 섹션을 덮어쓰지 않도록)
+        self._config = config if config is not None else load_config()
+        self._engine = AudioEngine(
+            dsp=DspChain.from_config(self._config.get('dsp', {})),
+            transcode_cache=TranscodeCache.from_config(self._config.get('audio', {})),
+            visualizer=VisualizerTap()
+        )
+        self._gapless = GaplessManager(restore_queue(self._config.get('playback', {})))
+        self._engine.set_on_track_end(self._on_track_end)
         self._current_track: Optional[dict] = None
         self._tracks: list[dict] = []
+        self._tracks_by_id: dict[int, dict] = {}
+        self._session: Optional[SessionCheckpointer] = None
         
         # 콜백 설정
         self._on_track_change: Optional[callable] = None
         self._on_state_change: Optional[callable] = None
         self._on_position_update: Optional[callable] = None
         
+        # 마지막 세션 복원 및 지연 저장 시작
+        if self._config.get('playback', {}).get('remember_position', True):
+            self._restore_session()
+            self._session = SessionCheckpointer(self._session_snapshot, self._gapless.queue)
+            self._session.start()
+
         logger.info("AppController 초기화 완료")
 
+    def _restore_session(self):
+        """마지막 재생 곡을 저장된 위치에서 미리 열기"""
+        try:
+            session = restore_session(self._engine, self._gapless.queue, lookup_track=TrackRepository.get_by_id)
+            if session:
+                self._current_track = session.get('track')
+        except Exception as e:
+            logger.warning(f"세션 복원 실패: {e}")
+
+    def _session_snapshot(self) -> Optional[dict]:
+        """세션 저장용 현재 상태"""
+        track = self._current_track
+        if not track:
+            return None
+        return {
+            'track_id': track.get('id'),
+            'file_path': track.get('file_path'),
+            'position': round(self._engine.audio_info.position_seconds, 1),
+            'queue_position': self._gapless.queue.position,
+        }
+
     def load_library(self):
         """라이브러리에서 트랙 로드"""
         self._tracks = TrackRepository.get_all()
-        track_paths = [t['file_path'] for t in self._tracks]
-        self._gapless.set_queue(track_paths)
+        self._tracks_by_id = {t['id']: t for t in self._tracks}
         logger.info(f"라이브러리 로드: {len(self._tracks)}개 트랙")
         return self._tracks
 
+    def add_tracks(self, tracks: list[dict]) -> int:
+        """스캔으로 추가된 트랙을 라이브러리 끝에 붙임 (반환: 추가 전 트랙 수)"""
+        start = len(self._tracks)
+        self._tracks.extend(tracks)
+        self._tracks_by_id.update((t['id'], t) for t in tracks)
+        return start
+
     def play_track(self, file_path: str) -> bool:
-        """특정 트랙 재생"""
-        # 트랙 정보 찾기
-        for track in self._tracks:
+        """특정 트랙 재생 (라이브러리 순서로 대기열 설정)"""
+        for index, track in enumerate(self._tracks):
             if track['file_path'] == file_path:
-                self._current_track = track
-                break
-        
-        if self._engine.load(file_path):
+                self._gapless.set_queue([t['id'] for t in self._tracks], index)
+                return self._play(track)
+        return self._play(TrackRepository.get_by_file_path(file_path) or {'file_path': file_path})
+
+    def _play(self, track: dict) -> bool:
+        """트랙 로드 후 재생"""
+        self._current_track = track
+        if self._engine.load(track['file_path'], stream_info=AudioInfo.from_track(track)):
             success = self._engine.play()
-            if success and self._on_track_change and self._current_track:
+            if success and self._on_track_change:
                 self._on_track_change(self._current_track)
+            if success:
+                self._warm_upcoming()
             return success
         return False
 
+    def _warm_upcoming(self):
+        """대기열의 다음 곡들을 변환 캐시에 미리 준비"""
+        paths = []
+        for track_id in self._gapless.queue.upcoming(WARM_UP_COUNT):
+            track = self._tracks_by_id.get(track_id) or TrackRepository.get_by_id(track_id)
+            if track:
+                paths.append(track['file_path'])
+        self._engine.warm_transcode_cache(paths)
+
+    def _play_track_id(self, track_id: Optional[int]) -> bool:
+        """대기열의 트랙 ID 재생"""
+        if track_id is None:
+            return False
+        track = self._tracks_by_id.get(track_id) or TrackRepository.get_by_id(track_id)
+        if not track:
+            logger.warning(f"대기열 트랙 없음: {track_id}")
+            return False
+        return self._play(track)
+
     def play_track_by_index(self, index: int) -> bool:
         """인덱스로 트랙 재생"""
         if 0 <= index < len(self._tracks):
@@ -70,9 +144,15 @@ class AppController:
             self._engine.pause()
         elif self._engine.state == PlaybackState.PAUSED:
             self._engine.resume()  # resume 호출
-        elif self._engine.state == PlaybackState.STOPPED and self._tracks:
-            # 정지 상태에서 첫 곡 재생
-            self.play_track_by_index(0)
+        elif self._engine.state == PlaybackState.STOPPED:
+            # 정지 상태: 미리 열린 곡(세션 복원), 대기열의 현재 곡, 없으면 첫 곡 재생
+            if self._current_track and self._engine.current_file == self._current_track.get('file_path'):
+                if self._engine.play() and self._on_track_change:
+                    self._on_track_change(self._current_track)
+            elif self._gapless.get_current_track() is not None:
+                self._play_track_id(self._gapless.get_current_track())
+            elif self._tracks:
+                self.play_track_by_index(0)
 
     def stop(self):
         """정지"""
@@ -80,15 +160,44 @@ class AppController:
 
     def next_track(self):
         """다음 트랙"""
-        next_path = self._gapless.get_next_track()
-        if next_path:
-            self.play_track(next_path)
+        self._play_track_id(self._gapless.get_next_track())
+
+    def _on_track_end(self):
+        """곡 재생 완료 (엔진의 위치 추적 스레드에서 호출 → 그 스레드를 멈추는 재생은 별도 스레드에서)"""
+        threading.Thread(target=self._advance_after_track_end, daemon=True).start()
+
+    def _advance_after_track_end(self):
+        """곡이 끝나면 다음 곡 재생 (한 곡 반복이면 같은 곡, 전체 반복이면 끝에서 처음으로)"""
+        self._play_track_id(self._gapless.get_next_track(manual=False))
 
     def previous_track(self):
         """이전 트랙"""
-        prev_path = self._gapless.get_previous_track()
-        if prev_path:
-            self.play_track(prev_path)
+        self._play_track_id(self._gapless.get_previous_track())
+
+    def toggle_shuffle(self) -> bool:
+        """셔플 토글 (설정에 저장)"""
+        queue = self._gapless.queue
+        queue.shuffle = not queue.shuffle
+        self._save_playback_setting('shuffle', queue.shuffle)
+        logger.info(f"셔플: {queue.shuffle}")
+        return queue.shuffle
+
+    def cycle_repeat_mode(self) -> RepeatMode:
+        """반복 모드 순환 (off → all → one → off)"""
+        queue = self._gapless.queue
+        order = [RepeatMode.OFF, RepeatMode.ALL, RepeatMode.ONE]
+        queue.repeat_mode = order[(order.index(queue.repeat_mode) + 1) % len(order)]
+        self._save_playback_setting('repeat_mode', queue.repeat_mode.value)
+        logger.info(f"반복 모드: {queue.repeat_mode.value}")
+        return queue.repeat_mode
+
+    def _save_playback_setting(self, key: str, value):
+        """playback 설정 저장"""
+        self._config.setdefault('playback', {})[key] = value
+        try:
+            save_config(self._config)
+        except Exception as e:
+            logger.warning(f"설정 저장 실패: {e}")
 
     def seek(self, position_seconds: float):
         """특정 위치로 이동"""
@@ -114,7 +223,7 @@ class AppController:
         return self._engine.audio_info
 
     def set_on_track_change(self, callback: callable):
-        """트랙 변경 콜백"""
+        """트랙 변경 콜백 (곡이 끝나 자동으로 넘어갈 때는 작업 스레드에서 호출됨)"""
         self._on_track_change = callback
 
     def set_on_state_change(self, callback: callable):
@@ -127,7 +236,24 @@ class AppController:
         self._on_position_update = callback
         self._engine.set_on_position_update(callback)
 
+    def subscribe_visualizer(self, callback):
+        """스펙트럼/레벨 미터 프레임 구독 (콜백은 분석 스레드에서 호출됨)"""
+        self._engine.visualizer.subscribe(callback)
+
+    def unsubscribe_visualizer(self):
+        """시각화 구독 해제"""
+        self._engine.visualizer.unsubscribe()
+
     def cleanup(self):
         """정리"""
+        self._engine.visualizer.unsubscribe()
+        if self._session:
+            self._session.stop()
+        else:
+            try:
+                self._gapless.queue.save()
+            except Exception as e:
+                logger.warning(f"대기열 저장 실패: {e}")
         self._engine.cleanup()
+        close_connections()
         logger.info("AppController 정리 완료")
@@ -6,5 +6,6 @@ WASAPI Exclusive 모드를 통한 Bit-Perfect 오디오 재생 엔진
 
 from .engine import AudioEngine
 from .decoder import AudioDecoder
+from .play_queue import PlayQueue, RepeatMode
 
-__all__ = ["AudioEngine", "AudioDecoder"]
+__all__ = ["AudioEngine", "AudioDecoder", "PlayQueue", "RepeatMode"]
@@ -0,0 +1,399 @@
+"""
+DSP Chain
+=========
+재생 스트림에 끼워 넣는 블록 단위 DSP 체인 (NumPy)
+
+- ParametricEQ: 바이쿼드(biquad) 필터 캐스케이드
+- Balance: 좌/우 밸런스
+- Crossfeed: 헤드폰 크로스피드
+
+각 스테이지는 콜백 블록 전체를 벡터 연산으로 처리하고 블록 간 필터 상태를 유지합니다.
+체인을 우회(bypass)하면 디코더 출력이 그대로 전달되어 Bit-Perfect가 유지됩니다.
+"""
+
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    logger.warning("numpy가 설치되지 않아 DSP 체인을 사용할 수 없습니다. pip install numpy")
+
+
+# ===== 필터 설계 (RBJ Audio EQ Cookbook) =====
+
+def design_peaking(sample_rate: int, freq: float, gain_db: float, q: float) -> tuple:
+    """피킹 EQ 계수 (b, a), a0 = 1로 정규화"""
+    amp = 10 ** (gain_db / 40)
+    w0 = 2 * math.pi * freq / sample_rate
+    alpha = math.sin(w0) / (2 * q)
+    cos_w0 = math.cos(w0)
+    b = (1 + alpha * amp, -2 * cos_w0, 1 - alpha * amp)
+    a = (1 + alpha / amp, -2 * cos_w0, 1 - alpha / amp)
+    return _normalize(b, a)
+
+
+def design_low_shelf(sample_rate: int, freq: float, gain_db: float, q: float) -> tuple:
+    """로우 셸프 계수 (b, a)"""
+    amp = 10 ** (gain_db / 40)
+    w0 = 2 * math.pi * freq / sample_rate
+    alpha = math.sin(w0) / (2 * q)
+    cos_w0 = math.cos(w0)
+    sq = 2 * math.sqrt(amp) * alpha
+    b = (
+        amp * ((amp + 1) - (amp - 1) * cos_w0 + sq),
+        2 * amp * ((amp - 1) - (amp + 1) * cos_w0),
+        amp * ((amp + 1) - (amp - 1) * cos_w0 - sq),
+    )
+    a = (
+        (amp + 1) + (amp - 1) * cos_w0 + sq,
+        -2 * ((amp - 1) + (amp + 1) * cos_w0),
+        (amp + 1) + (amp - 1) * cos_w0 - sq,
+    )
+    return _normalize(b, a)
+
+
+def design_high_shelf(sample_rate: int, freq: float, gain_db: float, q: float) -> tuple:
+    """하이 셸프 계수 (b, a)"""
+    amp = 10 ** (gain_db / 40)
+    w0 = 2 * math.pi * freq / sample_rate
+    alpha = math.sin(w0) / (2 * q)
+    cos_w0 = math.cos(w0)
+    sq = 2 * math.sqrt(amp) * alpha
+    b = (
+        amp * ((amp + 1) + (amp - 1) * cos_w0 + sq),
+        -2 * amp * ((amp - 1) + (amp + 1) * cos_w0),
+        amp * ((amp + 1) + (amp - 1) * cos_w0 - sq),
+    )
+    a = (
+        (amp + 1) - (amp - 1) * cos_w0 + sq,
+        2 * ((amp - 1) - (amp + 1) * cos_w0),
+        (amp + 1) - (amp - 1) * cos_w0 - sq,
+    )
+    return _normalize(b, a)
+
+
+def design_one_pole_lowpass(sample_rate: int, freq: float) -> tuple:
+    """1차 로우패스 계수 (쌍선형 변환, 바이쿼드 형식)"""
+    k = math.tan(math.pi * freq / sample_rate)
+    b = (k / (1 + k), k / (1 + k), 0.0)
+    a = (1.0, (k - 1) / (k + 1), 0.0)
+    return b, a
+
+
+def _normalize(b: tuple, a: tuple) -> tuple:
+    a0 = a[0]
+    return tuple(x / a0 for x in b), (1.0, a[1] / a0, a[2] / a0)
+
+
+_DESIGNERS = {
+    "peak": design_peaking,
+    "lowshelf": design_low_shelf,
+    "highshelf": design_high_shelf,
+}
+
+
+class Biquad:
+    """
+    2차 IIR 필터 (블록 단위 벡터 처리)
+
+    블록 길이 n에 대해 출력은
+        y = (w * h)[:n] + g1 * y[-1] + g2 * y[-2]
+    로 정확히 계산됩니다. w는 FIR 부분(b), h는 1/A(z)의 임펄스 응답,
+    g1/g2는 이전 블록 출력 상태에 대한 영입력 응답이며,
+    컨볼루션은 FFT로 수행합니다. 샘플 단위 파이썬 루프는 응답 계산(캐시) 시에만 돕니다.
+    """
+
+    def __init__(self, b: tuple, a: tuple):
+        self._b = b
+        self._a1, self._a2 = a[1], a[2]
+        self._x_hist = None
+        self._y_hist = None
+        self._responses = None
+        self._spectra: dict[int, "np.ndarray"] = {}
+
+    def reset(self, channels: int):
+        """필터 상태 초기화"""
+        self._x_hist = np.zeros((2, channels))
+        self._y_hist = np.zeros((2, channels))
+
+    def _kernel(self, n: int) -> tuple:
+        """길이 m(2의 거듭제곱 >= n)의 응답과 FFT 스펙트럼"""
+        m = 1 << max(n - 1, 1).bit_length()
+        if self._responses is None or len(self._responses[0]) < m:
+            a1, a2 = self._a1, self._a2
+            h = np.empty(m)
+            g1 = np.empty(m)
+            g2 = np.empty(m)
+            # (직전, 그 이전) 상태에서 재귀
+            h1, h2 = 0.0, 0.0
+            p1, p2 = 1.0, 0.0
+            q1, q2 = 0.0, 1.0
+            for i in range(m):
+                hv = (1.0 if i == 0 else 0.0) - a1 * h1 - a2 * h2
+                pv = -a1 * p1 - a2 * p2
+                qv = -a1 * q1 - a2 * q2
+                h[i], g1[i], g2[i] = hv, pv, qv
+                h1, h2 = hv, h1
+                p1, p2 = pv, p1
+                q1, q2 = qv, q1
+            self._responses = (h, g1, g2)
+            self._spectra.clear()
+
+        spectrum = self._spectra.get(m)
+        if spectrum is None:
+            spectrum = np.fft.rfft(self._responses[0][:m], 2 * m)
+            self._spectra[m] = spectrum
+        return m, spectrum, self._responses[1], self._responses[2]
+
+    def process(self, x: "np.ndarray") -> "np.ndarray":
+        """블록 처리 (x: frames × channels, float64)"""
+        n = len(x)
+        if n == 0:
+            return x
+        b0, b1, b2 = self._b
+        xp = np.concatenate((self._x_hist, x))
+        w = b0 * xp[2:] + b1 * xp[1:-1] + b2 * xp[:-2]
+
+        m, spectrum, g1, g2 = self._kernel(n)
+        y = np.fft.irfft(np.fft.rfft(w, 2 * m, axis=0) * spectrum[:, None], 2 * m, axis=0)[:n]
+        y += g1[:n, None] * self._y_hist[1] + g2[:n, None] * self._y_hist[0]
+
+        self._x_hist = xp[-2:]
+        self._y_hist = np.concatenate((self._y_hist, y))[-2:]
+        return y
+
+
+# ===== 스테이지 =====
+
+class DspStage:
+    """DSP 스테이지 기본 클래스 (처리 시간 통계 포함)"""
+
+    name = "stage"
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._calls = 0
+        self._busy_seconds = 0.0
+        self._audio_seconds = 0.0
+
+    def prepare(self, sample_rate: int, channels: int):
+        """재생 시작 시 계수 계산 및 상태 초기화"""
+
+    def process(self, block: "np.ndarray") -> "np.ndarray":
+        raise NotImplementedError
+
+    def _record(self, busy: float, audio: float):
+        self._calls += 1
+        self._busy_seconds += busy
+        self._audio_seconds += audio
+
+    def stats(self) -> dict:
+        """
+        처리 비용
+
+        cpu_load는 처리 시간 / 처리한 오디오 길이 (1.0이면 실시간 한계)
+        """
+        return {
+            "name": self.name,
+            "enabled": self.enabled,
+            "calls": self._calls,
+            "avg_ms": (self._busy_seconds / self._calls * 1000) if self._calls else 0.0,
+            "cpu_load": (self._busy_seconds / self._audio_seconds) if self._audio_seconds else 0.0,
+        }
+
+    def reset_stats(self):
+        self._calls = 0
+        self._busy_seconds = 0.0
+        self._audio_seconds = 0.0
+
+
+@dataclass
+class EqBand:
+    """파라메트릭 EQ 밴드"""
+    kind: str = "peak"  # peak, lowshelf, highshelf
+    freq: float = 1000.0
+    gain_db: float = 0.0
+    q: float = 0.707
+
+
+class ParametricEQ(DspStage):
+    """멀티 밴드 파라메트릭 EQ (바이쿼드 캐스케이드)"""
+
+    name = "eq"
+
+    def __init__(self, bands: list[EqBand], preamp_db: float = 0.0, enabled: bool = True):
+        super().__init__(enabled)
+        self.bands = bands
+        self.preamp_db = preamp_db
+        self._filters: list[Biquad] = []
+        self._preamp = 1.0
+
+    def prepare(self, sample_rate: int, channels: int):
+        self._filters = []
+        for band in self.bands:
+            if band.gain_db == 0 or not 0 < band.freq < sample_rate / 2:
+                continue
+            b, a = _DESIGNERS[band.kind](sample_rate, band.freq, band.gain_db, band.q)
+            biquad = Biquad(b, a)
+            biquad.reset(channels)
+            self._filters.append(biquad)
+        self._preamp = 10 ** (self.preamp_db / 20)
+
+    def process(self, block: "np.ndarray") -> "np.ndarray":
+        if self._preamp != 1.0:
+            block = block * self._preamp
+        for biquad in self._filters:
+            block = biquad.process(block)
+        return block
+
+
+class Balance(DspStage):
+    """좌/우 밸런스 (-1.0: 왼쪽 ~ 1.0: 오른쪽)"""
+
+    name = "balance"
+
+    def __init__(self, balance: float = 0.0, enabled: bool = True):
+        super().__init__(enabled)
+        self.balance = max(-1.0, min(1.0, balance))
+        self._gains = None
+
+    def prepare(self, sample_rate: int, channels: int):
+        gains = np.ones(channels)
+        if channels == 2:
+            gains[0] = min(1.0, 1.0 - self.balance)
+            gains[1] = min(1.0, 1.0 + self.balance)
+        self._gains = gains
+
+    def process(self, block: "np.ndarray") -> "np.ndarray":
+        return block * self._gains
+
+
+class Crossfeed(DspStage):
+    """
+    헤드폰 크로스피드
+
+    반대 채널을 로우패스 + 짧은 지연 후 섞어 스피커 청취와 비슷한 정위를 만듭니다.
+    """
+
+    name = "crossfeed"
+
+    def __init__(self, level: float = 0.3, cutoff: float = 700.0,
+                 delay_ms: float = 0.3, enabled: bool = True):
+        super().__init__(enabled)
+        self.level = level
+        self.cutoff = cutoff
+        self.delay_ms = delay_ms
+        self._lowpass: Optional[Biquad] = None
+        self._delay_buf = None
+        self._stereo = False
+
+    def prepare(self, sample_rate: int, channels: int):
+        self._stereo = channels == 2
+        if not self._stereo:
+            return
+        self._lowpass = Biquad(*design_one_pole_lowpass(sample_rate, self.cutoff))
+        self._lowpass.reset(2)
+        self._delay_buf = np.zeros((int(sample_rate * self.delay_ms / 1000), 2))
+
+    def process(self, block: "np.ndarray") -> "np.ndarray":
+        if not self._stereo:
+            return block
+        crossed = self._lowpass.process(block[:, ::-1])
+        delayed = np.concatenate((self._delay_buf, crossed))
+        self._delay_buf = delayed[len(block):]
+        return (block + self.level * delayed[:len(block)]) / (1.0 + self.level)
+
+
+# ===== 체인 =====
+
+class DspChain:
+    """
+    DSP 스테이지 체인
+
+    AudioEngine.play()가 만든 스트림 제너레이터를 감싸며,
+    bypass 상태에서는 디코더 출력 블록을 그대로 전달합니다 (Bit-Perfect).
+    """
+
+    def __init__(self, stages: Optional[list[DspStage]] = None, bypass: bool = False):
+        self.stages: list[DspStage] = stages or []
+        self.bypass = bypass
+        self._sample_rate = 0
+        self._channels = 0
+
+    @classmethod
+    def from_config(cls, dsp_config: dict) -> "DspChain":
+        """설정(config["dsp"])으로 체인 구성"""
+        bands = [EqBand(**band) for band in dsp_config.get("eq_bands", [])]
+        stages: list[DspStage] = [ParametricEQ(bands, dsp_config.get("preamp_db", 0.0), enabled=bool(bands))]
+        stages.append(Balance(dsp_config.get("balance", 0.0),
+                              enabled=dsp_config.get("balance", 0.0) != 0.0))
+        stages.append(Crossfeed(dsp_config.get("crossfeed_level", 0.3),
+                                enabled=bool(dsp_config.get("crossfeed", False))))
+        return cls(stages, bypass=dsp_config.get("bypass", True))
+
+    @property
+    def active(self) -> bool:
+        """실제로 처리하는 스테이지가 있는지"""
+        return NUMPY_AVAILABLE and not self.bypass and any(s.enabled for s in self.stages)
+
+    def prepare(self, sample_rate: int, channels: int):
+        """재생 시작 시 모든 스테이지 준비"""
+        self._sample_rate = sample_rate
+        self._channels = channels
+        if not NUMPY_AVAILABLE:
+            return
+        for stage in self.stages:
+            stage.prepare(sample_rate, channels)
+
+    def process(self, block: "np.ndarray") -> "np.ndarray":
+        """float 블록 처리 (frames × channels)"""
+        audio_seconds = len(block) / self._sample_rate if self._sample_rate else 0.0
+        for stage in self.stages:
+            if not stage.enabled:
+                continue
+            start = time.perf_counter()
+            block = stage.process(block)
+            stage._record(time.perf_counter() - start, audio_seconds)
+        return block
+
+    def process_int16(self, chunk):
+        """16-bit PCM 블록 처리 (bypass면 입력 그대로 반환)"""
+        if not self.active or not len(chunk):
+            return chunk
+        samples = np.frombuffer(chunk, dtype=np.int16).reshape(-1, self._channels)
+        block = self.process(samples.astype(np.float64) / 32768.0)
+        return np.clip(np.rint(block * 32768.0), -32768, 32767).astype(np.int16).tobytes()
+
+    def wrap(self, stream, sample_rate: int, channels: int):
+        """
+        스트림 제너레이터 감싸기
+
+        Args:
+            stream: 이미 시작된 miniaudio 스트림 제너레이터 (16-bit)
+        """
+        self.prepare(sample_rate, channels)
+
+        def dsp_generator():
+            required_frames = yield b""
+            while True:
+                try:
+                    chunk = stream.send(required_frames)
+                except StopIteration:
+                    return
+                required_frames = yield self.process_int16(chunk)
+
+        gen = dsp_generator()
+        next(gen)
+        return gen
+
+    def stats(self) -> list[dict]:
+        """스테이지별 처리 비용"""
+        return [stage.stats() for stage in self.stages]
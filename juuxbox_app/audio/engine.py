@@ -16,6 +16,10 @@ from enum import Enum
 
 import miniaudio
 
+from .dsp import DspChain
+from .transcode_cache import TranscodeCache
+from .visualizer import VisualizerTap
+
 # FFmpeg이 필요한 포맷 (miniaudio가 직접 지원하지 않음)
 FFMPEG_FORMATS = {'.m4a', '.aac', '.wma', '.opus', '.m4p', '.m4b'}
 
@@ -38,6 +42,41 @@ class AudioInfo:
     duration_seconds: float = 0.0
     position_seconds: float = 0.0
 
+    @classmethod
+    def from_track(cls, track: Optional[dict]) -> Optional["AudioInfo"]:
+        """DB 트랙 행의 스트림 정보 (샘플레이트/채널 수를 모르면 None → 로드 시 파일에서 읽음)"""
+        if not track or not track.get('sample_rate') or not track.get('channels'):
+            return None
+        return cls(
+            sample_rate=track['sample_rate'],
+            bit_depth=track.get('bit_depth') or 16,
+            channels=track['channels'],
+            duration_seconds=track.get('duration_seconds') or 0.0,
+        )
+
+
+class _MemorySource(miniaudio.StreamableSource):
+    """메모리 버퍼 기반 탐색 가능 소스 (stream_any의 seek_frame 사용)"""
+
+    def __init__(self, data: bytes):
+        self._view = memoryview(data)
+        self._offset = 0
+
+    def read(self, num_bytes: int) -> memoryview:
+        chunk = self._view[self._offset:self._offset + num_bytes]
+        self._offset += len(chunk)
+        return chunk
+
+    def seek(self, offset: int, origin: miniaudio.SeekOrigin) -> bool:
+        if origin == miniaudio.SeekOrigin.CURRENT:
+            base = self._offset
+        elif origin == miniaudio.SeekOrigin.END:
+            base = len(self._view)
+        else:
+            base = 0
+        self._offset = max(0, min(len(self._view), base + offset))
+        return True
+
 
 class AudioEngine:
     """
@@ -46,10 +85,18 @@ class AudioEngine:
     Features:
     - miniaudio 기반 재생
     - 실시간 오디오 정보 피드백
+    - DSP 체인 (bypass 시 Bit-Perfect)
+    - FFmpeg 디코딩 결과 디스크 캐시
+    - 스펙트럼/레벨 미터 분석 탭
     """
 
-    def __init__(self, device_name: Optional[str] = None):
+    def __init__(self, device_name: Optional[str] = None, dsp: Optional[DspChain] = None,
+                 transcode_cache: Optional[TranscodeCache] = None,
+                 visualizer: Optional[VisualizerTap] = None):
         self._device_name = device_name
+        self._dsp = dsp
+        self._transcode_cache = transcode_cache
+        self._visualizer = visualizer
         self._state = PlaybackState.STOPPED
         self._current_file: Optional[str] = None
         self._audio_info = AudioInfo()
@@ -60,6 +107,12 @@ class AudioEngine:
         self._stream = None
         self._playback_thread: Optional[threading.Thread] = None
         self._stop_flag = threading.Event()
+
+        # 로드 / 백그라운드 미리 열기
+        self._load_lock = threading.Lock()
+        self._load_serial = 0
+        self._preload_thread: Optional[threading.Thread] = None
+        self._start_position: float = 0.0
         
         # 위치 추적
         self._position_thread: Optional[threading.Thread] = None
@@ -82,6 +135,18 @@ class AudioEngine:
     def audio_info(self) -> AudioInfo:
         return self._audio_info
 
+    @property
+    def dsp(self) -> Optional[DspChain]:
+        return self._dsp
+
+    @property
+    def visualizer(self) -> Optional[VisualizerTap]:
+        return self._visualizer
+
+    @property
+    def current_file(self) -> Optional[str]:
+        return self._current_file
+
     @property
     def volume(self) -> float:
         return self._volume
@@ -91,22 +156,70 @@ class AudioEngine:
         self._volume = max(0.0, min(1.0, value))
         logger.debug(f"볼륨 설정: {self._volume:.2f}")
 
-    def load(self, file_path: str) -> bool:
-        """오디오 파일 로드"""
+    def load(self, file_path: str, start_position: float = 0.0,
+             stream_info: Optional[AudioInfo] = None) -> bool:
+        """
+        오디오 파일 로드
+
+        Args:
+            file_path: 오디오 파일 경로
+            start_position: play() 시 시작할 위치 (초)
+            stream_info: 라이브러리(DB)에 저장된 스트림 정보 (AudioInfo.from_track) - 있으면 mutagen 파싱 생략
+        """
+        # 대기 중인 미리 열기 취소
+        self._load_serial += 1
+        with self._load_lock:
+            return self._load(file_path, start_position, stream_info)
+
+    def preload(self, file_path: str, start_position: float = 0.0,
+                stream_info: Optional[AudioInfo] = None):
+        """
+        백그라운드에서 파일을 미리 열어 두기 (세션 복원용)
+
+        play() 호출 시 미리 열기가 끝나지 않았으면 완료될 때까지 기다립니다.
+        그 사이 load()가 호출되면 미리 열기는 취소됩니다.
+        """
+        serial = self._load_serial
+
+        def run():
+            with self._load_lock:
+                if serial != self._load_serial:
+                    logger.debug(f"미리 열기 취소: {file_path}")
+                    return
+                self._load(file_path, start_position, stream_info)
+
+        self._preload_thread = threading.Thread(target=run, daemon=True)
+        self._preload_thread.start()
+
+    def _wait_for_preload(self):
+        """진행 중인 미리 열기 완료 대기"""
+        thread = self._preload_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self._preload_thread = None
+
+    def _load(self, file_path: str, start_position: float, stream_info: Optional[AudioInfo] = None) -> bool:
+        """오디오 파일 로드 (_load_lock 보유 상태)"""
         try:
             # 기존 재생 중지
             self.stop()
 
-            # mutagen으로 파일 정보 가져오기 (유니코드 경로 지원)
-            import mutagen
-            audio = mutagen.File(file_path)
-            if audio is None:
-                raise ValueError("지원하지 않는 포맷")
+            if stream_info is not None:
+                sample_rate = stream_info.sample_rate
+                channels = stream_info.channels
+                duration = stream_info.duration_seconds
+                bit_depth = stream_info.bit_depth
+            else:
+                # 라이브러리에 없는 파일 → mutagen으로 파일 정보 가져오기 (유니코드 경로 지원)
+                import mutagen
+                audio = mutagen.File(file_path)
+                if audio is None:
+                    raise ValueError("지원하지 않는 포맷")
 
-            sample_rate = getattr(audio.info, 'sample_rate', 44100)
-            channels = getattr(audio.info, 'channels', 2)
-            duration = audio.info.length if audio.info else 0
-            bit_depth = getattr(audio.info, 'bits_per_sample', 16)
+                sample_rate = getattr(audio.info, 'sample_rate', 44100)
+                channels = getattr(audio.info, 'channels', 2)
+                duration = audio.info.length if audio.info else 0
+                bit_depth = getattr(audio.info, 'bits_per_sample', 16)
 
             self._audio_info = AudioInfo(
                 sample_rate=sample_rate,
@@ -115,17 +228,27 @@ class AudioEngine:
                 duration_seconds=duration,
                 position_seconds=0.0
             )
+            if 0 < start_position < duration:
+                self._start_position = start_position
+                self._audio_info.position_seconds = start_position
 
             # 파일 확장자 확인
             ext = Path(file_path).suffix.lower()
 
             if ext in FFMPEG_FORMATS:
-                # FFmpeg으로 PCM 디코딩 필요
-                self._file_bytes = self._decode_with_ffmpeg(file_path, sample_rate, channels)
+                # FFmpeg으로 PCM 디코딩 필요 (캐시에 있으면 재사용)
+                cache = self._transcode_cache
+                self._file_bytes = cache.get(file_path, sample_rate, channels) if cache else None
                 self._is_raw_pcm = True
-                if self._file_bytes is None:
-                    raise ValueError(f"FFmpeg 디코딩 실패: {ext}")
-                logger.info(f"FFmpeg 디코딩 완료: {ext}")
+                if self._file_bytes is not None:
+                    logger.info(f"변환 캐시 사용: {ext}")
+                else:
+                    self._file_bytes = self._decode_with_ffmpeg(file_path, sample_rate, channels)
+                    if self._file_bytes is None:
+                        raise ValueError(f"FFmpeg 디코딩 실패: {ext}")
+                    logger.info(f"FFmpeg 디코딩 완료: {ext}")
+                    if cache:
+                        cache.put(file_path, sample_rate, channels, self._file_bytes)
             else:
                 # miniaudio가 직접 지원하는 포맷 (WAV, FLAC, MP3, OGG)
                 with open(file_path, 'rb') as f:
@@ -133,7 +256,7 @@ class AudioEngine:
                 self._is_raw_pcm = False
 
             self._current_file = file_path
-            logger.info(f"파일 로드: {file_path} ({sample_rate}Hz, {channels}ch)")
+            logger.info(f"파일 로드: {file_path} ({sample_rate}Hz, {channels}ch, 시작 {self._start_position:.1f}초)")
             return True
 
         except Exception as e:
@@ -142,6 +265,25 @@ class AudioEngine:
             traceback.print_exc()
             return False
 
+    def warm_transcode_cache(self, file_paths: list[str]):
+        """곧 재생할 FFmpeg 포맷 파일을 백그라운드에서 미리 변환"""
+        if self._transcode_cache is None:
+            return
+        targets = [p for p in file_paths if Path(p).suffix.lower() in FFMPEG_FORMATS]
+        if targets:
+            self._transcode_cache.warm_up(targets, self._probe_and_decode)
+
+    def _probe_and_decode(self, file_path: str) -> Optional[tuple[bytes, int, int]]:
+        """스트림 정보 확인 후 FFmpeg 디코딩 (미리 변환용)"""
+        import mutagen
+        audio = mutagen.File(file_path)
+        if audio is None:
+            return None
+        sample_rate = getattr(audio.info, 'sample_rate', 44100)
+        channels = getattr(audio.info, 'channels', 2)
+        pcm = self._decode_with_ffmpeg(file_path, sample_rate, channels)
+        return (pcm, sample_rate, channels) if pcm is not None else None
+
     def _decode_with_ffmpeg(self, file_path: str, sample_rate: int, channels: int) -> Optional[bytes]:
         """FFmpeg으로 오디오 파일을 PCM으로 디코딩"""
         try:
@@ -175,12 +317,18 @@ class AudioEngine:
             return None
 
     def play(self) -> bool:
-        """재생 시작"""
+        """재생 시작 (load 시 지정한 시작 위치부터)"""
+        self._wait_for_preload()
         if not self._current_file or not hasattr(self, '_file_bytes'):
             logger.warning("재생할 파일이 없습니다")
             return False
 
         try:
+            start_position = self._start_position
+            sample_rate = self._audio_info.sample_rate
+            channels = self._audio_info.channels
+            start_frame = int(start_position * sample_rate)
+
             # 이미 재생 중이면 중지
             self.stop()
             self._stop_flag.clear()
@@ -188,25 +336,44 @@ class AudioEngine:
             # 재생 장치 생성
             self._device = miniaudio.PlaybackDevice(
                 output_format=miniaudio.SampleFormat.SIGNED16,
-                nchannels=self._audio_info.channels,
-                sample_rate=self._audio_info.sample_rate
+                nchannels=channels,
+                sample_rate=sample_rate
             )
 
             if getattr(self, '_is_raw_pcm', False):
                 # FFmpeg으로 디코딩된 raw PCM 데이터
-                self._stream = self._create_pcm_stream()
+                self._stream = self._create_pcm_stream(start_frame)
+            elif start_frame:
+                # 시작 위치가 있으면 탐색 가능한 소스로 디코딩
+                self._stream = miniaudio.stream_any(
+                    _MemorySource(self._file_bytes),
+                    output_format=miniaudio.SampleFormat.SIGNED16,
+                    nchannels=channels,
+                    sample_rate=sample_rate,
+                    seek_frame=start_frame
+                )
             else:
                 # miniaudio가 직접 디코딩 (WAV, FLAC, MP3, OGG)
                 self._stream = miniaudio.stream_memory(
                     self._file_bytes,
-                    output_format=miniaudio.SampleFormat.SIGNED16
+                    output_format=miniaudio.SampleFormat.SIGNED16,
+                    nchannels=channels,
+                    sample_rate=sample_rate
                 )
 
+            if self._dsp is not None:
+                # DSP 체인 (bypass 시 디코더 출력 그대로 전달)
+                self._stream = self._dsp.wrap(self._stream, sample_rate, channels)
+
+            if self._visualizer is not None:
+                # 출력 분석 탭 (구독자가 없으면 블록을 그대로 통과)
+                self._stream = self._visualizer.wrap(self._stream, sample_rate, channels)
+
             self._device.start(self._stream)
 
             self._state = PlaybackState.PLAYING
-            self._audio_info.position_seconds = 0.0
-            self._paused_position = 0.0
+            self._audio_info.position_seconds = start_position
+            self._paused_position = start_position
             self._playback_start_time = time.time()
 
             # 위치 추적 스레드 시작
@@ -226,14 +393,14 @@ class AudioEngine:
             self._state = PlaybackState.STOPPED
             return False
 
-    def _create_pcm_stream(self):
+    def _create_pcm_stream(self, start_frame: int = 0):
         """raw PCM 데이터를 위한 제너레이터 스트림 생성"""
         frame_size = self._audio_info.channels * 2
         data = self._file_bytes
         stop_flag = self._stop_flag
 
         def pcm_generator():
-            offset = 0
+            offset = start_frame * frame_size
             # 첫 번째 yield로 generator 시작 (None을 받음)
             required_frames = yield b""
 
@@ -303,6 +470,7 @@ class AudioEngine:
         self._state = PlaybackState.STOPPED
         self._audio_info.position_seconds = 0.0
         self._paused_position = 0.0
+        self._start_position = 0.0
         logger.info("정지")
         
         if self._on_state_change:
@@ -6,100 +6,95 @@ Gapless Playback Manager
 
 import logging
 from typing import Optional, Callable
-from collections import deque
-from dataclasses import dataclass
-
-logger = logging.getLogger(__name__)
 
+from .play_queue import PlayQueue
 
-@dataclass
-class QueuedTrack:
-    """대기열 트랙 정보"""
-    file_path: str
-    preloaded: bool = False
+logger = logging.getLogger(__name__)
 
 
 class GaplessManager:
     """
     Gapless 재생 관리자
-    
-    다음 곡을 미리 버퍼에 로드하여 곡 전환 시 끊김을 최소화합니다.
+
+    재생 대기열(PlayQueue)을 따라가며 다음 곡을 미리 버퍼에 로드하여
+    곡 전환 시 끊김을 최소화합니다.
     """
 
-    def __init__(self, prebuffer_count: int = 1):
+    def __init__(self, queue: Optional[PlayQueue] = None, prebuffer_count: int = 1):
         """
         Args:
+            queue: 재생 대기열 (없으면 새로 생성)
             prebuffer_count: 미리 로드할 곡 수
         """
         self._prebuffer_count = prebuffer_count
-        self._queue: deque[QueuedTrack] = deque()
-        self._current_index: int = -1
-        
+        self._queue = queue if queue is not None else PlayQueue()
+        self._preloaded: set[int] = set()
+
         # 콜백
-        self._on_track_change: Optional[Callable[[str], None]] = None
-        
+        self._on_track_change: Optional[Callable[[int], None]] = None
+
         logger.info(f"GaplessManager 초기화 (prebuffer: {prebuffer_count})")
 
-    def set_queue(self, tracks: list[str]):
+    @property
+    def queue(self) -> PlayQueue:
+        """재생 대기열"""
+        return self._queue
+
+    def set_queue(self, track_ids: list[int], start_index: int = -1):
         """
         재생 대기열 설정
-        
+
         Args:
-            tracks: 트랙 파일 경로 목록
+            track_ids: 트랙 ID 목록
+            start_index: 현재 곡 위치 (-1: 시작 전)
         """
-        self._queue = deque(QueuedTrack(path) for path in tracks)
-        self._current_index = -1
-        logger.info(f"대기열 설정: {len(tracks)}곡")
+        self._queue.set_tracks(track_ids, start_index)
+        self._preloaded.clear()
 
-    def add_to_queue(self, track: str):
+    def add_to_queue(self, track_id: int):
         """대기열에 트랙 추가"""
-        self._queue.append(QueuedTrack(track))
-        logger.debug(f"대기열 추가: {track}")
+        self._queue.append(track_id)
+        logger.debug(f"대기열 추가: {track_id}")
 
-    def get_next_track(self) -> Optional[str]:
+    def get_next_track(self, manual: bool = True) -> Optional[int]:
         """
         다음 트랙 가져오기
-        
+
+        Args:
+            manual: 사용자가 넘긴 경우 (False: 곡이 끝나 자동으로 넘어감 - 한 곡 반복이면 같은 곡)
+
         Returns:
-            다음 트랙 경로 또는 None
+            다음 트랙 ID 또는 None
         """
-        if self._current_index + 1 < len(self._queue):
-            self._current_index += 1
-            track = self._queue[self._current_index]
-            logger.info(f"다음 트랙: {track.file_path}")
-            return track.file_path
-        return None
-
-    def get_previous_track(self) -> Optional[str]:
+        track_id = self._queue.next(manual=manual)
+        if track_id is not None:
+            logger.info(f"다음 트랙: {track_id}")
+        return track_id
+
+    def get_previous_track(self) -> Optional[int]:
         """
         이전 트랙 가져오기
-        
+
         Returns:
-            이전 트랙 경로 또는 None
+            이전 트랙 ID 또는 None
         """
-        if self._current_index > 0:
-            self._current_index -= 1
-            track = self._queue[self._current_index]
-            logger.info(f"이전 트랙: {track.file_path}")
-            return track.file_path
-        return None
+        track_id = self._queue.previous()
+        if track_id is not None:
+            logger.info(f"이전 트랙: {track_id}")
+        return track_id
 
     def preload_next(self):
         """다음 곡 미리 로드 (백그라운드)"""
         # TODO: 비동기로 다음 곡 디코딩
-        next_index = self._current_index + 1
-        if next_index < len(self._queue):
-            track = self._queue[next_index]
-            if not track.preloaded:
-                logger.debug(f"미리 로드 시작: {track.file_path}")
-                # 실제 로드 로직
-                track.preloaded = True
-
-    def get_current_track(self) -> Optional[str]:
-        """현재 트랙 경로"""
-        if 0 <= self._current_index < len(self._queue):
-            return self._queue[self._current_index].file_path
-        return None
+        track_id = self._queue.peek_next()
+        if track_id is not None and track_id not in self._preloaded:
+            logger.debug(f"미리 로드 시작: {track_id}")
+            # 실제 로드 로직
+            self._preloaded.add(track_id)
+
+    def get_current_track(self) -> Optional[int]:
+        """현재 트랙 ID"""
+        return self._queue.current_id
 
     def get_queue_length(self) -> int:
         """대기열 길이"""
@@ -108,5 +103,5 @@ class GaplessManager:
     def clear_queue(self):
         """대기열 초기화"""
         self._queue.clear()
-        self._current_index = -1
+        self._preloaded.clear()
         logger.info("대기열 초기화")
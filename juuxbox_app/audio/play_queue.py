@@ -0,0 +1,477 @@
+"""
+Play Queue
+==========
+트랙 ID 기반 재생 대기열 (셔플 / 반복 / 영속화)
+
+- 트랙 ID를 array 블록에 저장 (dict 목록 대신 8바이트 정수)
+- 셔플 순서는 활성화 시 한 번 미리 계산 → 다음 곡 선택 O(1)
+- 다음에 재생 / 추가 / 삭제: O(log n) (블록 위치는 Fenwick 트리로 탐색)
+- 바이너리 파일로 저장하여 5만 곡 대기열도 즉시 복원
+"""
+
+import logging
+import random
+import struct
+import sys
+from array import array
+from enum import Enum
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# 대기열 저장 파일
+QUEUE_PATH = Path.home() / ".juuxbox" / "queue.bin"
+
+# 블록당 최대 원소 수 (초과 시 분할)
+_BLOCK_SIZE = 512
+
+# 파일 헤더: magic, version, shuffle, repeat, cursor, count
+_HEADER = struct.Struct("<4sHBBqQ")
+_MAGIC = b"JXQ1"
+_VERSION = 1
+
+# 삭제된 슬롯 표시
+_REMOVED = -1
+
+
+class RepeatMode(Enum):
+    """반복 모드 (config: playback.repeat_mode)"""
+    OFF = "off"
+    ONE = "one"
+    ALL = "all"
+
+    @classmethod
+    def parse(cls, value) -> "RepeatMode":
+        """설정 값 → RepeatMode (알 수 없으면 OFF)"""
+        try:
+            return cls(value)
+        except ValueError:
+            return cls.OFF
+
+
+_REPEAT_CODES = {RepeatMode.OFF: 0, RepeatMode.ONE: 1, RepeatMode.ALL: 2}
+_REPEAT_FROM_CODE = {code: mode for mode, code in _REPEAT_CODES.items()}
+
+
+class _BlockList:
+    """
+    array 블록으로 나눈 정수 리스트
+
+    위치 → 블록 탐색은 블록 길이에 대한 Fenwick 트리로 O(log n),
+    블록 내부 삽입/삭제는 최대 2 * _BLOCK_SIZE 원소만 이동합니다.
+    """
+
+    def __init__(self, values: Iterable[int] = ()):
+        self._blocks: list[array] = []
+        self._tree: list[int] = [0]
+        self._len = 0
+        self.extend(values)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[int]:
+        for block in self._blocks:
+            yield from block
+
+    def __getitem__(self, index: int) -> int:
+        block, offset = self._locate(self._normalize(index))
+        return self._blocks[block][offset]
+
+    def _normalize(self, index: int) -> int:
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("_BlockList index out of range")
+        return index
+
+    def _rebuild(self):
+        """Fenwick 트리 재구성 (블록 분할/삭제 시)"""
+        count = len(self._blocks)
+        tree = [0] * (count + 1)
+        for i, block in enumerate(self._blocks, 1):
+            tree[i] += len(block)
+            parent = i + (i & -i)
+            if parent <= count:
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _add(self, block: int, delta: int):
+        i = block + 1
+        count = len(self._blocks)
+        while i <= count:
+            self._tree[i] += delta
+            i += i & -i
+
+    def _locate(self, index: int) -> tuple[int, int]:
+        """전체 인덱스 → (블록 번호, 블록 내 오프셋)"""
+        count = len(self._blocks)
+        pos = 0
+        step = 1 << (count.bit_length() - 1) if count else 0
+        while step:
+            nxt = pos + step
+            if nxt <= count and self._tree[nxt] <= index:
+                pos = nxt
+                index -= self._tree[nxt]
+            step >>= 1
+        return pos, index
+
+    def append(self, value: int):
+        if not self._blocks or len(self._blocks[-1]) >= _BLOCK_SIZE:
+            self._blocks.append(array("q", (value,)))
+            self._rebuild()
+        else:
+            self._blocks[-1].append(value)
+            self._add(len(self._blocks) - 1, 1)
+        self._len += 1
+
+    def extend(self, values: Iterable[int]):
+        if isinstance(values, array) and values.typecode == "q":
+            data = values
+        else:
+            data = array("q", values)
+        if not data:
+            return
+        if self._blocks and len(self._blocks[-1]) < _BLOCK_SIZE:
+            room = _BLOCK_SIZE - len(self._blocks[-1])
+            self._blocks[-1].extend(data[:room])
+            data = data[room:]
+        for start in range(0, len(data), _BLOCK_SIZE):
+            self._blocks.append(data[start:start + _BLOCK_SIZE])
+        self._len = sum(len(block) for block in self._blocks)
+        self._rebuild()
+
+    def insert(self, index: int, value: int):
+        if index >= self._len:
+            self.append(value)
+            return
+        block, offset = self._locate(max(index, 0))
+        target = self._blocks[block]
+        target.insert(offset, value)
+        self._len += 1
+        if len(target) > 2 * _BLOCK_SIZE:
+            self._blocks[block:block + 1] = [target[:_BLOCK_SIZE], target[_BLOCK_SIZE:]]
+            self._rebuild()
+        else:
+            self._add(block, 1)
+
+    def pop(self, index: int = -1) -> int:
+        block, offset = self._locate(self._normalize(index))
+        target = self._blocks[block]
+        value = target.pop(offset)
+        self._len -= 1
+        if target:
+            self._add(block, -1)
+        else:
+            del self._blocks[block]
+            self._rebuild()
+        return value
+
+    def index(self, value: int) -> int:
+        """값 위치 검색 (선형)"""
+        base = 0
+        for block in self._blocks:
+            try:
+                return base + block.index(value)
+            except ValueError:
+                base += len(block)
+        raise ValueError(f"{value} not in _BlockList")
+
+
+class PlayQueue:
+    """
+    재생 대기열
+
+    같은 곡이 여러 번 들어갈 수 있도록 각 항목은 고유 슬롯을 가지며,
+    원래 순서와 셔플 순서는 슬롯 번호의 나열입니다.
+    셔플 중 삭제된 항목은 원래 순서에 삭제 표시로 남았다가
+    셔플 해제 시 한 번에 정리됩니다.
+    """
+
+    def __init__(self, track_ids: Iterable[int] = (), start_index: int = -1,
+                 shuffle: bool = False, repeat_mode: RepeatMode = RepeatMode.OFF,
+                 seed: Optional[int] = None):
+        self._rng = random.Random(seed)
+        self._slots = array("q")
+        self._base = _BlockList()
+        self._shuffled: Optional[_BlockList] = None
+        self._cursor = -1
+        self._repeat_mode = repeat_mode
+        self._revision = 0
+        self.set_tracks(track_ids, start_index)
+        if shuffle:
+            self.shuffle = True
+
+    # ===== 상태 =====
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    @property
+    def _order(self) -> _BlockList:
+        """현재 재생 순서 (삭제 표시 없음)"""
+        return self._shuffled if self._shuffled is not None else self._base
+
+    @property
+    def position(self) -> int:
+        """현재 재생 순서에서의 위치 (-1: 시작 전)"""
+        return self._cursor
+
+    @property
+    def current_id(self) -> Optional[int]:
+        """현재 트랙 ID"""
+        if 0 <= self._cursor < len(self._order):
+            return self._slots[self._order[self._cursor]]
+        return None
+
+    @property
+    def revision(self) -> int:
+        """구성 변경 횟수 (저장 필요 여부 판단용, 위치 이동은 제외)"""
+        return self._revision
+
+    @property
+    def repeat_mode(self) -> RepeatMode:
+        return self._repeat_mode
+
+    @repeat_mode.setter
+    def repeat_mode(self, mode: RepeatMode):
+        self._repeat_mode = RepeatMode(mode)
+        logger.debug(f"반복 모드: {self._repeat_mode.value}")
+
+    @property
+    def shuffle(self) -> bool:
+        return self._shuffled is not None
+
+    @shuffle.setter
+    def shuffle(self, enabled: bool):
+        if enabled and self._shuffled is None:
+            self._enable_shuffle()
+            self._revision += 1
+        elif not enabled and self._shuffled is not None:
+            self._disable_shuffle()
+            self._revision += 1
+
+    def _enable_shuffle(self):
+        """셔플 순서 미리 계산 (현재 곡을 맨 앞에 둠)"""
+        order = list(self._base)
+        current = None
+        if 0 <= self._cursor < len(order):
+            current = order.pop(self._cursor)
+        self._rng.shuffle(order)
+        if current is not None:
+            order.insert(0, current)
+        self._shuffled = _BlockList(order)
+        self._cursor = 0 if current is not None else -1
+        logger.debug(f"셔플 활성화: {len(order)}곡")
+
+    def _disable_shuffle(self):
+        """원래 순서로 복귀 (삭제 표시 정리, 현재 곡 위치 유지)"""
+        current = self._order[self._cursor] if 0 <= self._cursor < len(self._order) else None
+        slots = self._slots
+        self._base = _BlockList(s for s in self._base if slots[s] != _REMOVED)
+        self._shuffled = None
+        self._cursor = self._base.index(current) if current is not None else -1
+        logger.debug("셔플 해제")
+
+    def track_ids(self) -> list[int]:
+        """재생 순서대로 트랙 ID 목록"""
+        slots = self._slots
+        return [slots[s] for s in self._order]
+
+    # ===== 구성 =====
+
+    def set_tracks(self, track_ids: Iterable[int], start_index: int = -1):
+        """대기열 교체"""
+        self._slots = array("q", track_ids)
+        self._base = _BlockList(range(len(self._slots)))
+        self._cursor = start_index if 0 <= start_index < len(self._slots) else -1
+        if self._shuffled is not None:
+            self._shuffled = None
+            self._enable_shuffle()
+        self._revision += 1
+        logger.info(f"대기열 설정: {len(self._slots)}곡")
+
+    def _new_slot(self, track_id: int) -> int:
+        self._revision += 1
+        self._slots.append(track_id)
+        return len(self._slots) - 1
+
+    def append(self, track_id: int):
+        """대기열 끝에 추가 (셔플 중이면 남은 곡 사이 임의 위치)"""
+        slot = self._new_slot(track_id)
+        self._base.append(slot)
+        if self._shuffled is not None:
+            self._shuffled.insert(self._rng.randint(self._cursor + 1, len(self._shuffled)), slot)
+
+    def insert_next(self, track_id: int):
+        """현재 곡 바로 다음에 재생"""
+        slot = self._new_slot(track_id)
+        if self._shuffled is not None:
+            # 셔플 해제 후에도 현재 곡 다음이 되도록 원래 순서에서 현재 곡 위치를 찾음
+            current = self._shuffled[self._cursor] if 0 <= self._cursor < len(self._shuffled) else None
+            self._base.insert(self._base.index(current) + 1 if current is not None else 0, slot)
+        self._order.insert(self._cursor + 1, slot)
+
+    def remove(self, position: int) -> int:
+        """재생 순서상 위치의 항목 삭제, 트랙 ID 반환 (범위 밖이면 IndexError - 음수 위치도 허용하지 않음)"""
+        if not 0 <= position < len(self._order):
+            raise IndexError(f"대기열 위치 범위 밖: {position}")
+        slot = self._order.pop(position)
+        track_id = self._slots[slot]
+        if self._shuffled is not None:
+            # 원래 순서에서는 셔플 해제 시 정리
+            self._slots[slot] = _REMOVED
+        if position <= self._cursor:
+            self._cursor -= 1
+        self._revision += 1
+        return track_id
+
+    def clear(self):
+        """대기열 비우기"""
+        self._slots = array("q")
+        self._base = _BlockList()
+        self._shuffled = _BlockList() if self._shuffled is not None else None
+        self._cursor = -1
+        self._revision += 1
+
+    # ===== 이동 =====
+
+    def jump(self, position: int) -> Optional[int]:
+        """지정 위치로 이동"""
+        if 0 <= position < len(self._order):
+            self._cursor = position
+            return self.current_id
+        return None
+
+    def _next_position(self, manual: bool) -> Optional[int]:
+        count = len(self._order)
+        if not count:
+            return None
+        if self._repeat_mode == RepeatMode.ONE and not manual and self._cursor >= 0:
+            return self._cursor
+        if self._cursor + 1 < count:
+            return self._cursor + 1
+        if self._repeat_mode != RepeatMode.OFF:
+            return 0
+        return None
+
+    def next(self, manual: bool = False) -> Optional[int]:
+        """
+        다음 트랙 ID
+
+        Args:
+            manual: 사용자가 직접 넘긴 경우 (한 곡 반복 무시)
+        """
+        position = self._next_position(manual)
+        if position is None:
+            return None
+        self._cursor = position
+        return self.current_id
+
+    def peek_next(self) -> Optional[int]:
+        """다음 트랙 ID (이동 없음, 미리 로드용)"""
+        position = self._next_position(manual=False)
+        return self._slots[self._order[position]] if position is not None else None
+
+    def upcoming(self, count: int) -> list[int]:
+        """현재 곡 다음으로 재생될 트랙 ID 최대 count개 (이동 없음, 미리 변환용)"""
+        order = self._order
+        total = len(order)
+        if not total:
+            return []
+        wrap = self._repeat_mode == RepeatMode.ALL
+        limit = min(count, total - 1 if wrap else total - self._cursor - 1)
+        return [self._slots[order[(self._cursor + 1 + i) % total]] for i in range(max(0, limit))]
+
+    def previous(self) -> Optional[int]:
+        """이전 트랙 ID"""
+        if self._cursor > 0:
+            self._cursor -= 1
+        elif self._repeat_mode != RepeatMode.OFF and len(self._order):
+            self._cursor = len(self._order) - 1
+        else:
+            return None
+        return self.current_id
+
+    # ===== 영속화 =====
+
+    def save(self, path: Path = QUEUE_PATH):
+        """대기열을 바이너리로 저장 (헤더 + int64 ID + int32 셔플 순서)"""
+        slots = self._slots
+        base_slots = [s for s in self._base if slots[s] != _REMOVED]
+        ids = array("q", (slots[s] for s in base_slots))
+        order = None
+        if self._shuffled is not None:
+            base_pos = {slot: i for i, slot in enumerate(base_slots)}
+            order = array("i", (base_pos[s] for s in self._shuffled))
+        if sys.byteorder != "little":
+            ids.byteswap()
+            if order is not None:
+                order.byteswap()
+
+        header = _HEADER.pack(
+            _MAGIC, _VERSION, int(order is not None),
+            _REPEAT_CODES[self._repeat_mode], self._cursor, len(ids)
+        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(header)
+            f.write(ids.tobytes())
+            if order is not None:
+                f.write(order.tobytes())
+        tmp_path.replace(path)
+        logger.debug(f"대기열 저장: {len(ids)}곡 → {path}")
+
+    @classmethod
+    def load(cls, path: Path = QUEUE_PATH, seed: Optional[int] = None) -> Optional["PlayQueue"]:
+        """저장된 대기열 복원 (없거나 손상되면 None)"""
+        if not path.exists():
+            return None
+        try:
+            data = path.read_bytes()
+            magic, version, shuffled, repeat, cursor, count = _HEADER.unpack_from(data)
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError("알 수 없는 대기열 파일 형식")
+
+            offset = _HEADER.size
+            ids = array("q")
+            ids.frombytes(data[offset:offset + count * ids.itemsize])
+            offset += count * ids.itemsize
+            order = None
+            if shuffled:
+                order = array("i")
+                order.frombytes(data[offset:offset + count * order.itemsize])
+            if sys.byteorder != "little":
+                ids.byteswap()
+                if order is not None:
+                    order.byteswap()
+            if len(ids) != count or (order is not None and len(order) != count):
+                raise ValueError("대기열 파일이 잘렸습니다")
+
+            queue = cls(seed=seed, repeat_mode=_REPEAT_FROM_CODE.get(repeat, RepeatMode.OFF))
+            queue._slots = ids
+            queue._base = _BlockList(range(count))
+            if order is not None:
+                queue._shuffled = _BlockList(order)
+            queue._cursor = cursor if -1 <= cursor < count else -1
+            logger.info(f"대기열 복원: {count}곡")
+            return queue
+        except Exception as e:
+            logger.warning(f"대기열 복원 실패: {path} - {e}")
+            return None
+
+
+def restore_queue(playback_config: dict, path: Path = QUEUE_PATH) -> PlayQueue:
+    """
+    저장된 대기열 복원 후 설정(playback.shuffle / repeat_mode) 적용
+
+    Args:
+        playback_config: config["playback"]
+        path: 대기열 파일 경로
+    """
+    queue = PlayQueue.load(path) or PlayQueue()
+    queue.repeat_mode = RepeatMode.parse(playback_config.get("repeat_mode", "off"))
+    queue.shuffle = bool(playback_config.get("shuffle", False))
+    return queue
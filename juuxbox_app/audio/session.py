@@ -0,0 +1,144 @@
+"""
+Playback Session
+================
+재생 세션(대기열, 현재 곡, 위치) 지연 저장 및 시작 시 복원
+
+- 상태는 주기적으로 스냅샷만 비교하고, 바뀐 경우에만 파일에 씀 (write-behind)
+- 대기열 파일은 구성이 바뀐 경우에만 다시 저장
+- 복원 시 라이브러리 스캔이나 전체 트랙 조회 없이 마지막 곡을 백그라운드로 미리 엶
+"""
+
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+from .engine import AudioInfo
+from .play_queue import PlayQueue, QUEUE_PATH
+
+logger = logging.getLogger(__name__)
+
+# 세션 파일
+SESSION_PATH = Path.home() / ".juuxbox" / "session.json"
+
+# 저장 주기 (초)
+CHECKPOINT_INTERVAL = 5.0
+
+
+def load_session(path: Path = SESSION_PATH) -> Optional[dict]:
+    """저장된 세션 로드 (없거나 손상되면 None)"""
+    if not path.exists():
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning(f"세션 로드 실패: {e}")
+        return None
+
+
+def save_session(session: dict, path: Path = SESSION_PATH):
+    """세션 저장 (임시 파일 후 교체)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(session, f, ensure_ascii=False)
+    tmp_path.replace(path)
+
+
+def restore_session(engine, queue: PlayQueue, path: Path = SESSION_PATH,
+                    lookup_track: Optional[Callable[[int], Optional[dict]]] = None) -> Optional[dict]:
+    """
+    마지막 세션 복원
+
+    대기열 위치를 맞추고 마지막 곡을 저장된 위치에서 백그라운드로 미리 엽니다.
+
+    Args:
+        engine: AudioEngine
+        queue: 복원된 재생 대기열
+        lookup_track: 트랙 ID → 라이브러리 트랙 (예: TrackRepository.get_by_id)
+                      - 찾으면 저장된 스트림 정보로 미리 열어 파일 태그를 다시 읽지 않음
+
+    Returns:
+        세션 정보 (track_id, file_path, position, queue_position, 찾은 경우 track) 또는 None
+    """
+    session = load_session(path)
+    if not session:
+        return None
+
+    queue.jump(session.get("queue_position", -1))
+
+    file_path = session.get("file_path")
+    if not file_path or not Path(file_path).exists():
+        logger.info("세션 복원 생략: 마지막 곡 파일 없음")
+        return None
+
+    track_id = session.get("track_id")
+    track = lookup_track(track_id) if lookup_track and track_id is not None else None
+    if track:
+        session["track"] = track
+    engine.preload(file_path, session.get("position", 0.0), stream_info=AudioInfo.from_track(track))
+    logger.info(f"세션 복원: {file_path} ({session.get('position', 0.0):.1f}초)")
+    return session
+
+
+class SessionCheckpointer:
+    """
+    재생 세션 지연 저장기
+
+    재생 틱마다 쓰지 않고 CHECKPOINT_INTERVAL 간격으로 스냅샷을 비교하여
+    바뀐 경우에만 세션 파일을, 대기열 구성이 바뀐 경우에만 대기열 파일을 저장합니다.
+    """
+
+    def __init__(self, snapshot: Callable[[], Optional[dict]], queue: PlayQueue,
+                 interval: float = CHECKPOINT_INTERVAL,
+                 path: Path = SESSION_PATH, queue_path: Path = QUEUE_PATH):
+        """
+        Args:
+            snapshot: 현재 세션 상태를 반환하는 함수 (재생 곡 없으면 None)
+            queue: 재생 대기열
+            interval: 저장 주기 (초)
+        """
+        self._snapshot = snapshot
+        self._queue = queue
+        self._interval = interval
+        self._path = path
+        self._queue_path = queue_path
+        self._last_session: Optional[dict] = None
+        self._last_revision = queue.revision
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """저장 스레드 시작"""
+        def run():
+            while not self._stop_event.wait(self._interval):
+                self.flush()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+
+    def flush(self, force: bool = False):
+        """바뀐 내용 저장 (force=True면 대기열도 항상 저장)"""
+        try:
+            session = self._snapshot()
+            if session is not None and session != self._last_session:
+                save_session(session, self._path)
+                self._last_session = session
+                logger.debug(f"세션 저장: {session.get('position', 0.0):.1f}초")
+
+            revision = self._queue.revision
+            if force or revision != self._last_revision:
+                self._queue.save(self._queue_path)
+                self._last_revision = revision
+        except Exception as e:
+            logger.warning(f"세션 저장 실패: {e}")
+
+    def stop(self):
+        """스레드 중지 및 마지막 저장"""
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+        self.flush(force=True)
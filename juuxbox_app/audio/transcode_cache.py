@@ -0,0 +1,230 @@
+"""
+Transcode Cache
+===============
+FFmpeg이 필요한 포맷(M4A/AAC/WMA/OPUS 등)의 디코딩 결과를 디스크에 캐시
+
+- 키: 파일 경로 + 수정 시각 + 크기 (파일이 바뀌면 자동으로 새 항목)
+- 형식: 작은 헤더 + raw PCM (s16le) → 다시 재생할 때 FFmpeg 없이 파일 읽기만 수행
+- 전체 크기 상한을 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+- 대기열의 다음 곡을 백그라운드에서 미리 변환 (warm-up)
+"""
+
+import hashlib
+import logging
+import os
+import queue
+import struct
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# 캐시 폴더
+TRANSCODE_DIR = Path.home() / ".juuxbox" / "transcode"
+
+# 기본 용량 상한
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+# 헤더: magic, version, sample_rate, channels, data_len
+_HEADER = struct.Struct("<4sHIHQ")
+_MAGIC = b"JXPC"
+_VERSION = 1
+_SUFFIX = ".pcm"
+
+# (pcm, sample_rate, channels) 를 반환하는 디코더
+DecodeFunc = Callable[[str], Optional[tuple[bytes, int, int]]]
+
+# 미리 변환할 다음 곡 수
+WARM_UP_COUNT = 3
+
+
+class TranscodeCache:
+    """
+    디코딩 결과 디스크 캐시
+
+    Args:
+        cache_dir: 캐시 폴더
+        max_bytes: 전체 용량 상한
+    """
+
+    def __init__(self, cache_dir: Path = TRANSCODE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self._dir = cache_dir
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # key → 파일 크기 (LRU 순)
+        self._total = 0
+
+        # 백그라운드 미리 변환
+        self._pending: "queue.Queue[tuple[str, DecodeFunc]]" = queue.Queue()
+        self._pending_keys: set[str] = set()
+        self._worker: Optional[threading.Thread] = None
+
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._load_index()
+
+    @classmethod
+    def from_config(cls, audio_config: dict, cache_dir: Path = TRANSCODE_DIR) -> Optional["TranscodeCache"]:
+        """설정(audio 섹션)으로 생성 (비활성화 시 None)"""
+        if not audio_config.get("transcode_cache", True):
+            return None
+        max_mb = audio_config.get("transcode_cache_mb", DEFAULT_MAX_BYTES // 1024 ** 2)
+        try:
+            return cls(cache_dir, int(max_mb) * 1024 ** 2)
+        except OSError as e:
+            logger.warning(f"변환 캐시 사용 불가: {e}")
+            return None
+
+    def _load_index(self):
+        """기존 캐시 파일을 마지막 사용 시각 순으로 색인"""
+        files = []
+        for entry in os.scandir(self._dir):
+            if entry.name.endswith(_SUFFIX) and entry.is_file():
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name[:-len(_SUFFIX)], stat.st_size))
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._total += size
+        logger.info(f"변환 캐시: {len(self._entries)}개, {self._total / 1024 ** 2:.1f}MB")
+
+    @staticmethod
+    def make_key(file_path: str) -> Optional[str]:
+        """경로 + mtime + 크기 기반 캐시 키 (파일이 없으면 None)"""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        raw = f"{os.path.abspath(file_path)}|{stat.st_mtime_ns}|{stat.st_size}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self._dir / f"{key}{_SUFFIX}"
+
+    def contains(self, file_path: str) -> bool:
+        key = self.make_key(file_path)
+        with self._lock:
+            return key is not None and key in self._entries
+
+    def get(self, file_path: str, sample_rate: int, channels: int) -> Optional[bytes]:
+        """캐시된 PCM 반환 (없거나 형식이 다르면 None)"""
+        key = self.make_key(file_path)
+        if key is None:
+            return None
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                magic, version, rate, nch, length = _HEADER.unpack(f.read(_HEADER.size))
+                if magic != _MAGIC or version != _VERSION or rate != sample_rate or nch != channels:
+                    return None
+                data = f.read(length)
+            if len(data) != length:
+                raise ValueError("잘린 캐시 파일")
+            os.utime(path)  # 재시작 후에도 LRU 순서 유지
+            logger.debug(f"변환 캐시 적중: {file_path}")
+            return data
+        except Exception as e:
+            logger.warning(f"변환 캐시 읽기 실패: {path} - {e}")
+            self._discard(key)
+            return None
+
+    def put(self, file_path: str, sample_rate: int, channels: int, pcm: bytes):
+        """디코딩 결과 저장 후 용량 상한 초과분 정리"""
+        key = self.make_key(file_path)
+        if key is None:
+            return
+        size = _HEADER.size + len(pcm)
+        if size > self._max_bytes:
+            return
+
+        path = self._path(key)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(_HEADER.pack(_MAGIC, _VERSION, sample_rate, channels, len(pcm)))
+                f.write(pcm)
+            tmp_path.replace(path)
+        except OSError as e:
+            logger.warning(f"변환 캐시 저장 실패: {file_path} - {e}")
+            return
+
+        with self._lock:
+            self._total += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._evict()
+        logger.debug(f"변환 캐시 저장: {file_path} ({size / 1024 ** 2:.1f}MB)")
+
+    def _evict(self):
+        """LRU 정리 (_lock 보유 상태)"""
+        while self._total > self._max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total -= size
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+            logger.debug(f"변환 캐시 삭제: {key}")
+
+    def _discard(self, key: str):
+        with self._lock:
+            self._total -= self._entries.pop(key, 0)
+        try:
+            self._path(key).unlink()
+        except OSError:
+            pass
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ===== 백그라운드 미리 변환 =====
+
+    def warm_up(self, file_paths: Iterable[str], decode: DecodeFunc):
+        """
+        캐시에 없는 파일을 백그라운드에서 변환
+
+        Args:
+            file_paths: 곧 재생할 파일 경로 (대기열 순서)
+            decode: 파일 경로 → (pcm, sample_rate, channels)
+        """
+        for file_path in file_paths:
+            key = self.make_key(file_path)
+            with self._lock:
+                if key is None or key in self._entries or key in self._pending_keys:
+                    continue
+                self._pending_keys.add(key)
+            self._pending.put((file_path, decode))
+
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._warm_worker, daemon=True)
+            self._worker.start()
+
+    def wait_idle(self):
+        """대기 중인 미리 변환이 모두 끝날 때까지 대기"""
+        self._pending.join()
+
+    def _warm_worker(self):
+        while True:
+            file_path, decode = self._pending.get()
+            try:
+                if not self.contains(file_path):
+                    result = decode(file_path)
+                    if result is not None:
+                        pcm, sample_rate, channels = result
+                        self.put(file_path, sample_rate, channels, pcm)
+                        logger.info(f"변환 캐시 미리 변환: {file_path}")
+            except Exception as e:
+                logger.warning(f"미리 변환 실패: {file_path} - {e}")
+            finally:
+                key = self.make_key(file_path)
+                with self._lock:
+                    self._pending_keys.discard(key)
+                self._pending.task_done()
@@ -0,0 +1,229 @@
+"""
+Visualizer Tap
+==============
+재생 출력 스트림에서 스펙트럼 밴드와 레벨 미터(RMS/피크) 계산
+
+- 오디오 스레드는 블록 사본을 링 버퍼에 넣기만 함 (구독자가 없으면 아무것도 하지 않음)
+- 분석은 별도 스레드에서 고정 주기(fps)로 NumPy FFT 수행
+- 결과 프레임은 하나의 구독 콜백으로 UI에 전달
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    logger.warning("numpy가 설치되지 않아 시각화를 사용할 수 없습니다. pip install numpy")
+
+# 분석 기본값
+DEFAULT_BANDS = 32
+DEFAULT_FPS = 30.0
+DEFAULT_FFT_SIZE = 2048
+MIN_FREQ = 40.0
+FLOOR_DB = -90.0
+
+# 링 버퍼에 보관할 최대 블록 수
+_RING_BLOCKS = 64
+
+
+class VisualizerTap:
+    """
+    출력 스트림 분석 탭
+
+    Frame 형식:
+        {"bands": [0..1] * bands, "rms": [0..1] * channels,
+         "peak": [0..1] * channels, "timestamp": float}
+    """
+
+    def __init__(self, bands: int = DEFAULT_BANDS, fps: float = DEFAULT_FPS,
+                 fft_size: int = DEFAULT_FFT_SIZE):
+        self.bands = bands
+        self.fps = fps
+        self.fft_size = fft_size
+
+        self._sample_rate = 44100
+        self._channels = 2
+        self._window = None
+        self._band_starts = None
+
+        # 오디오 스레드 → 분석 스레드
+        self._chunks: deque = deque(maxlen=_RING_BLOCKS)
+        self._pushed = 0
+        self._consumed = 0
+
+        self._subscriber: Optional[Callable[[dict], None]] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._idle = False
+
+        # 분석 비용
+        self._frames = 0
+        self._total_time = 0.0
+
+    @property
+    def active(self) -> bool:
+        """구독자가 있어 분석 중인지"""
+        return self._subscriber is not None
+
+    def prepare(self, sample_rate: int, channels: int):
+        """스트림 형식 설정 및 창 함수/밴드 경계 계산"""
+        self._sample_rate = sample_rate
+        self._channels = channels
+        self._chunks.clear()
+        self._pushed = self._consumed = 0
+        if not NUMPY_AVAILABLE:
+            return
+
+        self._window = np.hanning(self.fft_size)
+        # 로그 간격 밴드 경계 (FFT bin 단위, 각 밴드 최소 1 bin)
+        bins = self.fft_size // 2 + 1
+        edges = np.geomspace(MIN_FREQ, sample_rate / 2, self.bands + 1)
+        starts = np.maximum(np.floor(edges[:-1] * self.fft_size / sample_rate).astype(np.intp), 1)
+        offsets = np.arange(self.bands)
+        starts = np.maximum.accumulate(starts - offsets) + offsets  # 순증가 보장
+        self._band_starts = np.minimum(starts, bins - 1)
+
+    def wrap(self, stream, sample_rate: int, channels: int):
+        """
+        스트림 제너레이터 감싸기
+
+        Args:
+            stream: 이미 시작된 miniaudio 스트림 제너레이터 (16-bit)
+        """
+        self.prepare(sample_rate, channels)
+        chunks = self._chunks
+
+        def tap_generator():
+            required_frames = yield b""
+            while True:
+                try:
+                    chunk = stream.send(required_frames)
+                except StopIteration:
+                    return
+                if self._subscriber is not None:
+                    chunks.append(bytes(chunk))
+                    self._pushed += 1
+                required_frames = yield chunk
+
+        gen = tap_generator()
+        next(gen)
+        return gen
+
+    # ===== 구독 =====
+
+    def subscribe(self, callback: Callable[[dict], None]):
+        """프레임 수신 콜백 등록 (하나만 유지, 분석 스레드에서 호출됨)"""
+        if not NUMPY_AVAILABLE:
+            logger.warning("numpy 없음: 시각화 사용 불가")
+            return
+        self._subscriber = callback
+        if self._thread is None or not self._thread.is_alive():
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        logger.debug("시각화 구독 시작")
+
+    def unsubscribe(self):
+        """구독 해제 및 분석 스레드 중지"""
+        self._subscriber = None
+        self._stop_event.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+        self._chunks.clear()
+        logger.debug("시각화 구독 해제")
+
+    def _run(self):
+        interval = 1.0 / self.fps
+        while not self._stop_event.wait(interval):
+            callback = self._subscriber
+            if callback is None:
+                break
+            frame = self.analyze()
+            if frame is None:
+                continue
+            try:
+                callback(frame)
+            except Exception as e:
+                logger.warning(f"시각화 프레임 전달 실패: {e}")
+
+    # ===== 분석 =====
+
+    def analyze(self) -> Optional[dict]:
+        """
+        최근 블록으로 프레임 계산
+
+        미터는 지난 프레임 이후 들어온 블록, 스펙트럼은 최근 fft_size 프레임 기준.
+        새 블록이 없으면 무음 프레임을 한 번 보내고 이후에는 None.
+        """
+        start = time.perf_counter()
+        chunks = list(self._chunks)
+        pushed = self._pushed
+        fresh = min(pushed - self._consumed, len(chunks))
+        self._consumed = pushed
+
+        if fresh <= 0:
+            if self._idle:
+                return None
+            self._idle = True
+            return self._silent_frame()
+        self._idle = False
+
+        channels = self._channels
+        recent = np.frombuffer(b"".join(chunks[-fresh:]), dtype=np.int16).reshape(-1, channels)
+        recent = recent.astype(np.float32) / 32768.0
+        rms = np.sqrt(np.mean(recent * recent, axis=0))
+        peak = np.max(np.abs(recent), axis=0)
+
+        # 최근 fft_size 프레임 모노 합성
+        needed = self.fft_size * channels * 2
+        tail, size = [], 0
+        for chunk in reversed(chunks):
+            tail.append(chunk)
+            size += len(chunk)
+            if size >= needed:
+                break
+        data = b"".join(reversed(tail))[-needed:]
+        samples = np.frombuffer(data, dtype=np.int16).reshape(-1, channels)
+        mono = samples.mean(axis=1) / 32768.0
+        if len(mono) < self.fft_size:
+            mono = np.pad(mono, (self.fft_size - len(mono), 0))
+
+        spectrum = np.abs(np.fft.rfft(mono * self._window)) * (2.0 / self._window.sum())
+        levels = np.maximum.reduceat(spectrum, self._band_starts)
+        db = 20.0 * np.log10(levels + 1e-12)
+        bands = np.clip((db - FLOOR_DB) / -FLOOR_DB, 0.0, 1.0)
+
+        self._frames += 1
+        self._total_time += time.perf_counter() - start
+        return {
+            "bands": np.round(bands, 3).tolist(),
+            "rms": np.round(rms, 4).tolist(),
+            "peak": np.round(peak, 4).tolist(),
+            "timestamp": time.time(),
+        }
+
+    def _silent_frame(self) -> dict:
+        return {
+            "bands": [0.0] * self.bands,
+            "rms": [0.0] * self._channels,
+            "peak": [0.0] * self._channels,
+            "timestamp": time.time(),
+        }
+
+    def stats(self) -> dict:
+        """분석 비용 (프레임당 평균, 분석 스레드 점유율)"""
+        avg = self._total_time / self._frames if self._frames else 0.0
+        return {
+            "frames": self._frames,
+            "avg_ms": avg * 1000,
+            "cpu_load": avg * self.fps,
+        }
@@ -0,0 +1,5 @@
+"""
+Benchmarks Module
+=================
+성능 측정 스크립트
+"""
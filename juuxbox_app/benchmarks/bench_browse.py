@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Browse Query Benchmark
+======================
+라이브러리 탐색 쿼리 시간 비교: 인덱스 없음 + 문자열로 매번 GROUP BY(기존) vs 탐색 인덱스 + ID + 요약 테이블
+
+- 기존: tracks 전체 스캔, 앨범/아티스트는 문자열로 찾고 묶음,
+        get_artists/get_folders는 그룹마다 (SELECT cover_path ... LIMIT 1)
+- 현재: 트랙 목록은 album_id / artist_id / folder_name 인덱스,
+        그리드(get_albums/artists/folders)는 정렬 키 순서로 읽고 트리거로 유지되는 요약 테이블을 ID로 붙임
+- 요약 다시 만들기(SummaryRepository.rebuild)는 커버링 인덱스 집계 한 번
+
+Usage:
+    python benchmarks/bench_browse.py
+    python benchmarks/bench_browse.py --tracks 100000 --repeat 5
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from db import models
+from db import repository
+
+# 이전 쿼리 (get_albums / get_artists / get_folders)
+_OLD_ALBUMS_SQL = """
+    SELECT album, artist, cover_path, COUNT(*) as track_count,
+           SUM(duration_seconds) as total_duration
+    FROM tracks
+    WHERE album IS NOT NULL AND album != ''
+    GROUP BY album
+    ORDER BY album
+"""
+
+_OLD_ARTISTS_SQL = """
+    SELECT artist,
+           (SELECT cover_path FROM tracks t2
+            WHERE t2.artist = tracks.artist AND t2.cover_path IS NOT NULL
+            LIMIT 1) as cover_path,
+           COUNT(DISTINCT album) as album_count,
+           COUNT(*) as track_count
+    FROM tracks
+    WHERE artist IS NOT NULL AND artist != ''
+    GROUP BY artist
+    ORDER BY artist
+"""
+
+_OLD_FOLDERS_SQL = """
+    SELECT folder_name,
+           (SELECT cover_path FROM tracks t2
+            WHERE t2.folder_name = tracks.folder_name AND t2.cover_path IS NOT NULL
+            LIMIT 1) as cover_path,
+           COUNT(*) as track_count
+    FROM tracks
+    WHERE folder_name IS NOT NULL AND folder_name != ''
+    GROUP BY folder_name
+    ORDER BY folder_name
+"""
+
+_OLD_ALL_TRACKS_SQL = "SELECT * FROM tracks ORDER BY artist, album, track_number"
+_OLD_TRACKS_BY_ALBUM_SQL = "SELECT * FROM tracks WHERE album = ? ORDER BY track_number"
+_OLD_TRACKS_BY_ARTIST_SQL = "SELECT * FROM tracks WHERE artist = ? ORDER BY album, track_number"
+
+_BROWSE_INDEXES = ("idx_tracks_album_id", "idx_tracks_artist_id", "idx_tracks_folder", "idx_tracks_page_artist")
+
+
+def make_tracks(count: int) -> list[dict]:
+    """앨범당 12곡, 아티스트당 약 4앨범, 앨범 3개 중 1개는 커버 없음"""
+    tracks = []
+    for i in range(count):
+        album = i // 12
+        tracks.append({
+            "file_path": f"/music/{album // 4:05d}/{album:06d}/{i:07d}.flac",
+            "title": f"Track {i}", "artist": f"Artist {album // 4:05d}", "album": f"Album {album:06d}",
+            "folder_name": f"Album {album:06d}", "track_number": i % 12 + 1, "duration_seconds": 200.0,
+            "cover_path": f"/covers/{album}.jpg" if album % 3 and i % 12 > 5 else None,
+        })
+    return tracks
+
+
+def timed(conn, sql: str, params: tuple, repeat: int) -> float:
+    """가장 빠른 실행 시간 (ms)"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JuuxBox browse query benchmark")
+    parser.add_argument("--tracks", type=int, default=100000, help="DB에 채울 트랙 수")
+    parser.add_argument("--repeat", type=int, default=5, help="쿼리별 반복 횟수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        models.DB_PATH = Path(work_dir) / "bench.db"
+        models.create_tables()
+        repository.TrackRepository.insert_many(make_tracks(args.tracks))
+        conn = models.connection()
+        albums = args.tracks // 12
+        middle = f"Album {albums // 2:06d}"
+        artist = f"Artist {albums // 8:05d}"
+        album_id = conn.execute("SELECT id FROM albums WHERE title = ?", (middle,)).fetchone()[0]
+        artist_id = conn.execute("SELECT id FROM artists WHERE name = ?", (artist,)).fetchone()[0]
+
+        # (이름, 기존 쿼리, 기존 파라미터, 현재 쿼리, 현재 파라미터)
+        cases = [
+            ("get_albums", _OLD_ALBUMS_SQL, (), repository._ALBUMS_SQL, ()),
+            ("get_artists", _OLD_ARTISTS_SQL, (), repository._ARTISTS_SQL, ()),
+            ("get_folders", _OLD_FOLDERS_SQL, (), repository._FOLDERS_SQL, ()),
+            ("get_tracks_by_album", _OLD_TRACKS_BY_ALBUM_SQL, (middle,),
+             repository._TRACKS_BY_ALBUM_SQL, (album_id,)),
+            ("get_tracks_by_artist", _OLD_TRACKS_BY_ARTIST_SQL, (artist,),
+             repository._TRACKS_BY_ARTIST_SQL, (artist_id,)),
+            ("get_tracks_by_folder", repository._TRACKS_BY_FOLDER_SQL, (middle,),
+             repository._TRACKS_BY_FOLDER_SQL, (middle,)),
+            ("get_all", _OLD_ALL_TRACKS_SQL, (), repository._ALL_TRACKS_SQL, ()),
+        ]
+
+        # 기존: 탐색 인덱스 없이
+        for index in _BROWSE_INDEXES:
+            conn.execute(f"DROP INDEX {index}")
+        # get_artists/get_folders 기존 쿼리는 그룹 수 × 전체 스캔이라 매우 느림 → 한 번만
+        before = {name: timed(conn, old, params, 1 if "(SELECT" in old else args.repeat)
+                  for name, old, params, _, _ in cases}
+        models.create_tables()
+        after = {name: timed(conn, new, params, args.repeat) for name, _, _, new, params in cases}
+        start = time.perf_counter()
+        repository.SummaryRepository.rebuild()
+        rebuild_ms = (time.perf_counter() - start) * 1000
+        models.close_connections()
+
+    print("\n" + "=" * 72)
+    print(f"📚 Browse Query Benchmark ({args.tracks:,} tracks, {albums:,} albums)")
+    print("=" * 72)
+    print(f"   {'query':<24}{'before':>12}{'after':>12}{'speedup':>12}")
+    for name in before:
+        print(f"   {name:<24}{before[name]:>10.1f}ms{after[name]:>10.1f}ms{before[name] / after[name]:>11.1f}×")
+    print(f"   {'summary rebuild':<24}{'':>12}{rebuild_ms:>10.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
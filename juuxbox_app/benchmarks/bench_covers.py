@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Cover Lookup Benchmark
+======================
+내장 아트가 없는 트랙의 폴더 커버 탐색 파일시스템 호출 수 비교
+
+- 기존 방식: 트랙마다 COVER_FILENAMES 24개 exists() + 확장자별 glob()
+- 폴더 캐시: 폴더당 os.scandir 한 번, 결과는 스캔 동안 재사용
+
+os.stat / os.scandir 호출을 세어 비교합니다 (Path.exists, Path.glob 포함).
+임시 폴더에 앨범 폴더를 만들고 커버 이름 유형(표준 이름/대체 이미지/없음)을 섞습니다.
+
+Usage:
+    python benchmarks/bench_covers.py
+    python benchmarks/bench_covers.py --albums 500 --tracks 20
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from db import scanner as scanner_module
+from db.scanner import COVER_FILENAMES, LibraryScanner
+
+
+class CallCounter:
+    """os.stat / os.scandir 호출 수 집계"""
+
+    def __init__(self):
+        self.stat = 0
+        self.scandir = 0
+
+    def __enter__(self):
+        self._stat, self._scandir = os.stat, os.scandir
+
+        def stat(*args, **kwargs):
+            self.stat += 1
+            return self._stat(*args, **kwargs)
+
+        def scandir(*args, **kwargs):
+            self.scandir += 1
+            return self._scandir(*args, **kwargs)
+
+        os.stat, os.scandir = stat, scandir
+        return self
+
+    def __exit__(self, *exc):
+        os.stat, os.scandir = self._stat, self._scandir
+
+
+def make_albums(root: Path, albums: int, tracks: int) -> list[Path]:
+    """앨범 폴더별 빈 트랙 + 커버 이미지 (3개 중 1개는 표준 이름, 1개는 대체 이미지, 1개는 없음)"""
+    files = []
+    for i in range(albums):
+        album = root / f"Album {i:04d}"
+        album.mkdir()
+        if i % 3 == 0:
+            (album / "folder.jpg").touch()
+        elif i % 3 == 1:
+            (album / "scan_front.png").touch()
+        for n in range(tracks):
+            path = album / f"{n + 1:02d}.flac"
+            path.touch()
+            files.append(path)
+    return files
+
+
+def legacy_find_cover(folder: Path):
+    """기존 방식 (트랙마다 호출)"""
+    for filename in COVER_FILENAMES:
+        cover_file = folder / filename
+        if cover_file.exists():
+            return str(cover_file)
+    for ext in [".jpg", ".jpeg", ".png"]:
+        images = list(folder.glob(f"*{ext}"))
+        if images:
+            return str(images[0])
+    return None
+
+
+def run(label: str, lookup, files: list[Path]):
+    with CallCounter() as counter:
+        start = time.perf_counter()
+        found = sum(1 for f in files if lookup(f.parent))
+        elapsed = time.perf_counter() - start
+    calls = counter.stat + counter.scandir
+    print(f"   {label:<14} stat {counter.stat:8,}  scandir {counter.scandir:6,}  "
+          f"합계 {calls:8,} ({calls / len(files):5.1f}/트랙)  {elapsed:6.3f}s  커버 {found:,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JuuxBox cover lookup benchmark")
+    parser.add_argument("--albums", type=int, default=300, help="앨범 폴더 수")
+    parser.add_argument("--tracks", type=int, default=20, help="앨범당 트랙 수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scanner_module.COVERS_DIR = Path(tmp) / "covers"
+        files = make_albums(Path(tmp), args.albums, args.tracks)
+
+        print("\n" + "=" * 60)
+        print(f"🖼  Cover Lookup Benchmark ({args.albums} albums x {args.tracks} tracks)")
+        print("=" * 60)
+        run("기존 (트랙마다)", legacy_find_cover, files)
+        scanner = LibraryScanner()
+        run("폴더 캐시", scanner._find_cover_image, files)
+
+
+if __name__ == "__main__":
+    main()
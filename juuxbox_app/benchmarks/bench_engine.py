@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Engine Benchmark
+================
+재생 스트림 경로(디코더 출력 → DSP 체인 → 시각화 탭) 처리 비용 측정
+
+오디오 장치 없이 miniaudio 콜백과 같은 방식으로 스트림 제너레이터에
+프레임 수를 보내며 블록당 처리 시간과 실시간 대비 부하를 출력합니다.
+
+Usage:
+    python benchmarks/bench_engine.py
+    python benchmarks/bench_engine.py --seconds 30 --frames 512 --rate 96000
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from audio.dsp import DspChain, ParametricEQ, Balance, Crossfeed, EqBand
+from audio.visualizer import VisualizerTap
+
+
+def make_source_stream(sample_rate: int, channels: int, seconds: float):
+    """16-bit 노이즈를 내보내는 스트림 제너레이터 (engine._create_pcm_stream과 같은 규약)"""
+    rng = np.random.default_rng(0)
+    data = (rng.standard_normal((int(sample_rate * seconds), channels)) * 3000).astype(np.int16).tobytes()
+    frame_size = channels * 2
+
+    def generator():
+        offset = 0
+        required_frames = yield b""
+        while offset < len(data):
+            chunk = data[offset:offset + required_frames * frame_size]
+            offset += required_frames * frame_size
+            required_frames = yield chunk
+
+    gen = generator()
+    next(gen)
+    return gen
+
+
+def make_chain(bypass: bool = False) -> DspChain:
+    """10밴드 EQ + 밸런스 + 크로스피드"""
+    bands = [EqBand("lowshelf", 80, 3.0), EqBand("highshelf", 10000, -2.0)]
+    bands += [EqBand("peak", f, 1.5, 1.0) for f in (125, 250, 500, 1000, 2000, 4000, 6000, 8000)]
+    stages = [ParametricEQ(bands, preamp_db=-3.0), Balance(0.1), Crossfeed(0.3)]
+    return DspChain(stages, bypass=bypass)
+
+
+def run_stream(stream, frames: int) -> tuple[int, float]:
+    """콜백처럼 프레임 수를 보내며 끝까지 소비"""
+    blocks = 0
+    start = time.perf_counter()
+    try:
+        while True:
+            stream.send(frames)
+            blocks += 1
+    except StopIteration:
+        pass
+    return blocks, time.perf_counter() - start
+
+
+def bench(label: str, chain, sample_rate: int, channels: int, seconds: float, frames: int):
+    stream = make_source_stream(sample_rate, channels, seconds)
+    if chain is not None:
+        stream = chain.wrap(stream, sample_rate, channels)
+    blocks, elapsed = run_stream(stream, frames)
+    per_block_ms = elapsed / max(blocks, 1) * 1000
+    budget_ms = frames / sample_rate * 1000
+    print(f"   {label:<22} {per_block_ms:8.3f} ms/block  (예산 {budget_ms:.2f} ms, 부하 {elapsed / seconds * 100:6.2f}%)")
+    return chain
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JuuxBox engine benchmark")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--frames", type=int, default=441, help="콜백당 프레임 수")
+    parser.add_argument("--rate", type=int, default=44100)
+    parser.add_argument("--channels", type=int, default=2)
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print(f"🎛️ Engine Benchmark ({args.seconds:.0f}s, {args.rate}Hz, {args.frames} frames/callback)")
+    print("=" * 60)
+
+    common = (args.rate, args.channels, args.seconds, args.frames)
+    bench("DSP 없음", None, *common)
+    bench("DSP bypass", make_chain(bypass=True), *common)
+    chain = bench("DSP (EQ+밸런스+크로스피드)", make_chain(), *common)
+
+    print("\n📊 스테이지별 비용:")
+    for stage in chain.stats():
+        print(f"   {stage['name']:<10} {stage['avg_ms']:7.3f} ms/block  cpu_load {stage['cpu_load'] * 100:6.2f}%")
+
+    print("\n📈 시각화 탭 (오디오 스레드 비용):")
+    bench("탭 (구독자 없음)", VisualizerTap(), *common)
+    tap = VisualizerTap()
+    frames = []
+    tap.subscribe(frames.append)
+    bench("탭 (구독 중)", tap, *common)
+
+    # 실시간 속도로 흘려 보내며 분석 스레드 비용 측정
+    stream = tap.wrap(make_source_stream(args.rate, args.channels, 2.0), args.rate, args.channels)
+    budget = args.frames / args.rate
+    deadline = time.perf_counter()
+    try:
+        while True:
+            stream.send(args.frames)
+            deadline += budget
+            time.sleep(max(0.0, deadline - time.perf_counter()))
+    except StopIteration:
+        pass
+    tap.unsubscribe()
+    stats = tap.stats()
+    print(f"   분석 스레드 (FFT {tap.fft_size}, {tap.bands}밴드) {stats['avg_ms']:7.3f} ms/frame  "
+          f"{stats['frames']} frames, 점유 {stats['cpu_load'] * 100:5.2f}% @ {tap.fps:.0f}fps")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+DB Executor Benchmark
+=====================
+브리지 호출처럼 요청마다 스레드를 띄울 때: 호출 스레드에서 바로 조회(기존) vs DB 실행기(DbExecutor)
+
+- 빠른 입력: 검색어를 한 글자씩 입력하듯 겹쳐 보낸 검색 요청 중 마지막 결과가 나오기까지의 시간
+  (실행기는 같은 key의 이전 요청을 취소 / 기존은 모든 요청이 끝까지 실행되며 GIL/CPU를 나눠 씀)
+- 스캔 중 조회: 쓰기 스레드가 스캔 배치(insert_many)를 계속 저장하는 동안 그리드 조회(get_albums) 지연
+  (실행기는 쓰기를 백그라운드 우선순위로, 조회를 먼저 실행)
+
+Usage:
+    python benchmarks/bench_executor.py
+    python benchmarks/bench_executor.py --tracks 100000 --rounds 20
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+import threading
+from concurrent.futures import CancelledError
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from db import models
+from db.executor import BACKGROUND, DbExecutor
+from db.repository import TrackRepository
+
+# 한 글자씩 입력되는 검색어 (앞쪽의 짧은 접두어일수록 결과가 많아 느림)
+TYPING = ("t", "tr", "tra", "trac", "track", "track 1", "track 12")
+
+
+def make_tracks(start: int, count: int) -> list[dict]:
+    return [{
+        "file_path": f"/music/{i // 48:05d}/{i // 12:06d}/{i:07d}.flac",
+        "title": f"Track {i}", "artist": f"Artist {i // 48:05d}", "album": f"Album {i // 12:06d}",
+        "folder_name": f"Album {i // 12:06d}", "track_number": i % 12 + 1, "duration_seconds": 200.0,
+    } for i in range(start, start + count)]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+def search(query: str) -> list[dict]:
+    """API의 검색 응답과 같이 행 → dict 변환까지"""
+    return [dict(t) for t in TrackRepository.search(query, 200)[0]]
+
+
+def typing_latency(executor, gap: float) -> float:
+    """입력 간격 gap초로 검색 요청을 띄우고 마지막 결과까지 걸린 시간 (ms)"""
+    done = {}
+
+    def request(query):
+        try:
+            result = executor.call(search, query, key="search") if executor else search(query)
+            done[query] = (time.perf_counter(), result)
+        except CancelledError:
+            pass
+
+    start = time.perf_counter()
+    threads = []
+    for query in TYPING:
+        thread = threading.Thread(target=request, args=(query,))
+        thread.start()
+        threads.append(thread)
+        time.sleep(gap)
+    for thread in threads:
+        thread.join()
+    return (done[TYPING[-1]][0] - start - gap * (len(TYPING) - 1)) * 1000
+
+
+def reads_during_writes(executor, tracks: int, seconds: float, batch: int) -> list[float]:
+    """스캔 배치 저장이 계속되는 동안 get_albums 지연 (ms)"""
+    stop = threading.Event()
+
+    def writer():
+        offset = 0
+        while not stop.is_set():
+            rows = make_tracks(offset, batch)
+            if executor:
+                executor.call(TrackRepository.insert_many, rows, priority=BACKGROUND)
+            else:
+                TrackRepository.insert_many(rows)
+            offset = (offset + batch) % max(tracks - batch, 1)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        if executor:
+            executor.call(TrackRepository.get_albums, key="view")
+        else:
+            TrackRepository.get_albums()
+        latencies.append((time.perf_counter() - start) * 1000)
+        time.sleep(0.01)
+    stop.set()
+    thread.join()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JuuxBox DB executor benchmark")
+    parser.add_argument("--tracks", type=int, default=50000, help="DB에 채울 트랙 수")
+    parser.add_argument("--rounds", type=int, default=10, help="빠른 입력 반복 횟수")
+    parser.add_argument("--gap", type=float, default=0.03, help="입력 간격 (초)")
+    parser.add_argument("--seconds", type=float, default=5.0, help="스캔 중 조회 측정 시간")
+    parser.add_argument("--batch", type=int, default=500, help="스캔 배치 크기")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        models.DB_PATH = Path(work_dir) / "bench.db"
+        models.create_tables()
+        TrackRepository.insert_many(make_tracks(0, args.tracks))
+
+        results = {}
+        for name in ("direct", "executor"):
+            executor = DbExecutor() if name == "executor" else None
+            typing = [typing_latency(executor, args.gap) for _ in range(args.rounds)]
+            reads = reads_during_writes(executor, args.tracks, args.seconds, args.batch)
+            if executor:
+                executor.shutdown()
+            results[name] = (typing, reads)
+        models.close_connections()
+
+    print("\n" + "=" * 84)
+    print(f"🧵 DB Executor Benchmark ({args.tracks:,} tracks, {len(TYPING)} keystrokes every {args.gap * 1000:.0f}ms)")
+    print("=" * 84)
+    print(f"   {'mode':<10}{'last search p50':>17}{'p90':>10}{'albums p50':>14}{'p99':>10}{'max':>10}")
+    for name, (typing, reads) in results.items():
+        print(f"   {name:<10}{percentile(typing, 0.5):>15.1f}ms{percentile(typing, 0.9):>8.1f}ms"
+              f"{percentile(reads, 0.5):>12.1f}ms{percentile(reads, 0.99):>8.1f}ms{max(reads):>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
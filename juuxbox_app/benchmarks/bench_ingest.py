@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Ingest Benchmark
+================
+가상 라이브러리(synth_library)를 LibraryScanner.rescan으로 빈 DB에 넣는 전체 과정 측정
+
+측정 항목 (단계마다 새 프로세스에서 실행):
+- files/s: 탐색 + 태그 파싱 + 커버 저장 + DB 반영
+- stat 호출: os.stat / os.lstat / DirEntry.stat (Path.exists 등 포함)
+- 읽은 바이트: /proc/self/io의 rchar(읽기 호출 합계)와 read_bytes(실제 저장장치 읽기)
+- 최대 RSS
+
+cold: 라이브러리 파일을 페이지 캐시에서 내린 뒤 측정
+      (posix_fadvise DONTNEED - Linux 전용, tmpfs에서는 효과 없음. 디렉토리 캐시는 남음)
+warm: 같은 라이브러리를 새 DB로 한 번 더 측정
+
+Usage:
+    python benchmarks/bench_ingest.py --files 5000
+    python benchmarks/bench_ingest.py --path D:/tmp/synth --workers 1,4,8
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import multiprocessing
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class _CountingEntry:
+    """DirEntry.stat 호출을 세는 대리 객체 (DirEntry는 속성을 바꿀 수 없음)"""
+
+    def __init__(self, entry, counter):
+        self._entry = entry
+        self._counter = counter
+
+    def stat(self, *args, **kwargs):
+        self._counter.stat += 1
+        return self._entry.stat(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._entry, name)
+
+    def __fspath__(self):
+        return self._entry.path
+
+
+class _CountingScandir:
+    def __init__(self, iterator, counter):
+        self._iterator = iterator
+        self._counter = counter
+
+    def __iter__(self):
+        return (_CountingEntry(entry, self._counter) for entry in self._iterator)
+
+    def __enter__(self):
+        self._iterator.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._iterator.__exit__(*exc)
+
+
+class SyscallCounter:
+    """os.stat / os.lstat / os.scandir 호출 수 집계"""
+
+    def __init__(self):
+        self.stat = 0
+        self.scandir = 0
+
+    def install(self):
+        real_stat, real_lstat, real_scandir = os.stat, os.lstat, os.scandir
+
+        def stat(*args, **kwargs):
+            self.stat += 1
+            return real_stat(*args, **kwargs)
+
+        def lstat(*args, **kwargs):
+            self.stat += 1
+            return real_lstat(*args, **kwargs)
+
+        def scandir(*args, **kwargs):
+            self.scandir += 1
+            return _CountingScandir(real_scandir(*args, **kwargs), self)
+
+        os.stat, os.lstat, os.scandir = stat, lstat, scandir
+
+
+def read_proc_io() -> dict:
+    """/proc/self/io (Linux 전용, 없으면 빈 dict)"""
+    try:
+        with open("/proc/self/io") as f:
+            return {key: int(value) for key, value in (line.split(": ") for line in f)}
+    except OSError:
+        return {}
+
+
+def peak_rss_mb() -> float:
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def evict_page_cache(root: str) -> bool:
+    """라이브러리 파일을 페이지 캐시에서 내림 → 성공 여부"""
+    if not hasattr(os, "posix_fadvise"):
+        return False
+    os.sync()
+    for directory, _, files in os.walk(root):
+        for name in files:
+            try:
+                fd = os.open(os.path.join(directory, name), os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            finally:
+                os.close(fd)
+    return True
+
+
+def run_ingest(path: str, workers: int, cold: bool) -> dict:
+    """새 프로세스에서 빈 DB에 전체 스캔 (spawn으로 실행되어 RSS/IO가 단계별로 분리됨)"""
+    from db import models
+    from db.artwork import ArtworkStore
+    from db.scanner import LibraryScanner
+
+    evicted = evict_page_cache(path) if cold else False
+    with tempfile.TemporaryDirectory() as work_dir:
+        models.DB_PATH = Path(work_dir) / "bench.db"
+        models.create_tables()
+        scanner = LibraryScanner(workers=workers, artwork_store=ArtworkStore(Path(work_dir) / "artwork"))
+
+        counter = SyscallCounter()
+        counter.install()
+        io_before = read_proc_io()
+        start = time.perf_counter()
+        result = scanner.rescan(path)
+        elapsed = time.perf_counter() - start
+        io_after = read_proc_io()
+
+    return {
+        "files": result.total_files,
+        "added": result.added,
+        "elapsed": elapsed,
+        "stat": counter.stat,
+        "scandir": counter.scandir,
+        "rchar": io_after.get("rchar", 0) - io_before.get("rchar", 0),
+        "read_bytes": io_after.get("read_bytes", 0) - io_before.get("read_bytes", 0),
+        "rss_mb": peak_rss_mb(),
+        "evicted": evicted,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JuuxBox scanner ingest benchmark")
+    parser.add_argument("--path", help="가상 라이브러리 폴더 (없으면 임시 폴더에 생성)")
+    parser.add_argument("--files", type=int, default=2000, help="생성할 트랙 수")
+    parser.add_argument("--seed", type=int, default=1, help="생성 난수 시드")
+    parser.add_argument("--workers", default="4", help="비교할 작업자 수 목록")
+    args = parser.parse_args()
+
+    tmp = None
+    path = args.path
+    if not path:
+        from benchmarks.synth_library import generate_library
+
+        tmp = tempfile.TemporaryDirectory()
+        path = tmp.name
+        start = time.perf_counter()
+        stats = generate_library(Path(path), args.files, args.seed)
+        print(f"   라이브러리 생성: {stats['files']:,}개 트랙, {stats['albums']:,}개 앨범 "
+              f"({time.perf_counter() - start:.1f}s)")
+
+    print("\n" + "=" * 96)
+    print(f"📥 Ingest Benchmark ({path})")
+    print("=" * 96)
+    print(f"   {'cache':<6}{'workers':>8}{'files':>8}{'time':>9}{'files/s':>10}"
+          f"{'stat':>9}{'stat/file':>10}{'scandir':>9}{'rchar MB':>10}{'disk MB':>9}{'peak RSS':>10}")
+
+    ctx = multiprocessing.get_context("spawn")
+    for workers in [int(w) for w in args.workers.split(",")]:
+        for cache in ("cold", "warm"):
+            with ctx.Pool(1) as pool:
+                r = pool.apply(run_ingest, (path, workers, cache == "cold"))
+            label = cache if cache == "warm" or r["evicted"] else "cold?"
+            files = max(r["files"], 1)
+            print(f"   {label:<6}{workers:>8}{r['files']:>8,}{r['elapsed']:>8.2f}s{r['files'] / r['elapsed']:>10.1f}"
+                  f"{r['stat']:>9,}{r['stat'] / files:>10.2f}{r['scandir']:>9,}"
+                  f"{r['rchar'] / 1e6:>10.1f}{r['read_bytes'] / 1e6:>9.1f}{r['rss_mb']:>8.1f}MB")
+
+    if tmp:
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Insert Benchmark
+================
+트랙 저장 속도 비교: 트랙마다 insert (트랙마다 커밋) vs insert_many (한 트랜잭션)
+
+- insert 반복: 행마다 트랜잭션 → 커밋(fsync)이 행 수만큼
+- insert_many: executemany + ON CONFLICT DO UPDATE, 커밋 한 번
+- insert_many 재실행: 모든 행이 충돌 → 갱신 경로 (ID 유지)
+
+insert 반복은 오래 걸리므로 --loop-max 이하 크기에서만 측정합니다.
+
+Usage:
+    python benchmarks/bench_insert.py
+    python benchmarks/bench_insert.py --sizes 1000,10000,100000 --loop-max 10000
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from db import models
+from db.repository import TrackRepository
+
+
+def make_tracks(count: int) -> list[dict]:
+    return [{
+        "file_path": f"/music/Artist {i % 300}/Album {i % 1000}/{i:06d}.flac",
+        "title": f"Track {i}", "artist": f"Artist {i % 300}", "album": f"Album {i % 1000}",
+        "folder_name": f"Album {i % 1000}", "track_number": i % 12 + 1, "duration_seconds": 200.0,
+        "sample_rate": 44100, "bit_depth": 16, "format": "FLAC", "file_size": 30_000_000, "last_modified": 1.0,
+    } for i in range(count)]
+
+
+def timed(work_dir: str, name: str, run) -> float:
+    """새 DB에서 실행 시간 측정"""
+    models.DB_PATH = Path(work_dir) / f"{name}.db"
+    models.create_tables()
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JuuxBox track insert benchmark")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="측정할 트랙 수 목록")
+    parser.add_argument("--loop-max", type=int, default=10000, help="insert 반복을 측정할 최대 크기")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 78)
+    print("📥 Insert Benchmark (rows/s)")
+    print("=" * 78)
+    print(f"   {'rows':>8}{'insert loop':>16}{'insert_many':>16}{'re-upsert':>16}{'speedup':>10}")
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        for size in [int(s) for s in args.sizes.split(",")]:
+            tracks = make_tracks(size)
+
+            loop = None
+            if size <= args.loop_max:
+                loop = timed(work_dir, f"loop{size}", lambda: [TrackRepository.insert(t) for t in tracks])
+
+            ids = []
+            many = timed(work_dir, f"many{size}", lambda: ids.extend(TrackRepository.insert_many(tracks)))
+            start = time.perf_counter()
+            assert TrackRepository.insert_many(tracks) == ids
+            again = time.perf_counter() - start
+
+            loop_rate = f"{size / loop:>14,.0f}/s" if loop else f"{'-':>16}"
+            speedup = f"{loop / many:>9.1f}×" if loop else f"{'-':>10}"
+            print(f"   {size:>8,}{loop_rate}{size / many:>14,.0f}/s{size / again:>14,.0f}/s{speedup}")
+        models.close_connections()
+
+
+if __name__ == "__main__":
+    main()
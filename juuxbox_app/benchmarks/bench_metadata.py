@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Stored Metadata Benchmark
+=========================
+재생 시 스트림 정보 얻기: 파일 태그 파싱(mutagen, 기존 AudioEngine.load) vs DB 트랙 행 (AudioInfo.from_track)
++ 스키마 마이그레이션 2(확장 메타데이터 컬럼) 적용/백필 시간
+
+- 가상 라이브러리(synth_library)를 스캔해 DB를 만든 뒤
+- 곡마다 mutagen.File / TrackRepository.get_by_file_path 시간을 비교하고
+- 확장 컬럼을 지운 버전 1 DB로 되돌려 create_tables(마이그레이션) → backfill_metadata 시간을 잽니다
+
+Usage:
+    python benchmarks/bench_metadata.py
+    python benchmarks/bench_metadata.py --files 5000 --batch 500
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import mutagen
+
+from audio.engine import AudioInfo
+from benchmarks.synth_library import generate_library
+from db import models
+from db.repository import BackfillRepository, TrackRepository
+from db.scanner import LibraryScanner
+
+
+def per_track_us(paths: list[str], probe) -> float:
+    """곡당 평균 시간 (µs)"""
+    start = time.perf_counter()
+    for path in paths:
+        probe(path)
+    return (time.perf_counter() - start) / len(paths) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JuuxBox stored metadata benchmark")
+    parser.add_argument("--files", type=int, default=2000, help="가상 라이브러리 트랙 수")
+    parser.add_argument("--batch", type=int, default=500, help="백필 배치 크기")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        root = Path(work_dir) / "music"
+        generate_library(root, args.files)
+        models.DB_PATH = Path(work_dir) / "bench.db"
+        models.create_tables()
+        LibraryScanner(workers=4).rescan(str(root))
+        paths = [t["file_path"] for t in TrackRepository.get_all()]
+
+        file_us = per_track_us(paths, lambda p: mutagen.File(p))
+        db_us = per_track_us(paths, lambda p: AudioInfo.from_track(TrackRepository.get_by_file_path(p)))
+
+        # 버전 1 DB로 되돌림
+        conn = models.connection()
+        for column in models.METADATA_COLUMNS:
+            conn.execute(f"ALTER TABLE tracks DROP COLUMN {column}")
+        conn.execute("UPDATE tracks SET year = NULL, disc_number = NULL")
+        conn.execute("PRAGMA user_version = 1")
+
+        start = time.perf_counter()
+        models.create_tables()
+        migrate_ms = (time.perf_counter() - start) * 1000
+        pending = BackfillRepository.pending()
+        start = time.perf_counter()
+        filled = LibraryScanner(batch_size=args.batch).backfill_metadata()
+        backfill_s = time.perf_counter() - start
+        models.close_connections()
+
+    print("\n" + "=" * 64)
+    print(f"🏷️  Stored Metadata Benchmark ({len(paths):,} tracks)")
+    print("=" * 64)
+    print(f"   {'stream info: mutagen.File':<36}{file_us:>10.0f}µs/track")
+    print(f"   {'stream info: DB row':<36}{db_us:>10.0f}µs/track  ({file_us / db_us:.1f}×)")
+    print(f"   {'migration (create_tables)':<36}{migrate_ms:>10.1f}ms")
+    print(f"   {'backfill':<36}{backfill_s:>10.2f}s  ({filled:,}/{pending:,} tracks, "
+          f"{filled / backfill_s:,.0f} tracks/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Track Page Benchmark
+====================
+전체 목록 첫 화면 비용 비교: get_all_tracks(전체 변환 + 직렬화, 기존) vs get_tracks_page(키셋 한 페이지)
+
+- 기존: TrackRepository.get_all → 트랙마다 _track_to_dict → 브리지로 JSON 전체 전송
+- 현재: TrackRepository.get_page 한 페이지 + 전체 곡 수, 다음 페이지는 커서로 이어 받음
+- 깊은 페이지(목록 중간)도 OFFSET 없이 커서 위치부터 읽으므로 첫 페이지와 비슷한 비용
+
+Usage:
+    python benchmarks/bench_pages.py
+    python benchmarks/bench_pages.py --tracks 100000 --page-size 200
+"""
+
+import sys
+import json
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api import JuuxBoxAPI
+from db import models
+from db.repository import TrackRepository
+
+
+def make_tracks(count: int) -> list[dict]:
+    tracks = []
+    for i in range(count):
+        album = i // 12
+        tracks.append({
+            "file_path": f"/music/{album // 4:05d}/{album:06d}/{i:07d}.flac",
+            "title": f"Track {i * 7919 % count}", "artist": f"Artist {album // 4:05d}",
+            "album": f"Album {album:06d}", "folder_name": f"Album {album:06d}", "track_number": i % 12 + 1,
+            "duration_seconds": 200.0, "sample_rate": 44100, "bit_depth": 16, "channels": 2, "format": "flac",
+        })
+    return tracks
+
+
+def to_bridge(tracks: list[dict]) -> str:
+    """API 응답 변환 + pywebview가 보내는 JSON 직렬화"""
+    return json.dumps([JuuxBoxAPI._track_to_dict(None, t) for t in tracks])
+
+
+def timed(func, repeat: int) -> float:
+    """가장 빠른 실행 시간 (ms)"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def cursor_at(sort: str, position: int, page_size: int) -> list:
+    """position 번째 트랙 직전까지 넘긴 커서 (깊은 페이지 측정용)"""
+    cursor = None
+    for _ in range(position // page_size):
+        _, cursor = TrackRepository.get_page(sort, cursor, page_size)
+    return cursor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JuuxBox track page benchmark")
+    parser.add_argument("--tracks", type=int, default=100000, help="DB에 채울 트랙 수")
+    parser.add_argument("--page-size", type=int, default=200, help="페이지 크기 (library.page_size)")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 횟수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        models.DB_PATH = Path(work_dir) / "bench.db"
+        models.create_tables()
+        TrackRepository.insert_many(make_tracks(args.tracks))
+
+        full_ms = timed(lambda: to_bridge(TrackRepository.get_all()), 2)
+        full_bytes = len(to_bridge(TrackRepository.get_all()))
+        rows = []
+        for sort in models.PAGE_SORTS:
+            first_ms = timed(lambda: (to_bridge(TrackRepository.get_page(sort, None, args.page_size)[0]),
+                                      TrackRepository.count()), args.repeat)
+            deep = cursor_at(sort, args.tracks // 2, args.page_size)
+            deep_ms = timed(lambda: to_bridge(TrackRepository.get_page(sort, deep, args.page_size)[0]),
+                            args.repeat)
+            queue_ms = timed(lambda: TrackRepository.get_ids(sort), args.repeat)
+            rows.append((sort, first_ms, deep_ms, queue_ms))
+        page_bytes = len(to_bridge(TrackRepository.get_page("artist", None, args.page_size)[0]))
+        models.close_connections()
+
+    print("\n" + "=" * 72)
+    print(f"📄 Track Page Benchmark ({args.tracks:,} tracks, page of {args.page_size})")
+    print("=" * 72)
+    print(f"   get_all_tracks (before): {full_ms:8.1f}ms  {full_bytes / 1e6:6.1f}MB")
+    print(f"   one page:                {'':>8}    {page_bytes / 1e3:6.1f}KB")
+    print(f"   {'sort':<10}{'first page+count':>18}{'middle page':>14}{'queue ids':>12}")
+    for sort, first_ms, deep_ms, queue_ms in rows:
+        print(f"   {sort:<10}{first_ms:>16.2f}ms{deep_ms:>12.2f}ms{queue_ms:>10.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
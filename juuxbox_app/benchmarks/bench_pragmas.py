@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+SQLite Profile Benchmark
+========================
+스캔(쓰기) 중 UI 조회 지연과 쓰기 속도 비교: SQLite 기본 설정 vs database 설정 기본값
+
+- sqlite default: rollback 저널, synchronous=FULL, 캐시 약 2MB, mmap 없음
+- juuxbox: WAL, synchronous=NORMAL, 캐시 64MB, mmap 256MB, temp_store=MEMORY
+
+쓰기 스레드가 기존 트랙을 insert_many 배치(스캔 배치 크기)로 계속 다시 저장하는 동안
+(재스캔과 같은 갱신 부하, 테이블 크기는 일정, 배치 사이는 태그 파싱 시간만큼 쉼 - --scan-rate)
+조회 스레드가 UI 쿼리(get_albums / get_by_id)를 반복하며 지연 시간을 잽니다.
+
+Usage:
+    python benchmarks/bench_pragmas.py
+    python benchmarks/bench_pragmas.py --tracks 50000 --seconds 10
+"""
+
+import sys
+import time
+import random
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from db import models
+from db.repository import TrackRepository
+
+PROFILES = {
+    "sqlite default": {"journal_mode": "delete", "synchronous": "full", "cache_size_mb": 2,
+                       "mmap_size_mb": 0, "temp_store": "default"},
+    "juuxbox": models.DEFAULT_PRAGMAS,
+}
+
+
+def make_tracks(start: int, count: int) -> list[dict]:
+    return [{
+        "file_path": f"/music/Artist {i % 300}/Album {i % 1000}/{i:07d}.flac",
+        "title": f"Track {i}", "artist": f"Artist {i % 300}", "album": f"Album {i % 1000}",
+        "folder_name": f"Album {i % 1000}", "track_number": i % 12 + 1,
+        "duration_seconds": 200.0, "file_size": 30_000_000, "last_modified": 1.0,
+    } for i in range(start, start + count)]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+def run_profile(work_dir: str, name: str, tracks: int, seconds: float, batch: int, scan_rate: float) -> dict:
+    models.DB_PATH = Path(work_dir) / f"{name.replace(' ', '_')}.db"
+    models.configure(PROFILES[name])
+    models.create_tables()
+    TrackRepository.insert_many(make_tracks(0, tracks))
+
+    stop = threading.Event()
+    written = [0]
+
+    def writer():
+        offset = 0
+        interval = batch / scan_rate if scan_rate else 0.0
+        while not stop.is_set():
+            started = time.perf_counter()
+            TrackRepository.insert_many(make_tracks(offset, batch))
+            offset = (offset + batch) % max(tracks - batch, 1)
+            written[0] += batch
+            stop.wait(max(0.0, interval - (time.perf_counter() - started)))
+        models.close_connections()
+
+    album_ms, lookup_ms = [], []
+    rng = random.Random(1)
+    thread = threading.Thread(target=writer)
+    start = time.perf_counter()
+    thread.start()
+    while time.perf_counter() - start < seconds:
+        t = time.perf_counter()
+        TrackRepository.get_albums()
+        album_ms.append((time.perf_counter() - t) * 1000)
+        t = time.perf_counter()
+        TrackRepository.get_by_id(rng.randint(1, tracks))
+        lookup_ms.append((time.perf_counter() - t) * 1000)
+    stop.set()
+    thread.join()
+    elapsed = time.perf_counter() - start
+    models.close_connections()
+
+    return {
+        "albums_p50": percentile(album_ms, 0.5), "albums_p99": percentile(album_ms, 0.99),
+        "albums_max": max(album_ms), "lookup_p99": percentile(lookup_ms, 0.99),
+        "queries": len(album_ms), "writes": written[0] / elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JuuxBox SQLite profile benchmark")
+    parser.add_argument("--tracks", type=int, default=20000, help="미리 채울 트랙 수")
+    parser.add_argument("--seconds", type=float, default=5.0, help="프로필당 측정 시간")
+    parser.add_argument("--batch", type=int, default=500, help="쓰기 배치 크기")
+    parser.add_argument("--scan-rate", type=float, default=1500, help="스캔 속도(files/s), 0이면 쉬지 않고 씀")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 92)
+    print(f"🗄️  SQLite Profile Benchmark ({args.tracks:,} tracks, scan batches of {args.batch} "
+          f"at {args.scan_rate:,.0f} files/s)")
+    print("=" * 92)
+    print(f"   {'profile':<16}{'albums p50':>12}{'albums p99':>12}{'albums max':>12}"
+          f"{'by_id p99':>12}{'queries':>10}{'writes/s':>12}")
+    with tempfile.TemporaryDirectory() as work_dir:
+        for name in PROFILES:
+            r = run_profile(work_dir, name, args.tracks, args.seconds, args.batch, args.scan_rate)
+            print(f"   {name:<16}{r['albums_p50']:>10.1f}ms{r['albums_p99']:>10.1f}ms{r['albums_max']:>10.1f}ms"
+                  f"{r['lookup_p99']:>10.2f}ms{r['queries']:>10,}{r['writes']:>12,.0f}")
+    models.configure(models.DEFAULT_PRAGMAS)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Repository Benchmark
+====================
+저장소 메서드 호출당 시간 비교: 호출마다 연결 열기 vs 스레드별 지속 연결
+
+- per-call: 호출마다 sqlite3.connect → 스키마 읽기 → 문장 준비 → 닫기 (기존 방식)
+- persistent: 스레드 연결 재사용, 준비된 문장 캐시 유지 (db.models.connection)
+
+임시 DB에 트랙을 채운 뒤 UI/재생 경로에서 자주 부르는 메서드를 반복 호출합니다.
+
+Usage:
+    python benchmarks/bench_repository.py
+    python benchmarks/bench_repository.py --tracks 50000 --calls 5000
+"""
+
+import sys
+import time
+import random
+import argparse
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from db import models
+from db import repository
+from db.repository import TrackRepository
+
+
+@contextmanager
+def connect_per_call():
+    """저장소가 호출마다 새 연결을 쓰도록 교체 (참조가 사라지면 닫힘)"""
+    original = models.connection
+    fresh = lambda: models._open_connection(models.DB_PATH)
+    models.connection = repository.connection = fresh
+    try:
+        yield
+    finally:
+        models.connection = repository.connection = original
+
+
+def fill(tracks: int):
+    added = [{
+        "file_path": f"/music/Artist {i % 300}/Album {i % 1000}/{i:06d}.flac",
+        "title": f"Track {i}", "artist": f"Artist {i % 300}", "album": f"Album {i % 1000}",
+        "folder_name": f"Album {i % 1000}", "track_number": i % 12 + 1,
+        "duration_seconds": 200.0, "file_size": 30_000_000, "last_modified": 1.0,
+    } for i in range(tracks)]
+    TrackRepository.apply_scan(added, [], [])
+    return [t["file_path"] for t in added]
+
+
+def measure(paths: list[str], calls: int) -> dict[str, float]:
+    """메서드별 호출당 시간 (µs)"""
+    rng = random.Random(1)
+    ids = [rng.randint(1, len(paths)) for _ in range(calls)]
+    picks = [rng.choice(paths) for _ in range(calls)]
+    cases = {
+        "get_by_id": lambda i: TrackRepository.get_by_id(ids[i]),
+        "get_by_file_path": lambda i: TrackRepository.get_by_file_path(picks[i]),
+        "exists_by_file_path": lambda i: TrackRepository.exists_by_file_path(picks[i]),
+        "get_ids_by_file_paths(20)": lambda i: TrackRepository.get_ids_by_file_paths(picks[i:i + 20]),
+        "get_tracks_by_album": lambda i: TrackRepository.get_tracks_by_album(i % 1000 + 1),
+        "insert": lambda i: TrackRepository.insert({"file_path": f"/new/{time.perf_counter_ns()}.flac"}),
+    }
+    results = {}
+    for name, call in cases.items():
+        n = calls if name != "insert" else calls // 10
+        start = time.perf_counter()
+        for i in range(n):
+            call(i)
+        results[name] = (time.perf_counter() - start) / n * 1e6
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JuuxBox repository benchmark")
+    parser.add_argument("--tracks", type=int, default=10000, help="DB에 채울 트랙 수")
+    parser.add_argument("--calls", type=int, default=2000, help="메서드별 호출 수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        models.DB_PATH = Path(tmp) / "bench.db"
+        models.create_tables()
+        paths = fill(args.tracks)
+
+        with connect_per_call():
+            before = measure(paths, args.calls)
+        after = measure(paths, args.calls)
+        models.close_connections()
+
+    print("\n" + "=" * 72)
+    print(f"🗄️  Repository Benchmark ({args.tracks:,} tracks, {args.calls:,} calls)")
+    print("=" * 72)
+    print(f"   {'method':<28}{'per-call':>12}{'persistent':>12}{'speedup':>10}")
+    for name in before:
+        print(f"   {name:<28}{before[name]:>10.1f}µs{after[name]:>10.1f}µs{before[name] / after[name]:>9.1f}×")
+
+
+if __name__ == "__main__":
+    main()
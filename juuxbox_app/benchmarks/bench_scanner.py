@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Scanner Benchmark
+=================
+LibraryScanner.scan_folder 처리량(파일/초)을 작업자 수별로 비교
+
+폴더를 지정하지 않으면 임시 폴더에 짧은 WAV 파일을 만들어 측정합니다.
+두 번째 실행부터는 OS 파일 캐시가 데워진 상태이므로
+NAS/HDD의 실제 체감 차이는 --path로 실제 라이브러리를 지정해 확인하세요.
+
+Usage:
+    python benchmarks/bench_scanner.py
+    python benchmarks/bench_scanner.py --path D:/Music --workers 1,4,8,16
+    python benchmarks/bench_scanner.py --files 2000 --processes
+    python benchmarks/bench_scanner.py --files 20000 --incremental
+"""
+
+import sys
+import time
+import wave
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from db import models
+from db.scanner import LibraryScanner
+
+
+def make_library(root: Path, count: int, per_album: int = 12):
+    """앨범 폴더별 짧은 WAV 파일 생성"""
+    silence = b"\x00\x00" * 2 * 4410  # 0.1초 스테레오
+    for i in range(count):
+        album = root / f"Artist {i // (per_album * 5)}" / f"Album {i // per_album}"
+        album.mkdir(parents=True, exist_ok=True)
+        with wave.open(str(album / f"{i % per_album + 1:02d} Track.wav"), "wb") as f:
+            f.setnchannels(2)
+            f.setsampwidth(2)
+            f.setframerate(44100)
+            f.writeframes(silence)
+
+
+def bench(path: str, workers: int, use_processes: bool, ordered: bool) -> tuple[int, float]:
+    scanner = LibraryScanner(workers=workers, use_processes=use_processes, ordered=ordered)
+    start = time.perf_counter()
+    tracks = scanner.scan_folder(path)
+    return len(tracks), time.perf_counter() - start
+
+
+def bench_incremental(path: str, workers: int):
+    """임시 DB에 첫 스캔 후 변경 없는 재스캔 시간 측정"""
+    with tempfile.TemporaryDirectory() as db_dir:
+        models.DB_PATH = Path(db_dir) / "bench.db"
+        models.create_tables()
+        scanner = LibraryScanner(workers=workers)
+        for label in ("첫 스캔", "재스캔 (변경 없음)"):
+            start = time.perf_counter()
+            result = scanner.rescan(path)
+            elapsed = time.perf_counter() - start
+            print(f"   {label:<14} {elapsed:7.2f}s  {result.summary()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JuuxBox scanner benchmark")
+    parser.add_argument("--path", help="스캔할 음악 폴더 (없으면 임시 WAV 라이브러리 생성)")
+    parser.add_argument("--files", type=int, default=1000, help="생성할 파일 수")
+    parser.add_argument("--workers", default="1,2,4,8", help="비교할 작업자 수 목록")
+    parser.add_argument("--processes", action="store_true", help="프로세스 풀 사용")
+    parser.add_argument("--unordered", action="store_true", help="완료 순서로 결과 수집")
+    parser.add_argument("--incremental", action="store_true", help="증분 재스캔 시간 측정")
+    args = parser.parse_args()
+
+    tmp = None
+    path = args.path
+    if not path:
+        tmp = tempfile.TemporaryDirectory()
+        path = tmp.name
+        make_library(Path(path), args.files)
+
+    print("\n" + "=" * 60)
+    print(f"🔍 Scanner Benchmark ({path}, {'process' if args.processes else 'thread'} pool)")
+    print("=" * 60)
+
+    if args.incremental:
+        bench_incremental(path, int(args.workers.split(",")[-1]))
+        if tmp:
+            tmp.cleanup()
+        return
+
+    baseline = None
+    for workers in [int(w) for w in args.workers.split(",")]:
+        count, elapsed = bench(path, workers, args.processes, not args.unordered)
+        rate = count / elapsed if elapsed else 0.0
+        baseline = baseline or rate
+        print(f"   workers={workers:<3} {count:6d}개  {elapsed:7.2f}s  {rate:8.1f} files/s  (x{rate / baseline:.2f})")
+
+    if tmp:
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
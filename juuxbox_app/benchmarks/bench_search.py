@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Search Benchmark
+================
+트랙 검색 시간 비교: 전체 트랙 로드 + 부분 문자열 필터(기존 웹 UI) vs LIKE 검색 vs FTS5 색인 검색
+
+- 기존: get_all_tracks로 전체를 받은 뒤 title/artist/album에 검색어가 들어 있는지 하나씩 확인
+- LIKE: FTS5가 없는 SQLite에서 쓰는 대체 경로 (전체 스캔)
+- FTS5: tracks_fts 색인 (접두어 검색, bm25 순위, 한 페이지만 반환)
+
+Usage:
+    python benchmarks/bench_search.py
+    python benchmarks/bench_search.py --tracks 100000 --repeat 5
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from db import models
+from db import repository
+from db.repository import TrackRepository
+
+QUERIES = ("love", "artist 01", "moonlight sonata", "밤", "zzz")
+
+WORDS = ("love", "night", "moon", "light", "dance", "heart", "rain", "summer", "blue", "road",
+         "sonata", "dream", "fire", "home", "star", "밤", "사랑", "노래", "바다", "하늘")
+
+
+def make_tracks(count: int) -> list[dict]:
+    tracks = []
+    for i in range(count):
+        album = i // 12
+        words = [WORDS[(i * 7 + k * 3) % len(WORDS)] for k in range(1 + i % 3)]
+        tracks.append({
+            "file_path": f"/music/{album // 4:05d}/{album:06d}/{i:07d}.flac",
+            "title": " ".join(words).title(), "artist": f"Artist {album // 4:05d}",
+            "album": f"Album {album:06d} {WORDS[album % len(WORDS)]}", "genre": ("Rock", "Jazz", "Pop")[album % 3],
+            "folder_name": f"Album {album:06d}", "track_number": i % 12 + 1, "duration_seconds": 200.0,
+        })
+    return tracks
+
+
+def client_filter(query: str) -> list[dict]:
+    """기존 웹 UI: 전체 로드 후 부분 문자열 필터"""
+    query = query.lower()
+    return [t for t in TrackRepository.get_all()
+            if query in (t["title"] or "").lower() or query in (t["artist"] or "").lower()
+            or query in (t["album"] or "").lower()]
+
+
+def timed(func, repeat: int) -> tuple[float, int]:
+    """가장 빠른 실행 시간 (ms), 결과 수"""
+    best, count = float("inf"), 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = len(func())
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JuuxBox search benchmark")
+    parser.add_argument("--tracks", type=int, default=100000, help="DB에 채울 트랙 수")
+    parser.add_argument("--repeat", type=int, default=5, help="검색어별 반복 횟수")
+    parser.add_argument("--limit", type=int, default=200, help="한 번에 받는 검색 결과 수 (웹 UI와 같음)")
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        models.DB_PATH = Path(work_dir) / "bench.db"
+        models.create_tables()
+        start = time.perf_counter()
+        TrackRepository.insert_many(make_tracks(args.tracks))
+        insert_s = time.perf_counter() - start
+
+        for query in QUERIES:
+            old_ms, _ = timed(lambda: client_filter(query), 1)
+            repository.FTS5_AVAILABLE = False
+            like_ms, _ = timed(lambda: TrackRepository.search(query, args.limit)[0], args.repeat)
+            repository.FTS5_AVAILABLE = models.FTS5_AVAILABLE
+            fts_ms, _ = timed(lambda: TrackRepository.search(query, args.limit)[0], args.repeat)
+            total = TrackRepository.search(query, 1)[1]
+            rows.append((query, total, old_ms, like_ms, fts_ms))
+        models.close_connections()
+
+    print("\n" + "=" * 76)
+    print(f"🔎 Search Benchmark ({args.tracks:,} tracks, page of {args.limit}, insert {insert_s:.1f}s)")
+    print("=" * 76)
+    print(f"   {'query':<20}{'matches':>9}{'load+filter':>14}{'LIKE':>11}{'FTS5':>11}")
+    for query, total, old_ms, like_ms, fts_ms in rows:
+        print(f"   {query:<20}{total:>9,}{old_ms:>12.1f}ms{like_ms:>9.1f}ms{fts_ms:>9.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
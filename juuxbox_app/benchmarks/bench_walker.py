@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Walker Benchmark
+================
+Path.rglob + 확장자 필터(기존 방식)와 os.scandir 기반 walk_audio_files 탐색 시간 비교
+
+폴더를 지정하지 않으면 임시 폴더에 음원/이미지/cue/log가 섞인
+중첩 폴더 구조(기본 10만 항목)를 만들어 측정합니다.
+내용은 비어 있으므로 순수 디렉토리 탐색 + stat 비용만 비교됩니다.
+
+Usage:
+    python benchmarks/bench_walker.py
+    python benchmarks/bench_walker.py --entries 200000 --repeat 5
+    python benchmarks/bench_walker.py --path D:/Music
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from db.scanner import AUDIO_EXTENSIONS
+from db.walker import walk_audio_files
+
+# 앨범 폴더 하나의 구성 (음원 12 + 부속 파일 4 + 스캔 폴더 1)
+ALBUM_EXTRAS = ("cover.jpg", "folder.jpg", "album.cue", "rip.log")
+
+
+def make_tree(root: Path, entries: int) -> int:
+    """아티스트/앨범/(CD) 중첩 폴더에 빈 파일 생성 → 생성한 음원 수"""
+    per_album = 12 + len(ALBUM_EXTRAS) + 3
+    audio = 0
+    for i in range(max(1, entries // per_album)):
+        album = root / f"Artist {i // 8:04d}" / f"Album {i:05d}"
+        if i % 5 == 0:
+            album = album / "CD1"
+        (album / "Scans").mkdir(parents=True)
+        (album / "Scans" / "back.jpg").touch()
+        for n in range(12):
+            (album / f"{n + 1:02d} Track.{('flac', 'mp3', 'm4a')[n % 3]}").touch()
+        for name in ALBUM_EXTRAS:
+            (album / name).touch()
+        audio += 12
+    return audio
+
+
+def walk_rglob(path: str) -> int:
+    """기존 방식: rglob → Path.suffix 필터 → 파일마다 stat"""
+    count = 0
+    for f in Path(path).rglob("*"):
+        if f.suffix.lower() in AUDIO_EXTENSIONS:
+            f.stat()
+            count += 1
+    return count
+
+
+def walk_scandir(path: str) -> int:
+    return sum(1 for _ in walk_audio_files(path, AUDIO_EXTENSIONS))
+
+
+def best_of(fn, path: str, repeat: int) -> tuple[int, float]:
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = fn(path)
+        best = min(best, time.perf_counter() - start)
+    return count, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JuuxBox library walker benchmark")
+    parser.add_argument("--path", help="탐색할 음악 폴더 (없으면 임시 폴더 생성)")
+    parser.add_argument("--entries", type=int, default=100_000, help="생성할 항목 수 (파일 + 폴더)")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (최솟값 사용)")
+    args = parser.parse_args()
+
+    tmp = None
+    path = args.path
+    if not path:
+        tmp = tempfile.TemporaryDirectory()
+        path = tmp.name
+        audio = make_tree(Path(path), args.entries)
+        print(f"   임시 트리 생성: 약 {args.entries:,}개 항목, 음원 {audio:,}개")
+
+    print("\n" + "=" * 60)
+    print(f"📂 Walker Benchmark ({path})")
+    print("=" * 60)
+
+    baseline = None
+    for label, fn in (("rglob + suffix", walk_rglob), ("walk_audio_files", walk_scandir)):
+        count, elapsed = best_of(fn, path, args.repeat)
+        baseline = baseline or elapsed
+        print(f"   {label:<18} {count:8,}개  {elapsed:7.3f}s  (x{baseline / elapsed:.2f})")
+
+    if tmp:
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Synthetic Library Generator
+===========================
+스캐너 측정용 가상 음악 라이브러리 생성
+
+- FLAC / MP3 / M4A / WAV (앨범 단위로 형식 결정), 오디오 데이터는 거의 없이 헤더와 태그만
+- 아티스트/앨범/(CD1, CD2) 중첩 폴더, 트랙 번호/장르/연도 등 실제와 비슷한 태그
+- 내장 커버 / 폴더 커버(folder.jpg, cover.jpg 등) / 커버 없음 앨범 혼합
+- 한글 태그 일부는 CP949 바이트가 Latin-1로 저장된 "깨진" 형태 (스캐너의 인코딩 복구 경로)
+- Music_Sample의 이미지가 있으면 커버 원본으로 사용
+
+같은 --seed면 같은 라이브러리가 만들어집니다.
+
+Usage:
+    python benchmarks/synth_library.py D:/tmp/synth --files 5000
+    python benchmarks/synth_library.py /tmp/synth --files 20000 --seed 7 --cover-kb 32
+"""
+
+import io
+import random
+import struct
+import sys
+import wave
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from mutagen.flac import FLAC, Picture
+from mutagen.id3 import APIC, ID3, TALB, TCON, TDRC, TIT2, TPE1, TPE2, TRCK
+from mutagen.mp4 import MP4, MP4Cover
+from mutagen.wave import WAVE
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+SAMPLE_DIR = Path(__file__).parent.parent.parent / "Music_Sample"
+
+# 형식 비율 (앨범 단위)
+FORMAT_WEIGHTS = {"flac": 40, "mp3": 30, "m4a": 20, "wav": 10}
+# 커버 유형 비율: 내장 / 폴더 이미지 / 없음
+COVER_WEIGHTS = {"embedded": 40, "folder": 35, "none": 25}
+FOLDER_COVER_NAMES = ("folder.jpg", "cover.jpg", "Front.JPG", "AlbumArt.png", "scan_01.jpg")
+
+GENRES = ("Pop", "Rock", "Jazz", "Classical", "K-Pop", "Ballad", "Hip-Hop", "Electronic", "OST")
+WORDS = ("Blue", "Night", "River", "Light", "Echo", "Summer", "Glass", "Paper", "Moon", "Road",
+         "Silent", "Golden", "Winter", "City", "Dream", "Ocean", "Fire", "Rain", "Star", "Home")
+KOREAN_WORDS = ("봄날", "바다", "그대", "노을", "새벽", "하늘", "기억", "여름", "별빛", "우리",
+                "사랑", "거리", "꽃잎", "바람", "편지", "시간", "마음", "겨울", "달빛", "노래")
+
+# 오디오 스트림 정보
+SAMPLE_RATE = 44100
+MP3_FRAME = bytes([0xFF, 0xFB, 0x90, 0x64])  # MPEG-1 Layer III, 128kbps, 44.1kHz
+MP3_FRAME_SIZE = 417
+MP3_FRAMES = 20
+
+
+def mangle_cp949(text: str) -> str:
+    """CP949로 인코딩된 바이트를 Latin-1로 잘못 읽은 문자열 (오래된 ID3 태그에서 흔함)"""
+    return text.encode("cp949").decode("latin-1")
+
+
+# ===== 오디오 파일 =====
+
+def _atom(name: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I4s", 8 + len(payload), name) + payload
+
+
+def _full_atom(name: bytes, payload: bytes, flags: int = 0) -> bytes:
+    return _atom(name, struct.pack(">I", flags) + payload)
+
+
+def _descriptor(tag: int, payload: bytes) -> bytes:
+    return bytes([tag, len(payload)]) + payload
+
+
+def write_flac(path: Path, seconds: int, bit_depth: int, sample_rate: int):
+    """STREAMINFO 블록만 있는 FLAC"""
+    info = struct.pack(">HH", 4096, 4096) + b"\0" * 6
+    info += ((sample_rate << 44) | (1 << 41) | ((bit_depth - 1) << 36)
+             | (sample_rate * seconds)).to_bytes(8, "big") + b"\0" * 16
+    path.write_bytes(b"fLaC" + bytes([0x80]) + len(info).to_bytes(3, "big") + info)
+
+
+def write_mp3(path: Path, seconds: int):
+    """Xing 헤더(전체 프레임 수)가 있는 무음 MP3 프레임 몇 개"""
+    total_frames = seconds * SAMPLE_RATE // 1152
+    xing = MP3_FRAME + b"\0" * 32 + b"Xing" + struct.pack(">II", 1, total_frames)
+    first = xing + b"\0" * (MP3_FRAME_SIZE - len(xing))
+    path.write_bytes(first + (MP3_FRAME + b"\0" * (MP3_FRAME_SIZE - 4)) * (MP3_FRAMES - 1))
+
+
+def write_m4a(path: Path, seconds: int):
+    """AAC 오디오 트랙 헤더만 있는 M4A (샘플 데이터 없음)"""
+    duration = SAMPLE_RATE * seconds
+    mvhd = _full_atom(b"mvhd", struct.pack(">IIII", 0, 0, SAMPLE_RATE, duration)
+                      + b"\x00\x01\x00\x00\x01\x00" + b"\0" * 70 + struct.pack(">I", 2))
+    mdhd = _full_atom(b"mdhd", struct.pack(">IIIIHH", 0, 0, SAMPLE_RATE, duration, 0x55C4, 0))
+    hdlr = _full_atom(b"hdlr", b"\0" * 4 + b"soun" + b"\0" * 12 + b"SoundHandler\0")
+    decoder_config = _descriptor(4, bytes([0x40, 0x15]) + b"\0\0\0"
+                                 + struct.pack(">II", 256000, 256000) + _descriptor(5, b"\x12\x10"))
+    esds = _full_atom(b"esds", _descriptor(3, struct.pack(">HB", 1, 0) + decoder_config + _descriptor(6, b"\x02")))
+    mp4a = _atom(b"mp4a", b"\0" * 6 + struct.pack(">H", 1) + b"\0" * 8
+                 + struct.pack(">HHHHI", 2, 16, 0, 0, SAMPLE_RATE << 16) + esds)
+    stbl = _atom(b"stbl", _full_atom(b"stsd", struct.pack(">I", 1) + mp4a)
+                 + _full_atom(b"stts", struct.pack(">I", 0)) + _full_atom(b"stsc", struct.pack(">I", 0))
+                 + _full_atom(b"stsz", struct.pack(">II", 0, 0)) + _full_atom(b"stco", struct.pack(">I", 0)))
+    dinf = _atom(b"dinf", _full_atom(b"dref", struct.pack(">I", 1) + _full_atom(b"url ", b"", flags=1)))
+    minf = _atom(b"minf", _full_atom(b"smhd", b"\0" * 4) + dinf + stbl)
+    trak = _atom(b"trak", _full_atom(b"tkhd", b"\0" * 80, flags=7) + _atom(b"mdia", mdhd + hdlr + minf))
+    path.write_bytes(_atom(b"ftyp", b"M4A \0\0\0\0M4A mp42isom") + _atom(b"moov", mvhd + trak) + _atom(b"mdat", b""))
+
+
+def write_wav(path: Path):
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(2)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(b"\0\0" * 2 * 441)
+
+
+# ===== 태그 =====
+
+def tag_file(path: Path, fmt: str, tags: dict, artwork: bytes = None):
+    """형식별 태그 + 내장 커버 기록"""
+    if fmt == "flac":
+        audio = FLAC(str(path))
+        for key in ("title", "artist", "album", "albumartist", "genre", "date"):
+            audio[key] = tags[key]
+        audio["tracknumber"] = f"{tags['track']}/{tags['total']}"
+        if artwork:
+            picture = Picture()
+            picture.type = 3
+            picture.mime = "image/jpeg"
+            picture.data = artwork
+            audio.add_picture(picture)
+        audio.save()
+    elif fmt == "m4a":
+        audio = MP4(str(path))
+        audio["\xa9nam"] = [tags["title"]]
+        audio["\xa9ART"] = [tags["artist"]]
+        audio["\xa9alb"] = [tags["album"]]
+        audio["aART"] = [tags["albumartist"]]
+        audio["\xa9gen"] = [tags["genre"]]
+        audio["\xa9day"] = [tags["date"]]
+        audio["trkn"] = [(tags["track"], tags["total"])]
+        if artwork:
+            audio["covr"] = [MP4Cover(artwork, MP4Cover.FORMAT_JPEG)]
+        audio.save()
+    else:
+        # MP3 / WAV: ID3v2.3 (깨진 한글 태그는 Latin-1 인코딩으로 저장되어 있는 경우가 많음)
+        encoding = 0 if tags["mangled"] else 3
+        frames = [
+            TIT2(encoding=encoding, text=tags["title"]),
+            TPE1(encoding=encoding, text=tags["artist"]),
+            TALB(encoding=encoding, text=tags["album"]),
+            TPE2(encoding=encoding, text=tags["albumartist"]),
+            TCON(encoding=3, text=tags["genre"]),
+            TDRC(encoding=3, text=tags["date"]),
+            TRCK(encoding=3, text=f"{tags['track']}/{tags['total']}"),
+        ]
+        if artwork:
+            frames.append(APIC(encoding=3, mime="image/jpeg", type=3, desc="", data=artwork))
+        if fmt == "wav":
+            # WAV는 RIFF "id3 " 청크에 저장
+            audio = WAVE(str(path))
+            audio.add_tags()
+            for frame in frames:
+                audio.tags.add(frame)
+            audio.save(v2_version=3)
+        else:
+            id3 = ID3()
+            for frame in frames:
+                id3.add(frame)
+            id3.save(str(path), v2_version=3)
+
+
+# ===== 커버 =====
+
+def load_cover_seeds(cover_kb: int) -> list[bytes]:
+    """Music_Sample 이미지 (Pillow가 있으면 500px JPEG로 축소, 없으면 앞부분만 사용)"""
+    seeds = []
+    for path in sorted(SAMPLE_DIR.glob("*.jpg")):
+        data = path.read_bytes()
+        if PIL_AVAILABLE:
+            with Image.open(io.BytesIO(data)) as image:
+                image = image.convert("RGB")
+                image.thumbnail((500, 500))
+                buffer = io.BytesIO()
+                image.save(buffer, "JPEG", quality=85)
+                data = buffer.getvalue()
+        seeds.append(data[:cover_kb * 1024])
+    if not seeds:
+        rng = random.Random(0)
+        seeds = [b"\xff\xd8\xff\xe0" + rng.randbytes(cover_kb * 1024 - 4)]
+    return seeds
+
+
+def album_cover(seeds: list[bytes], album_index: int) -> bytes:
+    """앨범마다 내용이 다른 커버 (앨범 내에서는 같은 이미지 → 저장소 중복 제거 확인용)"""
+    seed = seeds[album_index % len(seeds)]
+    return seed + b"\xff\xfe" + album_index.to_bytes(4, "big") + b"\xff\xd9"
+
+
+# ===== 라이브러리 =====
+
+def _name(rng: random.Random, korean: bool, words: int = 2) -> str:
+    pool = KOREAN_WORDS if korean else WORDS
+    return " ".join(rng.choice(pool) for _ in range(words))
+
+
+def generate_library(root: Path, files: int, seed: int = 1, cover_kb: int = 48) -> dict:
+    """
+    가상 라이브러리 생성
+
+    Returns:
+        {"files", "albums", "formats", "covers", "mangled"} 생성 통계
+    """
+    rng = random.Random(seed)
+    seeds = load_cover_seeds(cover_kb)
+    stats = {"files": 0, "albums": 0, "formats": dict.fromkeys(FORMAT_WEIGHTS, 0),
+             "covers": dict.fromkeys(COVER_WEIGHTS, 0), "mangled": 0}
+
+    artist_index = 0
+    while stats["files"] < files:
+        korean = rng.random() < 0.35
+        artist = _name(rng, korean) + f" {artist_index}"
+        artist_index += 1
+        for _ in range(rng.randint(1, 4)):
+            if stats["files"] >= files:
+                break
+            album_index = stats["albums"]
+            stats["albums"] += 1
+            fmt = rng.choices(list(FORMAT_WEIGHTS), list(FORMAT_WEIGHTS.values()))[0]
+            cover_kind = rng.choices(list(COVER_WEIGHTS), list(COVER_WEIGHTS.values()))[0]
+            # 한글 아티스트의 MP3/WAV 절반은 깨진 태그
+            mangled = korean and fmt in ("mp3", "wav") and rng.random() < 0.5
+            year = rng.randint(1975, 2025)
+            album = _name(rng, korean, 3)
+            album_dir = root / artist / f"{year} - {album}"
+            discs = 2 if rng.random() < 0.1 else 1
+            total = min(rng.randint(8, 14), files - stats["files"])
+            artwork = album_cover(seeds, album_index)
+
+            if cover_kind == "folder":
+                album_dir.mkdir(parents=True, exist_ok=True)
+                (album_dir / rng.choice(FOLDER_COVER_NAMES)).write_bytes(artwork)
+
+            for track in range(1, total + 1):
+                disc = 1 + (track - 1) * discs // total
+                folder = album_dir / f"CD{disc}" if discs > 1 else album_dir
+                folder.mkdir(parents=True, exist_ok=True)
+                title = _name(rng, korean, rng.randint(1, 3))
+                path = folder / f"{track:02d} {title}.{fmt}"
+                seconds = rng.randint(120, 420)
+
+                if fmt == "flac":
+                    write_flac(path, seconds, rng.choice((16, 24)), rng.choice((44100, 96000)))
+                elif fmt == "mp3":
+                    write_mp3(path, seconds)
+                elif fmt == "m4a":
+                    write_m4a(path, seconds)
+                else:
+                    write_wav(path)
+
+                tags = {
+                    "title": title, "artist": artist, "album": album, "albumartist": artist,
+                    "genre": rng.choice(GENRES), "date": str(year),
+                    "track": track, "total": total, "mangled": mangled,
+                }
+                if mangled:
+                    for key in ("title", "artist", "album", "albumartist"):
+                        tags[key] = mangle_cp949(tags[key])
+                tag_file(path, fmt, tags, artwork if cover_kind == "embedded" else None)
+
+                stats["files"] += 1
+                stats["formats"][fmt] += 1
+                stats["mangled"] += mangled
+            stats["covers"][cover_kind] += 1
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JuuxBox synthetic library generator")
+    parser.add_argument("output", help="생성할 폴더")
+    parser.add_argument("--files", type=int, default=2000, help="트랙 수")
+    parser.add_argument("--seed", type=int, default=1, help="난수 시드 (같으면 같은 라이브러리)")
+    parser.add_argument("--cover-kb", type=int, default=48, help="커버 이미지 최대 크기(KB)")
+    args = parser.parse_args()
+
+    stats = generate_library(Path(args.output), args.files, args.seed, args.cover_kb)
+    print(f"✅ {stats['files']:,}개 트랙, {stats['albums']:,}개 앨범 → {args.output}")
+    print(f"   형식: {stats['formats']}")
+    print(f"   커버(앨범): {stats['covers']}")
+    print(f"   깨진 한글 태그 트랙: {stats['mangled']:,}개")
+
+
+if __name__ == "__main__":
+    main()
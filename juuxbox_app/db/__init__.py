@@ -4,8 +4,8 @@ Database Module
 SQLite 기반 음원 메타데이터 및 설정 저장
 """
 
-from .models import create_tables
+from .models import close_connections, create_tables
 from .repository import TrackRepository, PlaylistRepository
 from .scanner import LibraryScanner
 
-__all__ = ["create_tables", "TrackRepository", "PlaylistRepository", "LibraryScanner"]
+__all__ = ["create_tables", "close_connections", "TrackRepository", "PlaylistRepository", "LibraryScanner"]
@@ -0,0 +1,195 @@
+"""
+Artwork Store
+=============
+내용 주소 기반 앨범아트 저장소
+
+- 이미지 내용의 SHA-1 해시로 저장 → 같은 이미지는 앨범/트랙 수와 관계없이 한 번만 저장
+- 저장 시 고정 크기 썸네일(64/256/600px) 생성 (Pillow 필요, 없으면 원본만 사용)
+- 트랙이 참조하는 수(ref_count)는 DB 트리거로 관리, 참조가 없는 이미지는 collect_garbage()로 정리
+  (최근에 저장/재사용된 이미지는 유예 - 아직 커밋되지 않은 스캔 배치가 참조할 수 있음)
+
+저장 구조:
+    ~/.juuxbox/artwork/ab/abcdef....jpg       원본
+    ~/.juuxbox/artwork/ab/abcdef..._256.jpg   썸네일
+"""
+
+import hashlib
+import io
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+from .repository import ArtworkRepository
+
+logger = logging.getLogger(__name__)
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+    logger.warning("Pillow 미설치 - 앨범아트 썸네일 없이 원본만 사용")
+
+ARTWORK_DIR = Path.home() / ".juuxbox" / "artwork"
+
+# 썸네일 크기 (긴 변 기준 px): 플레이어 바 / 그리드 카드 / 상세 보기
+THUMBNAIL_SIZES = (64, 256, 600)
+THUMBNAIL_QUALITY = 85
+
+# 참조 없는 이미지 정리 유예 (초) - ingest 후 이 시간 안의 원본은 남김
+# (추출 작업자가 이미지를 저장한 뒤 트랙 배치가 커밋되기 전에 정리되어 cover_path가 깨지지 않도록)
+GC_GRACE_SECONDS = 3600
+
+# 파일 시그니처 → 확장자
+_IMAGE_SIGNATURES = (
+    (b"\x89PNG", ".png"),
+    (b"GIF8", ".gif"),
+    (b"RIFF", ".webp"),
+)
+
+
+def _image_extension(data: bytes) -> str:
+    for signature, ext in _IMAGE_SIGNATURES:
+        if data.startswith(signature):
+            return ext
+    return ".jpg"
+
+
+def _write_atomic(path: Path, data: bytes):
+    """임시 파일에 쓴 뒤 교체 (동시에 같은 이미지를 저장해도 반쯤 쓰인 파일이 보이지 않음)"""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class ArtworkStore:
+    """앨범아트 저장소"""
+
+    def __init__(self, root: Optional[Path] = None, sizes: tuple[int, ...] = THUMBNAIL_SIZES):
+        """
+        Args:
+            root: 저장 폴더 (기본: ~/.juuxbox/artwork)
+            sizes: 생성할 썸네일 크기 목록
+        """
+        self._root = Path(root or ARTWORK_DIR)
+        self._sizes = tuple(sorted(sizes))
+        self._root.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    @property
+    def sizes(self) -> tuple[int, ...]:
+        return self._sizes
+
+    def ingest(self, data: bytes) -> tuple[str, str]:
+        """
+        이미지 저장 (이미 있으면 쓰지 않음)
+
+        Returns:
+            (해시, 원본 경로)
+        """
+        digest = hashlib.sha1(data).hexdigest()
+        original = self._original_path(digest, _image_extension(data))
+        if not self._touch(original):
+            original.parent.mkdir(exist_ok=True)
+            _write_atomic(original, data)
+            self._make_thumbnails(digest, data)
+            logger.debug(f"앨범아트 저장: {original}")
+        return digest, str(original)
+
+    def thumbnail_path(self, cover_path: str, size: int) -> str:
+        """
+        요청 크기 이상인 가장 작은 썸네일 경로
+
+        저장소 밖의 이미지이거나 썸네일이 없으면 (원본이 더 작은 경우 등) 원본 경로를 반환합니다.
+        """
+        path = Path(cover_path)
+        if path.parent.parent != self._root:
+            return cover_path
+        for thumb_size in self._sizes:
+            if thumb_size >= size:
+                thumb = path.with_name(f"{path.stem}_{thumb_size}.jpg")
+                if thumb.exists():
+                    return str(thumb)
+        return cover_path
+
+    def collect_garbage(self, grace: float = GC_GRACE_SECONDS) -> int:
+        """
+        어떤 트랙도 참조하지 않는 이미지와 썸네일 삭제 → 삭제한 이미지 수
+
+        파일 삭제는 참조 수를 확인한 쓰기 트랜잭션 안에서 하고,
+        grace초 안에 저장/재사용된 원본은 다음 정리로 미룸
+
+        Args:
+            grace: 유예 시간 (초)
+        """
+        cutoff = time.time() - grace
+
+        def remove_files(digest: str, path: str) -> bool:
+            original = Path(path)
+            try:
+                if original.stat().st_mtime > cutoff:
+                    return False
+            except FileNotFoundError:
+                pass
+            shard = self._root / digest[:2]
+            for file in [original, *(shard / f"{digest}_{s}.jpg" for s in self._sizes)]:
+                try:
+                    file.unlink()
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    logger.warning(f"앨범아트 삭제 실패: {file} - {e}")
+            return True
+
+        removed = ArtworkRepository.delete_orphans(remove_files)
+        if removed:
+            logger.info(f"참조 없는 앨범아트 정리: {len(removed)}개")
+        return len(removed)
+
+    @staticmethod
+    def _touch(original: Path) -> bool:
+        """이미 저장된 원본의 수정 시각 갱신 (정리 유예 기준) → 원본이 있었는지"""
+        try:
+            os.utime(original)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _original_path(self, digest: str, ext: str) -> Path:
+        return self._root / digest[:2] / f"{digest}{ext}"
+
+    def _make_thumbnails(self, digest: str, data: bytes):
+        """원본보다 작은 크기의 썸네일만 JPEG로 생성"""
+        if not PIL_AVAILABLE:
+            return
+        try:
+            with Image.open(io.BytesIO(data)) as image:
+                image.load()
+                image = image.convert("RGB")
+        except Exception as e:
+            logger.debug(f"썸네일 생성 불가 (이미지 해석 실패): {digest} - {e}")
+            return
+
+        shard = self._root / digest[:2]
+        for size in self._sizes:
+            if max(image.size) <= size:
+                break
+            thumb = image.copy()
+            thumb.thumbnail((size, size), Image.LANCZOS)
+            buffer = io.BytesIO()
+            thumb.save(buffer, "JPEG", quality=THUMBNAIL_QUALITY)
+            _write_atomic(shard / f"{digest}_{size}.jpg", buffer.getvalue())
@@ -0,0 +1,195 @@
+"""
+DB Executor
+===========
+웹 UI 브리지용 DB 작업 실행기
+
+- 전용 작업자 스레드가 우선순위 큐에서 요청을 꺼내 실행 (작업자마다 models의 스레드 연결 사용)
+- 화면 조회(INTERACTIVE)가 백그라운드 쓰기(BACKGROUND - 스캔 배치 저장, 삭제, 백필)보다 먼저 실행되고,
+  백그라운드 작업은 background_slots개 작업자까지만 차지 → 나머지 작업자는 항상 조회를 받음
+- 같은 key로 새 요청이 오면 이전 요청은 취소: 대기 중이면 실행하지 않고,
+  실행 중인 조회는 작업자 조회 연결의 진행 핸들러가 취소 표시를 보고 쿼리를 멈춤
+  (빠른 그리드 이동 등 - 결과를 기다리던 호출은 CancelledError)
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+from concurrent.futures import CancelledError, Future
+from typing import Any, Callable, Optional
+
+from .models import connection
+
+logger = logging.getLogger(__name__)
+
+# 요청 우선순위 (작을수록 먼저)
+INTERACTIVE = 0
+BACKGROUND = 1
+
+# 기본 작업자 수 / 백그라운드 작업이 동시에 쓸 수 있는 작업자 수
+DEFAULT_WORKERS = 2
+DEFAULT_BACKGROUND_SLOTS = 1
+
+# 진행 핸들러 호출 간격 (SQLite VM 명령 수) - 취소된 조회가 멈추기까지의 지연과 확인 비용 사이
+PROGRESS_STEPS = 10000
+
+
+class _Request:
+    """큐에 들어간 요청 하나"""
+
+    __slots__ = ("fn", "args", "kwargs", "priority", "key", "future", "superseded")
+
+    def __init__(self, fn: Callable, args: tuple, kwargs: dict, priority: int, key: Optional[str]):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.key = key
+        self.future: Future = Future()
+        self.superseded = False
+
+    def is_superseded(self) -> bool:
+        """진행 핸들러 (참이면 SQLite가 실행 중인 쿼리를 interrupted 오류로 멈춤)"""
+        return self.superseded
+
+
+class DbExecutor:
+    """
+    DB 작업 실행기
+
+    submit()은 Future를 돌려주고, call()은 결과를 기다려 반환합니다 (브리지 호출 스레드는 기다리기만 함).
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, background_slots: int = DEFAULT_BACKGROUND_SLOTS):
+        """
+        Args:
+            workers: 작업자 스레드 수
+            background_slots: 백그라운드 작업이 동시에 차지할 수 있는 작업자 수 (workers보다 작게)
+        """
+        self._workers = max(1, workers)
+        self._background_slots = max(1, min(background_slots, self._workers - 1)) if self._workers > 1 else 1
+        self._queue: list[tuple[int, int, _Request]] = []
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self._background_running = 0
+        # key → 가장 최근 요청
+        self._latest: dict[str, _Request] = {}
+        self._threads: list[threading.Thread] = []
+        self._closed = False
+
+    @classmethod
+    def from_config(cls, database_config: dict) -> "DbExecutor":
+        """설정(database 섹션)으로 생성"""
+        return cls(
+            workers=int(database_config.get("executor_workers", DEFAULT_WORKERS)),
+            background_slots=int(database_config.get("executor_background_slots", DEFAULT_BACKGROUND_SLOTS)),
+        )
+
+    def submit(self, fn: Callable, *args, priority: int = INTERACTIVE, key: Optional[str] = None,
+               **kwargs) -> Future:
+        """
+        요청 추가
+
+        Args:
+            priority: INTERACTIVE / BACKGROUND
+            key: 같은 key의 이전 요청을 취소 (조회에만 사용 - 쓰기는 멈추지 않음)
+        """
+        request = _Request(fn, args, kwargs, priority, key)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("DB 실행기가 종료됨")
+            if key is not None:
+                previous = self._latest.get(key)
+                if previous is not None:
+                    self._supersede(previous)
+                self._latest[key] = request
+            heapq.heappush(self._queue, (priority, next(self._sequence), request))
+            self._start_workers()
+            self._cond.notify()
+        return request.future
+
+    def call(self, fn: Callable, *args, priority: int = INTERACTIVE, key: Optional[str] = None, **kwargs) -> Any:
+        """요청 후 결과 대기 (다른 요청에 밀려 취소되면 CancelledError)"""
+        if threading.current_thread() in self._threads:
+            # 실행기 작업 안에서 다시 요청 → 기다리면 작업자가 묶이므로 바로 실행
+            return fn(*args, **kwargs)
+        return self.submit(fn, *args, priority=priority, key=key, **kwargs).result()
+
+    def shutdown(self, wait: bool = True):
+        """대기 중인 요청 취소 후 작업자 종료"""
+        with self._cond:
+            self._closed = True
+            for _, _, request in self._queue:
+                request.future.cancel()
+            self._queue.clear()
+            self._latest.clear()
+            self._cond.notify_all()
+        if wait:
+            for thread in self._threads:
+                if thread is not threading.current_thread():
+                    thread.join()
+
+    @staticmethod
+    def _supersede(request: _Request):
+        """이전 요청 취소 (_cond 보유 상태) - 실행 중이면 작업자 연결의 진행 핸들러가 쿼리를 멈춤"""
+        request.superseded = True
+        if request.future.cancel():
+            logger.debug(f"DB 요청 취소 (대기 중): {request.key}")
+
+    def _start_workers(self):
+        """필요할 때 작업자 시작 (_cond 보유 상태)"""
+        while len(self._threads) < self._workers:
+            thread = threading.Thread(target=self._run, name=f"db-executor-{len(self._threads)}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def _next_request(self) -> Optional[_Request]:
+        """실행할 다음 요청 (_cond 보유 상태에서 대기), 종료되면 None"""
+        while True:
+            if self._closed:
+                return None
+            if self._queue:
+                priority, _, request = self._queue[0]
+                # 맨 앞이 백그라운드면 대기 중인 조회가 없음 → 백그라운드 자리가 날 때까지 대기
+                if priority == INTERACTIVE or self._background_running < self._background_slots:
+                    heapq.heappop(self._queue)
+                    if not request.future.set_running_or_notify_cancel():
+                        continue
+                    if priority != INTERACTIVE:
+                        self._background_running += 1
+                    return request
+            self._cond.wait()
+
+    def _run(self):
+        """작업자 루프"""
+        while True:
+            with self._cond:
+                request = self._next_request()
+            if request is None:
+                return
+            reader = None
+            try:
+                if request.key is not None:
+                    # 취소될 수 있는 조회 → 이 작업자의 조회 연결에서 취소 표시 확인
+                    reader = connection(read_only=True)
+                    reader.set_progress_handler(request.is_superseded, PROGRESS_STEPS)
+                result = request.fn(*request.args, **request.kwargs)
+                error = None
+            except BaseException as e:
+                result, error = None, e
+            finally:
+                if reader is not None:
+                    reader.set_progress_handler(None, 0)
+            with self._cond:
+                if request.priority != INTERACTIVE:
+                    self._background_running -= 1
+                    self._cond.notify_all()
+                if request.key is not None and self._latest.get(request.key) is request:
+                    del self._latest[request.key]
+                superseded = request.superseded
+            if superseded:
+                request.future.set_exception(CancelledError())
+            elif error is not None:
+                request.future.set_exception(error)
+            else:
+                request.future.set_result(result)
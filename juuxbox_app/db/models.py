@@ -1,13 +1,25 @@
 """
 Database Models
 ===============
-SQLite 테이블 정의
+SQLite 테이블 정의 및 연결 관리
+
+- 스레드마다 오래 유지되는 연결 하나 (pywebview API 스레드 / Qt 스레드 / 스캔 작업자)
+- 같은 연결을 재사용하므로 준비된 문장(prepared statement) 캐시가 유지됨
+- 쓰기는 transaction()으로 명시적인 트랜잭션 범위 안에서 실행
+- 조회 전용 연결(read_only)은 쓰기 잠금을 잡지 않음 → WAL 모드에서 스캔 중에도 UI 조회가 막히지 않음
+- 성능 설정(PRAGMA)은 configure()로 한 곳에서 지정, 모든 연결에 적용
+- 아티스트/앨범은 정수 ID 테이블(artists / albums)로 정규화, 트랙은 ID로 참조 (저장 시 resolve_entities)
 """
 
 import sqlite3
 import logging
 import sys
+import threading
+import unicodedata
+import weakref
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Iterator, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -24,24 +36,533 @@ def get_app_dir() -> Path:
 
 DB_PATH = get_app_dir() / "juuxbox.db"
 
+# 연결마다 보관할 준비된 문장 수 (기본 128)
+STATEMENT_CACHE_SIZE = 256
+# 다른 스레드가 쓰기 잠금을 잡고 있을 때 기다리는 시간(초)
+BUSY_TIMEOUT = 10.0
+
+# 설정(database 섹션) 기본값
+DEFAULT_PRAGMAS = {
+    "journal_mode": "wal",      # wal / delete (네트워크 드라이브는 WAL 미지원 → delete)
+    "synchronous": "normal",    # off / normal / full / extra (WAL에서는 normal도 손상 없음)
+    "cache_size_mb": 64,        # 연결당 페이지 캐시
+    "mmap_size_mb": 256,        # 메모리 매핑 읽기 (0이면 사용 안 함)
+    "temp_store": "memory",     # default / file / memory (정렬/그룹핑 임시 저장)
+}
+# 트랙 목록 페이지 정렬 키 (정렬 이름 → 정렬 식, 마지막에 id로 동순위 구분)
+# NULL은 빈 값으로 바꿔 키셋 비교((키..., id) > (커서...))가 NULL에서 끊기지 않게 함, "added"는 id(추가 순서)
+PAGE_SORTS = {
+    "artist": ("IFNULL(artist, '')", "IFNULL(album, '')", "IFNULL(disc_number, 0)", "IFNULL(track_number, 0)"),
+    "album": ("IFNULL(album, '')", "IFNULL(disc_number, 0)", "IFNULL(track_number, 0)"),
+    "title": ("IFNULL(title, '')",),
+    "added": (),
+}
+# 확장 태그/스트림 정보 컬럼 (스키마 버전 2에서 추가)
+METADATA_COLUMNS = {
+    "composer": "TEXT",
+    "conductor": "TEXT",
+    "performer": "TEXT",
+    "bitrate": "INTEGER",
+}
+# 이 컬럼들과 year/disc_number를 파일에서 다시 읽어 채우는 백필 (schema_backfills.version)
+METADATA_BACKFILL = 2
+# 트랙 검색 색인 컬럼 (tracks_fts, 순서가 bm25 가중치 순서)
+FTS_COLUMNS = ("title", "artist", "album", "album_artist", "genre", "folder_name")
+
+
+def _fts5_available() -> bool:
+    """SQLite 빌드에 FTS5가 포함되어 있는지"""
+    try:
+        sqlite3.connect(":memory:").execute("CREATE VIRTUAL TABLE t USING fts5(x)")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+FTS5_AVAILABLE = _fts5_available()
+if not FTS5_AVAILABLE:
+    logger.warning("SQLite FTS5 미지원 - 트랙 검색은 LIKE 검색으로 동작")
+
+_PRAGMA_CHOICES = {
+    "journal_mode": ("wal", "delete", "truncate", "persist"),
+    "synchronous": ("off", "normal", "full", "extra"),
+    "temp_store": ("default", "file", "memory"),
+}
+
+
+class _ThreadConnection(sqlite3.Connection):
+    """스레드 연결 (약한 참조를 위해 하위 클래스로 만듦)"""
+
+
+_local = threading.local()
+# 열려 있는 스레드 연결 (종료 시 한 번에 닫기 위함, 스레드가 끝나면 자동으로 빠짐)
+_connections: "weakref.WeakSet[_ThreadConnection]" = weakref.WeakSet()
+_connections_lock = threading.Lock()
+# close_connections() / configure()마다 증가 → 다른 스레드도 다음 사용 시 새로 엶
+_generation = 0
+_pragmas = dict(DEFAULT_PRAGMAS)
+
+
+def configure(settings: dict):
+    """
+    연결 성능 설정 (설정 파일의 database 섹션)
+
+    잘못된 값은 경고 후 기본값을 사용합니다. 열려 있는 연결은 다음 사용 시 새 설정으로 다시 열립니다.
+    """
+    global _generation
+    pragmas = dict(DEFAULT_PRAGMAS)
+    for key, default in DEFAULT_PRAGMAS.items():
+        value = settings.get(key, default)
+        if key in _PRAGMA_CHOICES:
+            value = str(value).lower()
+            valid = value in _PRAGMA_CHOICES[key]
+        else:
+            valid = isinstance(value, (int, float)) and value >= 0
+        if valid:
+            pragmas[key] = value
+        else:
+            logger.warning(f"잘못된 DB 설정 무시: {key}={value!r} (기본값 {default!r} 사용)")
+    with _connections_lock:
+        _pragmas.update(pragmas)
+        _generation += 1
+
+
+def _apply_pragmas(conn: sqlite3.Connection, read_only: bool = False):
+    """성능 설정 적용 (값은 configure()에서 검증됨)"""
+    pragmas = _pragmas
+    if not read_only:
+        # 저널 모드는 DB 파일에 기록되므로 쓰기 연결에서만 바꿈
+        mode = conn.execute(f"PRAGMA journal_mode = {pragmas['journal_mode']}").fetchone()[0]
+        if mode != pragmas["journal_mode"]:
+            logger.warning(f"DB 저널 모드 변경 실패: {mode} 유지")
+    conn.execute(f"PRAGMA synchronous = {pragmas['synchronous']}")
+    conn.execute(f"PRAGMA cache_size = {-int(pragmas['cache_size_mb'] * 1024)}")
+    conn.execute(f"PRAGMA mmap_size = {int(pragmas['mmap_size_mb'] * 1024 * 1024)}")
+    conn.execute(f"PRAGMA temp_store = {pragmas['temp_store']}")
+    # REPLACE 충돌 해결(UPDATE OR REPLACE)로 지워지는 행도 삭제 트리거를 거치도록 (요약/앨범아트 참조 수)
+    conn.execute("PRAGMA recursive_triggers = ON")
+    if read_only:
+        conn.execute("PRAGMA query_only = ON")
+
 
 def get_connection() -> sqlite3.Connection:
-    """데이터베이스 연결"""
+    """데이터베이스 연결 (단독 연결 - 호출자가 닫아야 함)"""
     # 데이터베이스 디렉토리가 없으면 생성
     if not DB_PATH.parent.exists():
         DB_PATH.parent.mkdir(parents=True, exist_ok=True)
     
-    conn = sqlite3.connect(str(DB_PATH))
+    conn = sqlite3.connect(str(DB_PATH), timeout=BUSY_TIMEOUT)
     conn.row_factory = sqlite3.Row
     conn.text_factory = str  # 유니코드 문자열 처리
+    _apply_pragmas(conn)
     return conn
 
 
+def _open_connection(path: Path, read_only: bool = False) -> sqlite3.Connection:
+    """스레드 연결 열기 (자동 커밋 모드 - 트랜잭션은 transaction()에서 명시적으로 시작)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(
+        str(path),
+        timeout=BUSY_TIMEOUT,
+        isolation_level=None,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        factory=_ThreadConnection,
+        # 만든 스레드에서만 사용하지만, close_connections()는 다른 스레드에서 닫음
+        check_same_thread=False,
+    )
+    conn.row_factory = sqlite3.Row
+    conn.text_factory = str
+    _apply_pragmas(conn, read_only)
+    return conn
+
+
+def _thread_connection(read_only: bool) -> sqlite3.Connection:
+    attr = "reader" if read_only else "writer"
+    conn, key = getattr(_local, attr, (None, None))
+    current = (DB_PATH, _generation)
+    if conn is not None and key == current:
+        return conn
+    if conn is not None:
+        conn.close()
+    conn = _open_connection(DB_PATH, read_only)
+    setattr(_local, attr, (conn, current))
+    with _connections_lock:
+        _connections.add(conn)
+    return conn
+
+
+def connection(read_only: bool = False) -> sqlite3.Connection:
+    """
+    현재 스레드의 지속 연결 (닫지 말 것)
+
+    DB_PATH가 바뀌었거나 (테스트 등) close_connections() / configure() 이후면 다시 엽니다.
+
+    Args:
+        read_only: 조회 전용 연결 (query_only - 쓰기 잠금을 잡지 않음).
+            같은 스레드가 쓰기 트랜잭션 중이면 아직 커밋되지 않은 변경이 보이도록 쓰기 연결을 반환
+    """
+    if read_only:
+        writer, key = getattr(_local, "writer", (None, None))
+        if writer is not None and key == (DB_PATH, _generation) and writer.in_transaction:
+            return writer
+    return _thread_connection(read_only)
+
+
+@contextmanager
+def transaction() -> Iterator[sqlite3.Connection]:
+    """
+    쓰기 트랜잭션 범위 (정상 종료 시 커밋, 예외 시 롤백)
+
+    BEGIN IMMEDIATE로 시작해 쓰기 잠금을 먼저 잡습니다 (읽은 뒤 쓰기로 올릴 때 교착 방지).
+    이미 트랜잭션 안이면 바깥 트랜잭션에 합류합니다.
+    """
+    conn = connection()
+    if conn.in_transaction:
+        yield conn
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
+def close_connections():
+    """열려 있는 모든 스레드 연결 닫기 (앱 종료 시)"""
+    global _generation
+    with _connections_lock:
+        conns = list(_connections)
+        _connections.clear()
+        _generation += 1
+    for conn in conns:
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"DB 연결 닫기 실패: {e}")
+
+
+# 정렬 키에서 빼는 앞쪽 관사 ("The Beatles" → "beatles")
+_SORT_ARTICLES = ("the ", "a ", "an ")
+
+
+def sort_key(name: str) -> str:
+    """아티스트/앨범 이름 → 정렬 키 (대소문자/발음 구별 기호/전각 문자 무시, 앞쪽 영어 관사 제외)"""
+    text = "".join(ch for ch in unicodedata.normalize("NFKD", name) if not unicodedata.combining(ch))
+    text = " ".join(unicodedata.normalize("NFC", text).casefold().split())
+    for article in _SORT_ARTICLES:
+        if text.startswith(article) and len(text) > len(article):
+            return text[len(article):]
+    return text
+
+
+def resolve_entities(cursor: sqlite3.Cursor, tracks: list[dict]) -> list[tuple[Optional[int], Optional[int]]]:
+    """
+    트랙 dict → (artist_id, album_id), 없는 아티스트/앨범은 만듦 (트랜잭션 안에서 호출)
+
+    앨범은 (앨범 이름, 앨범 아티스트) 단위 - 앨범 아티스트가 없으면 트랙 아티스트.
+    그래서 아티스트가 다른 같은 이름의 앨범("Greatest Hits")은 따로 묶입니다.
+    """
+    artist_ids: dict[str, int] = {}
+    album_ids: dict[tuple[str, Optional[int]], int] = {}
+
+    def artist_id(name: Optional[str]) -> Optional[int]:
+        if not name:
+            return None
+        if name not in artist_ids:
+            cursor.execute("INSERT OR IGNORE INTO artists (name, sort_name) VALUES (?, ?)", (name, sort_key(name)))
+            cursor.execute("SELECT id FROM artists WHERE name = ?", (name,))
+            artist_ids[name] = cursor.fetchone()[0]
+        return artist_ids[name]
+
+    def album_id(title: Optional[str], album_artist_id: Optional[int]) -> Optional[int]:
+        if not title:
+            return None
+        key = (title, album_artist_id)
+        if key not in album_ids:
+            cursor.execute("SELECT id FROM albums WHERE title = ? AND artist_id IS ?", key)
+            row = cursor.fetchone()
+            if row is None:
+                cursor.execute("INSERT INTO albums (title, artist_id, sort_title) VALUES (?, ?, ?)",
+                               (title, album_artist_id, sort_key(title)))
+                album_ids[key] = cursor.lastrowid
+            else:
+                album_ids[key] = row[0]
+        return album_ids[key]
+
+    return [
+        (artist_id(t.get("artist")), album_id(t.get("album"), artist_id(t.get("album_artist") or t.get("artist"))))
+        for t in tracks
+    ]
+
+
+def prune_entities(cursor: sqlite3.Cursor):
+    """트랙이 참조하지 않는 앨범/아티스트 삭제 (트랜잭션 안에서 호출)"""
+    cursor.execute("DELETE FROM albums WHERE NOT EXISTS (SELECT 1 FROM tracks WHERE album_id = albums.id)")
+    cursor.execute("""
+        DELETE FROM artists
+        WHERE NOT EXISTS (SELECT 1 FROM tracks WHERE artist_id = artists.id)
+          AND NOT EXISTS (SELECT 1 FROM albums WHERE artist_id = artists.id)
+    """)
+
+
+# 요약 테이블 → tracks에서 다시 계산하는 집계 (다시 만들기/점검용, 컬럼은 테이블 정의 순서)
+# 대표 앨범아트는 그룹 안의 MIN (NULL 제외), 각 집계는 탐색 인덱스를 한 번 훑음
+SUMMARY_SOURCES = {
+    "album_summary": """
+        SELECT album_id, MIN(cover_path) AS cover_path,
+               COUNT(*) AS track_count, TOTAL(duration_seconds) AS total_duration
+        FROM tracks
+        WHERE album_id IS NOT NULL
+        GROUP BY album_id
+    """,
+    "artist_summary": """
+        SELECT artist_id, MIN(cover_path) AS cover_path,
+               COUNT(DISTINCT album_id) AS album_count, COUNT(*) AS track_count
+        FROM tracks
+        WHERE artist_id IS NOT NULL
+        GROUP BY artist_id
+    """,
+    "folder_summary": """
+        SELECT folder_name, MIN(cover_path) AS cover_path, COUNT(*) AS track_count
+        FROM tracks
+        WHERE folder_name IS NOT NULL AND folder_name != ''
+        GROUP BY folder_name
+    """,
+}
+
+
+def _keep_min(column: str) -> str:
+    """UPSERT에서 기존 값과 새 값 중 작은 값 (한쪽이 NULL이면 다른 쪽)"""
+    return f"COALESCE(MIN({column}, excluded.{column}), {column}, excluded.{column})"
+
+
+def _summary_add_sql(row: str) -> str:
+    """트랙 한 행(row: NEW)을 요약 테이블에 더하는 트리거 본문"""
+    return f"""
+        INSERT INTO album_summary (album_id, cover_path, track_count, total_duration)
+        SELECT {row}.album_id, {row}.cover_path, 1, COALESCE({row}.duration_seconds, 0)
+        WHERE {row}.album_id IS NOT NULL
+        ON CONFLICT(album_id) DO UPDATE SET
+            cover_path = {_keep_min("cover_path")},
+            track_count = track_count + 1,
+            total_duration = total_duration + excluded.total_duration;
+
+        INSERT INTO artist_summary (artist_id, cover_path, album_count, track_count)
+        SELECT {row}.artist_id, {row}.cover_path,
+               {row}.album_id IS NOT NULL AND NOT EXISTS (
+                   SELECT 1 FROM tracks
+                   WHERE artist_id = {row}.artist_id AND album_id = {row}.album_id AND id != {row}.id
+               ),
+               1
+        WHERE {row}.artist_id IS NOT NULL
+        ON CONFLICT(artist_id) DO UPDATE SET
+            cover_path = {_keep_min("cover_path")},
+            album_count = album_count + excluded.album_count,
+            track_count = track_count + 1;
+
+        INSERT INTO folder_summary (folder_name, cover_path, track_count)
+        SELECT {row}.folder_name, {row}.cover_path, 1
+        WHERE {row}.folder_name IS NOT NULL AND {row}.folder_name != ''
+        ON CONFLICT(folder_name) DO UPDATE SET
+            cover_path = {_keep_min("cover_path")},
+            track_count = track_count + 1;
+    """
+
+
+def _summary_remove_sql(row: str) -> str:
+    """
+    트랙 한 행(row: OLD)을 요약 테이블에서 빼는 트리거 본문
+
+    빠지는 행이 대표 앨범아트였으면 그 그룹만 인덱스로 다시 계산합니다.
+    갱신 트리거에서는 같은 행이 새 값으로 남아 있으므로 자기 자신(id)은 제외하고 셉니다.
+    """
+    return f"""
+        UPDATE album_summary SET
+            track_count = track_count - 1,
+            total_duration = total_duration - COALESCE({row}.duration_seconds, 0)
+        WHERE album_id = {row}.album_id;
+        DELETE FROM album_summary WHERE album_id = {row}.album_id AND track_count <= 0;
+        UPDATE album_summary SET
+            cover_path = (SELECT MIN(cover_path) FROM tracks WHERE album_id = {row}.album_id)
+        WHERE album_id = {row}.album_id AND cover_path = {row}.cover_path;
+
+        UPDATE artist_summary SET
+            track_count = track_count - 1,
+            album_count = album_count - ({row}.album_id IS NOT NULL AND NOT EXISTS (
+                SELECT 1 FROM tracks
+                WHERE artist_id = {row}.artist_id AND album_id = {row}.album_id AND id != {row}.id
+            ))
+        WHERE artist_id = {row}.artist_id;
+        DELETE FROM artist_summary WHERE artist_id = {row}.artist_id AND track_count <= 0;
+        UPDATE artist_summary SET
+            cover_path = (SELECT MIN(cover_path) FROM tracks WHERE artist_id = {row}.artist_id)
+        WHERE artist_id = {row}.artist_id AND cover_path = {row}.cover_path;
+
+        UPDATE folder_summary SET track_count = track_count - 1 WHERE folder_name = {row}.folder_name;
+        DELETE FROM folder_summary WHERE folder_name = {row}.folder_name AND track_count <= 0;
+        UPDATE folder_summary SET
+            cover_path = (SELECT MIN(cover_path) FROM tracks WHERE folder_name = {row}.folder_name)
+        WHERE folder_name = {row}.folder_name AND cover_path = {row}.cover_path;
+    """
+
+
+def rebuild_summaries(cursor: sqlite3.Cursor):
+    """요약 테이블을 tracks에서 다시 계산 (트랜잭션 안에서 호출)"""
+    for table, source in SUMMARY_SOURCES.items():
+        cursor.execute(f"DELETE FROM {table}")
+        cursor.execute(f"INSERT INTO {table} {source}")
+
+
+def _track_columns(cursor: sqlite3.Cursor) -> set[str]:
+    """tracks 테이블의 현재 컬럼 이름"""
+    cursor.execute("PRAGMA table_info(tracks)")
+    return {row[1] for row in cursor.fetchall()}
+
+
+def _upgrade_entity_columns(cursor: sqlite3.Cursor):
+    """
+    아티스트/앨범 ID가 없던 이전 DB → 컬럼 추가 후 기존 트랙의 ID를 채움
+
+    문자열로 묶던 요약 테이블/트리거/인덱스는 지우고, create_tables가 ID 기준으로 다시 만들어 채웁니다.
+    (버전 관리 이전에 ID 컬럼을 이미 만든 DB는 건너뜀)
+    """
+    if "album_id" in _track_columns(cursor):
+        return
+    cursor.execute("ALTER TABLE tracks ADD COLUMN artist_id INTEGER REFERENCES artists(id)")
+    cursor.execute("ALTER TABLE tracks ADD COLUMN album_id INTEGER REFERENCES albums(id)")
+    for name in ("insert", "delete", "update"):
+        cursor.execute(f"DROP TRIGGER IF EXISTS trg_tracks_summary_{name}")
+    for table in ("album_summary", "artist_summary"):
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+    for index in ("idx_tracks_album", "idx_tracks_artist"):
+        cursor.execute(f"DROP INDEX IF EXISTS {index}")
+
+    cursor.execute("SELECT id, artist, album, album_artist FROM tracks")
+    rows = cursor.fetchall()
+    ids = resolve_entities(cursor, [{"artist": r[1], "album": r[2], "album_artist": r[3]} for r in rows])
+    cursor.executemany(
+        "UPDATE tracks SET artist_id = ?, album_id = ? WHERE id = ?",
+        [(artist_id, album_id, row[0]) for row, (artist_id, album_id) in zip(rows, ids)]
+    )
+    logger.info(f"아티스트/앨범 ID 채움: 트랙 {len(rows)}개")
+
+
+def _add_metadata_columns(cursor: sqlite3.Cursor):
+    """
+    확장 태그/스트림 정보 컬럼 추가
+
+    기존 트랙 값은 파일에서 다시 읽어야 하므로 채울 범위(현재 마지막 ID까지)만 schema_backfills에 기록하고,
+    LibraryScanner.backfill_metadata가 배치 트랜잭션으로 이어서 채웁니다.
+    (year/disc_number는 컬럼만 있고 저장되지 않던 값 → 같이 채움)
+    """
+    existing = _track_columns(cursor)
+    for column, column_type in METADATA_COLUMNS.items():
+        if column not in existing:
+            cursor.execute(f"ALTER TABLE tracks ADD COLUMN {column} {column_type}")
+    cursor.execute("""
+        INSERT OR REPLACE INTO schema_backfills (version, last_id, max_id)
+        SELECT ?, 0, MAX(id) FROM tracks HAVING MAX(id) IS NOT NULL
+    """, (METADATA_BACKFILL,))
+
+
+def _drop_page_indexes(cursor: sqlite3.Cursor):
+    """
+    트랙 목록 페이지 정렬 식 인덱스 삭제 (정렬 키에 디스크 번호 추가)
+
+    이름이 같아 CREATE INDEX IF NOT EXISTS로는 바뀌지 않으므로 지우고, create_tables가 새 정렬 식으로 다시 만듭니다.
+    """
+    for name in PAGE_SORTS:
+        cursor.execute(f"DROP INDEX IF EXISTS idx_tracks_page_{name}")
+
+
+# 스키마 마이그레이션 (번호, 설명, 적용 함수) - PRAGMA user_version에 적용한 마지막 번호를 기록
+# 새 DB는 최신 스키마로 만들어 바로 SCHEMA_VERSION, 기존 DB는 user_version 다음 번호부터 차례로 적용
+# (마이그레이션마다 한 트랜잭션 - 실패하면 그 마이그레이션 전체와 번호 갱신이 함께 롤백)
+MIGRATIONS = (
+    (1, "아티스트/앨범 ID", _upgrade_entity_columns),
+    (2, "확장 태그/스트림 정보", _add_metadata_columns),
+    (3, "페이지 정렬 디스크 번호", _drop_page_indexes),
+)
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def _migrate(cursor: sqlite3.Cursor):
+    """기존 DB에 아직 적용하지 않은 마이그레이션 적용"""
+    version = cursor.execute("PRAGMA user_version").fetchone()[0]
+    for number, name, migration in MIGRATIONS:
+        if number <= version:
+            continue
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            migration(cursor)
+            cursor.execute(f"PRAGMA user_version = {number}")
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        logger.info(f"스키마 마이그레이션 {number} 적용: {name}")
+
+
+def _create_search_index(cursor: sqlite3.Cursor):
+    """
+    트랙 검색 색인 (FTS5, tracks를 원본으로 하는 external content 테이블)
+
+    - unicode61: 공백/문장부호 기준 단어, 대소문자/발음 구별 기호 무시 (한글은 어절 단위)
+    - prefix: 2~3글자 접두어 색인 → 짧은 검색어도 빠르게 접두어 검색
+    - 트리거로 tracks와 동기화, 색인이 새로 생기면 기존 트랙으로 채움
+    """
+    exists = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tracks_fts'"
+    ).fetchone()
+    columns = ", ".join(FTS_COLUMNS)
+    old_values = ", ".join(f"OLD.{c}" for c in FTS_COLUMNS)
+    new_values = ", ".join(f"NEW.{c}" for c in FTS_COLUMNS)
+    cursor.executescript(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS tracks_fts USING fts5(
+            {columns},
+            content = 'tracks', content_rowid = 'id',
+            tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+        );
+
+        CREATE TRIGGER IF NOT EXISTS trg_tracks_fts_insert AFTER INSERT ON tracks
+        BEGIN
+            INSERT INTO tracks_fts (rowid, {columns}) VALUES (NEW.id, {new_values});
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_tracks_fts_delete AFTER DELETE ON tracks
+        BEGIN
+            INSERT INTO tracks_fts (tracks_fts, rowid, {columns}) VALUES ('delete', OLD.id, {old_values});
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_tracks_fts_update AFTER UPDATE OF {columns} ON tracks
+        BEGIN
+            INSERT INTO tracks_fts (tracks_fts, rowid, {columns}) VALUES ('delete', OLD.id, {old_values});
+            INSERT INTO tracks_fts (rowid, {columns}) VALUES (NEW.id, {new_values});
+        END;
+    """)
+    if not exists:
+        cursor.execute("INSERT INTO tracks_fts (tracks_fts) VALUES ('rebuild')")
+
+
 def create_tables():
-    """테이블 생성"""
+    """테이블 생성 (기존 DB는 스키마 마이그레이션)"""
     conn = get_connection()
     cursor = conn.cursor()
-    
+    fresh = not cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tracks'"
+    ).fetchone()
+
+    # 파일을 다시 읽어 채우는 마이그레이션의 남은 범위 (version별, last_id 다음부터 max_id까지)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_backfills (
+            version INTEGER PRIMARY KEY,
+            last_id INTEGER NOT NULL,
+            max_id INTEGER NOT NULL
+        )
+    """)
+
     # 트랙 테이블
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS tracks (
@@ -64,9 +585,41 @@ def create_tables():
             format TEXT,
             file_size INTEGER,
             last_modified REAL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            artist_id INTEGER REFERENCES artists(id),
+            album_id INTEGER REFERENCES albums(id),
+            composer TEXT,
+            conductor TEXT,
+            performer TEXT,
+            bitrate INTEGER
         )
     """)
+
+    # 아티스트/앨범 (트랙 저장 시 resolve_entities로 채움, 정렬은 sort_name / sort_title)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS artists (
+            id INTEGER PRIMARY KEY,
+            name TEXT UNIQUE NOT NULL,
+            sort_name TEXT NOT NULL
+        )
+    """)
+    # 앨범 아티스트(artist_id)가 없는 앨범도 있음 (NULL)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS albums (
+            id INTEGER PRIMARY KEY,
+            title TEXT NOT NULL,
+            artist_id INTEGER REFERENCES artists(id),
+            sort_title TEXT NOT NULL,
+            UNIQUE (title, artist_id)
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_artists_sort ON artists(sort_name)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_albums_sort ON albums(sort_title)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_albums_artist ON albums(artist_id)")
+    if fresh:
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    else:
+        _migrate(cursor)
     
     # 플레이리스트 테이블
     cursor.execute("""
@@ -89,6 +642,134 @@ def create_tables():
         )
     """)
     
+    # 앨범아트 테이블 (내용 해시 기준, ref_count는 아래 트리거로 관리)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS artwork (
+            hash TEXT PRIMARY KEY,
+            path TEXT UNIQUE NOT NULL,
+            ref_count INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tracks_cover_path ON tracks(cover_path)")
+
+    # 탐색용 인덱스: 앞쪽은 WHERE/ORDER BY, 뒤쪽은 그룹 집계에 쓰는 컬럼 (테이블을 읽지 않는 커버링 인덱스)
+    # - 앨범: get_tracks_by_album (album_id = ? ORDER BY disc_number, track_number), 앨범 요약
+    # - 아티스트: get_tracks_by_artist (artist_id = ?), 아티스트 요약 (앨범 수 = 서로 다른 album_id)
+    # - 폴더: get_tracks_by_folder (folder_name = ? ORDER BY title), get_folders
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_tracks_album_id
+        ON tracks(album_id, disc_number, track_number, cover_path, duration_seconds)
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tracks_artist_id ON tracks(artist_id, album_id, cover_path)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tracks_folder ON tracks(folder_name, title, cover_path)")
+
+    # 트랙 목록 페이지용 정렬 식 인덱스 (get_page: 첫 정렬 키로 커서 위치를 찾고 인덱스 순서대로 한 페이지)
+    for name, keys in PAGE_SORTS.items():
+        if keys:
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_tracks_page_{name} ON tracks({', '.join(keys)})")
+
+    # 스캔 작업 (중단된 스캔 이어하기용 체크포인트)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS scan_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            folder_path TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'running',
+            files_done INTEGER NOT NULL DEFAULT 0,
+            last_batch INTEGER NOT NULL DEFAULT 0,
+            started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    # 모든 파일이 저장된 폴더 (하위 폴더 제외)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS scan_job_dirs (
+            job_id INTEGER NOT NULL,
+            dir_path TEXT NOT NULL,
+            FOREIGN KEY (job_id) REFERENCES scan_jobs(id),
+            PRIMARY KEY (job_id, dir_path)
+        )
+    """)
+    cursor.executescript("""
+        CREATE TRIGGER IF NOT EXISTS trg_tracks_artwork_insert AFTER INSERT ON tracks
+        WHEN NEW.cover_path IS NOT NULL
+        BEGIN
+            UPDATE artwork SET ref_count = ref_count + 1 WHERE path = NEW.cover_path;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_tracks_artwork_delete AFTER DELETE ON tracks
+        WHEN OLD.cover_path IS NOT NULL
+        BEGIN
+            UPDATE artwork SET ref_count = ref_count - 1 WHERE path = OLD.cover_path;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_tracks_artwork_update AFTER UPDATE OF cover_path ON tracks
+        WHEN OLD.cover_path IS NOT NEW.cover_path
+        BEGIN
+            UPDATE artwork SET ref_count = ref_count - 1 WHERE path = OLD.cover_path;
+            UPDATE artwork SET ref_count = ref_count + 1 WHERE path = NEW.cover_path;
+        END;
+    """)
+
+    # 탐색 화면 요약 테이블 (트랙 추가/갱신/삭제 트리거로 유지 → 그리드 조회 비용이 라이브러리 크기와 무관)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS album_summary (
+            album_id INTEGER PRIMARY KEY,
+            cover_path TEXT,
+            track_count INTEGER NOT NULL,
+            total_duration REAL NOT NULL
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS artist_summary (
+            artist_id INTEGER PRIMARY KEY,
+            cover_path TEXT,
+            album_count INTEGER NOT NULL,
+            track_count INTEGER NOT NULL
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS folder_summary (
+            folder_name TEXT PRIMARY KEY,
+            cover_path TEXT,
+            track_count INTEGER NOT NULL
+        ) WITHOUT ROWID
+    """)
+    cursor.executescript(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_tracks_summary_insert AFTER INSERT ON tracks
+        BEGIN
+            {_summary_add_sql("NEW")}
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_tracks_summary_delete AFTER DELETE ON tracks
+        BEGIN
+            {_summary_remove_sql("OLD")}
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_tracks_summary_update
+        AFTER UPDATE OF album_id, artist_id, folder_name, cover_path, duration_seconds ON tracks
+        WHEN OLD.album_id IS NOT NEW.album_id OR OLD.artist_id IS NOT NEW.artist_id
+          OR OLD.folder_name IS NOT NEW.folder_name OR OLD.cover_path IS NOT NEW.cover_path
+          OR OLD.duration_seconds IS NOT NEW.duration_seconds
+        BEGIN
+            {_summary_remove_sql("OLD")}
+            {_summary_add_sql("NEW")}
+        END;
+    """)
+    # 요약 테이블이 새로 생긴 기존 DB는 한 번 채움
+    cursor.execute("""
+        SELECT EXISTS (SELECT 1 FROM tracks)
+           AND NOT EXISTS (SELECT 1 FROM album_summary)
+           AND NOT EXISTS (SELECT 1 FROM artist_summary)
+           AND NOT EXISTS (SELECT 1 FROM folder_summary)
+    """)
+    if cursor.fetchone()[0]:
+        rebuild_summaries(cursor)
+        logger.info("탐색 요약 테이블 생성")
+
+    if FTS5_AVAILABLE:
+        _create_search_index(cursor)
+    
     conn.commit()
     conn.close()
     logger.info("데이터베이스 테이블 생성 완료")
@@ -5,214 +5,701 @@ CRUD 함수
 """
 
 import logging
-from typing import Optional
-from .models import get_connection
+import os
+from pathlib import Path
+from typing import Callable, Optional
+from .models import (
+    FTS5_AVAILABLE, FTS_COLUMNS, METADATA_BACKFILL, PAGE_SORTS, SUMMARY_SOURCES, connection, prune_entities,
+    rebuild_summaries, resolve_entities, transaction
+)
 
 logger = logging.getLogger(__name__)
 
+# 스캔으로 채워지는 트랙 컬럼 (file_path가 맨 앞, artist_id/album_id는 저장할 때 resolve_entities로)
+_TRACK_COLUMNS = (
+    "file_path", "title", "artist", "album", "album_artist", "folder_name", "cover_path",
+    "track_number", "genre", "duration_seconds", "sample_rate", "bit_depth", "channels", "format",
+    "file_size", "last_modified", "disc_number", "year", "composer", "conductor", "performer", "bitrate",
+    "artist_id", "album_id",
+)
+
+# 같은 경로가 있으면 행을 지우지 않고 갱신 (ID 유지 → 플레이리스트/대기열 참조 보존)
+_UPSERT_SQL = f"""
+    INSERT INTO tracks ({", ".join(_TRACK_COLUMNS)})
+    VALUES ({", ".join("?" * len(_TRACK_COLUMNS))})
+    ON CONFLICT(file_path) DO UPDATE SET
+        {", ".join(f"{c} = excluded.{c}" for c in _TRACK_COLUMNS[1:])}
+"""
+
+# 탐색 쿼리 - 그리드는 앨범/아티스트를 정렬 키 인덱스 순서로 읽으며 요약 테이블(트리거로 유지)을 ID로 붙이고,
+# 트랙 목록은 models.py의 idx_tracks_album_id / idx_tracks_artist_id / idx_tracks_folder 사용
+# (요약이 없는 앨범/아티스트 - 정리 전의 빈 항목 - 는 JOIN에서 빠짐)
+_ALBUMS_SQL = """
+    SELECT albums.id, albums.title AS album, albums.artist_id, artists.name AS artist,
+           album_summary.cover_path, album_summary.track_count, album_summary.total_duration
+    FROM albums
+    JOIN album_summary ON album_summary.album_id = albums.id
+    LEFT JOIN artists ON artists.id = albums.artist_id
+    ORDER BY albums.sort_title, albums.id
+"""
+_ARTISTS_SQL = """
+    SELECT artists.id, artists.name AS artist,
+           artist_summary.cover_path, artist_summary.album_count, artist_summary.track_count
+    FROM artists
+    JOIN artist_summary ON artist_summary.artist_id = artists.id
+    ORDER BY artists.sort_name, artists.id
+"""
+_FOLDERS_SQL = "SELECT folder_name, cover_path, track_count FROM folder_summary ORDER BY folder_name"
+
+_ALL_TRACKS_SQL = f"SELECT * FROM tracks ORDER BY {', '.join(PAGE_SORTS['artist'])}, id"
+_TRACKS_BY_ALBUM_SQL = "SELECT * FROM tracks WHERE album_id = ? ORDER BY disc_number, track_number"
+# 앨범 이름으로 찾기 - 같은 이름의 앨범(앨범 아티스트가 다름)은 앨범 ID 순으로 이어 붙임
+_TRACKS_BY_ALBUM_TITLE_SQL = """
+    SELECT * FROM tracks
+    WHERE album_id IN (SELECT id FROM albums WHERE title = ?)
+    ORDER BY album_id, disc_number, track_number
+"""
+# 아티스트 트랙은 수가 적으므로 앨범 정렬 키 순서는 찾은 뒤 정렬
+_TRACKS_BY_ARTIST_SQL = """
+    SELECT tracks.* FROM tracks
+    LEFT JOIN albums ON albums.id = tracks.album_id
+    WHERE tracks.artist_id = ?
+    ORDER BY albums.sort_title, tracks.album_id, tracks.disc_number, tracks.track_number
+"""
+_TRACKS_BY_FOLDER_SQL = "SELECT * FROM tracks WHERE folder_name = ? ORDER BY title"
+# 폴더 아래 트랙 - 경로 접두어를 범위 비교로 (file_path UNIQUE 인덱스 범위 탐색, 파라미터는 _prefix_range)
+_SCAN_SNAPSHOT_SQL = """
+    SELECT file_path, file_size, last_modified, id FROM tracks
+    WHERE file_path >= ? AND file_path < ?
+"""
+
+
+def _prefix_range(folder_path: str) -> tuple[str, str]:
+    """폴더 → 그 아래 경로의 범위 (접두어, 접두어의 마지막 문자(구분자)를 하나 올린 값)"""
+    prefix = os.path.join(str(Path(folder_path)), "")
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def _page_order(sort: str, descending: bool) -> tuple[tuple[str, ...], str]:
+    """정렬 이름 → (정렬 키 식 + id, ORDER BY 절)"""
+    if sort not in PAGE_SORTS:
+        raise ValueError(f"알 수 없는 정렬: {sort}")
+    keys = PAGE_SORTS[sort] + ("id",)
+    direction = " DESC" if descending else ""
+    return keys, ", ".join(key + direction for key in keys)
+
+
+def _page_sql(sort: str, descending: bool, after_cursor: bool) -> tuple[str, int]:
+    """
+    트랙 페이지 쿼리 → (SQL, 정렬 키 개수)
+
+    정렬 키는 _sort0.. 컬럼으로 함께 읽어 다음 커서로 씀. 커서 다음 페이지는
+    행 값 비교((키..., id) > (커서...))가 식 인덱스 탐색에 쓰이지 않으므로
+    첫 키 범위로 인덱스 위치를 찾고 나머지 키는 그 안에서 비교
+    (파라미터: 첫 키, 커서 전체, LIMIT)
+    """
+    keys, order = _page_order(sort, descending)
+    columns = ", ".join(f"{key} AS _sort{i}" for i, key in enumerate(keys))
+    where = ""
+    if after_cursor:
+        op = "<" if descending else ">"
+        where = f"WHERE {keys[0]} {op}= ? AND ({', '.join(keys)}) {op} ({', '.join('?' * len(keys))})"
+    return f"SELECT tracks.*, {columns} FROM tracks {where} ORDER BY {order} LIMIT ?", len(keys)
+
+
+# 검색 순위 가중치 (FTS_COLUMNS 순서: 제목 > 아티스트 > 앨범 > 앨범 아티스트 > 장르, 폴더)
+_SEARCH_WEIGHTS = (10.0, 5.0, 4.0, 3.0, 1.0, 1.0)
+
+_SEARCH_SQL = f"""
+    SELECT tracks.* FROM tracks_fts
+    JOIN tracks ON tracks.id = tracks_fts.rowid
+    WHERE tracks_fts MATCH ?
+    ORDER BY bm25(tracks_fts, {", ".join(map(str, _SEARCH_WEIGHTS))}), tracks.id
+    LIMIT ? OFFSET ?
+"""
+
+
+def _search_terms(text: str) -> list[str]:
+    """검색어 → 단어 목록 (글자/숫자가 없는 단어는 버림)"""
+    return [t for t in text.split() if any(ch.isalnum() for ch in t)]
+
+
+def _fts_query(terms: list[str]) -> str:
+    """단어 목록 → FTS5 쿼리 (단어마다 접두어 검색, 모든 단어 포함)"""
+    return " ".join('"{}"*'.format(t.replace('"', '""')) for t in terms)
+
+
+# SQLite 변수 개수 제한을 넘지 않도록 IN (...) 조회를 나누는 크기
+_IN_CHUNK = 500
+
+_UPDATE_SQL = f"""
+    UPDATE tracks SET {", ".join(f"{c} = ?" for c in _TRACK_COLUMNS[1:])}
+    WHERE file_path = ?
+"""
+
+
+def _track_params(track_data: dict, entity_ids: tuple) -> tuple:
+    """트랙 dict + (artist_id, album_id) → _TRACK_COLUMNS 순서의 값"""
+    return (
+        track_data.get("file_path"),
+        track_data.get("title"),
+        track_data.get("artist"),
+        track_data.get("album"),
+        track_data.get("album_artist", ""),
+        track_data.get("folder_name"),
+        track_data.get("cover_path"),
+        track_data.get("track_number", 0),
+        track_data.get("genre", ""),
+        track_data.get("duration_seconds"),
+        track_data.get("sample_rate"),
+        track_data.get("bit_depth"),
+        track_data.get("channels", 2),
+        track_data.get("format"),
+        track_data.get("file_size"),
+        track_data.get("last_modified"),
+        track_data.get("disc_number"),
+        track_data.get("year"),
+        track_data.get("composer", ""),
+        track_data.get("conductor", ""),
+        track_data.get("performer", ""),
+        track_data.get("bitrate"),
+        *entity_ids,
+    )
+
+
+def _upsert_tracks(cursor, tracks: list[dict]) -> list[int]:
+    """트랙 일괄 저장 → 입력 순서의 트랙 ID (트랜잭션 안에서 호출)"""
+    entity_ids = resolve_entities(cursor, tracks)
+    cursor.executemany(_UPSERT_SQL, [_track_params(t, e) for t, e in zip(tracks, entity_ids)])
+    # 갱신된 행은 lastrowid가 없으므로 경로로 다시 조회
+    ids = _select_ids(cursor, [t.get("file_path") for t in tracks])
+    return [ids[t.get("file_path")] for t in tracks]
+
+
+def _select_ids(cursor, file_paths: list[str]) -> dict[str, int]:
+    """파일 경로 → 트랙 ID (DB에 있는 경로만)"""
+    ids = {}
+    for start in range(0, len(file_paths), _IN_CHUNK):
+        chunk = file_paths[start:start + _IN_CHUNK]
+        cursor.execute(
+            f"SELECT file_path, id FROM tracks WHERE file_path IN ({','.join('?' * len(chunk))})", chunk
+        )
+        ids.update((row[0], row[1]) for row in cursor.fetchall())
+    return ids
+
+
+def _register_artwork(cursor, tracks: list[dict]):
+    """트랙이 참조할 저장소 앨범아트 등록 (트랙 저장 전에 있어야 트리거가 ref_count를 올림)"""
+    cursor.executemany(
+        "INSERT OR IGNORE INTO artwork (hash, path) VALUES (?, ?)",
+        {(t["artwork_hash"], t["cover_path"]) for t in tracks if t.get("artwork_hash")}
+    )
+
 
 class TrackRepository:
     """트랙 CRUD"""
 
     @staticmethod
     def insert(track_data: dict) -> int:
-        """트랙 추가"""
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT OR REPLACE INTO tracks
-            (file_path, title, artist, album, album_artist, folder_name, cover_path,
-             track_number, genre, duration_seconds, sample_rate, bit_depth, channels, format)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            track_data.get("file_path"),
-            track_data.get("title"),
-            track_data.get("artist"),
-            track_data.get("album"),
-            track_data.get("album_artist", ""),
-            track_data.get("folder_name"),
-            track_data.get("cover_path"),
-            track_data.get("track_number", 0),
-            track_data.get("genre", ""),
-            track_data.get("duration_seconds"),
-            track_data.get("sample_rate"),
-            track_data.get("bit_depth"),
-            track_data.get("channels", 2),
-            track_data.get("format"),
-        ))
-        conn.commit()
-        track_id = cursor.lastrowid
-        conn.close()
-        return track_id
+        """트랙 추가 (같은 경로가 있으면 갱신)"""
+        return TrackRepository.insert_many([track_data])[0]
+
+    @staticmethod
+    def insert_many(tracks: list[dict]) -> list[int]:
+        """
+        트랙 일괄 추가 (한 트랜잭션)
+
+        같은 경로의 트랙이 이미 있으면 기존 ID를 유지한 채 갱신합니다.
+
+        Returns:
+            트랙 ID (tracks 순서)
+        """
+        if not tracks:
+            return []
+        with transaction() as conn:
+            cursor = conn.cursor()
+            _register_artwork(cursor, tracks)
+            ids = _upsert_tracks(cursor, tracks)
+        logger.debug(f"트랙 일괄 저장: {len(tracks)}개")
+        return ids
+
+    @staticmethod
+    def get_scan_snapshot(folder_path: str) -> dict[str, tuple]:
+        """
+        폴더 아래 트랙의 파일 크기/수정 시각 한 번에 조회 (증분 스캔용)
+
+        Returns:
+            {file_path: (file_size, last_modified, id)}
+        """
+        cursor = connection(read_only=True).cursor()
+        cursor.execute(_SCAN_SNAPSHOT_SQL, _prefix_range(folder_path))
+        snapshot = {row[0]: (row[1], row[2], row[3]) for row in cursor.fetchall()}
+        return snapshot
+
+    @staticmethod
+    def apply_scan(added: list[dict], updated: list[dict], removed: list[str],
+                   moved: list[tuple[str, str]] = ()) -> list[int]:
+        """
+        스캔 결과를 한 트랜잭션으로 반영
+
+        변경된 트랙은 기존 ID를 유지한 채 갱신합니다 (재생 대기열/세션 보존).
+        이동된 트랙은 태그를 다시 읽지 않고 경로/폴더 이름만 바꿉니다 (이동 → 삭제 → 추가 → 갱신 순).
+
+        Args:
+            moved: (이전 경로, 새 경로) 목록 - 새 경로에 이미 트랙이 있으면 대체
+
+        Returns:
+            추가된 트랙의 ID (added 순서)
+        """
+        with transaction() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                "UPDATE OR REPLACE tracks SET file_path = ?, folder_name = ? WHERE file_path = ?",
+                [(new, Path(new).parent.name, old) for old, new in moved]
+            )
+            cursor.executemany("DELETE FROM tracks WHERE file_path = ?", [(p,) for p in removed])
+            _register_artwork(cursor, added + updated)
+            added_ids = _upsert_tracks(cursor, added) if added else []
+            entity_ids = resolve_entities(cursor, updated)
+            cursor.executemany(
+                _UPDATE_SQL,
+                [_track_params(t, e)[1:] + (t.get("file_path"),) for t, e in zip(updated, entity_ids)]
+            )
+            if removed or updated or moved:
+                prune_entities(cursor)
+        logger.debug(f"스캔 반영: 추가 {len(added)}, 갱신 {len(updated)}, 삭제 {len(removed)}, 이동 {len(moved)}")
+        return added_ids
+
+    @staticmethod
+    def get_ids_by_file_paths(file_paths: list[str]) -> dict[str, int]:
+        """파일 경로 → 트랙 ID (DB에 있는 경로만)"""
+        return _select_ids(connection(read_only=True).cursor(), file_paths)
 
     @staticmethod
     def exists_by_file_path(file_path: str) -> bool:
         """파일 경로로 트랙 존재 여부 확인"""
-        conn = get_connection()
-        cursor = conn.cursor()
+        cursor = connection(read_only=True).cursor()
         cursor.execute("SELECT 1 FROM tracks WHERE file_path = ?", (file_path,))
         exists = cursor.fetchone() is not None
-        conn.close()
         return exists
 
+    @staticmethod
+    def get_by_id(track_id: int) -> dict | None:
+        """ID로 트랙 조회"""
+        cursor = connection(read_only=True).cursor()
+        cursor.execute("SELECT * FROM tracks WHERE id = ?", (track_id,))
+        row = cursor.fetchone()
+        return dict(row) if row else None
+
     @staticmethod
     def get_by_file_path(file_path: str) -> dict | None:
         """파일 경로로 트랙 조회"""
-        conn = get_connection()
-        cursor = conn.cursor()
+        cursor = connection(read_only=True).cursor()
         cursor.execute("SELECT * FROM tracks WHERE file_path = ?", (file_path,))
         row = cursor.fetchone()
-        conn.close()
         return dict(row) if row else None
 
     @staticmethod
     def get_all() -> list[dict]:
         """모든 트랙 조회"""
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM tracks ORDER BY artist, album, track_number")
+        cursor = connection(read_only=True).cursor()
+        cursor.execute(_ALL_TRACKS_SQL)
         rows = [dict(row) for row in cursor.fetchall()]
-        conn.close()
         return rows
 
+    @staticmethod
+    def get_page(sort: str = "artist", after: Optional[list] = None, limit: int = 200,
+                 descending: bool = False) -> tuple[list[dict], Optional[list]]:
+        """
+        트랙 목록 한 페이지 (키셋 페이지네이션)
+
+        OFFSET 없이 이전 페이지 마지막 트랙의 정렬 키(커서) 다음부터 읽으므로
+        몇 번째 페이지든 한 페이지만큼만 읽습니다.
+
+        Args:
+            sort: 정렬 (artist: 아티스트/앨범/트랙 번호, album: 앨범/트랙 번호, title: 제목, added: 추가 순서)
+            after: 이전 페이지가 돌려준 커서 (None이면 첫 페이지)
+            limit: 페이지 크기
+            descending: 내림차순
+
+        Returns:
+            (트랙 목록, 다음 페이지 커서 - 마지막 페이지면 None)
+        """
+        sql, key_count = _page_sql(sort, descending, after is not None)
+        params = []
+        if after is not None:
+            if len(after) != key_count:
+                raise ValueError(f"잘못된 커서: {after}")
+            params = [after[0], *after]
+        cursor = connection(read_only=True).cursor()
+        cursor.execute(sql, params + [limit])
+        rows = [dict(row) for row in cursor.fetchall()]
+        next_cursor = None
+        if len(rows) == limit:
+            next_cursor = [rows[-1][f"_sort{i}"] for i in range(key_count)]
+        for row in rows:
+            for i in range(key_count):
+                del row[f"_sort{i}"]
+        return rows, next_cursor
+
+    @staticmethod
+    def get_ids(sort: str = "artist", descending: bool = False) -> list[int]:
+        """모든 트랙 ID를 get_page와 같은 순서로 (전체 라이브러리 재생 대기열용, 인덱스만 읽음)"""
+        _, order = _page_order(sort, descending)
+        cursor = connection(read_only=True).cursor()
+        cursor.execute(f"SELECT id FROM tracks ORDER BY {order}")
+        return [row[0] for row in cursor.fetchall()]
+
+    @staticmethod
+    def count() -> int:
+        """전체 트랙 수"""
+        cursor = connection(read_only=True).cursor()
+        cursor.execute("SELECT COUNT(*) FROM tracks")
+        return cursor.fetchone()[0]
+
     @staticmethod
     def get_by_album(album: str) -> list[dict]:
-        """앨범별 트랙 조회"""
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM tracks WHERE album = ? ORDER BY track_number", (album,))
+        """앨범 이름으로 트랙 조회 (그리드 항목은 get_tracks_by_album으로 앨범 ID 조회)"""
+        cursor = connection(read_only=True).cursor()
+        cursor.execute(_TRACKS_BY_ALBUM_TITLE_SQL, (album,))
         rows = [dict(row) for row in cursor.fetchall()]
-        conn.close()
         return rows
 
     @staticmethod
     def delete_by_file_path(file_path: str) -> bool:
         """파일 경로로 트랙 삭제"""
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM tracks WHERE file_path = ?", (file_path,))
-        conn.commit()
+        with transaction() as conn:
+            cursor = conn.execute("DELETE FROM tracks WHERE file_path = ?", (file_path,))
+            if cursor.rowcount:
+                prune_entities(conn.cursor())
         deleted = cursor.rowcount > 0
-        conn.close()
         if deleted:
             logger.info(f"트랙 삭제: {file_path}")
         return deleted
 
     @staticmethod
     def delete_by_file_paths(file_paths: list) -> int:
-        """여러 트랙 삭제 (배치)"""
+        """여러 트랙 삭제 (한 트랜잭션, 변수 개수 제한에 맞춰 나눠서 삭제)"""
         if not file_paths:
             return 0
-        conn = get_connection()
-        cursor = conn.cursor()
-        placeholders = ",".join("?" * len(file_paths))
-        cursor.execute(f"DELETE FROM tracks WHERE file_path IN ({placeholders})", file_paths)
-        conn.commit()
-        deleted_count = cursor.rowcount
-        conn.close()
+        deleted_count = 0
+        with transaction() as conn:
+            for start in range(0, len(file_paths), _IN_CHUNK):
+                chunk = file_paths[start:start + _IN_CHUNK]
+                cursor = conn.execute(f"DELETE FROM tracks WHERE file_path IN ({','.join('?' * len(chunk))})",
+                                      chunk)
+                deleted_count += cursor.rowcount
+            if deleted_count:
+                prune_entities(conn.cursor())
         logger.info(f"선택 트랙 삭제: {deleted_count}개")
         return deleted_count
 
     @staticmethod
     def delete_all() -> int:
         """모든 트랙 삭제"""
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM tracks")
-        conn.commit()
+        with transaction() as conn:
+            # 요약을 먼저 비우면 행마다 도는 삭제 트리거가 갱신할 요약 행이 없어 빨라짐
+            for table in SUMMARY_SOURCES:
+                conn.execute(f"DELETE FROM {table}")
+            cursor = conn.execute("DELETE FROM tracks")
+            conn.execute("DELETE FROM albums")
+            conn.execute("DELETE FROM artists")
         deleted_count = cursor.rowcount
-        conn.close()
         logger.info(f"전체 트랙 삭제: {deleted_count}개")
         return deleted_count
 
+    @staticmethod
+    def search(text: str, limit: int = 50, offset: int = 0) -> tuple[list[dict], int]:
+        """
+        트랙 검색 (제목/아티스트/앨범/앨범 아티스트/장르/폴더)
+
+        단어마다 접두어로 찾고 모든 단어가 들어 있는 트랙만 반환합니다.
+        제목에서 찾은 트랙이 먼저 오도록 컬럼별 가중치로 순위를 매깁니다.
+        FTS5가 없는 SQLite에서는 LIKE 검색(제목 순)으로 대신합니다.
+
+        Returns:
+            (트랙 목록, 전체 결과 수)
+        """
+        terms = _search_terms(text)
+        if not terms:
+            return [], 0
+        cursor = connection(read_only=True).cursor()
+        if FTS5_AVAILABLE:
+            query = _fts_query(terms)
+            cursor.execute("SELECT COUNT(*) FROM tracks_fts WHERE tracks_fts MATCH ?", (query,))
+            total = cursor.fetchone()[0]
+            cursor.execute(_SEARCH_SQL, (query, limit, offset))
+        else:
+            match_any = "(" + " OR ".join(f"{c} LIKE ? ESCAPE '\\'" for c in FTS_COLUMNS) + ")"
+            where = " AND ".join([match_any] * len(terms))
+            params = []
+            for term in terms:
+                pattern = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+                params.extend([pattern] * len(FTS_COLUMNS))
+            cursor.execute(f"SELECT COUNT(*) FROM tracks WHERE {where}", params)
+            total = cursor.fetchone()[0]
+            cursor.execute(f"SELECT * FROM tracks WHERE {where} ORDER BY title, id LIMIT ? OFFSET ?",
+                           params + [limit, offset])
+        rows = [dict(row) for row in cursor.fetchall()]
+        return rows, total
+
     @staticmethod
     def get_albums() -> list[dict]:
-        """앨범별 그룹핑 조회 (앨범아트, 아티스트, 트랙 수 포함)"""
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT album, artist, cover_path, COUNT(*) as track_count,
-                   SUM(duration_seconds) as total_duration
-            FROM tracks
-            WHERE album IS NOT NULL AND album != ''
-            GROUP BY album
-            ORDER BY album
-        """)
+        """앨범 목록 (앨범 ID, 앨범 아티스트, 대표 앨범아트, 트랙 수 포함, 정렬 키 순)"""
+        cursor = connection(read_only=True).cursor()
+        cursor.execute(_ALBUMS_SQL)
         rows = [dict(row) for row in cursor.fetchall()]
-        conn.close()
         return rows
 
     @staticmethod
     def get_artists() -> list[dict]:
-        """아티스트별 그룹핑 조회 (대표 앨범아트, 앨범 수, 트랙 수 포함)"""
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT artist, 
-                   (SELECT cover_path FROM tracks t2 
-                    WHERE t2.artist = tracks.artist AND t2.cover_path IS NOT NULL 
-                    LIMIT 1) as cover_path,
-                   COUNT(DISTINCT album) as album_count,
-                   COUNT(*) as track_count
-            FROM tracks
-            WHERE artist IS NOT NULL AND artist != ''
-            GROUP BY artist
-            ORDER BY artist
-        """)
+        """아티스트 목록 (아티스트 ID, 대표 앨범아트, 앨범 수, 트랙 수 포함, 정렬 키 순)"""
+        cursor = connection(read_only=True).cursor()
+        cursor.execute(_ARTISTS_SQL)
         rows = [dict(row) for row in cursor.fetchall()]
-        conn.close()
         return rows
 
     @staticmethod
     def get_folders() -> list[dict]:
         """폴더별 그룹핑 조회 (대표 앨범아트, 트랙 수 포함)"""
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT folder_name,
-                   (SELECT cover_path FROM tracks t2 
-                    WHERE t2.folder_name = tracks.folder_name AND t2.cover_path IS NOT NULL 
-                    LIMIT 1) as cover_path,
-                   COUNT(*) as track_count
-            FROM tracks
-            WHERE folder_name IS NOT NULL AND folder_name != ''
-            GROUP BY folder_name
-            ORDER BY folder_name
-        """)
+        cursor = connection(read_only=True).cursor()
+        cursor.execute(_FOLDERS_SQL)
         rows = [dict(row) for row in cursor.fetchall()]
-        conn.close()
         return rows
 
     @staticmethod
-    def get_tracks_by_album(album: str) -> list[dict]:
-        """앨범별 트랙 조회"""
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM tracks WHERE album = ? ORDER BY track_number", (album,))
+    def get_tracks_by_album(album_id: int) -> list[dict]:
+        """앨범 ID로 트랙 조회 (디스크/트랙 번호 순)"""
+        cursor = connection(read_only=True).cursor()
+        cursor.execute(_TRACKS_BY_ALBUM_SQL, (album_id,))
         rows = [dict(row) for row in cursor.fetchall()]
-        conn.close()
         return rows
 
     @staticmethod
-    def get_tracks_by_artist(artist: str) -> list[dict]:
-        """아티스트별 트랙 조회"""
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM tracks WHERE artist = ? ORDER BY album, track_number", (artist,))
+    def get_tracks_by_artist(artist_id: int) -> list[dict]:
+        """아티스트 ID로 트랙 조회 (앨범 정렬 키, 디스크/트랙 번호 순)"""
+        cursor = connection(read_only=True).cursor()
+        cursor.execute(_TRACKS_BY_ARTIST_SQL, (artist_id,))
         rows = [dict(row) for row in cursor.fetchall()]
-        conn.close()
         return rows
 
     @staticmethod
     def get_tracks_by_folder(folder_name: str) -> list[dict]:
         """폴더별 트랙 조회"""
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM tracks WHERE folder_name = ? ORDER BY title", (folder_name,))
+        cursor = connection(read_only=True).cursor()
+        cursor.execute(_TRACKS_BY_FOLDER_SQL, (folder_name,))
+        rows = [dict(row) for row in cursor.fetchall()]
+        return rows
+
+
+class ArtworkRepository:
+    """앨범아트 참조 관리"""
+
+    @staticmethod
+    def get_ref_count(artwork_hash: str) -> int | None:
+        """앨범아트를 참조하는 트랙 수 (등록되지 않았으면 None)"""
+        cursor = connection(read_only=True).cursor()
+        cursor.execute("SELECT ref_count FROM artwork WHERE hash = ?", (artwork_hash,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def delete_orphans(remove_files: Optional[Callable[[str, str], bool]] = None) -> list[tuple[str, str]]:
+        """
+        참조가 없는 앨범아트 행 삭제
+
+        트리거 밖에서 바뀐 참조(트리거가 없던 이전 버전 DB 등)도 맞도록
+        삭제 전에 ref_count를 실제 참조 수로 다시 맞춥니다.
+
+        Args:
+            remove_files: (해시, 원본 경로) → 파일을 지웠으면 True (False면 행을 남김).
+                쓰기 트랜잭션 안에서 호출되므로 파일을 지우는 동안 스캔 배치가 같은 이미지를 참조로 커밋할 수 없음
+
+        Returns:
+            삭제된 (해시, 원본 경로) 목록
+        """
+        with transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                UPDATE artwork SET ref_count =
+                    (SELECT COUNT(*) FROM tracks WHERE tracks.cover_path = artwork.path)
+            """)
+            cursor.execute("SELECT hash, path FROM artwork WHERE ref_count <= 0")
+            orphans = [(row[0], row[1]) for row in cursor.fetchall()]
+            if remove_files is not None:
+                orphans = [(digest, path) for digest, path in orphans if remove_files(digest, path)]
+            cursor.executemany("DELETE FROM artwork WHERE hash = ?", [(digest,) for digest, _ in orphans])
+        return orphans
+
+
+class SummaryRepository:
+    """탐색 요약 테이블(album_summary / artist_summary / folder_summary) 점검"""
+
+    @staticmethod
+    def check(repair: bool = False) -> dict[str, int]:
+        """
+        요약 테이블을 tracks 집계와 비교
+
+        Args:
+            repair: 어긋난 행이 있으면 요약 테이블 전체를 다시 계산
+
+        Returns:
+            {테이블: 어긋난 행 수} (요약에만 있거나 집계에만 있는 행, 값이 다르면 양쪽에서 셈)
+        """
+        cursor = connection(read_only=True).cursor()
+        mismatches = {}
+        for table, source in SUMMARY_SOURCES.items():
+            # 재생 시간 합은 더하고 빼기를 반복하며 생기는 부동소수점 오차를 무시
+            columns = [d[0] for d in cursor.execute(f"SELECT * FROM {table} LIMIT 0").description]
+            projection = ", ".join(f"ROUND({c}, 3)" if c == "total_duration" else c for c in columns)
+            summary = f"SELECT {projection} FROM {table}"
+            expected = f"SELECT {projection} FROM ({source})"
+            count = 0
+            for left, right in ((summary, expected), (expected, summary)):
+                cursor.execute(f"SELECT COUNT(*) FROM ({left} EXCEPT {right})")
+                count += cursor.fetchone()[0]
+            mismatches[table] = count
+
+        if repair and any(mismatches.values()):
+            SummaryRepository.rebuild()
+            logger.warning(f"탐색 요약 테이블 불일치 복구: {mismatches}")
+        return mismatches
+
+    @staticmethod
+    def rebuild():
+        """요약 테이블 전체를 tracks에서 다시 계산 (참조 없는 앨범/아티스트도 정리)"""
+        with transaction() as conn:
+            prune_entities(conn.cursor())
+            rebuild_summaries(conn.cursor())
+
+
+class ScanJobRepository:
+    """스캔 작업 체크포인트"""
+
+    RUNNING = "running"
+    CANCELLED = "cancelled"
+    COMPLETED = "completed"
+
+    @staticmethod
+    def create(folder_path: str) -> int:
+        """새 스캔 작업"""
+        with transaction() as conn:
+            cursor = conn.execute("INSERT INTO scan_jobs (folder_path) VALUES (?)", (folder_path,))
+        return cursor.lastrowid
+
+    @staticmethod
+    def find_interrupted(folder_path: str = None) -> list[dict]:
+        """
+        끝나지 않은 스캔 작업 (취소되었거나 실행 중에 앱이 종료됨), 최근 순
+
+        Args:
+            folder_path: 지정하면 해당 폴더의 작업만
+        """
+        cursor = connection(read_only=True).cursor()
+        sql = "SELECT * FROM scan_jobs WHERE status IN (?, ?)"
+        params = [ScanJobRepository.RUNNING, ScanJobRepository.CANCELLED]
+        if folder_path is not None:
+            sql += " AND folder_path = ?"
+            params.append(folder_path)
+        cursor.execute(sql + " ORDER BY id DESC", params)
         rows = [dict(row) for row in cursor.fetchall()]
-        conn.close()
         return rows
 
+    @staticmethod
+    def get_completed_dirs(job_id: int) -> set[str]:
+        """작업에서 완료된 폴더"""
+        cursor = connection(read_only=True).cursor()
+        cursor.execute("SELECT dir_path FROM scan_job_dirs WHERE job_id = ?", (job_id,))
+        dirs = {row[0] for row in cursor.fetchall()}
+        return dirs
+
+    @staticmethod
+    def checkpoint(job_id: int, completed_dirs: list[str], files_done: int, last_batch: int,
+                   status: str = RUNNING):
+        """완료된 폴더와 진행 상황 기록"""
+        with transaction() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO scan_job_dirs (job_id, dir_path) VALUES (?, ?)",
+                [(job_id, d) for d in completed_dirs]
+            )
+            conn.execute(
+                "UPDATE scan_jobs SET files_done = ?, last_batch = ?, status = ?, "
+                "updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                (files_done, last_batch, status, job_id)
+            )
+
+    @staticmethod
+    def finish(job_id: int):
+        """작업 완료 (폴더 목록은 더 이상 필요 없으므로 삭제)"""
+        with transaction() as conn:
+            conn.execute("DELETE FROM scan_job_dirs WHERE job_id = ?", (job_id,))
+            conn.execute(
+                "UPDATE scan_jobs SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                (ScanJobRepository.COMPLETED, job_id)
+            )
+
+
+class BackfillRepository:
+    """
+    기존 트랙 확장 메타데이터 백필 (스키마 마이그레이션 2)
+
+    채울 범위는 schema_backfills에 (last_id, max_id)로 남아 있고,
+    배치마다 값 저장과 last_id 갱신을 한 트랜잭션으로 처리 → 중단되어도 다음 실행에서 이어서 채움
+    """
+
+    # 파일에서 다시 읽어 채우는 컬럼
+    COLUMNS = ("composer", "conductor", "performer", "year", "disc_number", "bitrate")
+
+    @staticmethod
+    def pending() -> int:
+        """남은 트랙 수 (범위 안에서 그 사이 삭제된 트랙 제외)"""
+        cursor = connection(read_only=True).cursor()
+        cursor.execute("""
+            SELECT COUNT(*) FROM schema_backfills
+            JOIN tracks ON tracks.id > schema_backfills.last_id AND tracks.id <= schema_backfills.max_id
+            WHERE schema_backfills.version = ?
+        """, (METADATA_BACKFILL,))
+        return cursor.fetchone()[0]
+
+    @staticmethod
+    def next_batch(limit: int) -> list[dict]:
+        """다음에 채울 트랙 (id, file_path), ID 순"""
+        cursor = connection(read_only=True).cursor()
+        cursor.execute("""
+            SELECT tracks.id, tracks.file_path FROM schema_backfills
+            JOIN tracks ON tracks.id > schema_backfills.last_id AND tracks.id <= schema_backfills.max_id
+            WHERE schema_backfills.version = ?
+            ORDER BY tracks.id
+            LIMIT ?
+        """, (METADATA_BACKFILL, limit))
+        return [dict(row) for row in cursor.fetchall()]
+
+    @staticmethod
+    def save_batch(values: dict[int, dict], last_id: int):
+        """
+        배치 결과 저장 후 진행 위치 갱신 (범위를 다 채우면 백필 기록 삭제)
+
+        Args:
+            values: 트랙 ID → COLUMNS 값 (읽지 못한 파일은 빠짐 - 다음 스캔에서 채워짐)
+            last_id: 이번 배치의 마지막 트랙 ID
+        """
+        columns = BackfillRepository.COLUMNS
+        with transaction() as conn:
+            conn.executemany(
+                f"UPDATE tracks SET {', '.join(f'{c} = ?' for c in columns)} WHERE id = ?",
+                [(*(fields.get(c) for c in columns), track_id) for track_id, fields in values.items()]
+            )
+            conn.execute("UPDATE schema_backfills SET last_id = ? WHERE version = ?",
+                         (last_id, METADATA_BACKFILL))
+            conn.execute("DELETE FROM schema_backfills WHERE version = ? AND last_id >= max_id",
+                         (METADATA_BACKFILL,))
+
+    @staticmethod
+    def finish():
+        """남은 트랙이 없음 (범위 끝의 트랙이 삭제된 경우) → 백필 기록 삭제"""
+        with transaction() as conn:
+            conn.execute("DELETE FROM schema_backfills WHERE version = ?", (METADATA_BACKFILL,))
+
 
 class PlaylistRepository:
     """플레이리스트 CRUD"""
@@ -220,20 +707,14 @@ class PlaylistRepository:
     @staticmethod
     def create(name: str) -> int:
         """플레이리스트 생성"""
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("INSERT INTO playlists (name) VALUES (?)", (name,))
-        conn.commit()
-        playlist_id = cursor.lastrowid
-        conn.close()
-        return playlist_id
+        with transaction() as conn:
+            cursor = conn.execute("INSERT INTO playlists (name) VALUES (?)", (name,))
+        return cursor.lastrowid
 
     @staticmethod
     def get_all() -> list[dict]:
         """모든 플레이리스트 조회"""
-        conn = get_connection()
-        cursor = conn.cursor()
+        cursor = connection(read_only=True).cursor()
         cursor.execute("SELECT * FROM playlists")
         rows = [dict(row) for row in cursor.fetchall()]
-        conn.close()
         return rows
@@ -4,16 +4,23 @@ Library Scanner
 음원 폴더 스캔 및 메타데이터 추출
 """
 
+import os
+import re
 import logging
-import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Callable, Iterable, Iterator, Optional
 import mutagen
-from mutagen.flac import FLAC
-from mutagen.mp3 import MP3
-from mutagen.mp4 import MP4
+from mutagen.mp4 import MP4Tags
 from mutagen.id3 import ID3
 
+from .artwork import ArtworkStore
+from .executor import BACKGROUND, DbExecutor
+from .repository import BackfillRepository, ScanJobRepository, TrackRepository
+from .walker import DEFAULT_EXCLUDE, WalkEntry, walk_audio_files
+
 logger = logging.getLogger(__name__)
 
 AUDIO_EXTENSIONS = {".flac", ".wav", ".m4a", ".aiff", ".aif", ".dsf", ".dff", ".mp3"}
@@ -28,141 +35,656 @@ COVER_FILENAMES = [
     "0.jpg", "0.jpeg", "0.png",
     "1.jpg", "1.jpeg", "1.png",
 ]
+COVER_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+# 공통 태그 키 → ID3 프레임 / MP4 아톰
+ID3_TAG_FRAMES = {
+    "title": "TIT2",
+    "artist": "TPE1",
+    "album": "TALB",
+    "albumartist": "TPE2",
+    "tracknumber": "TRCK",
+    "genre": "TCON",
+    "composer": "TCOM",
+    "conductor": "TPE3",
+    "date": "TDRC",
+    "discnumber": "TPOS",
+}
+MP4_TAG_ATOMS = {
+    "title": "\xa9nam",
+    "artist": "\xa9ART",
+    "album": "\xa9alb",
+    "albumartist": "aART",
+    "tracknumber": "trkn",
+    "genre": "\xa9gen",
+    "composer": "\xa9wrt",
+    "date": "\xa9day",
+    "discnumber": "disk",
+}
+COMMON_TAG_KEYS = (
+    "title", "artist", "album", "albumartist", "tracknumber",
+    "genre", "composer", "conductor", "performer", "date", "discnumber",
+)
+
+# 기본 병렬 작업자 수
+DEFAULT_SCAN_WORKERS = 4
+
+# 한 트랜잭션으로 저장할 트랙 수
+DEFAULT_BATCH_SIZE = 500
+
+# 작업자당 동시에 맡겨 둘 파일 수
+_IN_FLIGHT_PER_WORKER = 4
+
+# 프로세스 풀 작업자용 스캐너 (프로세스마다 하나)
+_worker_scanner: Optional["LibraryScanner"] = None
+
+
+def _init_worker(artwork_root: str, thumbnail_sizes: tuple[int, ...], exclude: tuple[str, ...],
+                 skip_hidden: bool):
+    """프로세스 풀 작업자 초기화 - 부모 스캐너와 같은 앨범아트 저장소/설정으로 스캐너 생성"""
+    global _worker_scanner
+    _worker_scanner = LibraryScanner(exclude=exclude, skip_hidden=skip_hidden,
+                                     artwork_store=ArtworkStore(Path(artwork_root), thumbnail_sizes))
+
+
+def _extract_in_worker(file_path: str) -> Optional[dict]:
+    """프로세스 풀 작업 함수 (피클 가능한 최상위 함수)"""
+    return _worker_scanner._extract_metadata(Path(file_path))
+
+
+@dataclass
+class ScanResult:
+    """증분 스캔 결과 (개수만 보관, 트랙은 배치마다 DB에 반영 후 버림)"""
+    added: int = 0
+    updated: int = 0
+    removed: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    cancelled: bool = False
+    resumed: bool = False
 
-# 커버 이미지 캐시 폴더
-COVERS_DIR = Path.home() / ".juuxbox" / "covers"
+    @property
+    def total_files(self) -> int:
+        """폴더에서 발견한 오디오 파일 수"""
+        return self.added + self.updated + self.unchanged + self.failed
+
+    def summary(self) -> dict:
+        return {
+            "added": self.added,
+            "updated": self.updated,
+            "removed": self.removed,
+            "unchanged": self.unchanged,
+            "failed": self.failed,
+        }
+
+
+class _Checkpoint:
+    """스캔 작업 체크포인트 기록 (완료된 폴더는 새로 완료된 것만 저장)"""
+
+    def __init__(self, job_id: int, dirs: list[str]):
+        self._job_id = job_id
+        self._dirs = dirs
+        self._saved = 0  # dirs 중 기록된 개수
+        self._batches = 0
+
+    def save(self, last_path: Optional[str], files_done: int, finished_dirs: Optional[int] = None,
+             status: str = ScanJobRepository.RUNNING, unsaved: Iterable[str] = ()):
+        """
+        Args:
+            last_path: 마지막으로 저장된 파일 (순서대로 처리할 때 - 그 파일의 폴더 이전 폴더가 모두 완료)
+            files_done: 지금까지 확인한 파일 수
+            finished_dirs: 완료된 폴더 수를 직접 지정
+            unsaved: 저장되지 않은 파일 (추출 실패 등) - 이 파일의 폴더는 완료로 기록하지 않아 이어서 할 때 다시 확인
+        """
+        if finished_dirs is None:
+            finished_dirs = self._saved
+            if last_path is not None:
+                directory = os.path.dirname(last_path)
+                # 진행 중인 폴더는 목록 끝쪽에 있으므로 뒤에서부터 찾음
+                for i in range(len(self._dirs) - 1, self._saved - 1, -1):
+                    if self._dirs[i] == directory:
+                        finished_dirs = i
+                        break
+        finished_dirs = max(finished_dirs, self._saved)
+        if status == ScanJobRepository.RUNNING:
+            self._batches += 1
+        skip = {os.path.dirname(path) for path in unsaved}
+        completed = [d for d in self._dirs[self._saved:finished_dirs] if d not in skip]
+        ScanJobRepository.checkpoint(self._job_id, completed, files_done, self._batches, status)
+        self._saved = finished_dirs
 
 
 class LibraryScanner:
-    """라이브러리 스캐너"""
+    """
+    라이브러리 스캐너
+
+    폴더 탐색 → 메타데이터 추출 → 배치 DB 반영을 스트리밍으로 처리합니다.
+    추출된 트랙은 batch_size개마다 한 트랜잭션으로 저장되고 on_batch 이벤트로 전달되므로
+    라이브러리 크기와 관계없이 메모리 사용량이 일정합니다.
 
-    def __init__(self, on_progress: Optional[Callable[[int, int], None]] = None):
+    workers > 1이면 메타데이터 추출을 작업자 풀에서 병렬로 수행합니다.
+    mutagen 파싱은 대부분 파일 I/O 대기이므로 기본은 스레드 풀이며,
+    use_processes=True면 프로세스 풀을 사용합니다.
+    진행률 콜백은 항상 스캔을 호출한 스레드에서 완료 순서대로 호출됩니다.
+    """
+
+    def __init__(self, on_progress: Optional[Callable[[int, int], None]] = None,
+                 workers: int = 1, use_processes: bool = False, ordered: bool = True,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 exclude: Iterable[str] = DEFAULT_EXCLUDE, skip_hidden: bool = True,
+                 artwork_store: Optional[ArtworkStore] = None, db_executor: Optional[DbExecutor] = None):
+        """
+        Args:
+            on_progress: 진행률 콜백 (완료 수, 전체 수 - 탐색 중에는 지금까지 발견한 수)
+            workers: 병렬 작업자 수 (1: 순차)
+            use_processes: 스레드 대신 프로세스 풀 사용
+            ordered: 결과를 파일 목록 순서로 전달 (False: 완료 순서)
+            batch_size: 한 트랜잭션으로 저장할 트랙 수
+            exclude: 제외할 폴더/파일 glob 패턴
+            skip_hidden: 숨김/시스템 폴더 건너뛰기
+            artwork_store: 앨범아트 저장소 (기본: ~/.juuxbox/artwork)
+            db_executor: 배치 저장을 백그라운드 우선순위로 실행할 DB 실행기 (None: 스캔 스레드에서 바로 저장)
+        """
         self._on_progress = on_progress
-        # 캐시 폴더 생성
-        COVERS_DIR.mkdir(parents=True, exist_ok=True)
+        self._workers = max(1, workers)
+        self._use_processes = use_processes
+        self._ordered = ordered
+        self._batch_size = max(1, batch_size)
+        self._exclude = tuple(exclude)
+        self._skip_hidden = skip_hidden
+        # 앨범별 커버 결정 결과 (폴더+앨범 키 → (앨범아트 해시, 커버 경로)), 스캔 동안 유지
+        self._album_covers: dict[str, tuple[Optional[str], Optional[str]]] = {}
+        # 폴더별 커버 이미지 (폴더 경로 → 이미지 경로), 폴더 목록은 한 번만 읽음
+        self._folder_covers: dict[str, Optional[str]] = {}
+        self._cover_lock = threading.Lock()
+        self._artwork = artwork_store or ArtworkStore()
+        self._db_executor = db_executor
+
+    @classmethod
+    def from_config(cls, library_config: dict,
+                    on_progress: Optional[Callable[[int, int], None]] = None,
+                    db_executor: Optional[DbExecutor] = None) -> "LibraryScanner":
+        """설정(library 섹션)으로 생성"""
+        return cls(
+            on_progress=on_progress,
+            db_executor=db_executor,
+            workers=int(library_config.get("scan_workers", DEFAULT_SCAN_WORKERS)),
+            use_processes=bool(library_config.get("scan_use_processes", False)),
+            batch_size=int(library_config.get("scan_batch_size", DEFAULT_BATCH_SIZE)),
+            exclude=library_config.get("scan_exclude", DEFAULT_EXCLUDE),
+            skip_hidden=bool(library_config.get("scan_skip_hidden", True)),
+        )
+
+    @property
+    def artwork(self) -> ArtworkStore:
+        """앨범아트 저장소"""
+        return self._artwork
+
+    @property
+    def folder_covers(self) -> dict[str, Optional[str]]:
+        """마지막 스캔에서 폴더별로 선택된 커버 이미지 (폴더 경로 → 이미지 경로 또는 None)"""
+        with self._cover_lock:
+            return dict(self._folder_covers)
+
+    def _reset_covers(self):
+        """스캔 시작 시 커버 캐시 초기화 (이전 스캔 이후 바뀐 이미지 반영)"""
+        with self._cover_lock:
+            self._album_covers.clear()
+            self._folder_covers.clear()
 
     def scan_folder(self, folder_path: str) -> list[dict]:
-        """폴더 스캔"""
+        """폴더 스캔 (DB 반영 없이 모든 트랙 반환)"""
         folder = Path(folder_path)
         if not folder.exists():
             logger.error(f"폴더 없음: {folder_path}")
             return []
 
-        audio_files = [f for f in folder.rglob("*") if f.suffix.lower() in AUDIO_EXTENSIONS]
-        total = len(audio_files)
-        logger.info(f"스캔 시작: {total}개 파일")
+        self._reset_covers()
+        audio_files = self._collect_files(folder)
+        logger.info(f"스캔 시작: {len(audio_files)}개 파일 (작업자 {self._workers})")
+        tracks = list(self.iter_tracks(audio_files))
+        logger.info(f"스캔 완료: {len(tracks)}개 트랙")
+        return tracks
+
+    def rescan(self, folder_path: str,
+               on_batch: Optional[Callable[[list[dict], list[dict]], None]] = None,
+               cancel: Optional[threading.Event] = None, resume: bool = True) -> ScanResult:
+        """
+        증분 스캔 후 배치 단위로 DB 반영
+
+        파일 크기/수정 시각이 DB 스냅샷과 다른 파일만 추출하고,
+        batch_size개마다 한 트랜잭션으로 저장한 뒤 on_batch(추가된 트랙, 갱신된 트랙)을 호출합니다.
+        전달되는 트랙에는 DB id가 채워져 있습니다.
+
+        스캔은 DB의 스캔 작업(scan_jobs)으로 기록되고, 배치를 저장할 때마다
+        모든 파일이 저장된 폴더를 체크포인트로 남깁니다.
+        cancel이 설정되면 진행 중인 파일까지만 저장하고 멈추며(삭제 반영 생략),
+        같은 폴더를 다시 스캔하면 완료된 폴더의 파일은 건너뛰고 이어서 진행합니다.
+
+        Args:
+            on_batch: 배치 저장 후 호출
+            cancel: 취소 토큰
+            resume: 중단된 작업이 있으면 이어서 진행 (False: 처음부터)
+        """
+        result = ScanResult()
+        folder = Path(folder_path)
+        if not folder.exists():
+            # 분리된 드라이브 등: 삭제로 처리하지 않음
+            logger.error(f"폴더 없음: {folder_path}")
+            return result
+
+        job_id, completed_dirs = self._start_job(folder_path, resume)
+        result.resumed = bool(completed_dirs)
+        self._reset_covers()
+        snapshot = TrackRepository.get_scan_snapshot(folder_path)
+        seen: set[str] = set()
+        dirs: list[str] = []  # 파일을 발견한 폴더 (탐색 순서)
+        unsaved: set[str] = set()  # 추출을 맡겼지만 아직 저장되지 않은 파일 (진행 중 + 추출 실패)
+        entries = walk_audio_files(str(folder), AUDIO_EXTENSIONS, self._exclude, self._skip_hidden,
+                                   skip_files_in=completed_dirs)
+        changed = self._changed_files(entries, snapshot, seen, result, dirs, cancel, unsaved)
+
+        # 탐색과 추출이 동시에 진행됨 (발견한 폴더의 파일이 바로 작업자에게 전달)
+        checkpoint = _Checkpoint(job_id, dirs)
+        batch = []
+        for track in self.iter_tracks(changed):
+            batch.append(track)
+            # 체크포인트는 배치 저장 직후에만 기록되므로 배치에 넣으면 저장된 것으로 봄
+            unsaved.discard(track["file_path"])
+            if len(batch) >= self._batch_size:
+                self._commit_batch(batch, snapshot, result, on_batch)
+                checkpoint.save(batch[-1]["file_path"] if self._ordered else None, len(seen), unsaved=unsaved)
+                batch = []
+        if batch:
+            self._commit_batch(batch, snapshot, result, on_batch)
+        result.failed = len(seen) - result.unchanged - result.added - result.updated
+
+        if cancel is not None and cancel.is_set():
+            # 제출된 파일은 모두 처리됨 → 마지막 폴더(일부만 탐색됐을 수 있음)를 뺀 폴더가 완료
+            checkpoint.save(None, len(seen), finished_dirs=len(dirs) - 1,
+                            status=ScanJobRepository.CANCELLED, unsaved=unsaved)
+            result.cancelled = True
+            logger.info(f"스캔 취소 (다음 스캔에서 이어서 진행): {result.summary()}")
+            return result
+
+        # 이어서 진행한 경우 이전에 완료된 폴더의 파일은 삭제 대상이 아님
+        removed = [path for path in snapshot
+                   if path not in seen and os.path.dirname(path) not in completed_dirs]
+        if removed:
+            self._write(TrackRepository.apply_scan, [], [], removed)
+            result.removed = len(removed)
+        if result.removed or result.updated:
+            # 삭제/변경된 트랙만 참조하던 앨범아트 정리
+            self._artwork.collect_garbage()
+        ScanJobRepository.finish(job_id)
+
+        logger.info(f"증분 스캔 완료: {result.summary()}")
+        return result
+
+    @staticmethod
+    def _start_job(folder_path: str, resume: bool) -> tuple[int, set[str]]:
+        """스캔 작업 시작 → (작업 ID, 이미 완료된 폴더)"""
+        interrupted = ScanJobRepository.find_interrupted(folder_path)
+        if resume and interrupted:
+            job = interrupted.pop(0)
+            completed_dirs = ScanJobRepository.get_completed_dirs(job["id"])
+            logger.info(f"중단된 스캔 이어서 진행: {folder_path} (완료된 폴더 {len(completed_dirs)}개)")
+            job_id = job["id"]
+        else:
+            job_id, completed_dirs = ScanJobRepository.create(folder_path), set()
+        for job in interrupted:
+            ScanJobRepository.finish(job["id"])
+        return job_id, completed_dirs
+
+    @staticmethod
+    def _changed_files(entries: Iterable[WalkEntry], snapshot: dict[str, tuple],
+                       seen: set[str], result: ScanResult, dirs: list[str],
+                       cancel: Optional[threading.Event] = None,
+                       unsaved: Optional[set[str]] = None) -> Iterator[Path]:
+        """
+        탐색 결과를 스냅샷과 비교해 추출이 필요한 파일만 내보냄
+
+        seen에 발견한 경로, dirs에 파일을 발견한 폴더를 탐색 순서대로, unsaved에 내보낸 경로를 기록합니다.
+        cancel이 설정되면 더 내보내지 않습니다.
+        """
+        for entry in entries:
+            if cancel is not None and cancel.is_set():
+                return
+            directory = os.path.dirname(entry.path)
+            if not dirs or dirs[-1] != directory:
+                dirs.append(directory)
+            seen.add(entry.path)
+            previous = snapshot.get(entry.path)
+            if previous is not None and previous[:2] == (entry.size, entry.mtime):
+                result.unchanged += 1
+            else:
+                if unsaved is not None:
+                    unsaved.add(entry.path)
+                yield Path(entry.path)
+
+    def _write(self, fn: Callable, *args):
+        """DB 쓰기 (실행기가 있으면 백그라운드 우선순위 - 대기 중인 화면 조회가 먼저 실행됨)"""
+        if self._db_executor is None:
+            return fn(*args)
+        return self._db_executor.call(fn, *args, priority=BACKGROUND)
+
+    def _commit_batch(self, batch: list[dict], snapshot: dict[str, tuple], result: ScanResult,
+                      on_batch: Optional[Callable[[list[dict], list[dict]], None]]):
+        """한 배치를 한 트랜잭션으로 저장 후 이벤트 전달"""
+        added = [t for t in batch if t["file_path"] not in snapshot]
+        updated = [t for t in batch if t["file_path"] in snapshot]
+        for track in updated:
+            track["id"] = snapshot[track["file_path"]][2]
+        for track, track_id in zip(added, self._write(TrackRepository.apply_scan, added, updated, [])):
+            track["id"] = track_id
+        result.added += len(added)
+        result.updated += len(updated)
+        if on_batch:
+            on_batch(added, updated)
+
+    def _walk(self, folder: Path) -> Iterator[WalkEntry]:
+        """폴더 아래 오디오 파일 탐색 (os.scandir)"""
+        return walk_audio_files(str(folder), AUDIO_EXTENSIONS, self._exclude, self._skip_hidden)
+
+    def _collect_files(self, folder: Path) -> list[Path]:
+        """폴더 아래 오디오 파일 목록"""
+        return [Path(entry.path) for entry in self._walk(folder)]
+
+    def iter_tracks(self, audio_files: Iterable[Path]) -> Iterator[dict]:
+        """
+        추출된 트랙을 하나씩 내보내는 제너레이터 (작업자 수에 따라 순차/병렬)
+
+        audio_files가 리스트면 진행률의 전체 수가 고정되고,
+        제너레이터면 지금까지 발견한 파일 수가 전체 수로 보고됩니다.
+        """
+        if self._workers == 1:
+            return self._iter_serial(audio_files)
+        return self._iter_parallel(audio_files)
 
-        tracks = []
+    def _iter_serial(self, audio_files: Iterable[Path]) -> Iterator[dict]:
+        """순차 추출"""
+        total = len(audio_files) if isinstance(audio_files, list) else None
         for i, file_path in enumerate(audio_files):
             track = self._extract_metadata(file_path)
-            if track:
-                tracks.append(track)
             if self._on_progress:
-                self._on_progress(i + 1, total)
+                self._on_progress(i + 1, total or i + 1)
+            if track:
+                yield track
 
-        logger.info(f"스캔 완료: {len(tracks)}개 트랙")
-        return tracks
+    def _iter_parallel(self, audio_files: Iterable[Path]) -> Iterator[dict]:
+        """
+        작업자 풀에서 병렬 추출
+
+        동시에 진행 중인(완료 후 순서 대기 포함) 작업을 workers * _IN_FLIGHT_PER_WORKER개로
+        제한하여 결과가 한꺼번에 메모리에 쌓이지 않게 합니다.
+        """
+        total = len(audio_files) if isinstance(audio_files, list) else None
+        files = iter(audio_files)
+        if self._use_processes:
+            executor = ProcessPoolExecutor(
+                max_workers=self._workers, initializer=_init_worker,
+                initargs=(str(self._artwork.root), self._artwork.sizes, self._exclude, self._skip_hidden),
+            )
+            extract = _extract_in_worker
+        else:
+            executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="scan")
+            extract = self._extract_metadata
+
+        window = self._workers * _IN_FLIGHT_PER_WORKER
+        pending: dict = {}  # future → (파일 인덱스, 경로)
+        buffered: dict[int, Optional[dict]] = {}  # 순서 대기 중인 결과
+        next_index = 0
+        submitted = 0
+        completed = 0
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) + len(buffered) < window:
+                    file_path = next(files, None)
+                    if file_path is None:
+                        exhausted = True
+                        break
+                    arg = str(file_path) if self._use_processes else file_path
+                    pending[executor.submit(extract, arg)] = (submitted, file_path)
+                    submitted += 1
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, file_path = pending.pop(future)
+                    try:
+                        track = future.result()
+                    except Exception as e:
+                        logger.warning(f"메타데이터 추출 실패: {file_path} - {e}")
+                        track = None
+                    completed += 1
+                    if self._on_progress:
+                        self._on_progress(completed, total or submitted)
+                    if self._ordered:
+                        buffered[index] = track
+                    elif track:
+                        yield track
+
+                while next_index in buffered:
+                    track = buffered.pop(next_index)
+                    next_index += 1
+                    if track:
+                        yield track
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
 
     def _extract_metadata(self, file_path: Path) -> Optional[dict]:
-        """메타데이터 추출"""
+        """메타데이터 추출 (파일당 mutagen 파싱 1회로 태그와 앨범아트 모두 읽음)"""
         try:
-            audio = mutagen.File(str(file_path), easy=True)
+            stat = file_path.stat()
+            audio = mutagen.File(str(file_path))
             if audio is None:
                 return None
 
-            # 1. 임베디드 앨범아트 추출 시도 (우선)
-            cover_path = self._extract_embedded_cover(file_path)
-            
-            # 2. 없으면 폴더 내 이미지 파일 탐색
-            if not cover_path:
-                cover_path = self._find_cover_image(file_path.parent)
+            tags = self._read_tags(audio)
+            album = self._get_tag(tags, "album", "Unknown")
+            artwork_hash, cover_path = self._resolve_cover(file_path, album, audio)
 
             return {
                 "file_path": str(file_path),
-                "title": self._get_tag(audio, "title", file_path.stem),
-                "artist": self._get_tag(audio, "artist", "Unknown"),
-                "album": self._get_tag(audio, "album", "Unknown"),
-                "album_artist": self._get_tag(audio, "albumartist", ""),
+                "title": self._get_tag(tags, "title", file_path.stem),
+                "artist": self._get_tag(tags, "artist", "Unknown"),
+                "album": album,
+                "album_artist": self._get_tag(tags, "albumartist", ""),
                 "folder_name": file_path.parent.name,
                 "cover_path": cover_path,
-                "track_number": self._parse_track_number(self._get_tag(audio, "tracknumber", "")),
-                "genre": self._get_tag(audio, "genre", ""),
-                "composer": self._get_tag(audio, "composer", ""),
-                "conductor": self._get_tag(audio, "conductor", ""),
-                "performer": self._get_tag(audio, "performer", ""),
+                "artwork_hash": artwork_hash,
+                "track_number": self._parse_track_number(self._get_tag(tags, "tracknumber", "")),
+                "genre": self._get_tag(tags, "genre", ""),
                 "duration_seconds": audio.info.length if audio.info else 0,
                 "sample_rate": getattr(audio.info, "sample_rate", 0),
                 "bit_depth": getattr(audio.info, "bits_per_sample", 16),
-                "bitrate": getattr(audio.info, "bitrate", 0),
                 "channels": getattr(audio.info, "channels", 2),
                 "format": file_path.suffix.upper().replace(".", ""),
+                "file_size": stat.st_size,
+                "last_modified": stat.st_mtime,
+                **self._extended_fields(audio, tags),
             }
         except Exception as e:
             logger.warning(f"메타데이터 추출 실패: {file_path} - {e}")
             return None
 
-    def _extract_embedded_cover(self, file_path: Path) -> Optional[str]:
-        """파일 내장 앨범아트 추출"""
-        try:
-            suffix = file_path.suffix.lower()
-            artwork_data = None
-            
-            # FLAC
-            if suffix == ".flac":
-                audio = FLAC(str(file_path))
-                if audio.pictures:
-                    artwork_data = audio.pictures[0].data
-                    
-            # MP3 (ID3)
-            elif suffix == ".mp3":
-                audio = MP3(str(file_path), ID3=ID3)
-                if audio.tags:
-                    for key in audio.tags.keys():
-                        if key.startswith("APIC"):
-                            artwork_data = audio.tags[key].data
-                            break
-                            
-            # M4A / AAC (MP4)
-            elif suffix == ".m4a":
-                audio = MP4(str(file_path))
-                if "covr" in audio.tags:
-                    covers = audio.tags["covr"]
-                    if covers:
-                        artwork_data = bytes(covers[0])
-            
-            # 이미지 데이터가 있으면 캐시에 저장
-            if artwork_data:
-                # 파일 경로 해시로 고유 이름 생성
-                file_hash = hashlib.md5(str(file_path).encode()).hexdigest()[:12]
-                cache_path = COVERS_DIR / f"{file_hash}.jpg"
-                
-                if not cache_path.exists():
-                    cache_path.write_bytes(artwork_data)
-                    logger.debug(f"임베디드 커버 추출: {cache_path}")
-                
-                return str(cache_path)
-                
-        except Exception as e:
-            logger.debug(f"임베디드 커버 추출 실패: {file_path} - {e}")
-        
+    def _extended_fields(self, audio, tags: dict[str, str]) -> dict:
+        """확장 태그/스트림 정보 (BackfillRepository.COLUMNS - 백필도 같은 값을 씀)"""
+        return {
+            "composer": self._get_tag(tags, "composer", ""),
+            "conductor": self._get_tag(tags, "conductor", ""),
+            "performer": self._get_tag(tags, "performer", ""),
+            "year": self._parse_year(self._get_tag(tags, "date", "")),
+            "disc_number": self._parse_track_number(self._get_tag(tags, "discnumber", "")) or None,
+            "bitrate": getattr(audio.info, "bitrate", 0),
+        }
+
+    def backfill_metadata(self, cancel: Optional[threading.Event] = None) -> int:
+        """
+        스키마 마이그레이션 2 이전에 저장된 트랙의 확장 메타데이터를 파일에서 다시 읽어 채움
+
+        batch_size개씩 태그만 읽고(앨범아트 제외) 한 트랜잭션으로 저장하며,
+        진행 위치가 DB에 남으므로 취소되거나 앱이 종료되어도 다음 실행에서 이어서 채웁니다.
+
+        Returns:
+            채운 트랙 수
+        """
+        filled = 0
+        while not (cancel and cancel.is_set()):
+            rows = BackfillRepository.next_batch(self._batch_size)
+            if not rows:
+                BackfillRepository.finish()
+                break
+            values = {}
+            for row in rows:
+                try:
+                    audio = mutagen.File(row["file_path"])
+                except Exception as e:
+                    logger.debug(f"백필 태그 읽기 실패: {row['file_path']} - {e}")
+                    continue
+                if audio is not None:
+                    values[row["id"]] = self._extended_fields(audio, self._read_tags(audio))
+            self._write(BackfillRepository.save_batch, values, rows[-1]["id"])
+            filled += len(values)
+        if filled:
+            logger.info(f"확장 메타데이터 백필: 트랙 {filled}개")
+        return filled
+
+    @staticmethod
+    def _read_tags(audio) -> dict[str, str]:
+        """
+        포맷별 태그를 공통 키(title, artist, album, ...)로 정규화
+
+        ID3(MP3/WAV/AIFF/DSF)와 MP4는 프레임/아톰 이름을 변환하고,
+        Vorbis Comment(FLAC/OGG)와 APEv2는 대소문자 무관 키를 그대로 사용합니다.
+        """
+        tags = audio.tags
+        if not tags:
+            return {}
+
+        if isinstance(tags, ID3):
+            normalized = {}
+            for key, frame_id in ID3_TAG_FRAMES.items():
+                frame = tags.get(frame_id)
+                if frame is None:
+                    continue
+                # TCON은 "(13)" 같은 ID3v1 장르 번호를 이름으로 변환
+                values = frame.genres if frame_id == "TCON" else frame.text
+                if values:
+                    normalized[key] = str(values[0])
+            return normalized
+
+        if isinstance(tags, MP4Tags):
+            normalized = {}
+            for key, atom in MP4_TAG_ATOMS.items():
+                values = tags.get(atom)
+                if values:
+                    value = values[0]
+                    # trkn: [(번호, 전체)]
+                    normalized[key] = str(value[0]) if isinstance(value, tuple) else str(value)
+            return normalized
+
+        normalized = {}
+        for key in COMMON_TAG_KEYS:
+            try:
+                values = tags.get(key)
+            except (KeyError, ValueError):
+                continue
+            if values:
+                value = values[0] if isinstance(values, list) else values
+                normalized[key] = str(value)
+        return normalized
+
+    @staticmethod
+    def _read_artwork(audio) -> Optional[bytes]:
+        """이미 파싱된 파일 객체에서 내장 앨범아트 데이터 추출"""
+        pictures = getattr(audio, "pictures", None)  # FLAC
+        if pictures:
+            return pictures[0].data
+
+        tags = audio.tags
+        if not tags:
+            return None
+        if isinstance(tags, ID3):
+            frames = tags.getall("APIC")
+            return frames[0].data if frames else None
+        if isinstance(tags, MP4Tags):
+            covers = tags.get("covr")
+            return bytes(covers[0]) if covers else None
         return None
 
+    def _resolve_cover(self, file_path: Path, album: str, audio) -> tuple[Optional[str], Optional[str]]:
+        """
+        앨범 커버 결정 (폴더 + 앨범 단위로 한 번만) → (앨범아트 해시, 커버 경로)
+
+        앨범의 첫 트랙에서 내장 아트나 폴더 이미지를 앨범아트 저장소에 넣고,
+        같은 앨범의 나머지 트랙은 그 결과를 재사용합니다.
+        """
+        album_key = f"{file_path.parent}|{album}"
+        with self._cover_lock:
+            if album_key in self._album_covers:
+                return self._album_covers[album_key]
+
+        # 1. 임베디드 앨범아트 (우선), 없으면 폴더 내 이미지 파일
+        artwork = self._read_artwork(audio)
+        source = None
+        if not artwork:
+            source = self._find_cover_image(file_path.parent)
+            if source:
+                try:
+                    artwork = Path(source).read_bytes()
+                except OSError as e:
+                    logger.debug(f"커버 이미지 읽기 실패: {source} - {e}")
+
+        cover = (None, source)
+        if artwork:
+            try:
+                cover = self._artwork.ingest(artwork)
+            except OSError as e:
+                logger.debug(f"앨범아트 저장 실패: {file_path} - {e}")
+
+        with self._cover_lock:
+            return self._album_covers.setdefault(album_key, cover)
+
     def _find_cover_image(self, folder: Path) -> Optional[str]:
-        """폴더 내 커버 이미지 탐색"""
+        """폴더 내 커버 이미지 탐색 (폴더당 목록 한 번, 결과는 스캔 동안 캐시)"""
+        key = str(folder)
+        # 목록 읽기까지 잠금 안에서 수행: 같은 폴더의 트랙을 처리하는 작업자들이 중복으로 읽지 않음
+        with self._cover_lock:
+            if key not in self._folder_covers:
+                self._folder_covers[key] = self._pick_cover_image(folder)
+            return self._folder_covers[key]
+
+    @staticmethod
+    def _pick_cover_image(folder: Path) -> Optional[str]:
+        """폴더 목록 한 번으로 커버 이미지 선택 (이름 대소문자 무시)"""
+        images: dict[str, str] = {}  # 소문자 이름 → 실제 경로
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    name = entry.name.lower()
+                    if name.endswith(COVER_EXTENSIONS) and name not in images:
+                        images[name] = entry.path
+        except OSError as e:
+            logger.debug(f"커버 폴더 읽기 실패: {folder} - {e}")
+            return None
+        if not images:
+            return None
+
         # 우선순위 순으로 검색
         for filename in COVER_FILENAMES:
-            cover_file = folder / filename
-            if cover_file.exists():
-                logger.debug(f"커버 이미지 발견: {cover_file}")
-                return str(cover_file)
-        
-        # 없으면 폴더 내 첫 번째 이미지 파일 사용
-        for ext in [".jpg", ".jpeg", ".png"]:
-            images = list(folder.glob(f"*{ext}"))
-            if images:
-                logger.debug(f"대체 이미지 사용: {images[0]}")
-                return str(images[0])
-        
+            if filename in images:
+                logger.debug(f"커버 이미지 발견: {images[filename]}")
+                return images[filename]
+
+        # 없으면 폴더 내 첫 번째 이미지 파일 사용 (확장자 우선순위, 이름 순)
+        for ext in COVER_EXTENSIONS:
+            candidates = sorted(name for name in images if name.endswith(ext))
+            if candidates:
+                logger.debug(f"대체 이미지 사용: {images[candidates[0]]}")
+                return images[candidates[0]]
         return None
 
     @staticmethod
@@ -206,6 +728,12 @@ class LibraryScanner:
         
         return text
 
+    @staticmethod
+    def _parse_year(date_str: str) -> Optional[int]:
+        """연도 파싱 (예: '2001-05-12', '2001' → 2001)"""
+        match = re.match(r"\s*(\d{4})", date_str or "")
+        return int(match.group(1)) if match else None
+
     @staticmethod
     def _parse_track_number(track_str: str) -> int:
         """트랙 번호 파싱 (예: '5/12' → 5)"""
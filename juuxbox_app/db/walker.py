@@ -0,0 +1,142 @@
+"""
+Library Walker
+==============
+os.scandir 기반 음원 파일 탐색기
+
+- 확장자를 먼저 확인하여 이미지/cue/log 등은 Path 생성이나 stat 없이 건너뜀
+- DirEntry의 stat 정보 사용 (Windows는 디렉토리 목록에 포함되어 추가 호출 없음)
+- 제외 패턴(glob), 숨김/시스템 폴더 건너뛰기
+- 심볼릭 링크/정션으로 인한 순환 감지 (장치 + inode 기준)
+- 제너레이터: 발견 즉시 다음 단계(파싱 작업자)로 전달
+"""
+
+import fnmatch
+import logging
+import os
+import re
+import stat as stat_module
+from dataclasses import dataclass
+from typing import Container, Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# 기본 제외 폴더 (NAS 썸네일/휴지통, Windows 시스템 폴더)
+DEFAULT_EXCLUDE = ("@eaDir", "#recycle", "$RECYCLE.BIN", "System Volume Information")
+
+# Windows 숨김/시스템 속성
+_HIDDEN_ATTRIBUTES = (getattr(stat_module, "FILE_ATTRIBUTE_HIDDEN", 2)
+                      | getattr(stat_module, "FILE_ATTRIBUTE_SYSTEM", 4))
+
+
+@dataclass(frozen=True)
+class WalkEntry:
+    """탐색된 음원 파일"""
+    path: str
+    size: int
+    mtime: float
+
+
+def _is_hidden(entry: os.DirEntry) -> bool:
+    if entry.name.startswith("."):
+        return True
+    if os.name == "nt":
+        try:
+            return bool(entry.stat(follow_symlinks=False).st_file_attributes & _HIDDEN_ATTRIBUTES)
+        except OSError:
+            return False
+    return False
+
+
+def _dir_key(path: str, entry: os.DirEntry = None) -> tuple[int, int]:
+    """디렉토리 식별자 (장치, inode)"""
+    st = entry.stat() if entry is not None else os.stat(path)
+    if not st.st_ino:
+        # Windows DirEntry.stat()은 inode를 채우지 않음
+        st = os.stat(path)
+    return st.st_dev, st.st_ino
+
+
+def _compile(patterns: list[str]):
+    if not patterns:
+        return None
+    # fnmatch와 같이 Windows에서는 대소문자 무시
+    flags = re.IGNORECASE if os.name == "nt" else 0
+    return re.compile("|".join(fnmatch.translate(p) for p in patterns), flags).match
+
+
+def walk_audio_files(root: str, extensions: Iterable[str],
+                     exclude: Iterable[str] = DEFAULT_EXCLUDE,
+                     skip_hidden: bool = True,
+                     skip_files_in: Optional[Container[str]] = None) -> Iterator[WalkEntry]:
+    """
+    root 아래 음원 파일을 발견 순서대로 내보냄
+
+    Args:
+        root: 탐색할 폴더
+        extensions: 허용 확장자 (소문자, 점 포함)
+        exclude: 제외할 이름/상대 경로 glob 패턴 (예: "@eaDir", "*/Scans/*", "*.tmp.flac")
+        skip_hidden: 숨김/시스템 폴더와 파일 건너뛰기
+        skip_files_in: 파일을 내보내지 않을 폴더 (하위 폴더는 계속 탐색, 중단된 스캔 이어하기용)
+    """
+    extensions = frozenset(extensions)
+    root = os.path.abspath(root)
+    patterns = tuple(exclude)
+    # 이름 패턴과 상대 경로 패턴을 각각 하나의 정규식으로 (항목마다 fnmatch 반복 방지)
+    name_match = _compile([p for p in patterns if "/" not in p])
+    path_match = _compile([p for p in patterns if "/" in p])
+    prefix_len = len(os.path.join(root, ""))
+
+    def excluded(name: str, path: str) -> bool:
+        if name_match and name_match(name):
+            return True
+        if path_match:
+            return bool(path_match(path[prefix_len:].replace(os.sep, "/")))
+        return False
+
+    try:
+        stack = [(root, _dir_key(root))]
+    except OSError as e:
+        logger.error(f"폴더 탐색 실패: {root} - {e}")
+        return
+
+    # 탐색할 때 방문 처리 → 링크보다 이름 순으로 먼저 만난 실제 경로가 우선
+    visited: set[tuple[int, int]] = set()
+    while stack:
+        directory, key = stack.pop()
+        if key in visited:
+            logger.warning(f"순환 링크 건너뜀: {directory}")
+            continue
+        visited.add(key)
+        list_files = not (skip_files_in and directory in skip_files_in)
+        try:
+            with os.scandir(directory) as entries:
+                subdirs = []
+                for entry in entries:
+                    name = entry.name
+                    try:
+                        if entry.is_dir():
+                            if (skip_hidden and _is_hidden(entry)) or excluded(name, entry.path):
+                                continue
+                            subdirs.append((entry.path, _dir_key(entry.path, entry)))
+                            continue
+
+                        if not list_files:
+                            continue
+                        dot = name.rfind(".")
+                        if dot <= 0 or name[dot:].lower() not in extensions:
+                            continue
+                        if (skip_hidden and name.startswith(".")) or excluded(name, entry.path):
+                            continue
+                        st = entry.stat()
+                        if not stat_module.S_ISREG(st.st_mode):
+                            continue
+                        yield WalkEntry(entry.path, st.st_size, st.st_mtime)
+                    except OSError as e:
+                        logger.debug(f"항목 건너뜀: {entry.path} - {e}")
+        except OSError as e:
+            logger.warning(f"폴더 읽기 실패: {directory} - {e}")
+            continue
+
+        # 이름 순으로 깊이 우선 탐색 (스택이므로 역순으로 넣음)
+        subdirs.sort(reverse=True)
+        stack.extend(subdirs)
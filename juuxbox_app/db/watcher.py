@@ -0,0 +1,386 @@
+"""
+Library Watcher
+===============
+라이브러리 폴더 감시 → 변경된 파일만 DB에 반영
+
+- watchdog으로 library.scan_paths 폴더를 재귀 감시
+- 생성/수정/이동/삭제 이벤트를 모아 두었다가 조용해지면(debounce) 한 트랜잭션으로 반영
+- 생성/수정된 파일만 다시 파싱, 이동은 태그를 다시 읽지 않고 경로만 변경
+- 폴더 이동/삭제는 DB에 있는 하위 트랙 전체에 적용, 새 폴더는 폴더 안을 탐색
+"""
+
+import fnmatch
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from .executor import BACKGROUND, DbExecutor
+from .repository import TrackRepository
+from .scanner import AUDIO_EXTENSIONS, LibraryScanner
+from .walker import DEFAULT_EXCLUDE, walk_audio_files
+
+logger = logging.getLogger(__name__)
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+    logger.warning("watchdog 미설치 - 라이브러리 실시간 감시 비활성화")
+
+# 마지막 이벤트 후 이만큼 조용하면 반영
+DEFAULT_DEBOUNCE_SECONDS = 2.0
+# 이벤트가 계속 들어와도 이 배수만큼 지나면 반영 (대용량 복사 중에도 진행 상황 표시)
+MAX_DELAY_FACTOR = 10
+
+
+@dataclass
+class WatchBatch:
+    """한 번의 반영 결과"""
+    added: list[dict] = field(default_factory=list)
+    updated: list[dict] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    moved: list[tuple[str, str]] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.updated or self.removed or self.moved)
+
+
+if WATCHDOG_AVAILABLE:
+    class _EventHandler(FileSystemEventHandler):
+        """watchdog 이벤트 → LibraryWatcher.handle_event"""
+
+        def __init__(self, watcher: "LibraryWatcher"):
+            super().__init__()
+            self._watcher = watcher
+
+        def on_any_event(self, event):
+            self._watcher.handle_event(event.event_type, event.src_path,
+                                       getattr(event, "dest_path", ""), event.is_directory)
+
+
+class LibraryWatcher:
+    """라이브러리 폴더 감시자"""
+
+    def __init__(self, scanner: Optional[LibraryScanner] = None,
+                 on_change: Optional[Callable[[WatchBatch], None]] = None,
+                 debounce: float = DEFAULT_DEBOUNCE_SECONDS,
+                 exclude: Iterable[str] = DEFAULT_EXCLUDE, skip_hidden: bool = True,
+                 db_executor: Optional[DbExecutor] = None):
+        """
+        Args:
+            scanner: 변경된 파일을 파싱할 스캐너
+            on_change: 반영 후 호출 (작업 스레드에서 호출됨)
+            debounce: 마지막 이벤트 후 반영까지 대기 시간(초)
+            exclude: 무시할 폴더/파일 이름 glob 패턴
+            skip_hidden: 숨김 폴더/파일 무시
+            db_executor: 반영 쓰기를 백그라운드 우선순위로 실행할 DB 실행기 (None: 감시 스레드에서 바로 저장)
+        """
+        self._scanner = scanner or LibraryScanner(db_executor=db_executor)
+        self._db_executor = db_executor
+        self._on_change = on_change
+        self._debounce = debounce
+        self._exclude = tuple(exclude)
+        self._skip_hidden = skip_hidden
+        # 감시 폴더 (절대 경로, 깊은 폴더 먼저) - 제외 판단은 이 폴더 기준 상대 경로로
+        self._roots: list[str] = []
+
+        # 대기 중인 변경 (다음 반영 때 한 번에 처리)
+        self._upserts: set[str] = set()
+        self._removed: set[str] = set()
+        self._moves: dict[str, str] = {}  # 원래 경로 → 현재 경로
+        self._dir_moves: list[tuple[str, str]] = []
+        self._removed_dirs: set[str] = set()
+        self._new_dirs: set[str] = set()
+        self._first_event: Optional[float] = None
+        self._last_event = 0.0
+
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._observer = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    @classmethod
+    def from_config(cls, library_config: dict,
+                    on_change: Optional[Callable[[WatchBatch], None]] = None,
+                    db_executor: Optional[DbExecutor] = None) -> "LibraryWatcher":
+        """설정(library 섹션)으로 생성"""
+        return cls(
+            scanner=LibraryScanner.from_config(library_config, db_executor=db_executor),
+            db_executor=db_executor,
+            on_change=on_change,
+            debounce=float(library_config.get("watch_debounce_seconds", DEFAULT_DEBOUNCE_SECONDS)),
+            exclude=library_config.get("scan_exclude", DEFAULT_EXCLUDE),
+            skip_hidden=bool(library_config.get("scan_skip_hidden", True)),
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._observer is not None
+
+    def start(self, paths: Iterable[str]) -> bool:
+        """감시 시작"""
+        if not WATCHDOG_AVAILABLE:
+            return False
+        if self._observer:
+            return True
+        self._stopping = False
+        self._observer = Observer()
+        for path in paths:
+            self.add_path(path)
+        self._observer.start()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="LibraryWatcher")
+        self._thread.start()
+        return True
+
+    def add_path(self, path: str):
+        """감시 폴더 추가 (실행 중이면 바로 감시)"""
+        root = os.path.abspath(path)
+        if root not in self._roots:
+            self._roots.append(root)
+            self._roots.sort(key=len, reverse=True)
+        if self._observer:
+            self._schedule(path)
+
+    def stop(self):
+        """감시 중지 (대기 중인 변경은 반영)"""
+        if not self._observer:
+            return
+        self._observer.stop()
+        self._observer.join(timeout=5)
+        self._observer = None
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.flush()
+
+    def _schedule(self, path: str):
+        if not os.path.isdir(path):
+            logger.warning(f"감시할 폴더 없음: {path}")
+            return
+        try:
+            self._observer.schedule(_EventHandler(self), path, recursive=True)
+            logger.info(f"라이브러리 감시: {path}")
+        except OSError as e:
+            logger.warning(f"폴더 감시 실패: {path} - {e}")
+
+    # ===== 이벤트 수집 =====
+
+    def _relative_parts(self, path: str) -> Optional[list[str]]:
+        """감시 폴더 기준 경로 구성 요소 (감시 폴더 밖이면 None)"""
+        path = os.path.abspath(path)
+        for root in self._roots:
+            if path == root:
+                return []
+            prefix = os.path.join(root, "")
+            if path.startswith(prefix):
+                return path[len(prefix):].split(os.sep)
+        return None
+
+    def _ignored(self, path: str) -> bool:
+        """
+        숨김/제외 경로 여부 (감시 폴더 밖도 무시)
+
+        walk_audio_files와 같이 감시 폴더 아래 구성 요소만 봄
+        → ~/.local/share/music처럼 숨김/제외 이름 아래 있는 라이브러리도 감시됨
+        """
+        parts = self._relative_parts(path)
+        if parts is None:
+            return True
+        for part in parts:
+            if self._skip_hidden and part.startswith("."):
+                return True
+            if any(fnmatch.fnmatch(part, p) for p in self._exclude):
+                return True
+        return False
+
+    def _is_audio(self, path: str) -> bool:
+        return os.path.splitext(path)[1].lower() in AUDIO_EXTENSIONS and not self._ignored(path)
+
+    def handle_event(self, kind: str, src: str, dest: str = "", is_directory: bool = False):
+        """
+        파일시스템 이벤트 기록 (watchdog 스레드에서 호출)
+
+        Args:
+            kind: "created" / "modified" / "closed" / "deleted" / "moved"
+            src: 경로 (이동은 이전 경로)
+            dest: 이동 후 경로
+            is_directory: 폴더 이벤트 여부
+        """
+        with self._cond:
+            if is_directory:
+                changed = self._record_dir_event(kind, src, dest)
+            else:
+                changed = self._record_file_event(kind, src, dest)
+            if not changed:
+                return
+            now = time.monotonic()
+            if self._first_event is None:
+                self._first_event = now
+            self._last_event = now
+            self._cond.notify_all()
+
+    def _record_file_event(self, kind: str, src: str, dest: str) -> bool:
+        if kind == "moved":
+            src_audio, dest_audio = self._is_audio(src), self._is_audio(dest)
+            if src_audio and dest_audio:
+                self._record_move(src, dest)
+                return True
+            if src_audio:
+                # 음원 → 다른 확장자/무시 폴더로 이동: 삭제
+                kind, dest = "deleted", ""
+            elif dest_audio:
+                # 임시 파일 → 음원 (다운로드/리핑 완료): 생성
+                kind, src = "created", dest
+            else:
+                return False
+
+        if not self._is_audio(src):
+            return False
+        if kind in ("created", "modified", "closed"):
+            self._removed.discard(src)
+            self._upserts.add(src)
+        elif kind == "deleted":
+            self._upserts.discard(src)
+            origin = self._pop_move_to(src)
+            self._removed.add(origin or src)
+        else:
+            return False
+        return True
+
+    def _record_move(self, src: str, dest: str):
+        """이동 기록 (연속 이동은 원래 경로 기준으로 합침)"""
+        origin = self._pop_move_to(src) or src
+        if origin != dest:
+            self._moves[origin] = dest
+        self._removed.discard(dest)
+        if src in self._upserts:
+            # 아직 반영 전인 새 파일/수정된 파일은 새 경로에서 파싱
+            self._upserts.discard(src)
+            self._upserts.add(dest)
+
+    def _pop_move_to(self, path: str) -> Optional[str]:
+        for origin, current in self._moves.items():
+            if current == path:
+                del self._moves[origin]
+                return origin
+        return None
+
+    def _record_dir_event(self, kind: str, src: str, dest: str) -> bool:
+        if kind == "moved":
+            if self._ignored(dest):
+                kind = "deleted"
+            elif self._ignored(src):
+                kind, src = "created", dest
+            else:
+                self._dir_moves.append((src, dest))
+                return True
+        if self._ignored(src):
+            return False
+        if kind == "created":
+            self._new_dirs.add(src)
+        elif kind == "deleted":
+            self._new_dirs.discard(src)
+            self._removed_dirs.add(src)
+        else:
+            return False
+        return True
+
+    # ===== 반영 =====
+
+    def _run(self):
+        """조용해질 때까지 기다렸다가 반영하는 작업 스레드"""
+        while True:
+            with self._cond:
+                while not self._stopping and self._first_event is None:
+                    self._cond.wait()
+                while not self._stopping:
+                    due = min(self._last_event + self._debounce,
+                              self._first_event + self._debounce * MAX_DELAY_FACTOR)
+                    remaining = due - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._stopping:
+                    return
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"라이브러리 변경 반영 실패: {e}")
+
+    def _write(self, fn: Callable, *args):
+        """DB 쓰기 (실행기가 있으면 백그라운드 우선순위 - 대기 중인 화면 조회가 먼저 실행됨)"""
+        if self._db_executor is None:
+            return fn(*args)
+        return self._db_executor.call(fn, *args, priority=BACKGROUND)
+
+    def _apply(self, batch: WatchBatch) -> list[int]:
+        """변경 저장 후 참조가 없어진 앨범아트 정리 (반환: 추가된 트랙 ID)"""
+        ids = TrackRepository.apply_scan(batch.added, batch.updated, batch.removed, batch.moved)
+        if batch.removed or batch.updated:
+            self._scanner.artwork.collect_garbage()
+        return ids
+
+    def flush(self) -> WatchBatch:
+        """대기 중인 변경을 한 트랜잭션으로 반영"""
+        with self._flush_lock:
+            with self._cond:
+                upserts, self._upserts = self._upserts, set()
+                removed, self._removed = self._removed, set()
+                moves, self._moves = self._moves, {}
+                dir_moves, self._dir_moves = self._dir_moves, []
+                removed_dirs, self._removed_dirs = self._removed_dirs, set()
+                new_dirs, self._new_dirs = self._new_dirs, set()
+                self._first_event = None
+
+            batch = WatchBatch()
+            # 폴더 단위 변경 → DB에 있는 하위 트랙 단위로 펼침
+            for src_dir, dest_dir in dir_moves:
+                prefix = os.path.join(src_dir, "")
+                for path in TrackRepository.get_scan_snapshot(src_dir):
+                    batch.moved.append((path, os.path.join(dest_dir, path[len(prefix):])))
+            batch.moved.extend(moves.items())
+            for directory in removed_dirs:
+                removed.update(TrackRepository.get_scan_snapshot(directory))
+            for directory in new_dirs:
+                upserts.update(entry.path for entry in
+                               walk_audio_files(directory, AUDIO_EXTENSIONS, self._exclude, self._skip_hidden))
+            batch.removed = sorted(removed - upserts)
+
+            files = [Path(p) for p in sorted(upserts) if os.path.isfile(p)]
+            tracks = list(self._scanner.iter_tracks(files)) if files else []
+            if not (tracks or batch.removed or batch.moved):
+                return batch
+
+            # 이동 후 수정된 파일은 원래 트랙의 ID로 갱신
+            origins = {dest: src for src, dest in batch.moved}
+            known = TrackRepository.get_ids_by_file_paths(
+                [t["file_path"] for t in tracks] + list(origins.values())
+            )
+            for track in tracks:
+                path = track["file_path"]
+                track_id = known.get(path) or known.get(origins.get(path))
+                if track_id:
+                    track["id"] = track_id
+                    batch.updated.append(track)
+                else:
+                    batch.added.append(track)
+
+            ids = self._write(self._apply, batch)
+            for track, track_id in zip(batch.added, ids):
+                track["id"] = track_id
+
+            logger.info(f"라이브러리 변경 반영: 추가 {len(batch.added)}, 갱신 {len(batch.updated)}, "
+                        f"삭제 {len(batch.removed)}, 이동 {len(batch.moved)}")
+            if self._on_change:
+                self._on_change(batch)
+            return batch
@@ -7,6 +7,7 @@ WASAPI Exclusive 모드를 지원하는 하이파이 뮤직 플레이어
 Usage:
     python run.py              # 앱 실행
     python run.py --scan DIR   # 폴더 스캔 후 실행
+    python run.py --check-db   # 탐색 요약 테이블 점검/복구 후 실행
 """
 
 import sys
@@ -18,9 +19,9 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from PySide6.QtWidgets import QApplication
 
-from db.models import create_tables
+from db.models import configure as configure_database, create_tables
+from db.repository import SummaryRepository
 from db.scanner import LibraryScanner
-from db.repository import TrackRepository
 from utils.logger import setup_logging
 from utils.config import load_config
 from utils.error_handler import get_error_handler
@@ -30,20 +31,29 @@ def scan_folder(folder_path: str):
     """폴더 스캔 및 DB 저장"""
     print(f"📁 스캔 중: {folder_path}")
     
-    scanner = LibraryScanner(
+    scanner = LibraryScanner.from_config(
+        load_config().get("library", {}),
         on_progress=lambda c, t: print(f"   {c}/{t}")
     )
-    tracks = scanner.scan_folder(folder_path)
-    
-    for track in tracks:
-        TrackRepository.insert(track)
-    
-    print(f"✅ {len(tracks)}개 트랙 저장 완료")
+    result = scanner.rescan(folder_path)
+    summary = result.summary()
+    print(f"✅ 추가 {summary['added']}, 갱신 {summary['updated']}, 삭제 {summary['removed']}, "
+          f"변경 없음 {summary['unchanged']}")
+
+
+def check_database():
+    """탐색 요약 테이블 점검 (어긋나면 다시 계산)"""
+    mismatches = SummaryRepository.check(repair=True)
+    if any(mismatches.values()):
+        print(f"🔧 요약 테이블 복구: {mismatches}")
+    else:
+        print("✅ 요약 테이블 정상")
 
 
 def main():
     parser = argparse.ArgumentParser(description="JuuxBox Hi-Fi Music Player")
     parser.add_argument("--scan", metavar="DIR", help="스캔할 음악 폴더")
+    parser.add_argument("--check-db", action="store_true", help="탐색 요약 테이블 점검/복구")
     parser.add_argument("--debug", action="store_true", help="디버그 모드")
     args = parser.parse_args()
     
@@ -53,11 +63,14 @@ def main():
     setup_logging(level)
     
     # DB 초기화
+    configure_database(load_config().get("database", {}))
     create_tables()
     
     # 폴더 스캔 (옵션)
     if args.scan:
         scan_folder(args.scan)
+    if args.check_db:
+        check_database()
     
     # 에러 핸들러
     error_handler = get_error_handler()
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Test Fixtures
+=============
+여러 테스트 파일이 같이 쓰는 픽스처 (임시 DB)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from db import models
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """테스트마다 새 DB (기본 PRAGMA 설정, 끝나면 이 스레드의 연결을 닫음)"""
+    monkeypatch.setattr(models, "DB_PATH", tmp_path / "test.db")
+    monkeypatch.setattr(models, "_pragmas", dict(models.DEFAULT_PRAGMAS))
+    models.create_tables()
+    yield
+    models.close_connections()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+App Controller Test
+===================
+곡이 끝났을 때 대기열 따라 자동 재생 (한 곡 반복 / 전체 반복) 테스트 (오디오 장치 없이 엔진 대역 사용)
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+import app_controller
+from audio.engine import PlaybackState
+from audio.play_queue import PlayQueue, RepeatMode
+
+
+class FakeEngine:
+    """load/play 호출만 기록하는 엔진 대역"""
+
+    def __init__(self, **kwargs):
+        self.state = PlaybackState.STOPPED
+        self.played = []
+        self.on_track_end = None
+        self.changed = threading.Event()
+
+    def set_on_track_end(self, callback):
+        self.on_track_end = callback
+
+    def load(self, file_path, stream_info=None):
+        self.current_file = file_path
+        return True
+
+    def play(self):
+        self.played.append(self.current_file)
+        self.changed.set()
+        return True
+
+    def warm_transcode_cache(self, paths):
+        pass
+
+    def end_track(self):
+        """위치 추적 스레드처럼 곡 종료 콜백 호출 후 다음 재생까지 대기"""
+        self.changed.clear()
+        self.on_track_end()
+        assert self.changed.wait(5)
+        return self.played[-1]
+
+
+@pytest.fixture
+def controller(monkeypatch):
+    monkeypatch.setattr(app_controller, "AudioEngine", FakeEngine)
+    monkeypatch.setattr(app_controller, "restore_queue", lambda playback_config: PlayQueue())
+    controller = app_controller.AppController({"playback": {"remember_position": False}})
+    controller._tracks = [{"id": i, "file_path": f"/m/{i}.flac"} for i in (1, 2, 3)]
+    controller._tracks_by_id = {t["id"]: t for t in controller._tracks}
+    return controller
+
+
+def test_track_end_repeat_one_replays_current(controller):
+    """한 곡 반복: 곡이 끝나면 같은 곡, 다음 버튼은 다음 곡"""
+    controller.play_track("/m/2.flac")
+    controller._gapless.queue.repeat_mode = RepeatMode.ONE
+    engine = controller._engine
+
+    assert engine.end_track() == "/m/2.flac"
+    assert engine.end_track() == "/m/2.flac"
+    controller.next_track()
+    assert engine.played[-1] == "/m/3.flac"
+
+
+def test_track_end_repeat_all_wraps(controller):
+    """전체 반복: 마지막 곡이 끝나면 처음으로, 반복 없음이면 멈춤"""
+    controller.play_track("/m/2.flac")
+    controller._gapless.queue.repeat_mode = RepeatMode.ALL
+    engine = controller._engine
+
+    assert engine.end_track() == "/m/3.flac"
+    assert engine.end_track() == "/m/1.flac"
+
+    controller._gapless.queue.repeat_mode = RepeatMode.OFF
+    controller._gapless.queue.jump(2)
+    played = len(engine.played)
+    engine.changed.clear()
+    engine.on_track_end()
+    assert not engine.changed.wait(0.2)
+    assert len(engine.played) == played
+
+
+def test_default_config_keeps_other_settings(monkeypatch):
+    """설정 없이 만들면 저장된 설정을 읽어 셔플 저장 시 라이브러리/오디오 설정 유지"""
+    saved = {"library": {"scan_paths": ["/music"]}, "audio": {"device_name": "DAC"},
+             "playback": {"remember_position": False}}
+    written = []
+    monkeypatch.setattr(app_controller, "AudioEngine", FakeEngine)
+    monkeypatch.setattr(app_controller, "restore_queue", lambda playback_config: PlayQueue())
+    monkeypatch.setattr(app_controller, "load_config", lambda: saved)
+    monkeypatch.setattr(app_controller, "save_config", lambda config: written.append(config))
+
+    app_controller.AppController().toggle_shuffle()
+    assert written[-1]["library"] == {"scan_paths": ["/music"]}
+    assert written[-1]["audio"] == {"device_name": "DAC"}
+    assert written[-1]["playback"]["shuffle"] is True
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Artwork Store Test
+==================
+내용 주소 기반 앨범아트 저장소 테스트 (중복 제거, 참조 수, 정리)
+"""
+
+import io
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from db.artwork import GC_GRACE_SECONDS, ArtworkStore
+from db.repository import ArtworkRepository, TrackRepository
+
+
+def make_track(path: str, artwork: tuple[str, str]) -> dict:
+    digest, cover_path = artwork
+    return {"file_path": path, "title": Path(path).stem, "cover_path": cover_path, "artwork_hash": digest}
+
+
+def test_ingest_deduplicates_by_content(tmp_path):
+    """같은 이미지는 한 번만 저장, 형식은 내용으로 판별"""
+    store = ArtworkStore(tmp_path / "artwork")
+    first = store.ingest(b"\xff\xd8same")
+    second = store.ingest(b"\xff\xd8same")
+    png = store.ingest(b"\x89PNGother")
+
+    assert first == second
+    assert png[1].endswith(".png")
+    assert len(list(store.root.glob("*/*"))) == 2
+    # 썸네일이 없으면 원본 경로
+    assert store.thumbnail_path(first[1], 64) == first[1]
+    assert store.thumbnail_path("/music/cover.jpg", 64) == "/music/cover.jpg"
+
+
+def test_ref_count_and_garbage_collection(tmp_path, db):
+    """트랙 추가/변경/삭제에 따라 참조 수 유지, 참조 없는 이미지만 정리"""
+    store = ArtworkStore(tmp_path / "artwork")
+    shared = store.ingest(b"\xff\xd8shared")
+    single = store.ingest(b"\xff\xd8single")
+
+    TrackRepository.apply_scan(
+        [make_track("/m/a/01.flac", shared), make_track("/m/a/02.flac", shared),
+         make_track("/m/b/01.flac", single)], [], [])
+    assert ArtworkRepository.get_ref_count(shared[0]) == 2
+    assert ArtworkRepository.get_ref_count(single[0]) == 1
+
+    # 커버가 바뀌면 이전 이미지 참조 감소
+    TrackRepository.apply_scan([], [make_track("/m/b/01.flac", shared)], [])
+    assert ArtworkRepository.get_ref_count(shared[0]) == 3
+    assert store.collect_garbage(grace=0) == 1
+    assert not Path(single[1]).exists()
+    assert ArtworkRepository.get_ref_count(single[0]) is None
+
+    TrackRepository.apply_scan([], [], ["/m/a/01.flac", "/m/a/02.flac"])
+    assert store.collect_garbage(grace=0) == 0
+    TrackRepository.delete_all()
+    assert store.collect_garbage(grace=0) == 1
+    assert list(store.root.glob("*/*")) == []
+
+
+def test_garbage_collection_spares_recently_ingested(tmp_path, db):
+    """스캔 작업자가 다시 저장한 이미지는 트랙 배치가 커밋되기 전에 정리되지 않음"""
+    store = ArtworkStore(tmp_path / "artwork")
+    artwork = store.ingest(b"\xff\xd8reused")
+    TrackRepository.apply_scan([make_track("/m/a/01.flac", artwork)], [], [])
+    TrackRepository.apply_scan([], [], ["/m/a/01.flac"])
+    old = time.time() - GC_GRACE_SECONDS - 60
+    os.utime(artwork[1], (old, old))
+
+    # 참조 없는 행이 남아 있는 이미지를 다른 트랙이 다시 사용 (아직 커밋 전)
+    assert store.ingest(b"\xff\xd8reused") == artwork
+    assert store.collect_garbage() == 0
+    TrackRepository.apply_scan([make_track("/m/b/01.flac", artwork)], [], [])
+    assert Path(artwork[1]).exists()
+    assert ArtworkRepository.get_ref_count(artwork[0]) == 1
+
+    # 유예가 지난 참조 없는 이미지는 정리
+    TrackRepository.apply_scan([], [], ["/m/b/01.flac"])
+    os.utime(artwork[1], (old, old))
+    assert store.collect_garbage() == 1
+    assert not Path(artwork[1]).exists()
+    # 정리된 뒤 다시 저장하면 파일을 새로 씀
+    assert store.ingest(b"\xff\xd8reused") == artwork
+    assert Path(artwork[1]).read_bytes() == b"\xff\xd8reused"
+
+
+def test_thumbnails(tmp_path):
+    """원본보다 작은 크기만 썸네일 생성, 요청 크기 이상인 가장 작은 것 선택"""
+    Image = pytest.importorskip("PIL.Image")
+    buffer = io.BytesIO()
+    Image.new("RGB", (300, 200), "red").save(buffer, "PNG")
+    store = ArtworkStore(tmp_path / "artwork")
+    _, original = store.ingest(buffer.getvalue())
+
+    assert store.thumbnail_path(original, 48).endswith("_64.jpg")
+    assert store.thumbnail_path(original, 200).endswith("_256.jpg")
+    assert store.thumbnail_path(original, 600) == original
+    with Image.open(store.thumbnail_path(original, 200)) as thumb:
+        assert thumb.size == (256, 171)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Connection Test
+===============
+스레드별 지속 연결, 트랜잭션 범위, 성능 설정(PRAGMA), 조회 전용 연결 테스트
+"""
+
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from db import models
+from db.repository import TrackRepository
+
+
+def test_connection_per_thread(db, tmp_path, monkeypatch):
+    """같은 스레드는 같은 연결, 다른 스레드/다른 DB 경로는 새 연결"""
+    conn = models.connection()
+    assert models.connection() is conn
+
+    others = []
+    worker = threading.Thread(target=lambda: others.append(models.connection()))
+    worker.start()
+    worker.join()
+    assert others[0] is not conn
+
+    monkeypatch.setattr(models, "DB_PATH", tmp_path / "other.db")
+    assert models.connection() is not conn
+
+    # 닫은 뒤에는 다시 열림
+    reopened = models.connection()
+    models.close_connections()
+    assert models.connection() is not reopened
+
+
+def test_transaction_rollback_and_nesting(db):
+    """예외 시 전체 롤백, 중첩된 transaction()은 바깥 트랜잭션에 합류"""
+    with pytest.raises(RuntimeError):
+        with models.transaction():
+            TrackRepository.insert({"file_path": "/music/a.flac", "title": "a"})
+            raise RuntimeError("중단")
+    assert TrackRepository.get_all() == []
+
+    with models.transaction() as conn:
+        TrackRepository.insert({"file_path": "/music/a.flac", "title": "a"})
+        TrackRepository.insert({"file_path": "/music/b.flac", "title": "b"})
+        assert conn.in_transaction
+    assert not conn.in_transaction
+    assert len(TrackRepository.get_all()) == 2
+
+
+def test_concurrent_writers(db):
+    """여러 스레드가 동시에 써도 잠금 오류 없이 모두 반영"""
+    errors = []
+
+    def write(n):
+        try:
+            for i in range(20):
+                TrackRepository.insert({"file_path": f"/music/{n}/{i}.flac", "title": str(i)})
+        except Exception as e:
+            errors.append(e)
+
+    workers = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert errors == []
+    assert len(TrackRepository.get_all()) == 80
+
+
+def test_pragmas_applied(db):
+    """WAL + 설정한 PRAGMA가 모든 연결에 적용, 잘못된 값은 기본값"""
+    models.configure({"synchronous": "FULL", "cache_size_mb": 8, "temp_store": "nope"})
+    conn = models.connection()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 2
+    assert conn.execute("PRAGMA cache_size").fetchone()[0] == -8192
+    assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2
+
+    reader = models.connection(read_only=True)
+    assert reader is not conn
+    assert reader.execute("PRAGMA query_only").fetchone()[0] == 1
+    with pytest.raises(sqlite3.OperationalError):
+        reader.execute("DELETE FROM tracks")
+
+
+def test_reader_not_blocked_by_writer(db):
+    """다른 스레드가 쓰기 트랜잭션 중이어도 조회는 바로 완료, 같은 스레드는 자기 변경을 봄"""
+    TrackRepository.insert({"file_path": "/music/a.flac", "title": "a"})
+    writing, done = threading.Event(), threading.Event()
+    seen_by_writer = []
+
+    def writer():
+        with models.transaction():
+            TrackRepository.insert({"file_path": "/music/b.flac", "title": "b"})
+            seen_by_writer.append(len(TrackRepository.get_all()))
+            writing.set()
+            done.wait(5)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    writing.wait(5)
+    try:
+        # 커밋 전 → 이 스레드에는 보이지 않음
+        assert [t["title"] for t in TrackRepository.get_all()] == ["a"]
+    finally:
+        done.set()
+        thread.join()
+    assert seen_by_writer == [2]
+    assert len(TrackRepository.get_all()) == 2
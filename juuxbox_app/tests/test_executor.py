@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+DB Executor Test
+================
+DB 실행기 우선순위(조회 > 백그라운드 쓰기)와 밀린 요청 취소 테스트
+"""
+
+import sys
+import threading
+from concurrent.futures import CancelledError
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from db import models
+from db.executor import BACKGROUND, INTERACTIVE, DbExecutor
+
+# 끝나지 않는 조회 (interrupt로만 멈춤)
+ENDLESS_SQL = "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c) SELECT COUNT(*) FROM c"
+
+
+def blocker(started: threading.Event, release: threading.Event):
+    started.set()
+    release.wait(5)
+
+
+def test_interactive_before_background():
+    """대기 중인 요청은 조회가 먼저, 같은 우선순위는 들어온 순서"""
+    executor = DbExecutor(workers=1)
+    started, release = threading.Event(), threading.Event()
+    executor.submit(blocker, started, release)
+    started.wait(5)
+
+    order = []
+    futures = [
+        executor.submit(order.append, "write 1", priority=BACKGROUND),
+        executor.submit(order.append, "read 1", priority=INTERACTIVE),
+        executor.submit(order.append, "write 2", priority=BACKGROUND),
+        executor.submit(order.append, "read 2", priority=INTERACTIVE),
+    ]
+    release.set()
+    for future in futures:
+        future.result(5)
+    executor.shutdown()
+    assert order == ["read 1", "read 2", "write 1", "write 2"]
+
+
+def test_background_leaves_worker_for_reads():
+    """백그라운드 작업이 길어도 다른 작업자가 조회를 바로 처리하고, 다음 쓰기는 자리가 날 때까지 대기"""
+    executor = DbExecutor(workers=2, background_slots=1)
+    started, release = threading.Event(), threading.Event()
+    writing = executor.submit(blocker, started, release, priority=BACKGROUND)
+    started.wait(5)
+
+    next_write = executor.submit(lambda: "written", priority=BACKGROUND)
+    assert executor.call(lambda: "read") == "read"
+    assert not next_write.done()
+
+    release.set()
+    writing.result(5)
+    assert next_write.result(5) == "written"
+    executor.shutdown()
+
+
+def test_superseded_pending_request_cancelled(db):
+    """같은 key의 새 요청이 오면 대기 중인 이전 요청은 실행하지 않음"""
+    executor = DbExecutor(workers=1)
+    started, release = threading.Event(), threading.Event()
+    executor.submit(blocker, started, release)
+    started.wait(5)
+
+    ran = []
+    first = executor.submit(ran.append, "album 1", key="view")
+    second = executor.submit(ran.append, "album 2", key="view")
+    other = executor.submit(ran.append, "search", key="search")
+    release.set()
+    second.result(5)
+    other.result(5)
+    executor.shutdown()
+
+    assert first.cancelled()
+    with pytest.raises(CancelledError):
+        first.result()
+    assert ran == ["album 2", "search"]
+
+
+def test_superseded_running_query_interrupted(db):
+    """실행 중인 조회는 쿼리를 멈추고 CancelledError, 작업자 연결은 계속 사용 가능"""
+    executor = DbExecutor(workers=1)
+    running = threading.Event()
+
+    def endless():
+        conn = models.connection(read_only=True)
+        running.set()
+        return conn.execute(ENDLESS_SQL).fetchone()
+
+    first = executor.submit(endless, key="view")
+    running.wait(5)
+    second = executor.submit(lambda: models.connection(read_only=True).execute("SELECT 42").fetchone()[0],
+                             key="view")
+    with pytest.raises(CancelledError):
+        first.result(5)
+    assert second.result(5) == 42
+    executor.shutdown()
+
+
+def test_errors_and_shutdown():
+    """작업 예외는 호출자에게 전달, 종료 후 요청은 거부"""
+    executor = DbExecutor()
+    with pytest.raises(ZeroDivisionError):
+        executor.call(lambda: 1 / 0)
+    executor.shutdown()
+    with pytest.raises(RuntimeError):
+        executor.submit(lambda: None)
@@ -6,29 +6,36 @@ UI와 오디오 엔진 연결 테스트
 """
 
 import sys
+import threading
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import QTimer
+from PySide6.QtCore import QTimer, Signal
 
 from ui.main_window import MainWindow
 from app_controller import AppController
 from db.models import create_tables
 from db.scanner import LibraryScanner
-from db.repository import TrackRepository
+from db.repository import ScanJobRepository, TrackRepository
 from utils.config import load_config
 
 
 class IntegratedMainWindow(MainWindow):
     """컨트롤러가 연결된 메인 윈도우"""
+
+    # 스캔 스레드 → UI 스레드
+    scan_batch_ready = Signal(list)
+    scan_finished = Signal(str, object)
     
     def __init__(self, config: dict = None):
         super().__init__(config)
+        self._scan_thread = None
+        self._scan_cancel = threading.Event()
         
         # 컨트롤러 생성
-        self._controller = AppController()
+        self._controller = AppController(config)
         
         # 재생 위치 추적
         self._playback_position = 0.0
@@ -42,6 +49,9 @@ class IntegratedMainWindow(MainWindow):
         # 트랙 로드 및 UI 연결
         self._load_tracks()
         self._connect_signals()
+
+        # 중단된 스캔 이어서 진행
+        QTimer.singleShot(0, self._resume_interrupted_scan)
         
     def _load_tracks(self):
         """트랙 로드 및 UI 표시"""
@@ -85,8 +95,10 @@ class IntegratedMainWindow(MainWindow):
         # 컨트롤러 콜백
         self._controller.set_on_track_change(self._on_track_change)
         
-        # 사이드바: 폴더 추가
+        # 사이드바: 폴더 추가 (스캔 배치마다 목록에 추가)
         self._sidebar.add_folder_clicked.connect(self._on_folder_added)
+        self.scan_batch_ready.connect(self._append_scanned_songs)
+        self.scan_finished.connect(self._on_scan_finished)
         self._sidebar.add_files_clicked.connect(self._on_files_added)
 
         # 곡 목록: 삭제
@@ -98,7 +110,7 @@ class IntegratedMainWindow(MainWindow):
         self._player_bar.clicked.connect(self._show_detail_view)
 
         # 상세 뷰 시그널
-        self._detail_view.back_clicked.connect(self.show_main_view)
+        self._detail_view.back_clicked.connect(self._hide_detail_view)
         self._detail_view.play_clicked.connect(self._on_toggle_play)
         self._detail_view.pause_clicked.connect(self._on_toggle_play)
         self._detail_view.stop_clicked.connect(self._controller.stop)
@@ -135,10 +147,10 @@ class IntegratedMainWindow(MainWindow):
         self._player_bar._is_playing = True
         self._player_bar._play_btn.setText("⏸")
         
-        # 진행바 초기화 및 타이머 시작
-        self._playback_position = 0.0
+        # 진행바 초기화 및 타이머 시작 (세션 복원 시 저장된 위치부터)
+        self._playback_position = self._controller.audio_info.position_seconds
         self._playback_duration = track.get('duration_seconds', 0.0)
-        self._player_bar.set_progress(0, int(self._playback_duration))
+        self._player_bar.set_progress(int(self._playback_position), int(self._playback_duration))
         self._progress_timer.start()
 
         # 상세 뷰에 트랙 정보 설정
@@ -230,7 +242,15 @@ class IntegratedMainWindow(MainWindow):
                 channels=track.get('channels', 0),
             )
             self._detail_view.set_playing_state(self._player_bar._is_playing)
+        # 상세 뷰가 보이는 동안만 스펙트럼 분석
+        self._controller.subscribe_visualizer(self._detail_view.visualizer_frame.emit)
         self.show_detail_view()
+
+    def _hide_detail_view(self):
+        """상세 뷰 닫기 (시각화 구독 해제)"""
+        self._controller.unsubscribe_visualizer()
+        self._detail_view.clear_visualizer()
+        self.show_main_view()
         
     def _on_previous(self):
         """이전 곡"""
@@ -239,23 +259,69 @@ class IntegratedMainWindow(MainWindow):
     def _on_next(self):
         """다음 곡"""
         self._controller.next_track()
+
+    def _on_shuffle(self):
+        """셔플 토글"""
+        self._controller.toggle_shuffle()
+
+    def _on_repeat(self):
+        """반복 모드 순환"""
+        self._controller.cycle_repeat_mode()
         
     def closeEvent(self, event):
-        """종료 시 정리"""
+        """종료 시 정리 (진행 중인 스캔은 체크포인트 후 중단 → 다음 실행 때 이어서 진행)"""
+        self._scan_cancel.set()
+        if self._scan_thread:
+            self._scan_thread.join(timeout=5)
         self._controller.cleanup()
         super().closeEvent(event)
 
+    def _resume_interrupted_scan(self):
+        """취소되었거나 종료로 끝나지 않은 스캔 이어서 진행"""
+        jobs = ScanJobRepository.find_interrupted()
+        if jobs:
+            print(f"↻ 중단된 스캔 이어서 진행: {jobs[0]['folder_path']}")
+            self._on_folder_added(jobs[0]['folder_path'])
+
     def _on_folder_added(self, folder_path: str):
-        """폴더 추가 시 스캔 및 UI 업데이트"""
+        """폴더 추가 시 백그라운드 증분 스캔 (배치마다 곡 목록에 추가)"""
         from PySide6.QtWidgets import QMessageBox
+
+        if self._scan_thread and self._scan_thread.is_alive():
+            answer = QMessageBox.question(
+                self, "스캔 중",
+                "이전 폴더 스캔이 아직 진행 중입니다.\n스캔을 취소할까요? (다음에 이어서 진행)"
+            )
+            if answer == QMessageBox.Yes:
+                self._scan_cancel.set()
+            return
         
         print(f"📁 폴더 스캔 중: {folder_path}")
-        
-        # 스캔
-        scanner = LibraryScanner()
-        tracks = scanner.scan_folder(folder_path)
-        
-        if not tracks:
+        self._scan_cancel.clear()
+        
+        def run():
+            scanner = LibraryScanner.from_config(self._config.get('library', {}))
+            result = scanner.rescan(
+                folder_path,
+                on_batch=lambda added, updated: self.scan_batch_ready.emit(added),
+                cancel=self._scan_cancel
+            )
+            self.scan_finished.emit(folder_path, result)
+
+        self._scan_thread = threading.Thread(target=run, daemon=True)
+        self._scan_thread.start()
+
+    def _append_scanned_songs(self, tracks: list):
+        """스캔 배치로 추가된 곡을 목록 끝에 표시"""
+        start = self._controller.add_tracks(tracks)
+        for i, track in enumerate(tracks):
+            self._add_song_row(start + i + 1, track)
+
+    def _on_scan_finished(self, folder_path: str, result):
+        """스캔 완료 알림"""
+        from PySide6.QtWidgets import QMessageBox
+
+        if not result.total_files:
             QMessageBox.warning(
                 self, 
                 "스캔 결과", 
@@ -265,31 +331,41 @@ class IntegratedMainWindow(MainWindow):
             )
             return
         
-        # 중복 필터링 (이미 DB에 있는 파일 스킵)
-        new_tracks = [t for t in tracks if not TrackRepository.exists_by_file_path(t["file_path"])]
-        skipped_count = len(tracks) - len(new_tracks)
+        if result.cancelled:
+            QMessageBox.information(
+                self,
+                "스캔 취소",
+                f"스캔을 취소했습니다. 다음에 같은 폴더를 스캔하면 이어서 진행합니다.\n"
+                f"(추가: {result.added}, 갱신: {result.updated})"
+            )
+            if result.updated:
+                self._refresh_song_list()
+            return
+
+        summary = result.summary()
+        print(f"✅ 추가 {summary['added']}, 갱신 {summary['updated']}, "
+              f"삭제 {summary['removed']}, 변경 없음 {summary['unchanged']}")
         
-        if not new_tracks:
+        if not (result.added or result.updated or result.removed):
             QMessageBox.information(
                 self,
                 "스캔 결과",
-                f"모든 파일이 이미 라이브러리에 있습니다.\n(스캔됨: {len(tracks)}, 스킵: {skipped_count})"
+                f"모든 파일이 이미 라이브러리에 있습니다.\n(변경 없음: {result.unchanged})"
             )
             return
         
-        # DB 저장
-        for track in new_tracks:
-            TrackRepository.insert(track)
-        
-        print(f"✅ {len(new_tracks)}개 트랙 추가됨 (스킵: {skipped_count})")
-        
-        # UI 업데이트
-        self._refresh_song_list()
+        # 갱신/삭제된 곡은 기존 행을 바꿔야 하므로 전체 새로고침
+        if result.updated or result.removed:
+            self._refresh_song_list()
         
         # 결과 알림
-        msg = f"✅ {len(new_tracks)}개 트랙이 추가되었습니다!"
-        if skipped_count > 0:
-            msg += f"\n(스킵: {skipped_count}개 - 이미 존재)"
+        msg = f"✅ {result.added}개 트랙이 추가되었습니다!"
+        if result.updated:
+            msg += f"\n(갱신: {result.updated}개 - 파일 변경됨)"
+        if result.removed:
+            msg += f"\n(삭제: {result.removed}개 - 파일 없음)"
+        if result.unchanged:
+            msg += f"\n(스킵: {result.unchanged}개 - 변경 없음)"
         QMessageBox.information(self, "스캔 완료", msg)
 
     def _on_files_added(self, file_paths: list):
@@ -298,7 +374,7 @@ class IntegratedMainWindow(MainWindow):
         from PySide6.QtWidgets import QMessageBox
         
         scanner = LibraryScanner()
-        added_count = 0
+        tracks = []
         skipped_count = 0
         
         for file_path in file_paths:
@@ -309,8 +385,11 @@ class IntegratedMainWindow(MainWindow):
             
             track = scanner._extract_metadata(Path(file_path))
             if track:
-                TrackRepository.insert(track)
-                added_count += 1
+                tracks.append(track)
+        
+        # 한 트랜잭션으로 저장
+        TrackRepository.insert_many(tracks)
+        added_count = len(tracks)
         
         if added_count > 0:
             print(f"✅ {added_count}개 파일 추가됨 (스킵: {skipped_count})")
@@ -339,19 +418,23 @@ class IntegratedMainWindow(MainWindow):
         tracks = self._controller.load_library()
 
         for i, track in enumerate(tracks):
-            duration = track.get('duration_seconds', 0)
-            duration_str = f"{int(duration//60)}:{int(duration%60):02d}"
-            self._song_list.add_song(
-                index=i + 1,
-                title=track.get('title', 'Unknown'),
-                artist=track.get('artist', 'Unknown'),
-                album=track.get('album', 'Unknown'),
-                folder_name=track.get('folder_name', ''),
-                duration=duration_str,
-                file_path=track.get('file_path', ''),
-                audio_format=track.get('format'),
-                cover_path=track.get('cover_path')
-            )
+            self._add_song_row(i + 1, track)
+
+    def _add_song_row(self, index: int, track: dict):
+        """곡 목록에 한 행 추가"""
+        duration = track.get('duration_seconds', 0)
+        duration_str = f"{int(duration//60)}:{int(duration%60):02d}"
+        self._song_list.add_song(
+            index=index,
+            title=track.get('title', 'Unknown'),
+            artist=track.get('artist', 'Unknown'),
+            album=track.get('album', 'Unknown'),
+            folder_name=track.get('folder_name', ''),
+            duration=duration_str,
+            file_path=track.get('file_path', ''),
+            audio_format=track.get('format'),
+            cover_path=track.get('cover_path')
+        )
 
     def _on_song_delete(self, file_path: str):
         """곡 삭제"""
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Play Queue Test
+===============
+재생 대기열 (셔플 / 반복 / 삽입·삭제 / 영속화) 테스트
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from audio.play_queue import PlayQueue, RepeatMode
+
+
+def test_sequential_and_repeat():
+    """순차 재생 및 반복 모드"""
+    queue = PlayQueue([10, 20, 30], start_index=0)
+    assert queue.current_id == 10
+    assert queue.next() == 20
+    assert queue.next() == 30
+    assert queue.next() is None
+
+    queue.repeat_mode = RepeatMode.ALL
+    assert queue.next() == 10
+    assert queue.previous() == 30
+
+    queue.repeat_mode = RepeatMode.ONE
+    assert queue.next() == 30
+    assert queue.next(manual=True) == 10
+
+
+def test_insert_next_append_remove():
+    """다음에 재생 / 추가 / 삭제"""
+    queue = PlayQueue([1, 2, 3], start_index=0)
+    queue.insert_next(9)
+    queue.append(4)
+    assert queue.track_ids() == [1, 9, 2, 3, 4]
+
+    assert queue.remove(0) == 1
+    assert queue.position == -1
+    assert queue.next() == 9
+    assert queue.track_ids() == [9, 2, 3, 4]
+
+
+def test_remove_rejects_out_of_range():
+    """음수/범위 밖 위치는 IndexError, 대기열과 현재 위치는 그대로"""
+    queue = PlayQueue([1, 2, 3], start_index=0)
+    for position in (-1, 3):
+        with pytest.raises(IndexError):
+            queue.remove(position)
+    assert queue.track_ids() == [1, 2, 3]
+    assert queue.current_id == 1
+    assert queue.upcoming(5) == [2, 3]
+
+
+def test_shuffle_keeps_current_and_restores_order():
+    """셔플: 현재 곡 유지, 해제 시 원래 순서 복귀"""
+    ids = list(range(100))
+    queue = PlayQueue(ids, start_index=42, seed=1)
+    queue.shuffle = True
+    assert queue.current_id == 42
+    assert queue.position == 0
+    assert sorted(queue.track_ids()) == ids
+
+    queue.insert_next(500)
+    assert queue.peek_next() == 500
+    removed = queue.remove(5)
+
+    queue.shuffle = False
+    assert queue.current_id == 42
+    restored = queue.track_ids()
+    assert removed not in restored
+    assert restored.index(500) == 43
+    assert len(restored) == 100
+
+
+def test_insert_next_after_shuffled_skips():
+    """셔플 중 몇 곡 넘긴 뒤 다음에 재생한 곡은 셔플 해제 후에도 현재 곡 다음"""
+    queue = PlayQueue(range(100), start_index=42, seed=1)
+    queue.shuffle = True
+    queue.next(manual=True)
+    queue.next(manual=True)
+    current = queue.next(manual=True)
+    assert current != 42
+
+    queue.insert_next(500)
+    queue.shuffle = False
+    assert queue.current_id == current
+    assert queue.peek_next() == 500
+    restored = queue.track_ids()
+    assert restored.index(500) == restored.index(current) + 1
+
+
+def test_large_queue_block_split():
+    """블록 분할 이후에도 위치 탐색이 정확한지 확인"""
+    queue = PlayQueue(range(5000), start_index=2500)
+    for i in range(2000):
+        queue.insert_next(-i)
+    ids = queue.track_ids()
+    assert ids[2501] == -1999
+    assert ids[4500] == 0
+    assert ids[4501] == 2501
+    assert len(queue) == 7000
+    assert queue.jump(4501) == 2501
+
+
+def test_save_and_load(tmp_path):
+    """바이너리 저장/복원 (5만 곡)"""
+    path = tmp_path / "queue.bin"
+    queue = PlayQueue(range(50000), start_index=123, repeat_mode=RepeatMode.ALL, seed=7)
+    queue.shuffle = True
+    queue.save(path)
+
+    start = time.perf_counter()
+    restored = PlayQueue.load(path)
+    elapsed = time.perf_counter() - start
+
+    assert restored is not None
+    assert restored.shuffle
+    assert restored.repeat_mode == RepeatMode.ALL
+    assert restored.current_id == 123
+    assert restored.track_ids() == queue.track_ids()
+    print(f"\n   5만 곡 대기열 복원: {elapsed * 1000:.1f}ms ({path.stat().st_size} bytes)")
+
+    restored.shuffle = False
+    assert restored.track_ids() == list(range(50000))
+
+
+def test_load_corrupted_file(tmp_path):
+    """손상된 파일은 None"""
+    path = tmp_path / "queue.bin"
+    path.write_bytes(b"garbage")
+    assert PlayQueue.load(path) is None
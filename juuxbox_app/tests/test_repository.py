@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""
+Repository Test
+===============
+트랙 저장소 테스트 (일괄 저장, ID 유지, 아티스트/앨범 정규화, 탐색 쿼리 실행 계획, 요약 테이블, 페이지 목록, 검색)
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from db import models
+from db import repository
+from db.repository import BackfillRepository, SummaryRepository, TrackRepository
+
+
+def make_track(path: str, **tags) -> dict:
+    return {"file_path": path, "title": Path(path).stem, "album": "Album", "artist": "Artist", **tags}
+
+
+def test_insert_many_returns_ids_in_order(db):
+    """입력 순서대로 ID 반환, 모두 한 번에 저장"""
+    tracks = [make_track(f"/music/{i:03d}.flac", track_number=i) for i in range(1200)]
+    ids = TrackRepository.insert_many(tracks)
+
+    assert len(set(ids)) == 1200
+    assert TrackRepository.get_by_id(ids[700])["file_path"] == "/music/700.flac"
+    assert TrackRepository.insert_many([]) == []
+
+
+def test_insert_many_upsert_keeps_id(db):
+    """같은 경로는 행을 교체하지 않고 갱신 (ID와 플레이리스트 참조 유지)"""
+    first = TrackRepository.insert_many([make_track("/music/a.flac"), make_track("/music/b.flac")])
+    conn = models.connection()
+    conn.execute("INSERT INTO playlist_tracks (playlist_id, track_id, position) VALUES (1, ?, 0)", (first[1],))
+
+    again = TrackRepository.insert_many([make_track("/music/b.flac", title="새 제목"), make_track("/music/c.flac")])
+
+    assert again[0] == first[1]
+    assert TrackRepository.get_by_id(first[1])["title"] == "새 제목"
+    assert TrackRepository.insert(make_track("/music/a.flac")) == first[0]
+    assert conn.execute("SELECT track_id FROM playlist_tracks").fetchone()[0] == first[1]
+    assert len(TrackRepository.get_all()) == 3
+
+
+def query_plan(sql: str, params: tuple = ()) -> list[str]:
+    rows = models.connection().execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+    return [row[3] for row in rows]
+
+
+@pytest.mark.parametrize("sql, index", [
+    (repository._TRACKS_BY_ALBUM_SQL, "idx_tracks_album_id"),
+    (repository._TRACKS_BY_FOLDER_SQL, "idx_tracks_folder"),
+    (repository._ALL_TRACKS_SQL, "idx_tracks_page_artist"),
+])
+def test_track_lists_use_index_order(db, sql, index):
+    """트랙 목록은 인덱스로 찾고 인덱스 순서 그대로 반환 (정렬용 임시 B-tree 없음)"""
+    plan = query_plan(sql, (1,) * sql.count("?"))
+    assert any(f"USING INDEX {index}" in step for step in plan), plan
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+
+
+def test_scan_snapshot_seeks_path_index(db):
+    """폴더 스냅샷은 file_path 인덱스 범위 탐색, 이름이 같은 접두어로 시작하는 다른 폴더는 제외"""
+    plan = query_plan(repository._SCAN_SNAPSHOT_SQL, ("/m/", "/m0"))
+    assert plan == ["SEARCH tracks USING INDEX sqlite_autoindex_tracks_1 (file_path>? AND file_path<?)"], plan
+
+    ids = TrackRepository.insert_many([make_track(p) for p in
+                                       ("/m/a/1.flac", "/m/a/b/2.flac", "/m/ab/3.flac", "/m/a0.flac", "/m/a.flac")])
+    snapshot = TrackRepository.get_scan_snapshot("/m/a")
+    assert {path: row[2] for path, row in snapshot.items()} == {"/m/a/1.flac": ids[0], "/m/a/b/2.flac": ids[1]}
+
+
+def test_artist_tracks_found_by_id(db):
+    """아티스트 트랙은 ID 인덱스로 찾음 (앨범 정렬 키 순서는 찾은 트랙만 정렬)"""
+    plan = query_plan(repository._TRACKS_BY_ARTIST_SQL, (1,))
+    assert plan[0] == "SEARCH tracks USING INDEX idx_tracks_artist_id (artist_id=?)", plan
+
+
+@pytest.mark.parametrize("table, index", [
+    ("album_summary", "idx_tracks_album_id"),
+    ("artist_summary", "idx_tracks_artist_id"),
+    ("folder_summary", "idx_tracks_folder"),
+])
+def test_summary_sources_single_covering_pass(db, table, index):
+    """요약 다시 만들기 집계는 커버링 인덱스 한 번 - 테이블 조회/상관 서브쿼리/GROUP BY 정렬 없음"""
+    plan = query_plan(models.SUMMARY_SOURCES[table])
+    assert f"USING COVERING INDEX {index}" in plan[0], plan
+    assert not any("SUBQUERY" in step or "GROUP BY" in step for step in plan), plan
+
+
+@pytest.mark.parametrize("sql, first", [
+    (repository._ALBUMS_SQL, "SCAN albums USING INDEX idx_albums_sort"),
+    (repository._ARTISTS_SQL, "SCAN artists USING INDEX idx_artists_sort"),
+    (repository._FOLDERS_SQL, "SCAN folder_summary"),
+])
+def test_grid_reads_summary_in_key_order(db, sql, first):
+    """그리드 조회는 정렬 키 인덱스 순서대로 읽고 요약/이름은 ID로 붙임 (집계/정렬 없음)"""
+    plan = query_plan(sql)
+    assert plan[0] == first, plan
+    assert all("INTEGER PRIMARY KEY" in step for step in plan[1:]), plan
+
+
+def test_aggregate_values(db):
+    """대표 앨범아트는 NULL이 아닌 값, 앨범 수는 서로 다른 앨범"""
+    TrackRepository.insert_many([
+        make_track("/m/A/x/1.flac", artist="A", album="x", folder_name="x", duration_seconds=100),
+        make_track("/m/A/x/2.flac", artist="A", album="x", folder_name="x", cover_path="/c/x.jpg",
+                   duration_seconds=50),
+        make_track("/m/A/y/1.flac", artist="A", album="y", folder_name="y"),
+        make_track("/m/B/z/1.flac", artist="B", album="z", folder_name="z"),
+    ])
+
+    albums = {a["album"]: a for a in TrackRepository.get_albums()}
+    assert albums["x"]["cover_path"] == "/c/x.jpg"
+    assert albums["x"]["total_duration"] == 150
+    artists = TrackRepository.get_artists()
+    assert [(a["artist"], a["album_count"], a["track_count"], a["cover_path"]) for a in artists] == [
+        ("A", 2, 3, "/c/x.jpg"), ("B", 1, 1, None)
+    ]
+    assert [f["track_count"] for f in TrackRepository.get_folders()] == [2, 1, 1]
+
+
+def test_summaries_follow_changes(db):
+    """추가/태그 변경/이동/삭제 후에도 요약 테이블이 tracks 집계와 같음"""
+    tracks = [make_track(f"/m/{a}/{b}/{i}.flac", artist=f"Artist {a}", album=f"Album {a}{b}",
+                         folder_name=f"{a}{b}", cover_path=f"/c/{a}{b}.jpg" if i % 2 else None,
+                         duration_seconds=60.5 + i)
+              for a in range(3) for b in range(3) for i in range(4)]
+    ids = TrackRepository.insert_many(tracks)
+    assert sum(SummaryRepository.check().values()) == 0
+
+    # 앨범/아티스트/앨범아트 변경 (같은 ID로 갱신)
+    tracks[0].update(album="Album 11", artist="Artist 1", cover_path="/c/new.jpg")
+    tracks[5].update(cover_path=None, duration_seconds=None)
+    TrackRepository.apply_scan([], [tracks[0], tracks[5]], [])
+    # 이동 (대상 경로에 있던 트랙은 대체됨), 삭제
+    TrackRepository.apply_scan([], [], [t["file_path"] for t in tracks[8:12]],
+                               moved=[(tracks[1]["file_path"], tracks[2]["file_path"]),
+                                      (tracks[13]["file_path"], "/m/other/moved.flac")])
+    TrackRepository.delete_by_file_path(tracks[20]["file_path"])
+
+    assert SummaryRepository.check() == {"album_summary": 0, "artist_summary": 0, "folder_summary": 0}
+    albums = {a["album"]: a for a in TrackRepository.get_albums()}
+    assert "Album 02" not in albums
+    assert albums["Album 11"]["cover_path"] == "/c/11.jpg"
+    assert TrackRepository.get_by_id(ids[0])["album"] == "Album 11"
+
+    TrackRepository.delete_all()
+    assert TrackRepository.get_albums() == [] and TrackRepository.get_artists() == []
+
+
+def test_summary_check_repairs(db):
+    """어긋난 요약은 점검에서 드러나고 repair로 다시 계산"""
+    TrackRepository.insert_many([make_track("/m/a.flac"), make_track("/m/b.flac", album="Other")])
+    with models.transaction() as conn:
+        conn.execute("UPDATE album_summary SET track_count = 9 WHERE album_id = "
+                     "(SELECT id FROM albums WHERE title = 'Album')")
+        conn.execute("DELETE FROM folder_summary")
+        conn.execute("INSERT INTO artist_summary VALUES (999, NULL, 1, 1)")
+
+    assert SummaryRepository.check() == {"album_summary": 2, "artist_summary": 1, "folder_summary": 0}
+    SummaryRepository.check(repair=True)
+    assert sum(SummaryRepository.check().values()) == 0
+    assert [a["track_count"] for a in TrackRepository.get_albums()] == [1, 1]
+
+
+def test_albums_grouped_by_album_artist(db):
+    """같은 이름의 앨범도 앨범 아티스트가 다르면 따로, 컴필레이션은 앨범 아티스트로 한 앨범"""
+    ids = TrackRepository.insert_many([
+        make_track("/m/a/1.flac", artist="Queen", album="Greatest Hits"),
+        make_track("/m/b/1.flac", artist="ABBA", album="Greatest Hits"),
+        make_track("/m/c/1.flac", artist="X", album="Mix", album_artist="Various Artists", track_number=2),
+        make_track("/m/c/2.flac", artist="Y", album="Mix", album_artist="Various Artists", track_number=1),
+    ])
+
+    albums = TrackRepository.get_albums()
+    assert [(a["album"], a["artist"], a["track_count"]) for a in albums] == [
+        ("Greatest Hits", "Queen", 1), ("Greatest Hits", "ABBA", 1), ("Mix", "Various Artists", 2)
+    ]
+    mix = TrackRepository.get_tracks_by_album(albums[2]["id"])
+    assert [t["id"] for t in mix] == [ids[3], ids[2]]
+    queen = next(a for a in TrackRepository.get_artists() if a["artist"] == "Queen")
+    assert [t["id"] for t in TrackRepository.get_tracks_by_artist(queen["id"])] == [ids[0]]
+    # 이름으로 찾으면 같은 이름의 앨범을 모두
+    assert [t["id"] for t in TrackRepository.get_by_album("Mix")] == [ids[3], ids[2]]
+    assert [t["id"] for t in TrackRepository.get_by_album("Greatest Hits")] == [ids[0], ids[1]]
+    assert TrackRepository.get_by_album("Nothing") == []
+
+
+def test_sort_keys(db):
+    """그리드는 정렬 키 순 (대소문자/발음 구별 기호/앞쪽 The 무시)"""
+    assert models.sort_key("The  Beatles") == "beatles"
+    assert models.sort_key("Ólafur Arnalds") == "olafur arnalds"
+    assert models.sort_key("ＡＢＣ") == "abc"
+    assert models.sort_key("아이유") == "아이유"
+    TrackRepository.insert_many([
+        make_track(f"/m/{name}.flac", artist=name, album=name)
+        for name in ("The Beatles", "abba", "Ólafur Arnalds", "Coldplay", "아이유")
+    ])
+    assert [a["artist"] for a in TrackRepository.get_artists()] == [
+        "abba", "The Beatles", "Coldplay", "Ólafur Arnalds", "아이유"
+    ]
+
+
+def test_entities_pruned_on_delete(db):
+    """트랙이 없어진 앨범/아티스트는 삭제 시 정리"""
+    TrackRepository.insert_many([make_track("/m/a.flac", artist="A", album="x"),
+                                 make_track("/m/b.flac", artist="B", album="y", album_artist="C")])
+    TrackRepository.delete_by_file_path("/m/b.flac")
+    conn = models.connection()
+    assert [r[0] for r in conn.execute("SELECT name FROM artists")] == ["A"]
+    assert [r[0] for r in conn.execute("SELECT title FROM albums")] == ["x"]
+
+    TrackRepository.delete_all()
+    assert conn.execute("SELECT COUNT(*) FROM artists").fetchone()[0] == 0
+
+
+def test_delete_many_in_one_transaction(db, monkeypatch):
+    """선택 삭제는 변수 개수 제한보다 많아도 한 트랜잭션으로 삭제"""
+    TrackRepository.insert_many([make_track(f"/m/{i:04d}.flac", album=f"Album {i % 3}") for i in range(1200)])
+    begins = []
+    real_transaction = repository.transaction
+
+    def counting_transaction():
+        begins.append(1)
+        return real_transaction()
+
+    monkeypatch.setattr(repository, "transaction", counting_transaction)
+    paths = [f"/m/{i:04d}.flac" for i in range(1100)] + ["/m/missing.flac"]
+    assert TrackRepository.delete_by_file_paths(paths) == 1100
+    assert len(begins) == 1
+    assert TrackRepository.count() == 100
+    assert sum(SummaryRepository.check().values()) == 0
+
+
+def test_fresh_db_at_latest_version(db):
+    """새 DB는 마이그레이션 없이 최신 스키마 버전, 채울 트랙 없음"""
+    TrackRepository.insert(make_track("/m/1.flac", composer="Bach", year=1720, disc_number=2, bitrate=900_000))
+    assert models.connection().execute("PRAGMA user_version").fetchone()[0] == models.SCHEMA_VERSION
+    assert BackfillRepository.pending() == 0
+    track = TrackRepository.get_by_file_path("/m/1.flac")
+    assert (track["composer"], track["year"], track["disc_number"], track["bitrate"]) == ("Bach", 1720, 2, 900_000)
+
+
+def test_upgrade_fills_entity_ids(tmp_path, monkeypatch):
+    """아티스트/앨범 ID가 없던 DB는 컬럼을 추가하고 기존 트랙의 ID와 요약을 채움"""
+    path = tmp_path / "old.db"
+    old = sqlite3.connect(path)
+    old.executescript("""
+        CREATE TABLE tracks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, file_path TEXT UNIQUE NOT NULL, title TEXT, artist TEXT,
+            album TEXT, album_artist TEXT, folder_name TEXT, cover_path TEXT, track_number INTEGER,
+            disc_number INTEGER, year INTEGER, genre TEXT, duration_seconds REAL, sample_rate INTEGER,
+            bit_depth INTEGER, channels INTEGER, format TEXT, file_size INTEGER, last_modified REAL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE album_summary (album TEXT PRIMARY KEY, artist TEXT, cover_path TEXT,
+                                    track_count INTEGER NOT NULL, total_duration REAL NOT NULL) WITHOUT ROWID;
+        CREATE INDEX idx_tracks_album ON tracks(album);
+        INSERT INTO tracks (file_path, title, artist, album) VALUES
+            ('/m/1.flac', 'a', 'Queen', 'Greatest Hits'), ('/m/2.flac', 'b', 'ABBA', 'Greatest Hits'),
+            ('/m/3.flac', 'c', 'Queen', 'Greatest Hits');
+    """)
+    old.close()
+    monkeypatch.setattr(models, "DB_PATH", path)
+    try:
+        models.create_tables()
+        assert [(a["artist"], a["track_count"]) for a in TrackRepository.get_albums()] == [("Queen", 2), ("ABBA", 1)]
+        assert sum(SummaryRepository.check().values()) == 0
+        assert models.connection().execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE name = 'idx_tracks_album'"
+        ).fetchone()[0] == 0
+        # 이후 마이그레이션까지 적용 → 확장 메타데이터는 기존 트랙 전체를 채울 차례
+        assert models.connection().execute("PRAGMA user_version").fetchone()[0] == models.SCHEMA_VERSION
+        assert BackfillRepository.pending() == 3
+        # 다시 열어도 그대로
+        models.create_tables()
+        assert len(TrackRepository.get_albums()) == 2
+        assert BackfillRepository.pending() == 3
+    finally:
+        models.close_connections()
+
+
+def read_pages(sort: str, limit: int, descending: bool = False) -> list[int]:
+    ids, cursor = [], None
+    while True:
+        page, cursor = TrackRepository.get_page(sort, cursor, limit, descending)
+        ids.extend(t["id"] for t in page)
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.parametrize("sort", list(models.PAGE_SORTS))
+@pytest.mark.parametrize("descending", [False, True])
+def test_pages_cover_every_track_in_order(db, sort, descending):
+    """페이지를 이어 읽으면 빠짐/중복 없이 전체 정렬과 같음 (NULL 태그, 같은 정렬 키 포함)"""
+    tracks = [make_track(f"/m/{i:03d}.flac", title=None if i % 7 == 0 else f"T{i % 5}",
+                         artist=None if i % 4 == 0 else f"A{i % 3}", album=None if i % 6 == 0 else "B",
+                         track_number=None if i % 5 == 0 else i % 3)
+              for i in range(53)]
+    TrackRepository.insert_many(tracks)
+
+    expected = TrackRepository.get_ids(sort, descending)
+    assert len(expected) == 53
+    assert read_pages(sort, 5, descending) == expected
+    assert read_pages(sort, 53, descending) == expected
+
+
+def test_page_order_and_cursor(db):
+    """아티스트/앨범/트랙 번호 순서, 추가 순서, 마지막 페이지는 커서 없음"""
+    ids = TrackRepository.insert_many([
+        make_track("/m/3.flac", artist="B", album="x", track_number=1),
+        make_track("/m/2.flac", artist="A", album="y", track_number=2),
+        make_track("/m/1.flac", artist="A", album="y", track_number=1),
+    ])
+    page, cursor = TrackRepository.get_page("artist", limit=2)
+    assert [t["file_path"] for t in page] == ["/m/1.flac", "/m/2.flac"]
+    assert "_sort0" not in page[0]
+    page, cursor = TrackRepository.get_page("artist", cursor, limit=2)
+    assert [t["id"] for t in page] == [ids[0]] and cursor is None
+
+    assert TrackRepository.get_ids("added", descending=True) == ids[::-1]
+    assert TrackRepository.count() == 3
+    with pytest.raises(ValueError):
+        TrackRepository.get_page("genre")
+
+
+@pytest.mark.parametrize("sort", ["artist", "album"])
+def test_page_orders_discs_before_track_numbers(db, sort):
+    """여러 장짜리 앨범은 디스크 순서 다음 트랙 번호 순서 (디스크 번호 없는 트랙이 먼저)"""
+    ids = TrackRepository.insert_many([
+        make_track("/m/2-1.flac", disc_number=2, track_number=1),
+        make_track("/m/1-2.flac", disc_number=1, track_number=2),
+        make_track("/m/1-1.flac", disc_number=1, track_number=1),
+        make_track("/m/0-3.flac", track_number=3),
+    ])
+    assert TrackRepository.get_ids(sort) == [ids[3], ids[2], ids[1], ids[0]]
+    page, cursor = TrackRepository.get_page(sort, limit=2)
+    page, cursor = TrackRepository.get_page(sort, cursor, limit=2)
+    assert [t["id"] for t in page] == [ids[1], ids[0]]
+
+
+def test_upgrade_rebuilds_page_indexes(db):
+    """이전 정렬 식으로 만든 페이지 인덱스는 마이그레이션에서 새 정렬 식으로 다시 만듦"""
+    conn = models.connection()
+    conn.execute("DROP INDEX idx_tracks_page_album")
+    conn.execute("CREATE INDEX idx_tracks_page_album ON tracks(IFNULL(album, ''), IFNULL(track_number, 0))")
+    conn.execute("PRAGMA user_version = 2")
+    models.create_tables()
+
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == models.SCHEMA_VERSION
+    sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'idx_tracks_page_album'").fetchone()[0]
+    assert "disc_number" in sql
+
+
+@pytest.mark.parametrize("sort", ["artist", "album", "title"])
+def test_page_seeks_with_index(db, sort):
+    """다음 페이지는 정렬 식 인덱스로 커서 위치를 찾음 (앞 페이지를 다시 읽지 않음)"""
+    sql, key_count = repository._page_sql(sort, False, after_cursor=True)
+    plan = query_plan(sql, (1,) * (key_count + 2))
+    assert plan == [f"SEARCH tracks USING INDEX idx_tracks_page_{sort} (<expr>>?)"], plan
+
+
+@pytest.fixture
+def library(db):
+    return TrackRepository.insert_many([
+        make_track("/m/1.flac", title="Yesterday", artist="The Beatles", album="Help!", genre="Rock"),
+        make_track("/m/2.flac", title="Help!", artist="The Beatles", album="Help!", genre="Rock"),
+        make_track("/m/3.flac", title="Blackbird", artist="The Beatles", album="The White Album"),
+        make_track("/m/4.flac", title="Hey Jude", artist="Beatles Tribute", album="Covers"),
+        make_track("/m/5.flac", title="밤편지", artist="아이유", album="Palette", genre="K-Pop"),
+        make_track("/m/6.flac", title="Café Del Mar", artist="Energy 52", album="Ibiza", folder_name="Trance"),
+    ])
+
+
+def titles(result) -> list[str]:
+    return [t["title"] for t in result[0]]
+
+
+def test_search_prefix_and_ranking(library):
+    """단어 접두어 검색, 모든 단어 포함, 제목 일치가 먼저"""
+    assert titles(TrackRepository.search("help")) == ["Help!", "Yesterday"]
+    assert titles(TrackRepository.search("beat bl")) == ["Blackbird"]
+    assert titles(TrackRepository.search("아이")) == ["밤편지"]
+    assert titles(TrackRepository.search("cafe")) == ["Café Del Mar"]
+    assert titles(TrackRepository.search("tran")) == ["Café Del Mar"]
+
+    tracks, total = TrackRepository.search("beatles", limit=2, offset=1)
+    assert total == 4 and len(tracks) == 2
+
+
+@pytest.mark.parametrize("text", ['"', "AND", 'he"y', "NEAR(", "*", "k-pop", "-", "   "])
+def test_search_odd_input(library, text):
+    """따옴표/연산자/문장부호만 있는 검색어도 오류 없이 처리"""
+    tracks, total = TrackRepository.search(text)
+    assert len(tracks) == total
+
+
+def test_search_follows_changes(library):
+    """태그 변경/이동/삭제가 검색 색인에 바로 반영"""
+    tracks = TrackRepository.get_all()
+    jude = next(t for t in tracks if t["title"] == "Hey Jude")
+    jude["title"] = "Let It Be"
+    TrackRepository.apply_scan([], [jude], [], moved=[("/m/3.flac", "/m/moved.flac")])
+    TrackRepository.delete_by_file_path("/m/1.flac")
+
+    assert titles(TrackRepository.search("jude")) == []
+    assert titles(TrackRepository.search("let")) == ["Let It Be"]
+    assert TrackRepository.search("blackbird")[0][0]["file_path"] == "/m/moved.flac"
+    assert titles(TrackRepository.search("yesterday")) == []
+
+
+def test_search_like_fallback(library, monkeypatch):
+    """FTS5가 없으면 LIKE 검색 (부분 문자열, 제목 순, 와일드카드 문자는 그대로 찾음)"""
+    monkeypatch.setattr(repository, "FTS5_AVAILABLE", False)
+    assert titles(TrackRepository.search("help")) == ["Help!", "Yesterday"]
+    assert titles(TrackRepository.search("eatles bird")) == ["Blackbird"]
+    assert TrackRepository.search("%") == ([], 0)
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Library Scanner Test
+====================
+라이브러리 스캐너 테스트 (병렬 추출)
+"""
+
+import os
+import struct
+import sys
+import wave
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import mutagen
+from mutagen.flac import FLAC, Picture
+from mutagen.id3 import APIC, TALB, TCOM, TCON, TDRC, TIT2, TPE1, TPOS, TRCK
+from mutagen.wave import WAVE
+
+from db import scanner as scanner_module
+from db.artwork import ArtworkStore
+from db.scanner import LibraryScanner
+
+
+def make_wav(path: Path, frames: int = 441):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(2)
+        f.setsampwidth(2)
+        f.setframerate(44100)
+        f.writeframes(b"\x00\x00" * 2 * frames)
+
+
+def make_flac(path: Path, tags: dict, artwork: bytes = None):
+    """STREAMINFO만 있는 최소 FLAC 파일 (1초, 44.1kHz 스테레오 16-bit)"""
+    info = struct.pack(">HH", 4096, 4096) + b"\0" * 6
+    info += ((44100 << 44) | (1 << 41) | (15 << 36) | 44100).to_bytes(8, "big") + b"\0" * 16
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"fLaC" + bytes([0x80]) + len(info).to_bytes(3, "big") + info)
+    audio = FLAC(str(path))
+    for key, value in tags.items():
+        audio[key] = value
+    if artwork:
+        picture = Picture()
+        picture.type = 3
+        picture.mime = "image/jpeg"
+        picture.data = artwork
+        audio.add_picture(picture)
+    audio.save()
+
+
+def make_library(root: Path, count: int = 24):
+    for i in range(count):
+        make_wav(root / f"Album {i // 6}" / f"{i % 6 + 1:02d}.wav")
+    (root / "notes.txt").write_text("not audio")
+
+
+def test_parallel_matches_serial(tmp_path):
+    """병렬 스캔 결과가 순차 스캔과 같은 순서"""
+    make_library(tmp_path)
+    serial = LibraryScanner().scan_folder(str(tmp_path))
+    parallel = LibraryScanner(workers=4).scan_folder(str(tmp_path))
+
+    assert len(serial) == 24
+    assert [t["file_path"] for t in parallel] == [t["file_path"] for t in serial]
+
+
+def test_unordered_progress(tmp_path):
+    """완료 순서 수집 시에도 진행률은 1..전체로 증가"""
+    make_library(tmp_path)
+    progress = []
+    scanner = LibraryScanner(on_progress=lambda c, t: progress.append((c, t)),
+                             workers=3, ordered=False)
+    tracks = scanner.scan_folder(str(tmp_path))
+
+    assert len(tracks) == 24
+    assert progress == [(i, 24) for i in range(1, 25)]
+
+
+def test_incremental_rescan(tmp_path, monkeypatch):
+    """변경 없는 파일은 건너뛰고, 변경/추가/삭제만 반영 (갱신 시 ID 유지)"""
+    from db import models
+    from db.repository import TrackRepository
+
+    monkeypatch.setattr(models, "DB_PATH", tmp_path / "test.db")
+    models.create_tables()
+    library = tmp_path / "music"
+    make_library(library)
+    scanner = LibraryScanner(workers=2)
+
+    first = scanner.rescan(str(library))
+    assert first.summary() == {"added": 24, "updated": 0, "removed": 0, "unchanged": 0, "failed": 0}
+
+    second = scanner.rescan(str(library))
+    assert second.summary()["unchanged"] == 24
+    assert not (second.added or second.updated or second.removed)
+
+    changed = library / "Album 0" / "01.wav"
+    track_id = TrackRepository.get_by_file_path(str(changed))["id"]
+    make_wav(changed, frames=882)
+    os.utime(changed, (1_700_000_000, 1_700_000_000))
+    (library / "Album 1" / "02.wav").unlink()
+    make_wav(library / "Album 9" / "01.wav")
+
+    third = scanner.rescan(str(library))
+    assert third.summary() == {"added": 1, "updated": 1, "removed": 1, "unchanged": 22, "failed": 0}
+    updated = TrackRepository.get_by_file_path(str(changed))
+    assert updated["id"] == track_id
+    assert updated["file_size"] == changed.stat().st_size
+    assert TrackRepository.get_by_file_path(str(library / "Album 1" / "02.wav")) is None
+
+
+def test_single_parse_tags_and_album_cover(tmp_path, monkeypatch):
+    """파일당 한 번 파싱, 앨범 커버는 앨범당 한 번 저장"""
+    store = ArtworkStore(tmp_path / "artwork")
+
+    album = tmp_path / "music" / "Album"
+    for n in (1, 2):
+        make_flac(album / f"{n:02d}.flac",
+                  {"title": f"곡 {n}", "artist": "가수", "album": "앨범", "tracknumber": f"{n}/2"},
+                  artwork=b"\xff\xd8jpeg")
+
+    wav_path = tmp_path / "music" / "Single" / "01.wav"
+    make_wav(wav_path)
+    wav = WAVE(str(wav_path))
+    wav.add_tags()
+    wav.tags.add(TIT2(encoding=3, text="Wave Title"))
+    wav.tags.add(TPE1(encoding=3, text="Wave Artist"))
+    wav.tags.add(TALB(encoding=3, text="Wave Album"))
+    wav.tags.add(TRCK(encoding=3, text="7"))
+    wav.tags.add(TCON(encoding=3, text="(13)"))
+    wav.tags.add(APIC(encoding=3, mime="image/png", type=3, data=b"\x89PNG"))
+    wav.save()
+
+    opened = []
+    real_file = mutagen.File
+    monkeypatch.setattr(scanner_module.mutagen, "File",
+                        lambda path, *a, **kw: opened.append(path) or real_file(path, *a, **kw))
+
+    tracks = LibraryScanner(artwork_store=store).scan_folder(str(tmp_path / "music"))
+    by_title = {t["title"]: t for t in tracks}
+
+    assert len(opened) == 3
+    assert by_title["곡 2"]["track_number"] == 2
+    assert by_title["곡 1"]["artist"] == "가수"
+    assert by_title["곡 1"]["cover_path"] == by_title["곡 2"]["cover_path"]
+    wave_track = by_title["Wave Title"]
+    assert (wave_track["artist"], wave_track["album"], wave_track["track_number"]) == ("Wave Artist", "Wave Album", 7)
+    assert wave_track["genre"] == "Pop"
+    assert Path(wave_track["cover_path"]).read_bytes() == b"\x89PNG"
+    assert len(list(store.root.glob("*/*"))) == 2
+
+
+def test_process_workers_use_scanner_artwork_store(tmp_path):
+    """프로세스 풀 작업자도 스캐너에 지정한 앨범아트 저장소에 커버 저장 (스레드 풀과 같은 결과)"""
+    for n in range(4):
+        make_flac(tmp_path / "music" / f"Album {n}" / "01.flac", {"title": f"{n}", "album": f"Album {n}"},
+                  artwork=b"\xff\xd8jpeg" + bytes([n]))
+
+    results = {}
+    for mode, use_processes in (("threads", False), ("processes", True)):
+        store = ArtworkStore(tmp_path / mode)
+        tracks = LibraryScanner(workers=2, use_processes=use_processes, artwork_store=store)\
+            .scan_folder(str(tmp_path / "music"))
+        assert all(Path(t["cover_path"]).parent.parent == store.root for t in tracks)
+        results[mode] = [(t["title"], t["artwork_hash"]) for t in tracks]
+    assert results["processes"] == results["threads"]
+
+
+def test_extended_metadata_saved(tmp_path, monkeypatch):
+    """작곡가/지휘자/연주자/연도/디스크 번호/비트레이트를 DB에 저장"""
+    from db import models
+    from db.repository import TrackRepository
+
+    monkeypatch.setattr(models, "DB_PATH", tmp_path / "test.db")
+    models.create_tables()
+    flac_path = tmp_path / "music" / "Album" / "01.flac"
+    make_flac(flac_path, {"title": "Aria", "composer": "Bach", "conductor": "Karajan",
+                          "performer": "BPO", "date": "1962-05-01", "discnumber": "2/3"})
+    wav_path = tmp_path / "music" / "Single" / "01.wav"
+    make_wav(wav_path)
+    wav = WAVE(str(wav_path))
+    wav.add_tags()
+    wav.tags.add(TCOM(encoding=3, text="Mozart"))
+    wav.tags.add(TDRC(encoding=3, text="1787"))
+    wav.tags.add(TPOS(encoding=3, text="1"))
+    wav.save()
+
+    LibraryScanner().rescan(str(tmp_path / "music"))
+
+    flac = TrackRepository.get_by_file_path(str(flac_path))
+    assert (flac["composer"], flac["conductor"], flac["performer"]) == ("Bach", "Karajan", "BPO")
+    assert (flac["year"], flac["disc_number"]) == (1962, 2)
+    wav_track = TrackRepository.get_by_file_path(str(wav_path))
+    assert (wav_track["composer"], wav_track["year"], wav_track["disc_number"]) == ("Mozart", 1787, 1)
+    assert wav_track["bitrate"] == 44100 * 2 * 16
+
+
+def test_backfill_after_upgrade(tmp_path, monkeypatch):
+    """마이그레이션 전에 저장된 트랙은 배치로 파일을 다시 읽어 채우고, 중단되면 이어서 채움"""
+    import threading
+    from db import models
+    from db.repository import BackfillRepository, TrackRepository
+
+    monkeypatch.setattr(models, "DB_PATH", tmp_path / "test.db")
+    models.create_tables()
+    library = tmp_path / "music"
+    for n in range(1, 4):
+        make_flac(library / f"{n:02d}.flac", {"title": f"T{n}", "composer": f"C{n}", "date": "2001"})
+    LibraryScanner().rescan(str(library))
+
+    # 버전 1 DB로 되돌림 (확장 컬럼 없음, year는 저장된 적 없음)
+    conn = models.connection()
+    for column in models.METADATA_COLUMNS:
+        conn.execute(f"ALTER TABLE tracks DROP COLUMN {column}")
+    conn.execute("UPDATE tracks SET year = NULL")
+    conn.execute("PRAGMA user_version = 1")
+    (library / "02.flac").unlink()
+
+    models.create_tables()
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == models.SCHEMA_VERSION
+    assert BackfillRepository.pending() == 3
+
+    scanner = LibraryScanner(batch_size=1)
+    cancel = threading.Event()
+    cancel.set()
+    assert scanner.backfill_metadata(cancel) == 0
+    assert BackfillRepository.pending() == 3
+
+    # 읽을 수 없는 파일은 건너뛰고 끝까지 진행
+    assert scanner.backfill_metadata() == 2
+    assert BackfillRepository.pending() == 0
+    assert conn.execute("SELECT COUNT(*) FROM schema_backfills").fetchone()[0] == 0
+    rows = {t["title"]: t for t in TrackRepository.get_all()}
+    assert (rows["T1"]["composer"], rows["T1"]["year"], rows["T3"]["composer"]) == ("C1", 2001, "C3")
+    assert (rows["T2"]["composer"], rows["T2"]["year"]) == (None, None)
+
+    # 다시 열어도 백필을 다시 예약하지 않음
+    models.create_tables()
+    assert BackfillRepository.pending() == 0
+
+
+def test_rescan_commits_in_batches(tmp_path, monkeypatch):
+    """batch_size개마다 저장하고 DB id가 채워진 트랙을 이벤트로 전달"""
+    from db import models
+    from db.repository import TrackRepository
+
+    monkeypatch.setattr(models, "DB_PATH", tmp_path / "test.db")
+    models.create_tables()
+    make_library(tmp_path / "music")
+    batches = []
+
+    def on_batch(added, updated):
+        # 이벤트 시점에 이미 커밋되어 있어야 함
+        assert all(TrackRepository.get_by_id(t["id"])["file_path"] == t["file_path"] for t in added)
+        batches.append(len(added))
+
+    result = LibraryScanner(workers=3, batch_size=5).rescan(str(tmp_path / "music"), on_batch=on_batch)
+
+    assert batches == [5, 5, 5, 5, 4]
+    assert result.added == 24
+
+
+def test_rescan_writes_through_executor(tmp_path, monkeypatch):
+    """DB 실행기를 주면 배치 저장은 실행기 작업자에서 백그라운드 우선순위로"""
+    import threading
+    from db import models
+    from db.executor import DbExecutor
+    from db.repository import TrackRepository
+
+    monkeypatch.setattr(models, "DB_PATH", tmp_path / "test.db")
+    models.create_tables()
+    make_library(tmp_path / "music", count=12)
+    writers = set()
+    real_apply = TrackRepository.apply_scan
+
+    def apply_scan(*args):
+        writers.add(threading.current_thread().name)
+        return real_apply(*args)
+
+    monkeypatch.setattr(TrackRepository, "apply_scan", staticmethod(apply_scan))
+    executor = DbExecutor()
+    result = LibraryScanner(batch_size=5, db_executor=executor).rescan(str(tmp_path / "music"))
+    executor.shutdown()
+
+    assert result.added == 12
+    assert len(TrackRepository.get_all()) == 12
+    assert writers and all(name.startswith("db-executor") for name in writers)
+
+
+def test_folder_cover_listed_once(tmp_path, monkeypatch):
+    """폴더 이미지는 폴더당 한 번 목록으로 결정하고 폴더별로 기록"""
+    music = tmp_path / "music"
+    make_library(music, count=12)
+    (music / "Album 0" / "Folder.JPG").write_bytes(b"jpeg")
+    (music / "Album 0" / "back.png").write_bytes(b"png")
+    (music / "Album 1" / "scan2.png").write_bytes(b"png")
+    (music / "Album 1" / "scan1.png").write_bytes(b"png")
+
+    listed = []
+    pick = LibraryScanner._pick_cover_image
+    monkeypatch.setattr(LibraryScanner, "_pick_cover_image",
+                        staticmethod(lambda folder: listed.append(folder) or pick(folder)))
+
+    scanner = LibraryScanner(workers=3, artwork_store=ArtworkStore(tmp_path / "artwork"))
+    tracks = scanner.scan_folder(str(music))
+
+    assert sorted(listed) == [music / "Album 0", music / "Album 1"]
+    assert {Path(t["cover_path"]).read_bytes() for t in tracks} == {b"jpeg", b"png"}
+    assert scanner.folder_covers == {
+        str(music / "Album 0"): str(music / "Album 0" / "Folder.JPG"),
+        str(music / "Album 1"): str(music / "Album 1" / "scan1.png"),
+    }
+
+
+def test_cancel_and_resume(tmp_path, monkeypatch):
+    """취소하면 저장된 배치까지 체크포인트, 다시 스캔하면 완료된 폴더는 건너뛰고 이어서 진행"""
+    import threading
+
+    from db import models
+    from db.repository import ScanJobRepository, TrackRepository
+
+    monkeypatch.setattr(models, "DB_PATH", tmp_path / "test.db")
+    models.create_tables()
+    music = tmp_path / "music"
+    make_library(music)
+    cancel = threading.Event()
+    batches = []
+
+    def on_batch(added, updated):
+        batches.append(len(added))
+        if len(batches) == 2:
+            cancel.set()
+
+    scanner = LibraryScanner(batch_size=5)
+    first = scanner.rescan(str(music), on_batch=on_batch, cancel=cancel)
+    assert first.cancelled and first.added == 10
+    job = ScanJobRepository.find_interrupted(str(music))[0]
+    assert job["status"] == "cancelled" and job["last_batch"] == 2
+    assert ScanJobRepository.get_completed_dirs(job["id"]) == {str(music / "Album 0")}
+
+    second = scanner.rescan(str(music))
+    assert second.resumed and not second.cancelled
+    # Album 0은 건너뛰고, Album 1에서 이미 저장된 4개만 변경 없음으로 확인
+    assert second.summary() == {"added": 14, "updated": 0, "removed": 0, "unchanged": 4, "failed": 0}
+    assert len(TrackRepository.get_all()) == 24
+    assert ScanJobRepository.find_interrupted(str(music)) == []
+
+    third = scanner.rescan(str(music))
+    assert not third.resumed and third.unchanged == 24
+
+
+def test_resume_retries_failed_files(tmp_path, monkeypatch):
+    """추출에 실패한 파일이 있는 폴더는 완료로 기록하지 않음 → 이어서 할 때 다시 추출"""
+    import threading
+
+    from db import models
+    from db.repository import ScanJobRepository, TrackRepository
+
+    monkeypatch.setattr(models, "DB_PATH", tmp_path / "test.db")
+    models.create_tables()
+    music = tmp_path / "music"
+    make_library(music)
+    broken = str(music / "Album 0" / "03.wav")
+    cancel = threading.Event()
+    batches = []
+
+    def on_batch(added, updated):
+        batches.append(len(added))
+        if len(batches) == 2:
+            cancel.set()
+
+    scanner = LibraryScanner(batch_size=5)
+    real_extract = scanner._extract_metadata
+    monkeypatch.setattr(scanner, "_extract_metadata",
+                        lambda path: None if str(path) == broken else real_extract(path))
+    first = scanner.rescan(str(music), on_batch=on_batch, cancel=cancel)
+    assert first.cancelled and first.failed == 1
+    job = ScanJobRepository.find_interrupted(str(music))[0]
+    assert str(music / "Album 0") not in ScanJobRepository.get_completed_dirs(job["id"])
+
+    monkeypatch.setattr(scanner, "_extract_metadata", real_extract)
+    second = scanner.rescan(str(music))
+    assert second.summary() == {"added": 14, "updated": 0, "removed": 0, "unchanged": 10, "failed": 0}
+    assert TrackRepository.get_by_file_path(broken) is not None
+    assert len(TrackRepository.get_all()) == 24
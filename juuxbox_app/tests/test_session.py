@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Playback Session Test
+=====================
+세션 지연 저장 및 복원 테스트
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from audio.play_queue import PlayQueue
+from audio.session import SessionCheckpointer, load_session, restore_session
+
+
+class RecordingEngine:
+    """preload 호출만 기록하는 엔진 대역"""
+
+    def __init__(self):
+        self.preloaded = []
+        self.stream_info = []
+
+    def preload(self, file_path: str, start_position: float = 0.0, stream_info=None):
+        self.preloaded.append((file_path, start_position))
+        self.stream_info.append(stream_info)
+
+
+def test_checkpoint_writes_only_on_change(tmp_path):
+    """스냅샷이 바뀐 경우에만 세션/대기열 저장"""
+    session_path = tmp_path / "session.json"
+    queue_path = tmp_path / "queue.bin"
+    queue = PlayQueue([1, 2, 3], start_index=1)
+    state = {"track_id": 2, "file_path": "a.flac", "position": 10.0, "queue_position": 1}
+
+    checkpointer = SessionCheckpointer(lambda: dict(state), queue,
+                                       path=session_path, queue_path=queue_path)
+    checkpointer.flush()
+    assert load_session(session_path) == state
+    assert not queue_path.exists()
+
+    mtime = session_path.stat().st_mtime_ns
+    checkpointer.flush()
+    assert session_path.stat().st_mtime_ns == mtime
+
+    queue.append(4)
+    state["position"] = 12.5
+    checkpointer.flush()
+    assert load_session(session_path)["position"] == 12.5
+    assert PlayQueue.load(queue_path).track_ids() == [1, 2, 3, 4]
+
+
+def test_restore_session_preloads_last_track(tmp_path):
+    """마지막 곡을 저장 위치에서 미리 열고 대기열 위치 복원"""
+    audio_file = tmp_path / "last.flac"
+    audio_file.write_bytes(b"")
+    session_path = tmp_path / "session.json"
+    queue = PlayQueue([5, 6, 7])
+    SessionCheckpointer(
+        lambda: {"track_id": 6, "file_path": str(audio_file), "position": 42.0, "queue_position": 1},
+        queue, path=session_path, queue_path=tmp_path / "queue.bin"
+    ).flush()
+
+    engine = RecordingEngine()
+    session = restore_session(engine, queue, session_path)
+    assert session["track_id"] == 6
+    assert queue.current_id == 6
+    assert engine.preloaded == [(str(audio_file), 42.0)]
+    assert engine.stream_info == [None]
+
+
+def test_restore_session_uses_library_stream_info(tmp_path):
+    """라이브러리 트랙을 찾으면 저장된 스트림 정보로 미리 열고 세션에 트랙을 담음"""
+    audio_file = tmp_path / "last.flac"
+    audio_file.write_bytes(b"")
+    session_path = tmp_path / "session.json"
+    SessionCheckpointer(
+        lambda: {"track_id": 6, "file_path": str(audio_file), "position": 3.0, "queue_position": 0},
+        PlayQueue([6]), path=session_path, queue_path=tmp_path / "queue.bin"
+    ).flush()
+    track = {"id": 6, "file_path": str(audio_file), "sample_rate": 96000, "channels": 2,
+             "bit_depth": 24, "duration_seconds": 300.0}
+
+    engine = RecordingEngine()
+    session = restore_session(engine, PlayQueue([6]), session_path, lookup_track={6: track}.get)
+    assert session["track"] == track
+    info = engine.stream_info[0]
+    assert (info.sample_rate, info.channels, info.bit_depth, info.duration_seconds) == (96000, 2, 24, 300.0)
+
+
+def test_restore_session_skips_missing_file(tmp_path):
+    """파일이 사라졌으면 미리 열지 않음"""
+    session_path = tmp_path / "session.json"
+    SessionCheckpointer(
+        lambda: {"track_id": 1, "file_path": str(tmp_path / "gone.flac"), "position": 1.0, "queue_position": 0},
+        PlayQueue([1]), path=session_path, queue_path=tmp_path / "queue.bin"
+    ).flush()
+
+    engine = RecordingEngine()
+    assert restore_session(engine, PlayQueue([1]), session_path) is None
+    assert engine.preloaded == []
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Transcode Cache Test
+====================
+디코딩 결과 디스크 캐시 테스트
+"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from audio.play_queue import PlayQueue, RepeatMode
+from audio.transcode_cache import TranscodeCache
+
+
+def make_source(tmp_path, name: str, content: bytes = b"m4a") -> str:
+    path = tmp_path / name
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_roundtrip_and_invalidation(tmp_path):
+    """저장한 PCM 재사용, 원본이 바뀌면 무효"""
+    cache = TranscodeCache(tmp_path / "cache", max_bytes=10_000)
+    source = make_source(tmp_path, "a.m4a")
+    pcm = bytes(range(256)) * 4
+
+    assert cache.get(source, 44100, 2) is None
+    cache.put(source, 44100, 2, pcm)
+    assert cache.get(source, 44100, 2) == pcm
+    assert cache.get(source, 48000, 2) is None
+
+    # 재시작 후에도 색인 복원
+    assert TranscodeCache(tmp_path / "cache").get(source, 44100, 2) == pcm
+
+    Path(source).write_bytes(b"changed file")
+    assert cache.get(source, 44100, 2) is None
+
+
+def test_lru_eviction(tmp_path):
+    """용량 상한 초과 시 가장 오래 사용하지 않은 항목부터 삭제"""
+    cache = TranscodeCache(tmp_path / "cache", max_bytes=2500)
+    sources = [make_source(tmp_path, f"{i}.m4a", bytes([i])) for i in range(3)]
+
+    cache.put(sources[0], 44100, 2, b"\0" * 1000)
+    cache.put(sources[1], 44100, 2, b"\0" * 1000)
+    assert cache.get(sources[0], 44100, 2) is not None  # 0번을 최근 사용으로
+    cache.put(sources[2], 44100, 2, b"\0" * 1000)
+
+    assert cache.contains(sources[0])
+    assert not cache.contains(sources[1])
+    assert cache.contains(sources[2])
+    assert cache.total_bytes <= 2500
+    assert len(os.listdir(tmp_path / "cache")) == 2
+
+
+def test_warm_up_decodes_once(tmp_path):
+    """미리 변환은 캐시에 없는 파일만 한 번씩 디코딩"""
+    cache = TranscodeCache(tmp_path / "cache")
+    sources = [make_source(tmp_path, f"{i}.m4a", bytes([i])) for i in range(3)]
+    cache.put(sources[0], 44100, 2, b"cached")
+    decoded = []
+
+    def decode(file_path):
+        decoded.append(file_path)
+        return b"\1\2" * 100, 44100, 2
+
+    cache.warm_up(sources + sources, decode)
+    cache.wait_idle()
+
+    assert sorted(decoded) == sorted(sources[1:])
+    assert cache.get(sources[2], 44100, 2) == b"\1\2" * 100
+
+
+def test_queue_upcoming():
+    """대기열의 다음 곡 목록 (반복 모드에 따라 순환)"""
+    queue = PlayQueue([1, 2, 3, 4], start_index=2)
+    assert queue.upcoming(3) == [4]
+    queue.repeat_mode = RepeatMode.ALL
+    assert queue.upcoming(5) == [4, 1, 2]
+    assert queue.position == 2
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Visualizer Tap Test
+===================
+스펙트럼/레벨 미터 분석 탭 테스트
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from audio.visualizer import VisualizerTap
+
+
+def sine_stream(freq: float, amplitude: float, sample_rate: int = 44100, seconds: float = 0.5):
+    """스테레오 사인파 스트림 제너레이터 (오른쪽 채널은 절반 크기)"""
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    left = amplitude * np.sin(2 * np.pi * freq * t)
+    data = (np.stack([left, left / 2], axis=1) * 32767).astype(np.int16).tobytes()
+
+    def generator():
+        offset = 0
+        required_frames = yield b""
+        while offset < len(data):
+            chunk = data[offset:offset + required_frames * 4]
+            offset += required_frames * 4
+            required_frames = yield chunk
+
+    gen = generator()
+    next(gen)
+    return gen
+
+
+def test_passthrough_without_subscriber():
+    """구독자가 없으면 블록을 그대로 넘기고 보관하지 않음"""
+    tap = VisualizerTap()
+    source = sine_stream(440, 0.5)
+    stream = tap.wrap(source, 44100, 2)
+    chunk = stream.send(512)
+    assert isinstance(chunk, bytes) and len(chunk) == 512 * 4
+    assert not tap.active
+    assert len(tap._chunks) == 0
+
+
+def test_spectrum_and_levels():
+    """1kHz 사인파: 해당 밴드가 최대, RMS/피크는 채널별 진폭과 일치"""
+    tap = VisualizerTap(bands=32)
+    stream = tap.wrap(sine_stream(1000, 0.5), 44100, 2)
+    tap._subscriber = lambda frame: None  # 분석 스레드 없이 수집만
+    for _ in range(8):
+        stream.send(512)
+
+    frame = tap.analyze()
+    bands = frame["bands"]
+    edges = np.geomspace(40.0, 22050, 33)
+    expected = int(np.searchsorted(edges, 1000)) - 1
+    assert abs(int(np.argmax(bands)) - expected) <= 1
+    assert max(bands) > 0.8
+
+    assert abs(frame["peak"][0] - 0.5) < 0.01
+    assert abs(frame["rms"][0] - 0.5 / np.sqrt(2)) < 0.01
+    assert abs(frame["rms"][1] - 0.25 / np.sqrt(2)) < 0.01
+
+    # 새 블록이 없으면 무음 프레임 한 번 후 None
+    assert tap.analyze()["peak"] == [0.0, 0.0]
+    assert tap.analyze() is None
+
+
+def test_subscribe_delivers_frames():
+    """구독 시 분석 스레드가 콜백으로 프레임 전달"""
+    import threading
+
+    tap = VisualizerTap(fps=100)
+    received = threading.Event()
+    stream = tap.wrap(sine_stream(440, 0.5), 44100, 2)
+    tap.subscribe(lambda frame: received.set())
+    stream.send(512)
+    assert received.wait(2.0)
+    tap.unsubscribe()
+    assert not tap.active
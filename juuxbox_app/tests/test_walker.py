@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Library Walker Test
+===================
+os.scandir 기반 음원 파일 탐색기 테스트
+"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from db.walker import walk_audio_files
+
+EXTENSIONS = {".flac", ".mp3", ".wav"}
+
+
+def touch(path: Path, data: bytes = b"x"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+def relative_paths(root: Path, **kwargs) -> list[str]:
+    return [Path(e.path).relative_to(root).as_posix()
+            for e in walk_audio_files(str(root), EXTENSIONS, **kwargs)]
+
+
+def test_filters_extensions_and_reports_stat(tmp_path):
+    """음원 확장자만 (대소문자 무시), 크기/수정 시각 포함, 이름 순 깊이 우선"""
+    touch(tmp_path / "B" / "01.FLAC", b"12345")
+    touch(tmp_path / "B" / "cover.jpg")
+    touch(tmp_path / "A" / "CD1" / "01.mp3")
+    touch(tmp_path / "A" / "album.cue")
+    touch(tmp_path / "A" / "rip.log")
+
+    entries = list(walk_audio_files(str(tmp_path), EXTENSIONS))
+
+    assert relative_paths(tmp_path) == ["A/CD1/01.mp3", "B/01.FLAC"]
+    flac = entries[1]
+    assert flac.size == 5
+    assert flac.mtime == os.stat(flac.path).st_mtime
+
+
+def test_exclude_patterns_and_hidden(tmp_path):
+    """제외 패턴(이름/상대 경로)과 숨김 폴더/파일 건너뛰기"""
+    touch(tmp_path / "Album" / "01.flac")
+    touch(tmp_path / "Album" / "@eaDir" / "01.flac")
+    touch(tmp_path / "Album" / "Scans" / "bonus.wav")
+    touch(tmp_path / "Album" / "._01.flac")
+    touch(tmp_path / ".trash" / "old.mp3")
+
+    assert relative_paths(tmp_path, exclude=("@eaDir", "Album/Scans")) == ["Album/01.flac"]
+    assert "Album/@eaDir/01.flac" in relative_paths(tmp_path, exclude=())
+    assert ".trash/old.mp3" in relative_paths(tmp_path, exclude=(), skip_hidden=False)
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink") or os.name == "nt", reason="심볼릭 링크 필요")
+def test_symlink_loop_visited_once(tmp_path):
+    """상위 폴더를 가리키는 링크가 있어도 한 번씩만 탐색"""
+    touch(tmp_path / "Artist" / "Album" / "01.flac")
+    os.symlink(tmp_path / "Artist", tmp_path / "Artist" / "Album" / "loop")
+    os.symlink(tmp_path / "Artist" / "Album", tmp_path / "Zz link")
+
+    assert relative_paths(tmp_path) == ["Artist/Album/01.flac"]
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Library Watcher Test
+====================
+폴더 감시 이벤트 병합 및 일괄 반영 테스트 (watchdog 없이 이벤트를 직접 전달)
+"""
+
+import sys
+import threading
+import wave
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from db import models
+from db.artwork import ArtworkStore
+from db.executor import DbExecutor
+from db.repository import TrackRepository
+from db.scanner import LibraryScanner
+from db.watcher import LibraryWatcher
+
+
+def make_wav(path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(2)
+        f.setsampwidth(2)
+        f.setframerate(44100)
+        f.writeframes(b"\x00\x00" * 2 * 441)
+
+
+@pytest.fixture
+def library(tmp_path, monkeypatch):
+    monkeypatch.setattr(models, "DB_PATH", tmp_path / "test.db")
+    models.create_tables()
+    music = tmp_path / "music"
+    for name in ("01.wav", "02.wav"):
+        make_wav(music / "Album" / name)
+    scanner = LibraryScanner(artwork_store=ArtworkStore(tmp_path / "artwork"))
+    scanner.rescan(str(music))
+    return music, scanner
+
+
+def test_burst_coalesced_into_one_batch(library):
+    """생성/수정 이벤트가 여러 번 와도 파일당 한 번 파싱, 임시 파일 이름 변경은 생성으로 처리"""
+    music, scanner = library
+    batches = []
+    watcher = LibraryWatcher(scanner, on_change=batches.append)
+    watcher.add_path(str(music))
+    new = music / "Album" / "03.wav"
+    make_wav(new)
+    for kind in ("created", "modified", "modified", "closed"):
+        watcher.handle_event(kind, str(new))
+    watcher.handle_event("modified", str(music / "Album" / "01.wav"))
+    make_wav(music / "Album" / "04.wav")
+    watcher.handle_event("created", str(music / "Album" / "04.wav.part"))
+    watcher.handle_event("moved", str(music / "Album" / "04.wav.part"), str(music / "Album" / "04.wav"))
+    watcher.handle_event("created", str(music / "Album" / "cover.jpg"))
+    watcher.handle_event("created", str(music / ".hidden" / "x.wav"))
+
+    batch = watcher.flush()
+
+    assert batches == [batch]
+    assert sorted(Path(t["file_path"]).name for t in batch.added) == ["03.wav", "04.wav"]
+    assert [Path(t["file_path"]).name for t in batch.updated] == ["01.wav"]
+    assert all(TrackRepository.get_by_id(t["id"]) for t in batch.added + batch.updated)
+    assert not watcher.flush()
+
+
+def test_moves_keep_ids_without_reparsing(library, monkeypatch):
+    """파일/폴더 이동은 ID를 유지한 채 경로만 변경"""
+    music, scanner = library
+    watcher = LibraryWatcher(scanner)
+    watcher.add_path(str(music))
+    ids = {p: TrackRepository.get_by_file_path(str(music / "Album" / p))["id"] for p in ("01.wav", "02.wav")}
+    monkeypatch.setattr(scanner, "_extract_metadata", lambda path: pytest.fail(f"다시 파싱됨: {path}"))
+
+    # 파일 이름 변경 두 번 → 원래 경로 기준으로 합쳐짐
+    (music / "Album" / "01.wav").rename(music / "Album" / "tmp.wav")
+    watcher.handle_event("moved", str(music / "Album" / "01.wav"), str(music / "Album" / "tmp.wav"))
+    (music / "Album" / "tmp.wav").rename(music / "Album" / "Intro.wav")
+    watcher.handle_event("moved", str(music / "Album" / "tmp.wav"), str(music / "Album" / "Intro.wav"))
+    batch = watcher.flush()
+    assert batch.moved == [(str(music / "Album" / "01.wav"), str(music / "Album" / "Intro.wav"))]
+    assert TrackRepository.get_by_file_path(str(music / "Album" / "Intro.wav"))["id"] == ids["01.wav"]
+
+    (music / "Album").rename(music / "Renamed")
+    watcher.handle_event("moved", str(music / "Album"), str(music / "Renamed"), is_directory=True)
+    watcher.flush()
+    moved = TrackRepository.get_by_file_path(str(music / "Renamed" / "02.wav"))
+    assert moved["id"] == ids["02.wav"]
+    assert moved["folder_name"] == "Renamed"
+    assert TrackRepository.get_scan_snapshot(str(music / "Album")) == {}
+
+
+def test_deletes_and_new_folders(library):
+    """파일/폴더 삭제는 DB에서 제거, 새 폴더는 안의 파일을 추가"""
+    music, scanner = library
+    watcher = LibraryWatcher(scanner)
+    watcher.add_path(str(music))
+    make_wav(music / "New" / "CD1" / "01.wav")
+    watcher.handle_event("created", str(music / "New"), is_directory=True)
+    watcher.handle_event("deleted", str(music / "Album" / "01.wav"))
+    batch = watcher.flush()
+    assert [Path(t["file_path"]).name for t in batch.added] == ["01.wav"]
+    assert batch.removed == [str(music / "Album" / "01.wav")]
+
+    watcher.handle_event("deleted", str(music / "Album"), is_directory=True)
+    batch = watcher.flush()
+    assert batch.removed == [str(music / "Album" / "02.wav")]
+    assert len(TrackRepository.get_all()) == 1
+
+
+def test_flush_writes_on_db_executor(library, monkeypatch):
+    """실행기가 있으면 반영 쓰기와 앨범아트 정리는 감시 스레드가 아닌 DB 실행기에서 실행"""
+    music, scanner = library
+    executor = DbExecutor(workers=1)
+    writers = []
+    apply_scan = TrackRepository.apply_scan
+    collect_garbage = scanner.artwork.collect_garbage
+
+    def recording_apply_scan(*args, **kwargs):
+        writers.append(threading.current_thread().name)
+        return apply_scan(*args, **kwargs)
+
+    def recording_collect_garbage():
+        writers.append(threading.current_thread().name)
+        return collect_garbage()
+
+    monkeypatch.setattr(TrackRepository, "apply_scan", recording_apply_scan)
+    monkeypatch.setattr(scanner.artwork, "collect_garbage", recording_collect_garbage)
+    watcher = LibraryWatcher(scanner, db_executor=executor)
+    watcher.add_path(str(music))
+    watcher.handle_event("deleted", str(music / "Album" / "01.wav"))
+    try:
+        batch = watcher.flush()
+    finally:
+        executor.shutdown()
+
+    assert batch.removed == [str(music / "Album" / "01.wav")]
+    assert writers == ["db-executor-0", "db-executor-0"]
+    assert len(TrackRepository.get_all()) == 1
+
+
+def test_library_under_hidden_or_excluded_folder(tmp_path, monkeypatch):
+    """숨김/제외 이름은 감시 폴더 아래에서만 적용 (~/.local/share/music 같은 라이브러리도 감시)"""
+    monkeypatch.setattr(models, "DB_PATH", tmp_path / "test.db")
+    models.create_tables()
+    music = tmp_path / ".local" / "@eaDir" / "music"
+    scanner = LibraryScanner(artwork_store=ArtworkStore(tmp_path / "artwork"))
+    watcher = LibraryWatcher(scanner)
+    watcher.add_path(str(music))
+    make_wav(music / "Album" / "01.wav")
+    make_wav(music / ".cache" / "02.wav")
+    make_wav(music / "@eaDir" / "03.wav")
+    make_wav(tmp_path / "other" / "04.wav")
+    for path in (music / "Album" / "01.wav", music / ".cache" / "02.wav",
+                 music / "@eaDir" / "03.wav", tmp_path / "other" / "04.wav"):
+        watcher.handle_event("created", str(path))
+
+    batch = watcher.flush()
+    assert [t["file_path"] for t in batch.added] == [str(music / "Album" / "01.wav")]
@@ -13,7 +13,7 @@ from PySide6.QtWidgets import (
     QCheckBox, QListWidget, QListWidgetItem, QGroupBox
 )
 from PySide6.QtCore import Qt, Signal, QUrl, QThread, QObject
-from PySide6.QtGui import QPixmap, QFont, QDesktopServices
+from PySide6.QtGui import QPixmap, QFont, QDesktopServices, QPainter, QColor
 
 # WebEngineView는 선택적 (일부 환경에서 미지원)
 try:
@@ -26,6 +26,52 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+class SpectrumWidget(QWidget):
+    """스펙트럼 밴드 + 채널별 레벨 미터 (VisualizerTap 프레임 표시)"""
+
+    def __init__(self):
+        super().__init__()
+        self._bands: list[float] = []
+        self._rms: list[float] = []
+        self._peak: list[float] = []
+        self.setFixedHeight(56)
+        self.setStyleSheet("background: transparent;")
+
+    def set_frame(self, frame: dict):
+        """분석 프레임 반영"""
+        self._bands = frame.get("bands", [])
+        self._rms = frame.get("rms", [])
+        self._peak = frame.get("peak", [])
+        self.update()
+
+    def clear(self):
+        self._bands, self._rms, self._peak = [], [], []
+        self.update()
+
+    def paintEvent(self, event):
+        if not self._bands:
+            return
+        painter = QPainter(self)
+        width, height = self.width(), self.height()
+        meter_width = 6 * len(self._rms) + 8
+        bar_area = width - meter_width
+        bar_width = bar_area / len(self._bands)
+
+        # 스펙트럼 밴드
+        for i, level in enumerate(self._bands):
+            bar_height = level * height
+            painter.fillRect(int(i * bar_width) + 1, int(height - bar_height),
+                             max(1, int(bar_width) - 2), int(bar_height), QColor(29, 185, 84, 200))
+
+        # 레벨 미터 (RMS 막대 + 피크 선)
+        for ch, rms in enumerate(self._rms):
+            x = bar_area + 8 + ch * 6
+            painter.fillRect(int(x), int(height - rms * height), 4, int(rms * height), QColor(179, 179, 179))
+            peak = self._peak[ch] if ch < len(self._peak) else 0.0
+            painter.fillRect(int(x), int(height - peak * height), 4, 2, QColor(255, 255, 255))
+        painter.end()
+
+
 class DetailView(QWidget):
     """
     음악 상세 뷰 (전체화면)
@@ -63,6 +109,7 @@ class DetailView(QWidget):
     prev_clicked = Signal()
     seek_changed = Signal(int)
     youtube_clicked = Signal()
+    visualizer_frame = Signal(object)  # 분석 스레드에서 emit → UI 스레드에서 표시
 
     def __init__(self):
         super().__init__()
@@ -206,6 +253,11 @@ class DetailView(QWidget):
 
         layout.addWidget(info_widget)
 
+        # 스펙트럼 / 레벨 미터
+        self._spectrum = SpectrumWidget()
+        self.visualizer_frame.connect(self._spectrum.set_frame)
+        layout.addWidget(self._spectrum)
+
         # 프로그레스 바
         progress_widget = self._create_progress_bar()
         layout.addWidget(progress_widget)
@@ -665,6 +717,10 @@ class DetailView(QWidget):
         super().resizeEvent(event)
         self._update_album_art()
 
+    def clear_visualizer(self):
+        """스펙트럼 표시 지우기"""
+        self._spectrum.clear()
+
     def set_playing_state(self, is_playing: bool):
         """재생 상태 동기화"""
         self._is_playing = is_playing
@@ -17,11 +17,21 @@ DEFAULT_CONFIG = {
         "output_device": None,
         "exclusive_mode": True,
         "software_volume": 100,
-        "gapless_enabled": True
+        "gapless_enabled": True,
+        "transcode_cache": True,
+        "transcode_cache_mb": 2048
     },
     "library": {
         "scan_paths": [],
-        "auto_scan_on_startup": True
+        "auto_scan_on_startup": True,
+        "scan_workers": 4,
+        "scan_use_processes": False,
+        "scan_batch_size": 500,
+        "scan_exclude": ["@eaDir", "#recycle", "$RECYCLE.BIN", "System Volume Information"],
+        "scan_skip_hidden": True,
+        "watch_enabled": True,
+        "watch_debounce_seconds": 2.0,
+        "page_size": 200
     },
     "ui": {
         "theme": "spotify_dark",
@@ -32,6 +42,23 @@ DEFAULT_CONFIG = {
         "shuffle": False,
         "repeat_mode": "off",
         "remember_position": True
+    },
+    "dsp": {
+        "bypass": True,
+        "preamp_db": 0.0,
+        "eq_bands": [],
+        "balance": 0.0,
+        "crossfeed": False,
+        "crossfeed_level": 0.3
+    },
+    "database": {
+        "journal_mode": "wal",
+        "synchronous": "normal",
+        "cache_size_mb": 64,
+        "mmap_size_mb": 256,
+        "temp_store": "memory",
+        "executor_workers": 2,
+        "executor_background_slots": 1
     }
 }
 
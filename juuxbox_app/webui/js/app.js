@@ -4,7 +4,12 @@
 
 // 전역 상태
 const state = {
-    tracks: [],
+    tracks: [],        // 전체 보기에서는 지금까지 불러온 페이지들
+    pageCursor: null,  // 전체 보기 다음 페이지 커서 (null이면 끝까지 불러옴)
+    viewRequest: 0,    // 화면 요청 번호 (늦게 온 이전 정렬/보기의 응답 무시 - 서버에서 취소된 요청 포함)
+    pagesLoaded: 0,    // 전체 보기에서 불러온 페이지 수
+    loadingPage: false,
+    libraryTotal: 0,   // 라이브러리 전체 트랙 수
     filteredTracks: [],  // 검색/정렬 적용된 트랙
     currentTrack: null,
     isPlaying: false,
@@ -14,13 +19,23 @@ const state = {
     viewMode: 'all',  // all, albums, artists, folders
     gridFilter: null,  // 그리드에서 선택한 필터값 (앨범명, 아티스트명, 폴더명)
     searchQuery: '',   // 검색어
-    sortBy: 'title',   // 정렬 기준: title, artist, album, genre
-    sortAsc: true      // 오름차순 정렬
+    searchResults: null,  // 서버 검색 결과 (전체 목록에서 검색할 때, 관련도 순)
+    searchTotal: 0,       // 서버 검색 전체 결과 수
+    sortByRelevance: true,  // 서버 검색 결과는 정렬을 고르기 전까지 관련도 순
+    sortBy: 'title',   // 정렬 기준: title, artist, album, added
+    sortAsc: true,     // 오름차순 정렬
+    scanning: false    // 폴더 스캔 진행 중
 };
 
 // DOM 요소 캐싱
 const elements = {};
 
+// 서버 검색 결과 최대 개수
+const SEARCH_LIMIT = 200;
+
+// 커버 표시 크기(px) → 서버가 그 이상인 가장 작은 썸네일을 보냄 (0: 원본)
+const COVER_SIZE = { player: 64, card: 256, detail: 600 };
+
 // 초기화
 document.addEventListener('DOMContentLoaded', () => {
     cacheElements();
@@ -30,7 +45,14 @@ document.addEventListener('DOMContentLoaded', () => {
 // pywebview API 준비 후 트랙 로드
 window.addEventListener('pywebviewready', () => {
     console.log('pywebview API ready');
-    loadTracks();
+    restoreSession();
+    loadTracks().then(resumeInterruptedScans);
+    toggleVisualizer(!document.hidden);
+});
+
+// 창이 보일 때만 시각화 프레임 수신
+document.addEventListener('visibilitychange', () => {
+    if (window.pywebview) toggleVisualizer(!document.hidden);
 });
 
 // DOM 요소 캐싱
@@ -84,6 +106,7 @@ function cacheElements() {
     elements.viewTabs = document.querySelectorAll('.view-tab');
     elements.gridContainer = document.getElementById('grid-container');
     elements.trackListContainer = document.getElementById('track-list-container');
+    elements.mainContent = document.querySelector('.main-content');
     elements.libraryTitle = document.getElementById('library-title');
     elements.btnGridBack = document.getElementById('btn-grid-back');
 
@@ -191,6 +214,14 @@ function bindEvents() {
         option.addEventListener('click', () => handleSort(option.dataset.sort));
     });
 
+    // 전체 보기: 목록 끝 근처까지 스크롤하면 다음 페이지
+    elements.mainContent.addEventListener('scroll', () => {
+        const el = elements.mainContent;
+        if (el.scrollTop + el.clientHeight >= el.scrollHeight - 600) {
+            loadMoreTracks();
+        }
+    });
+
     // 정렬 메뉴 외부 클릭 시 닫기
     document.addEventListener('click', (e) => {
         if (!e.target.closest('.sort-control')) {
@@ -199,17 +230,78 @@ function bindEvents() {
     });
 }
 
-// 트랙 목록 로드
+// 전체 보기인지 (서버 정렬 페이지 목록)
+function pagedView() {
+    return state.viewMode === 'all' && !state.gridFilter;
+}
+
+// 트랙 목록 로드 (현재 정렬로 첫 페이지만, 나머지는 스크롤하며 loadMoreTracks)
 async function loadTracks() {
+    const request = ++state.viewRequest;
     try {
-        const tracks = await pywebview.api.get_all_tracks();
-        state.tracks = tracks;
+        const page = await pywebview.api.get_tracks_page(state.sortBy, null, null, !state.sortAsc);
+        // 그 사이 정렬이 바뀌었거나 다른 보기로 옮겼으면 무시
+        if (request !== state.viewRequest || !pagedView()) return;
+        if (!page.success) {
+            console.error('트랙 로드 실패:', page.error);
+            return;
+        }
+        state.tracks = page.tracks;
+        state.pageCursor = page.cursor;
+        state.libraryTotal = page.total;
+        state.pagesLoaded = 1;
         applySearchAndSort();
     } catch (e) {
         console.error('트랙 로드 실패:', e);
     }
 }
 
+// 다음 페이지 이어 받기
+async function loadMoreTracks() {
+    if (!pagedView() || !state.pageCursor || state.loadingPage || serverSearchActive()) return;
+    const request = state.viewRequest;
+    state.loadingPage = true;
+    try {
+        const page = await pywebview.api.get_tracks_page(state.sortBy, state.pageCursor, null, !state.sortAsc);
+        if (request !== state.viewRequest || !pagedView() || !page.success) return;
+        const start = state.tracks.length;
+        state.tracks.push(...page.tracks);
+        state.pageCursor = page.cursor;
+        state.pagesLoaded += 1;
+        if (state.searchQuery) {
+            applySearchAndSort();
+        } else {
+            // 이미 그린 행은 그대로 두고 새 페이지만 추가
+            state.filteredTracks = state.tracks;
+            appendTrackRows(page.tracks, start);
+        }
+    } catch (e) {
+        console.error('다음 페이지 로드 실패:', e);
+    } finally {
+        state.loadingPage = false;
+    }
+}
+
+// 표시할 전체 곡 수 (전체 보기는 아직 안 불러온 페이지 포함)
+function libraryCount() {
+    return pagedView() ? state.libraryTotal : state.tracks.length;
+}
+
+// 마지막 세션 복원 (Python에서 미리 연 곡을 플레이어에 표시)
+async function restoreSession() {
+    try {
+        const playback = await pywebview.api.get_playback_state();
+        if (!playback.track) return;
+        state.currentTrack = playback.track;
+        state.isPlaying = playback.playing;
+        updatePlayerUI();
+        updateNowPlayingUI();
+        window.onProgressUpdate(playback.position, playback.track.duration);
+    } catch (e) {
+        console.error('세션 복원 실패:', e);
+    }
+}
+
 // 트랙 목록 렌더링
 function renderTrackList() {
     const tbody = elements.trackListBody;
@@ -227,12 +319,22 @@ function renderTrackList() {
 
     // 필터링된 결과 표시
     if (state.searchQuery) {
-        elements.trackCount.textContent = `${tracksToRender.length}/${state.tracks.length}곡`;
+        const matched = serverSearchActive() ? state.searchTotal : tracksToRender.length;
+        elements.trackCount.textContent = `${matched}/${libraryCount()}곡`;
     } else {
-        elements.trackCount.textContent = `${state.tracks.length}곡`;
+        elements.trackCount.textContent = `${libraryCount()}곡`;
     }
 
-    tracksToRender.forEach((track, index) => {
+    appendTrackRows(tracksToRender, 0);
+}
+
+// 트랙 행 추가 (index: filteredTracks 기준 시작 인덱스)
+function appendTrackRows(tracks, start) {
+    const tbody = elements.trackListBody;
+    const fragment = document.createDocumentFragment();
+
+    tracks.forEach((track, offset) => {
+        const index = start + offset;
         const tr = document.createElement('tr');
         tr.dataset.index = index;
         tr.dataset.path = track.file_path;
@@ -267,16 +369,27 @@ function renderTrackList() {
             toggleTrackSelection(track.file_path, checkbox.checked);
         });
 
-        tbody.appendChild(tr);
+        fragment.appendChild(tr);
     });
 
+    tbody.appendChild(fragment);
+
     // 플레이리스트 업데이트 (필터링된 트랙 기준)
-    state.playlist = [...tracksToRender];
+    state.playlist = [...state.filteredTracks];
+}
+
+// 대기열 설정 - 전체 보기는 불러온 페이지가 아니라 라이브러리 전체를 현재 정렬 순서로
+async function setPlayQueue(tracks, index) {
+    if (tracks === state.tracks && pagedView()) {
+        await pywebview.api.set_library_playlist(state.sortBy, !state.sortAsc, tracks[index].id);
+    } else {
+        await pywebview.api.set_playlist(tracks.map(t => t.id), index);
+    }
 }
 
-// 트랙 재생
-async function playTrack(index) {
-    const track = state.tracks[index];
+// 트랙 재생 (tracks: 대기열로 쓸 목록)
+async function playTrack(index, tracks = state.tracks) {
+    const track = tracks[index];
     if (!track) return;
 
     // YouTube 재생 중지
@@ -290,7 +403,7 @@ async function playTrack(index) {
             state.currentTrack = track;
             state.isPlaying = true;
             state.playlistIndex = index;
-            await pywebview.api.set_playlist(state.tracks, index);
+            await setPlayQueue(tracks, index);
             updatePlayerUI();
             updateNowPlayingUI();
             highlightPlayingTrack();
@@ -310,7 +423,7 @@ function updatePlayerUI() {
     elements.playerTitle.textContent = track.title;
     elements.playerArtist.textContent = track.artist;
 
-    loadCoverImage(track.cover_path, elements.playerAlbumArt);
+    loadCoverImage(track.cover_path, elements.playerAlbumArt, COVER_SIZE.player);
 
     updatePlayButtonIcon();
     elements.totalTime.textContent = formatDuration(track.duration);
@@ -348,7 +461,7 @@ function updateNowPlayingUI() {
     }
 
     // 앨범아트
-    loadCoverImage(track.cover_path, elements.albumArtImg);
+    loadCoverImage(track.cover_path, elements.albumArtImg, COVER_SIZE.detail);
 
     // YouTube 검색 결과 초기화
     elements.youtubeResults.innerHTML = '';
@@ -471,32 +584,127 @@ window.onProgressUpdate = function (current, total) {
     }
 };
 
-// 폴더 추가
+// 곡이 끝나 대기열의 다음 곡으로 넘어감 (Python에서 호출, 한 곡 반복이면 같은 곡)
+window.onTrackChanged = function (track) {
+    state.currentTrack = track;
+    state.isPlaying = true;
+    state.playlistIndex = state.tracks.findIndex(t => t.file_path === track.file_path);
+    updatePlayerUI();
+    updateNowPlayingUI();
+    highlightPlayingTrack();
+};
+
+// 시각화 시작/중지
+async function toggleVisualizer(enabled) {
+    try {
+        if (enabled) {
+            await pywebview.api.start_visualizer();
+        } else {
+            await pywebview.api.stop_visualizer();
+        }
+    } catch (e) {
+        console.error('시각화 설정 실패:', e);
+    }
+}
+
+// 스펙트럼/레벨 미터 프레임 (Python 분석 스레드에서 호출)
+window.onVisualizerFrame = function (frame) {
+    const canvas = document.getElementById('visualizer');
+    if (!canvas) return;
+    const ctx = canvas.getContext('2d');
+    const { width, height } = canvas;
+    const meterWidth = frame.rms.length * 5 + 6;
+    const barWidth = (width - meterWidth) / frame.bands.length;
+
+    ctx.clearRect(0, 0, width, height);
+    ctx.fillStyle = 'rgba(29, 185, 84, 0.8)';
+    frame.bands.forEach((level, i) => {
+        const h = level * height;
+        ctx.fillRect(i * barWidth + 0.5, height - h, Math.max(1, barWidth - 1), h);
+    });
+
+    frame.rms.forEach((rms, ch) => {
+        const x = width - meterWidth + 6 + ch * 5;
+        ctx.fillStyle = '#b3b3b3';
+        ctx.fillRect(x, height - rms * height, 3, rms * height);
+        ctx.fillStyle = '#ffffff';
+        ctx.fillRect(x, height - frame.peak[ch] * height, 3, 1);
+    });
+};
+
+// 스캔 배치 수신 (Python에서 배치 저장마다 호출)
+// 폴더 감시로 트랙이 삭제/이동됨 → 목록 다시 로드
+window.onLibraryChanged = function () {
+    if (pagedView()) loadTracks();
+    if (serverSearchActive()) runServerSearch();
+};
+
+// 스캔 중 전체 보기 새로고침 (배치마다 다시 읽지 않도록 모아서)
+const reloadTracksSoon = debounce(() => loadTracks(), 1000);
+
+window.onTracksAdded = function (added, updated) {
+    if (updated.length) {
+        const byId = new Map(updated.map(t => [t.id, t]));
+        state.tracks = state.tracks.map(t => byId.get(t.id) || t);
+    }
+    if (pagedView()) {
+        // 새 트랙이 정렬 순서 어디에 들어갈지 모르므로 첫 페이지만 보고 있을 때 다시 로드, 아니면 곡 수만
+        state.libraryTotal += added.length;
+        if (added.length && state.pagesLoaded <= 1) reloadTracksSoon();
+    } else {
+        state.tracks.push(...added);
+    }
+    applySearchAndSort();
+};
+
+// 폴더 추가 (스캔 중에는 스캔 취소)
 async function addFolder() {
+    if (state.scanning) {
+        elements.btnAddFolder.disabled = true;
+        await pywebview.api.cancel_scan();
+        return;
+    }
     try {
         const folderPath = await pywebview.api.select_folder();
         if (folderPath) {
-            elements.btnAddFolder.disabled = true;
-            elements.btnAddFolder.querySelector('span:last-child').textContent = '스캔 중...';
-
-            const result = await pywebview.api.scan_folder(folderPath);
-            if (result.success) {
-                await loadTracks();
-                alert(`${result.count}개 트랙을 추가했습니다.`);
-            } else {
-                alert('스캔 실패: ' + result.error);
-            }
-
-            elements.btnAddFolder.disabled = false;
-            elements.btnAddFolder.querySelector('span:last-child').textContent = '폴더 추가';
+            await runScan(folderPath);
         }
     } catch (e) {
         console.error('폴더 추가 실패:', e);
+    }
+}
+
+// 폴더 스캔 실행 (취소되면 다음 스캔에서 이어서 진행)
+async function runScan(folderPath) {
+    state.scanning = true;
+    elements.btnAddFolder.querySelector('span:last-child').textContent = '스캔 취소';
+    try {
+        const result = await pywebview.api.scan_folder(folderPath);
+        if (result.success) {
+            await loadTracks();
+            const summary = `추가 ${result.added}개, 갱신 ${result.updated}개, 삭제 ${result.removed}개 (변경 없음 ${result.unchanged}개)`;
+            alert(result.cancelled ? `스캔 취소됨 - 다음에 이어서 진행합니다\n${summary}` : summary);
+        } else {
+            alert('스캔 실패: ' + result.error);
+        }
+    } catch (e) {
+        console.error('폴더 스캔 실패:', e);
+    } finally {
+        state.scanning = false;
         elements.btnAddFolder.disabled = false;
         elements.btnAddFolder.querySelector('span:last-child').textContent = '폴더 추가';
     }
 }
 
+// 중단된 스캔 이어서 진행
+async function resumeInterruptedScans() {
+    const folders = await pywebview.api.get_interrupted_scans();
+    for (const folderPath of folders) {
+        if (state.scanning) break;
+        await runScan(folderPath);
+    }
+}
+
 // 전체 선택 토글
 function toggleSelectAll() {
     const checked = elements.selectAll.checked;
@@ -629,13 +837,13 @@ function stopYoutubePlayback() {
 }
 
 // 유틸리티 함수들
-async function loadCoverImage(coverPath, imgElement) {
+async function loadCoverImage(coverPath, imgElement, size = 0) {
     if (!coverPath) {
         imgElement.classList.remove('show');
         return;
     }
     try {
-        const result = await pywebview.api.get_cover_image(coverPath);
+        const result = await pywebview.api.get_cover_image(coverPath, size);
         if (result.success) {
             imgElement.src = result.data_uri;
             imgElement.classList.add('show');
@@ -679,10 +887,10 @@ function debounce(func, wait) {
 
 // 검색 및 정렬 적용
 function applySearchAndSort() {
-    let filtered = [...state.tracks];
+    let filtered = serverSearchActive() ? [...state.searchResults] : [...state.tracks];
 
-    // 검색 필터 적용
-    if (state.searchQuery) {
+    // 검색 필터 적용 (앨범/아티스트/폴더 트랙 목록 안에서 검색하거나 서버 검색 실패 시)
+    if (state.searchQuery && !serverSearchActive()) {
         const query = state.searchQuery.toLowerCase();
         filtered = filtered.filter(track =>
             (track.title && track.title.toLowerCase().includes(query)) ||
@@ -691,8 +899,9 @@ function applySearchAndSort() {
         );
     }
 
-    // 정렬 적용
-    filtered.sort((a, b) => {
+    // 정렬 적용 (전체 보기는 서버가 정렬한 페이지, 서버 검색 결과는 고르기 전까지 관련도 순)
+    const serverOrdered = serverSearchActive() ? state.sortByRelevance : pagedView();
+    if (!serverOrdered) filtered.sort((a, b) => {
         let valA, valB;
 
         switch (state.sortBy) {
@@ -704,9 +913,9 @@ function applySearchAndSort() {
                 valA = (a.album || '').toLowerCase();
                 valB = (b.album || '').toLowerCase();
                 break;
-            case 'genre':
-                valA = (a.genre || '').toLowerCase();
-                valB = (b.genre || '').toLowerCase();
+            case 'added':
+                valA = a.id;
+                valB = b.id;
                 break;
             case 'title':
             default:
@@ -724,9 +933,42 @@ function applySearchAndSort() {
     renderTrackList();
 }
 
+// 서버 검색 결과를 보여주는 중인지 (전체 목록에서 검색)
+function serverSearchActive() {
+    return Boolean(state.searchQuery && state.searchResults && !state.gridFilter);
+}
+
 // 검색 처리
-function handleSearch() {
+async function handleSearch() {
     state.searchQuery = elements.searchInput.value.trim();
+    state.searchResults = null;
+    state.sortByRelevance = true;
+    if (state.searchQuery && !state.gridFilter) {
+        await runServerSearch();
+        return;
+    }
+    applySearchAndSort();
+}
+
+// 서버 검색 (FTS 색인) - 응답이 늦게 와도 더 최근 검색어의 결과를 덮어쓰지 않음
+async function runServerSearch() {
+    const query = state.searchQuery;
+    let results = null;
+    let total = 0;
+    try {
+        const result = await pywebview.api.search_tracks(query, SEARCH_LIMIT, 0);
+        // 더 최근 검색에 밀려 서버에서 취소됨
+        if (result.cancelled) return;
+        if (result.success) {
+            results = result.tracks;
+            total = result.total;
+        }
+    } catch (e) {
+        console.error('검색 실패:', e);
+    }
+    if (query !== state.searchQuery) return;
+    state.searchResults = results;  // 실패하면 null → 불러온 목록에서 검색
+    state.searchTotal = total;
     applySearchAndSort();
 }
 
@@ -738,12 +980,14 @@ function toggleSortMenu(e) {
 
 // 정렬 처리
 function handleSort(sortBy) {
+    state.sortByRelevance = false;
+
     // 같은 기준이면 정렬 방향 토글
     if (state.sortBy === sortBy) {
         state.sortAsc = !state.sortAsc;
     } else {
         state.sortBy = sortBy;
-        state.sortAsc = true;
+        state.sortAsc = sortBy !== 'added';  // 추가 순서는 최근 것부터
     }
 
     // 활성 옵션 표시
@@ -754,7 +998,12 @@ function handleSort(sortBy) {
     // 메뉴 닫기
     elements.sortMenu.classList.add('hidden');
 
-    applySearchAndSort();
+    if (pagedView()) {
+        // 전체 보기는 서버에서 새 정렬로 첫 페이지부터
+        loadTracks();
+    } else {
+        applySearchAndSort();
+    }
 }
 
 // 필터링된 트랙 재생
@@ -762,6 +1011,12 @@ function playFilteredTrack(index) {
     const track = state.filteredTracks[index];
     if (!track) return;
 
+    // 서버 검색 결과는 불러온 페이지에 없을 수 있음 → 검색 결과를 대기열로
+    if (serverSearchActive()) {
+        playTrack(index, state.filteredTracks);
+        return;
+    }
+
     // 원본 트랙 배열에서의 인덱스 찾기
     const originalIndex = state.tracks.findIndex(t => t.file_path === track.file_path);
     if (originalIndex !== -1) {
@@ -804,9 +1059,11 @@ async function loadAlbums() {
     elements.trackListContainer.style.display = 'none';
     elements.gridContainer.style.display = 'grid';
     elements.gridContainer.innerHTML = '';
+    const request = ++state.viewRequest;
 
     try {
         const albums = await pywebview.api.get_albums();
+        if (request !== state.viewRequest) return;
         elements.trackCount.textContent = `${albums.length}개 앨범`;
 
         albums.forEach(album => {
@@ -815,7 +1072,7 @@ async function loadAlbums() {
                 album.artist || 'Unknown Artist',
                 `${album.track_count}곡`,
                 album.cover_path,
-                () => showAlbumTracks(album.album)
+                () => showAlbumTracks(album)
             );
             elements.gridContainer.appendChild(card);
         });
@@ -829,9 +1086,11 @@ async function loadArtists() {
     elements.trackListContainer.style.display = 'none';
     elements.gridContainer.style.display = 'grid';
     elements.gridContainer.innerHTML = '';
+    const request = ++state.viewRequest;
 
     try {
         const artists = await pywebview.api.get_artists();
+        if (request !== state.viewRequest) return;
         elements.trackCount.textContent = `${artists.length}명 아티스트`;
 
         artists.forEach(artist => {
@@ -840,7 +1099,7 @@ async function loadArtists() {
                 `${artist.album_count}개 앨범`,
                 `${artist.track_count}곡`,
                 artist.cover_path,
-                () => showArtistTracks(artist.artist)
+                () => showArtistTracks(artist)
             );
             elements.gridContainer.appendChild(card);
         });
@@ -854,9 +1113,11 @@ async function loadFolders() {
     elements.trackListContainer.style.display = 'none';
     elements.gridContainer.style.display = 'grid';
     elements.gridContainer.innerHTML = '';
+    const request = ++state.viewRequest;
 
     try {
         const folders = await pywebview.api.get_folders();
+        if (request !== state.viewRequest) return;
         elements.trackCount.textContent = `${folders.length}개 폴더`;
 
         folders.forEach(folder => {
@@ -901,7 +1162,7 @@ function createGridCard(title, subtitle, meta, coverPath, onClick) {
 async function loadCoverForCard(coverPath, imageContainer) {
     if (!coverPath) return;
     try {
-        const result = await pywebview.api.get_cover_image(coverPath);
+        const result = await pywebview.api.get_cover_image(coverPath, COVER_SIZE.card);
         if (result.success) {
             imageContainer.innerHTML = `<img src="${result.data_uri}" alt="">`;
         }
@@ -910,16 +1171,18 @@ async function loadCoverForCard(coverPath, imageContainer) {
     }
 }
 
-// 앨범 트랙 표시
+// 앨범 트랙 표시 (album: get_albums 항목)
 async function showAlbumTracks(album) {
-    state.gridFilter = album;
-    elements.libraryTitle.textContent = album;
+    state.gridFilter = album.album;
+    elements.libraryTitle.textContent = album.album;
     elements.btnGridBack.style.display = 'block';
     elements.gridContainer.style.display = 'none';
     elements.trackListContainer.style.display = 'block';
+    const request = ++state.viewRequest;
 
     try {
-        const tracks = await pywebview.api.get_tracks_by_album(album);
+        const tracks = await pywebview.api.get_tracks_by_album(album.id);
+        if (request !== state.viewRequest) return;
         state.tracks = tracks;
         applySearchAndSort();
     } catch (e) {
@@ -927,16 +1190,18 @@ async function showAlbumTracks(album) {
     }
 }
 
-// 아티스트 트랙 표시
+// 아티스트 트랙 표시 (artist: get_artists 항목)
 async function showArtistTracks(artist) {
-    state.gridFilter = artist;
-    elements.libraryTitle.textContent = artist;
+    state.gridFilter = artist.artist;
+    elements.libraryTitle.textContent = artist.artist;
     elements.btnGridBack.style.display = 'block';
     elements.gridContainer.style.display = 'none';
     elements.trackListContainer.style.display = 'block';
+    const request = ++state.viewRequest;
 
     try {
-        const tracks = await pywebview.api.get_tracks_by_artist(artist);
+        const tracks = await pywebview.api.get_tracks_by_artist(artist.id);
+        if (request !== state.viewRequest) return;
         state.tracks = tracks;
         applySearchAndSort();
     } catch (e) {
@@ -951,9 +1216,11 @@ async function showFolderTracks(folderName) {
     elements.btnGridBack.style.display = 'block';
     elements.gridContainer.style.display = 'none';
     elements.trackListContainer.style.display = 'block';
+    const request = ++state.viewRequest;
 
     try {
         const tracks = await pywebview.api.get_tracks_by_folder(folderName);
+        if (request !== state.viewRequest) return;
         state.tracks = tracks;
         applySearchAndSort();
     } catch (e) {